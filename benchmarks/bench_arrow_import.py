@@ -0,0 +1,107 @@
+"""
+Benchmark: reading the same bars from CSV, Parquet and Arrow IPC.
+
+Usage:
+  python benchmarks/bench_arrow_import.py [--rows 1000000] [--chunk-size 50000]
+
+Reports, per format, file size and import throughput from source file to
+bars_1m row tuples (parse/validate -> time fields -> rows, no database).
+Parquet/Arrow files use a typed timestamp column, as exported by most
+vendors' tooling. Needs the optional pyarrow package; writes temporary
+files, nothing touches Postgres.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from es_stats.services.import_pipeline import ImportBounds, iter_bars_1m_chunks, open_bar_reader
+
+_BASE = datetime(2024, 1, 1)
+# Input zone without DST gaps, so every synthetic minute is a valid local time.
+_TZ = "UTC"
+
+
+def _write_sources(d: Path, n: int) -> dict[str, Path]:
+    ts = [_BASE + timedelta(minutes=i) for i in range(n)]
+    px = [4800.0 + (i % 400) * 0.25 for i in range(n)]
+
+    csv_path = d / "bars.csv"
+    with csv_path.open("w") as f:
+        f.write("datetime,open,high,low,last,volume,# of Trades\n")
+        for t, p in zip(ts, px):
+            f.write(f"{t:%Y-%m-%d %H:%M},{p},{p + 1},{p - 1},{p + 0.5},100,10\n")
+
+    table = pa.table(
+        {
+            "datetime": pa.array(ts, pa.timestamp("s")),
+            "open": px,
+            "high": [p + 1 for p in px],
+            "low": [p - 1 for p in px],
+            "last": [p + 0.5 for p in px],
+            "volume": pa.array([100] * n, pa.int64()),
+            "# of Trades": pa.array([10] * n, pa.int64()),
+        }
+    )
+    pq_path = d / "bars.parquet"
+    pq.write_table(table, pq_path)
+    arrow_path = d / "bars.arrow"
+    with ipc.new_file(arrow_path, table.schema) as w:
+        w.write_table(table)
+
+    return {"csv": csv_path, "parquet": pq_path, "arrow": arrow_path}
+
+
+def _import_rows(path: Path, fmt: str, chunk_size: int) -> int:
+    n = 0
+    for rows in iter_bars_1m_chunks(
+        open_bar_reader(path, fmt=fmt).iter_batches(chunk_size),
+        input_timezone=_TZ,
+        instrument_id=1,
+        import_id=7,
+        bounds=ImportBounds(),
+    ):
+        n += sum(1 for _ in rows)
+    return n
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--chunk-size", type=int, default=50_000)
+    args = ap.parse_args()
+
+    if pa is None:
+        print("skipped: pyarrow is not installed (pip install -e '.[arrow]')")
+        return 0
+
+    with tempfile.TemporaryDirectory() as d:
+        sources = _write_sources(Path(d), args.rows)
+
+        print(f"{'format':>8} {'MiB':>8} {'seconds':>9} {'rows/s':>12}")
+        timings = {}
+        for fmt, path in sources.items():
+            t0 = time.perf_counter()
+            assert _import_rows(path, fmt, args.chunk_size) == args.rows
+            timings[fmt] = time.perf_counter() - t0
+            size = path.stat().st_size / 2**20
+            print(f"{fmt:>8} {size:>8.1f} {timings[fmt]:>9.2f} {args.rows / timings[fmt]:>12,.0f}")
+
+        for fmt in ("parquet", "arrow"):
+            print(f"{fmt} vs csv: {timings['csv'] / timings[fmt]:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""
+Benchmark: columnar BarBatch vs per-row RawBar objects on the import path.
+
+Usage:
+  python benchmarks/bench_bar_batch.py [--rows 1000000] [--chunk-size 50000]
+
+Reports
+- memory held per million bars (tracemalloc): list[RawBar] vs BarBatch
+- import throughput from CSV to bars_1m row tuples (parse -> time fields ->
+  rows, no database): per-row RawBar path vs columnar BarBatch path
+
+Writes a temporary CSV; nothing touches Postgres.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from es_stats.services.csv_parser import CsvBarReader
+from es_stats.services.import_pipeline import ImportBounds, chunked, iter_bars_1m_chunks
+from es_stats.services.time_fields import compute_time_fields_batch
+
+_BASE = datetime(2024, 1, 1)
+# Input zone without DST gaps, so every synthetic minute is a valid local time.
+_TZ = "UTC"
+
+
+def _write_csv(path: Path, n: int) -> None:
+    with path.open("w") as f:
+        f.write("datetime,open,high,low,last,volume,# of Trades\n")
+        for i in range(n):
+            px = 4800.0 + (i % 400) * 0.25
+            ts = _BASE + timedelta(minutes=i)
+            f.write(f"{ts:%Y-%m-%d %H:%M},{px},{px + 1},{px - 1},{px + 0.5},100,10\n")
+
+
+def _held_bytes(build) -> int:
+    tracemalloc.start()
+    obj = build()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return held
+
+
+def _rows_per_row(path: Path, chunk_size: int) -> int:
+    """Previous pipeline shape: RawBar per row, datetime column, tuple lists per chunk."""
+    n = 0
+    for chunk in chunked(CsvBarReader(path), chunk_size):
+        t = compute_time_fields_batch([b.dt for b in chunk], _TZ)
+        rows = [
+            (1, ts, td, m, b.open, b.high, b.low, b.close, b.volume, b.trades_count, 7)
+            for b, ts, td, m in zip(
+                chunk, t.ts_start_utc, t.trading_date_ct_int, t.ct_minute_of_day
+            )
+        ]
+        n += len(rows)
+    return n
+
+
+def _rows_columnar(path: Path, chunk_size: int) -> int:
+    n = 0
+    for rows in iter_bars_1m_chunks(
+        CsvBarReader(path).iter_batches(chunk_size),
+        input_timezone=_TZ,
+        instrument_id=1,
+        import_id=7,
+        bounds=ImportBounds(),
+    ):
+        n += sum(1 for _ in rows)
+    return n
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--chunk-size", type=int, default=50_000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "bars.csv"
+        _write_csv(path, args.rows)
+
+        per_million = 1_000_000 / args.rows
+        mem_rows = _held_bytes(lambda: list(CsvBarReader(path))) * per_million
+        mem_batch = _held_bytes(
+            lambda: deque(CsvBarReader(path).iter_batches(args.rows), maxlen=1)
+        ) * per_million
+        print(
+            f"memory per 1M bars: list[RawBar] {mem_rows / 2**20:,.1f} MiB, "
+            f"BarBatch {mem_batch / 2**20:,.1f} MiB ({mem_rows / mem_batch:.1f}x less)"
+        )
+
+        t0 = time.perf_counter()
+        assert _rows_per_row(path, args.chunk_size) == args.rows
+        t_rows = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        assert _rows_columnar(path, args.chunk_size) == args.rows
+        t_batch = time.perf_counter() - t0
+
+        print(f"{'path':>10} {'seconds':>9} {'rows/s':>12}")
+        print(f"{'RawBar':>10} {t_rows:>9.2f} {args.rows / t_rows:>12,.0f}")
+        print(f"{'BarBatch':>10} {t_batch:>9.2f} {args.rows / t_batch:>12,.0f}")
+        print(f"speedup: {t_rows / t_batch:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
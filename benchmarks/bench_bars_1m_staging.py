@@ -0,0 +1,59 @@
+"""
+Benchmark: staging rows into tmp_bars_1m via binary COPY vs executemany.
+
+Usage:
+  ES_STATS_DATABASE_URL=... python benchmarks/bench_bars_1m_staging.py [--sizes 10000 100000 1000000]
+
+Runs inside a single transaction that is rolled back; nothing is persisted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Iterator
+
+from es_stats.db.connection import connect_default
+from es_stats.repositories.bars_1m_repo import stage_bars_1m
+from es_stats.repositories.sql_loader import load_sql
+
+_BASE_TS = 1_704_067_200  # 2024-01-01 00:00:00 UTC
+
+
+def _rows(n: int) -> Iterator[tuple]:
+    for i in range(n):
+        ts = _BASE_TS + 60 * i
+        px = 4800.0 + (i % 400) * 0.25
+        yield (1, ts, 20240101, i % 1440, px, px + 1.0, px - 1.0, px + 0.5, 100, 10, None)
+
+
+def _time_staging(conn, n: int, staging: str) -> float:
+    conn.execute(load_sql("bars_1m/clear_temp.sql"))
+    t0 = time.perf_counter()
+    staged = stage_bars_1m(conn, _rows(n), staging=staging)
+    elapsed = time.perf_counter() - t0
+    assert staged == n
+    return elapsed
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = ap.parse_args()
+
+    conn = connect_default()
+    try:
+        conn.execute(load_sql("bars_1m/create_temp.sql"))
+        print(f"{'rows':>10} {'executemany_s':>14} {'copy_s':>10} {'speedup':>8} {'copy_rows/s':>12}")
+        for n in args.sizes:
+            t_many = _time_staging(conn, n, "executemany")
+            t_copy = _time_staging(conn, n, "copy")
+            print(f"{n:>10} {t_many:>14.3f} {t_copy:>10.3f} {t_many / t_copy:>7.1f}x {n / t_copy:>12,.0f}")
+    finally:
+        conn.rollback()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
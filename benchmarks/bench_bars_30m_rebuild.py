@@ -0,0 +1,285 @@
+"""
+Benchmark: bars_30m rebuild, windowed single pass vs the previous self-join SQL.
+
+Usage:
+  ES_STATS_DATABASE_URL=... python benchmarks/bench_bars_30m_rebuild.py \
+      [--years 3] [--minutes-per-day 1380] [--repeat 3]
+
+Loads synthetic 1m bars for one instrument over --years years into bars_1m,
+then rebuilds bars_30m for the whole range with each statement under
+EXPLAIN (ANALYZE, FORMAT JSON):
+- self_join: aggregate per bucket, join bars_1m twice for open/close and
+             compute session/period/TPO with inline CASE expressions
+             (insert_range.sql before the bucket_30m_dim rewrite, kept below)
+- windowed:  the current bars_30m/insert_range.sql
+
+Reports the best execution time of each and checks both produce identical rows.
+Runs inside a single transaction that is rolled back; nothing is persisted.
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date, timedelta
+
+from es_stats.db.connection import connect_default
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
+from es_stats.repositories.sql_loader import load_sql
+
+_SYMBOL = "BENCH_30M"
+_START = date(2020, 1, 2)
+
+# CME Globex day: 17:00 CT through 15:59 CT (the first --minutes-per-day minutes).
+_LOAD = """
+INSERT INTO bars_1m (instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+                     open, high, low, close, volume, trades_count)
+SELECT %(instrument_id)s,
+       %(epoch0)s + d * 86400 + m * 60,
+       to_char(%(start)s::date + d, 'YYYYMMDD')::int,
+       (1020 + m) %% 1440,
+       16000 + (hashint4(d * 1440 + m) %% 400),
+       16003 + (hashint4(d * 1440 + m) %% 400),
+       15997 + (hashint4(d * 1440 + m) %% 400),
+       16001 + (hashint4(d * 1440 + m) %% 400),
+       10, 1
+FROM generate_series(0, %(days)s - 1) AS d,
+     generate_series(0, %(minutes)s - 1) AS m;
+"""
+
+_SELF_JOIN_INSERT_RANGE = """
+WITH agg AS (
+  SELECT
+    instrument_id,
+    trading_date_ct_int,
+    (ct_minute_of_day - (ct_minute_of_day %% 30)) AS bucket_ct_minute_of_day,
+    MIN(ts_start_utc) AS bucket_start_utc,
+    MAX(ts_start_utc) AS bucket_last_utc,
+    MAX(high) AS high,
+    MIN(low)  AS low,
+    SUM(volume) AS volume,
+    SUM(trades_count) AS trades_count,
+    COUNT(*) AS bar_count_1m
+  FROM bars_1m
+  WHERE instrument_id = %(instrument_id)s
+    AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+    /* dirty mode: only buckets recorded in tmp_dirty_30m by the bars_1m upsert */
+    AND (
+      NOT %(dirty_only)s
+      OR (trading_date_ct_int, ct_minute_of_day - (ct_minute_of_day %% 30)) IN (
+        SELECT d.trading_date_ct_int, d.bucket_ct_minute_of_day
+        FROM tmp_dirty_30m d
+        WHERE d.instrument_id = %(instrument_id)s
+      )
+    )
+  GROUP BY instrument_id, trading_date_ct_int, bucket_ct_minute_of_day
+),
+oc AS (
+  SELECT
+    a.*,
+    bo.open  AS open,
+    bc.close AS close
+  FROM agg a
+  /* trading date in the join keys: partition pruning + full primary-key lookups */
+  JOIN bars_1m bo
+    ON bo.instrument_id       = a.instrument_id
+   AND bo.trading_date_ct_int = a.trading_date_ct_int
+   AND bo.ts_start_utc        = a.bucket_start_utc
+  JOIN bars_1m bc
+    ON bc.instrument_id       = a.instrument_id
+   AND bc.trading_date_ct_int = a.trading_date_ct_int
+   AND bc.ts_start_utc        = a.bucket_last_utc
+),
+classified AS (
+  SELECT
+    instrument_id,
+    bucket_start_utc,
+    bucket_last_utc,
+    trading_date_ct_int,
+    bucket_ct_minute_of_day,
+
+    CASE
+      WHEN bucket_ct_minute_of_day >= 1020 OR bucket_ct_minute_of_day < 510 THEN 'ON'
+      WHEN bucket_ct_minute_of_day >= 510 AND bucket_ct_minute_of_day <= 930 THEN 'RTH'
+      ELSE NULL
+    END AS session,
+
+    /* NOTE: force integer period_index */
+    CASE
+      WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
+      WHEN bucket_ct_minute_of_day < 510  THEN CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
+      WHEN bucket_ct_minute_of_day >= 510 AND bucket_ct_minute_of_day <= 930
+           THEN CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER)
+      ELSE NULL
+    END AS period_index,
+
+    /* Option A: base-26 Excel-style labels beyond 25: a..z, aa..az, ba.. ; A..Z, AA..AZ, ... */
+    CASE
+      WHEN (bucket_ct_minute_of_day >= 1020 OR bucket_ct_minute_of_day < 510) THEN
+        CASE
+          WHEN (
+            CASE
+              WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
+              ELSE CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
+            END
+          ) BETWEEN 0 AND 25 THEN
+            CHR(97 + (
+              CASE
+                WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
+                ELSE CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
+              END
+            ))
+          WHEN (
+            CASE
+              WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
+              ELSE CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
+            END
+          ) BETWEEN 26 AND 701 THEN
+            CHR(97 + (CAST((
+              CASE
+                WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
+                ELSE CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
+              END
+            ) / 26 AS INTEGER) - 1))
+            || CHR(97 + ((
+              CASE
+                WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
+                ELSE CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
+              END
+            ) %% 26))
+          ELSE NULL
+        END
+
+      WHEN (bucket_ct_minute_of_day >= 510 AND bucket_ct_minute_of_day <= 930) THEN
+        CASE
+          WHEN CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER) BETWEEN 0 AND 25 THEN
+            CHR(65 + CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER))
+          WHEN CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER) BETWEEN 26 AND 701 THEN
+            CHR(65 + (CAST(CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER) / 26 AS INTEGER) - 1))
+            || CHR(65 + (CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER) %% 26))
+          ELSE NULL
+        END
+
+      ELSE NULL
+    END AS tpo,
+
+    open, high, low, close,
+    volume,
+    trades_count,
+    bar_count_1m,
+    CASE WHEN bar_count_1m = 30 THEN 1 ELSE 0 END AS is_complete
+  FROM oc
+)
+INSERT INTO bars_30m (
+  instrument_id,
+  bucket_start_utc,
+  bucket_end_utc,
+  trading_date_ct_int,
+  bucket_ct_minute_of_day,
+  session,
+  period_index,
+  tpo,
+  open, high, low, close,
+  volume,
+  trades_count,
+  bar_count_1m,
+  is_complete,
+  derived_from_import_id
+)
+SELECT
+  instrument_id,
+  bucket_start_utc,
+  bucket_last_utc,
+  trading_date_ct_int,
+  bucket_ct_minute_of_day,
+  session,
+  period_index,
+  tpo,
+  open, high, low, close,
+  volume,
+  trades_count,
+  bar_count_1m,
+  is_complete,
+  %(derived_from_import_id)s
+FROM classified;
+"""
+
+_COLUMNS = """
+    bucket_start_utc, bucket_end_utc, trading_date_ct_int, bucket_ct_minute_of_day,
+    session, period_index, tpo, open, high, low, close, volume, trades_count, bar_count_1m, is_complete
+"""
+
+
+def _td(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _exec_ms(conn, query: str, params: dict) -> float:
+    (plan,) = conn.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + query, params).fetchone()
+    return plan[0]["Execution Time"]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--years", type=int, default=3)
+    ap.add_argument("--minutes-per-day", type=int, default=1380)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    days = args.years * 365
+    end = _START + timedelta(days=days - 1)
+    conn = connect_default()
+    try:
+        instrument_id = ensure_instrument(conn, _SYMBOL)
+        for table in ("bars_1m", "bars_30m"):
+            ensure_bars_partitions(conn, table, td_min=_td(_START), td_max=_td(end))
+        conn.execute(
+            _LOAD,
+            {
+                "instrument_id": instrument_id,
+                "epoch0": 1_577_998_800,  # 2020-01-02 17:00 CT (23:00 UTC)
+                "start": _START,
+                "days": days,
+                "minutes": args.minutes_per_day,
+            },
+        )
+        conn.execute("ANALYZE bars_1m;")
+        conn.execute(load_sql("bars_30m/create_dirty_temp.sql"))
+
+        params = {
+            "instrument_id": instrument_id,
+            "td_min": _td(_START),
+            "td_max": _td(end),
+            "derived_from_import_id": None,
+            "dirty_only": False,
+        }
+        queries = {
+            "self_join": _SELF_JOIN_INSERT_RANGE,
+            "windowed": load_sql("bars_30m/insert_range.sql"),
+        }
+        print(f"rows={days * args.minutes_per_day:,} ({args.years} years), full-range rebuild:")
+        print(f"{'sql':>10} {'best_ms':>9}")
+        best: dict[str, float] = {}
+        results = {}
+        for _ in range(args.repeat):  # interleaved, so both see the same cache state
+            for name, query in queries.items():
+                conn.execute(load_sql("bars_30m/delete_range.sql"), params)
+                ms = _exec_ms(conn, query, params)
+                best[name] = min(ms, best.get(name, ms))
+                results[name] = conn.execute(
+                    f"SELECT {_COLUMNS} FROM bars_30m WHERE instrument_id = %s ORDER BY 1;",
+                    (instrument_id,),
+                ).fetchall()
+        for name, ms in best.items():
+            print(f"{name:>10} {ms:>9.1f}")
+
+        assert results["self_join"] == results["windowed"], "rebuilds differ"
+        print(f"identical output: {len(results['windowed']):,} bars_30m rows")
+    finally:
+        conn.rollback()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+"""
+Benchmark: observed bars per (trading date, window), COUNT over bars_1m vs day_coverage popcount.
+
+Usage:
+  ES_STATS_DATABASE_URL=... python benchmarks/bench_day_coverage.py \
+      [--days 250] [--repeat 3]
+
+Loads --days synthetic trading days (1440 minutes, every 13th bar missing)
+for one instrument into bars_1m and builds their day_coverage bitmaps, then
+counts the observed bars of a typical window set on every date two ways:
+- scan:   COUNT(*) over bars_1m joined to the windows' minute ranges
+- bitmap: count_window_minutes(), bit_count(minute_bits & window mask)
+Both must agree. Reports the best time of --repeat runs.
+
+Runs inside a single transaction that is rolled back; nothing is persisted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from es_stats.db.connection import connect_default
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.repositories.day_coverage_repo import count_window_minutes, rebuild_day_coverage
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
+
+_SYMBOL = "BENCH_COVERAGE"
+_START = date(2024, 1, 2)
+
+_LOAD = """
+INSERT INTO bars_1m (instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+                     open, high, low, close, volume, trades_count)
+SELECT %(instrument_id)s,
+       %(epoch0)s + d * 86400 + i * 60,
+       to_char(%(start)s::date + d, 'YYYYMMDD')::int,
+       (1020 + i) %% 1440,
+       16000, 16002, 15998, 16001, 10, 1
+FROM generate_series(0, %(days)s - 1) AS d,
+     generate_series(0, 1439) AS i
+WHERE (d * 1440 + i) %% 13 <> 0;
+"""
+
+_SCAN = """
+SELECT b.trading_date_ct_int, w.i, COUNT(*)::int
+FROM bars_1m b
+JOIN (SELECT * FROM unnest(%(starts)s::int[], %(ends)s::int[]) WITH ORDINALITY AS w(s, e, i)) w
+  ON CASE WHEN w.s <= w.e THEN b.ct_minute_of_day BETWEEN w.s AND w.e
+          ELSE b.ct_minute_of_day >= w.s OR b.ct_minute_of_day <= w.e END
+WHERE b.instrument_id = %(instrument_id)s
+  AND b.trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+GROUP BY 1, 2
+ORDER BY 1, 2;
+"""
+
+_WINDOWS = [
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 509, "ON"),
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH"),
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 569, "IB"),
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 900, 959, "close"),
+]
+
+
+def _td(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _best(fn, repeat: int) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--days", type=int, default=250)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    td_min, td_max = _td(_START), _td(_START + timedelta(days=args.days - 1))
+    conn = connect_default()
+    try:
+        instrument_id = ensure_instrument(conn, _SYMBOL)
+        ensure_bars_partitions(conn, "bars_1m", td_min=td_min, td_max=td_max)
+        conn.execute(
+            _LOAD,
+            {
+                "instrument_id": instrument_id,
+                "epoch0": 1_704_157_200,  # 2024-01-01 17:00 CT
+                "start": _START,
+                "days": args.days,
+            },
+        )
+        rebuild_day_coverage(conn, instrument_id=instrument_id)
+        conn.execute("ANALYZE bars_1m;")
+        conn.execute("ANALYZE day_coverage;")
+
+        params = {
+            "instrument_id": instrument_id,
+            "td_min": td_min,
+            "td_max": td_max,
+            "starts": [w.start_minute_ct for w in _WINDOWS],
+            "ends": [w.end_minute_ct for w in _WINDOWS],
+        }
+        t_scan, scanned = _best(lambda: conn.execute(_SCAN, params).fetchall(), args.repeat)
+        t_bits, counted = _best(
+            lambda: count_window_minutes(
+                conn, instrument_id=instrument_id, td_min=td_min, td_max=td_max, windows=_WINDOWS
+            ),
+            args.repeat,
+        )
+        assert [(td, i - 1, n) for td, i, n in scanned] == counted
+
+        print(f"days={args.days} windows={len(_WINDOWS)} (date, window) counts={len(counted):,}")
+        print(f"  scan bars_1m     {t_scan * 1e3:>9.1f} ms")
+        print(f"  day_coverage     {t_bits * 1e3:>9.1f} ms   ({t_scan / t_bits:.0f}x)")
+    finally:
+        conn.rollback()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
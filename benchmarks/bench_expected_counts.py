@@ -0,0 +1,118 @@
+"""
+Benchmark: expected bars per (trading date, window), per-day Python vs one trading_calendar query.
+
+Usage:
+  ES_STATS_DATABASE_URL=... python benchmarks/bench_expected_counts.py \
+      [--years 5] [--repeat 3]
+
+Generates --years of the default calendar (with a few early closes) for one
+instrument and stores it in trading_calendar, then computes the expected 1m
+bar count of a typical window set on every date two ways:
+- per-day: for each date and window, walk the window's minutes and keep
+  those inside the session that exist on the CT wall clock (zoneinfo
+  round trip), the derivation the calendar table precomputes
+- bulk:    expected_bar_counts(), one bit_count query over the range
+Both must agree. Reports one per-day run and the best of --repeat bulk runs.
+
+Runs inside a single transaction that is rolled back; nothing is persisted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import UTC, date, datetime, timedelta
+
+from es_stats.db.connection import connect_default
+from es_stats.domain.resolutions import TRADING_DAY_START_CT
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.trading_calendar_repo import (
+    expected_bar_counts,
+    upsert_trading_calendar,
+)
+from es_stats.services.time_fields import CT_TZ
+from es_stats.services.trading_calendar import generate_sessions, trading_session
+
+_SYMBOL = "BENCH_CALENDAR"
+_START = date(2020, 1, 1)
+
+_WINDOWS = [
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 509, "ON"),
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH"),
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 569, "IB"),
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 60, 239, "01:00-03:59"),
+]
+
+
+def _exists(day: date, minute: int) -> bool:
+    naive = datetime(day.year, day.month, day.day, minute // 60, minute % 60)
+    local = naive.replace(tzinfo=CT_TZ)
+    return local.astimezone(UTC).astimezone(CT_TZ).replace(tzinfo=None) == naive
+
+
+def _per_day(sessions) -> list[tuple[int, int, int]]:
+    out = []
+    for s in sessions:
+        td = datetime.strptime(str(s.trading_date_ct_int), "%Y%m%d").date()
+        session = s.session_window
+        inside = set() if session is None else session.covered_minutes()
+        for i, w in enumerate(_WINDOWS):
+            n = 0
+            for m in w.covered_minutes():
+                day = td - timedelta(days=1) if m >= TRADING_DAY_START_CT else td
+                if m in inside and _exists(day, m):
+                    n += 1
+            out.append((s.trading_date_ct_int, i, n))
+    return out
+
+
+def _best(fn, repeat: int) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--years", type=int, default=5)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    end = date(_START.year + args.years, 1, 1) - timedelta(days=1)
+    early_closes = {
+        d.year * 10000 + d.month * 100 + d.day: trading_session(d, 1020, 719)
+        for d in (date(y, 7, 3) for y in range(_START.year, end.year + 1))
+    }
+    sessions = generate_sessions(_START, end, overrides=early_closes)
+    td_min, td_max = sessions[0].trading_date_ct_int, sessions[-1].trading_date_ct_int
+
+    conn = connect_default()
+    try:
+        instrument_id = ensure_instrument(conn, _SYMBOL)
+        upsert_trading_calendar(conn, instrument_id=instrument_id, sessions=sessions)
+        conn.execute("ANALYZE trading_calendar;")
+
+        t_py, per_day = _best(lambda: _per_day(sessions), 1)
+        t_sql, bulk = _best(
+            lambda: expected_bar_counts(
+                conn, instrument_id=instrument_id, td_min=td_min, td_max=td_max, windows=_WINDOWS
+            ),
+            args.repeat,
+        )
+        assert per_day == bulk
+
+        print(f"dates={len(sessions):,} windows={len(_WINDOWS)} counts={len(bulk):,}")
+        print(f"  per-day Python   {t_py * 1e3:>9.1f} ms")
+        print(f"  one query        {t_sql * 1e3:>9.1f} ms   ({t_py / t_sql:.0f}x)")
+    finally:
+        conn.rollback()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
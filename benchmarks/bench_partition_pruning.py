@@ -0,0 +1,150 @@
+"""
+Benchmark: partition pruning for trading-date range scans on bars_1m.
+
+Usage:
+  ES_STATS_DATABASE_URL=... python benchmarks/bench_partition_pruning.py \
+      [--years 5] [--minutes-per-day 1440] [--range-days 30]
+
+Loads synthetic 1m bars for one instrument over --years years into the
+(yearly partitioned) bars_1m and into an unpartitioned copy with the same
+indexes, then runs EXPLAIN (ANALYZE, FORMAT JSON) for:
+- rebuild:  bars_30m/insert_range.sql over the last --range-days trading dates
+- window:   a per-trading-date window scan (08:30-09:00 CT high/low per day),
+            the shape of the planned window analyses
+
+Reports the bars_1m partitions each plan touches and the execution time.
+Runs inside a single transaction that is rolled back; nothing is persisted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import date, timedelta
+
+from es_stats.db.connection import connect_default
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
+from es_stats.repositories.sql_loader import load_sql
+
+_SYMBOL = "BENCH_PARTITIONS"
+_START = date(2020, 1, 2)
+
+# One row per (day, minute); prices are arbitrary but satisfy high >= low.
+_LOAD = """
+INSERT INTO {table} (instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+                     open, high, low, close, volume, trades_count)
+SELECT %(instrument_id)s,
+       %(epoch0)s + d * 86400 + m * 60,
+       to_char(%(start)s::date + d, 'YYYYMMDD')::int,
+       m,
+       100 + m * 0.25, 101 + m * 0.25, 99 + m * 0.25, 100.5 + m * 0.25,
+       10, 1
+FROM generate_series(0, %(days)s - 1) AS d,
+     generate_series(0, %(minutes)s - 1) AS m;
+"""
+
+_WINDOW = """
+SELECT trading_date_ct_int, MAX(high) - MIN(low) AS range_pts, COUNT(*) AS bars
+FROM {table}
+WHERE instrument_id = %(instrument_id)s
+  AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+  AND ct_minute_of_day BETWEEN 510 AND 539
+GROUP BY trading_date_ct_int;
+"""
+
+
+def _td(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _plan_relations(node: dict, out: set[str]) -> set[str]:
+    """bars_1m relations the plan actually scanned (runtime-pruned nodes never run)."""
+    name = node.get("Relation Name")
+    if name and name.startswith("bars_1m") and node.get("Actual Loops", 0) > 0:
+        out.add(name)
+    for child in node.get("Plans", []):
+        _plan_relations(child, out)
+    return out
+
+
+def _explain(conn, query: str, params: dict) -> tuple[float, set[str]]:
+    (plan,) = conn.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + query, params).fetchone()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    top = plan[0]
+    return top["Execution Time"], _plan_relations(top["Plan"], set())
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--years", type=int, default=5)
+    ap.add_argument("--minutes-per-day", type=int, default=1440)
+    ap.add_argument("--range-days", type=int, default=30)
+    args = ap.parse_args()
+
+    days = args.years * 365
+    end = _START + timedelta(days=days - 1)
+    conn = connect_default()
+    try:
+        instrument_id = ensure_instrument(conn, _SYMBOL)
+        ensure_bars_partitions(conn, "bars_1m", td_min=_td(_START), td_max=_td(end))
+        ensure_bars_partitions(conn, "bars_30m", td_min=_td(_START), td_max=_td(end))
+
+        load = {
+            "instrument_id": instrument_id,
+            "epoch0": 1_577_923_200,  # 2020-01-02 00:00 UTC
+            "start": _START,
+            "days": days,
+            "minutes": args.minutes_per_day,
+        }
+        conn.execute(_LOAD.format(table="bars_1m"), load)
+        conn.execute(load_sql("bars_30m/create_dirty_temp.sql"))
+        conn.execute(
+            "CREATE TEMP TABLE bars_1m_flat (LIKE bars_1m INCLUDING ALL) ON COMMIT DROP;"
+        )
+        conn.execute(
+            "INSERT INTO bars_1m_flat SELECT * FROM bars_1m WHERE instrument_id = %s;",
+            (instrument_id,),
+        )
+        conn.execute("ANALYZE bars_1m;")
+        conn.execute("ANALYZE bars_1m_flat;")
+        rows = days * args.minutes_per_day
+        n_parts = len({d.year for d in (_START + timedelta(days=i) for i in range(days))})
+        print(f"rows={rows:,} yearly partitions={n_parts} range={args.range_days} trading dates")
+
+        params = {
+            "instrument_id": instrument_id,
+            "td_min": _td(end - timedelta(days=args.range_days - 1)),
+            "td_max": _td(end),
+            "derived_from_import_id": None,
+            "dirty_only": False,
+        }
+        rebuild = load_sql("bars_30m/insert_range.sql")
+        queries = {
+            "rebuild": {
+                "partitioned": rebuild,
+                "flat": rebuild.replace("FROM bars_1m", "FROM bars_1m_flat").replace(
+                    "JOIN bars_1m", "JOIN bars_1m_flat"
+                ),
+            },
+            "window": {
+                "partitioned": _WINDOW.format(table="bars_1m"),
+                "flat": _WINDOW.format(table="bars_1m_flat"),
+            },
+        }
+
+        print(f"{'query':>8} {'table':>12} {'exec_ms':>9}  bars_1m relations scanned")
+        for name, variants in queries.items():
+            for layout, query in variants.items():
+                conn.execute(load_sql("bars_30m/delete_range.sql"), params)
+                ms, relations = _explain(conn, query, params)
+                print(f"{name:>8} {layout:>12} {ms:>9.1f}  {', '.join(sorted(relations))}")
+    finally:
+        conn.rollback()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
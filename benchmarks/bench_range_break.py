@@ -0,0 +1,204 @@
+"""
+Benchmark: Range Break (X breaches Y) over years of 1m data, against a latency target.
+
+Usage:
+  ES_STATS_DATABASE_URL=... python benchmarks/bench_range_break.py \
+      [--years 10] [--repeat 3] [--target-ms 1000]
+
+Loads --years of synthetic Monday-Friday sessions (1380 1m bars per trading
+date, 17:00-15:59 CT, about 2% missing) for one instrument and rebuilds
+bars_30m/bars_derived and day_coverage, then runs run_range_break() for typical X/Y pairs.
+Reports the best of --repeat end-to-end runs and whether each meets
+--target-ms, plus the breach step alone two ways on the same rows:
+- loop:  per-day Python over the fetched rows (dicts by date, if/else flags)
+- numpy: compute_breaks() + summarize_breaks() on aligned columns
+Both must agree.
+
+Runs inside a single transaction that is rolled back; nothing is persisted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from es_stats.db.connection import connect_default
+from es_stats.domain.missing_policy import MissingPolicy, MissingPolicyMode
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
+from es_stats.repositories.day_coverage_repo import rebuild_day_coverage
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
+from es_stats.services.analyses.range_break import (
+    BreakDirection,
+    compute_breaks,
+    run_range_break,
+    summarize_breaks,
+)
+
+_SYMBOL = "BENCH_RANGE_BREAK"
+
+# Trading date start + d, bar i covers CT minute (1020 + i) % 1440, weekdays only,
+# about 2% of bars missing.
+_LOAD = """
+INSERT INTO bars_1m (instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+                     open, high, low, close, volume, trades_count)
+SELECT %(instrument_id)s,
+       %(epoch0)s + d * 86400 + i * 60,
+       to_char(%(start)s::date + d, 'YYYYMMDD')::int,
+       (1020 + i) %% 1440,
+       mid, mid + 2, mid - 2, mid + 1,
+       1 + (d + i) %% 9, 1
+FROM generate_series(0, %(days)s - 1) AS d,
+     generate_series(0, 1379) AS i,
+     LATERAL (SELECT 16000 + (hashint4(d * 1440 + i) %% 200) AS mid) p
+WHERE extract(isodow FROM %(start)s::date + d) <= 5
+  AND hashint4(d * 1440 + i) %% 50 <> 0;
+"""
+
+ON = WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 509, "ON")
+RTH = WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH")
+IB = WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 569, "IB")
+REST = WindowSpec(WindowAnchor.TRADING_DATE_CT, 570, 959, "RTH-IB")
+
+_PAIRS = [(RTH, ON), (REST, IB)]
+
+
+def _td(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _fragments(plan) -> str:
+    return "+".join(f.resolution for f in plan.fragments)
+
+
+def _best(fn, repeat: int) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def _loop(days) -> tuple[int, int, int]:
+    """The per-day version of the breach step: returns (included, up, either)."""
+    x, y = {}, {}
+    for i, td in enumerate(days.trading_date_ct_int.tolist()):
+        x[td] = (days.x_high[i], days.x_low[i], days.x_complete[i])
+        y[td] = (days.y_high[i], days.y_low[i], days.y_complete[i])
+    included = up = either = 0
+    for td in x:
+        xh, xl, xc = x[td]
+        yh, yl, yc = y[td]
+        if not (xc and yc) or xh != xh or yh != yh:
+            continue
+        included += 1
+        broke_up = xh > yh
+        broke_down = xl < yl
+        up += broke_up
+        either += broke_up or broke_down
+    return included, up, either
+
+
+def _vectorized(days, tick_size: float):
+    again = compute_breaks(
+        days.trading_date_ct_int,
+        x_high=days.x_high,
+        x_low=days.x_low,
+        x_complete=days.x_complete,
+        y_high=days.y_high,
+        y_low=days.y_low,
+        y_complete=days.y_complete,
+        tick_size=tick_size,
+    )
+    summary = summarize_breaks(again, BreakDirection.EITHER)
+    return (
+        int(np.count_nonzero(again.included)),
+        summary["break_up"].count,
+        summary["break_either"].count,
+    )
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--target-ms", type=float, default=1000.0)
+    args = ap.parse_args()
+
+    start = date(2015, 1, 1)
+    end = date(start.year + args.years, 1, 1) - timedelta(days=1)
+    td_min, td_max = _td(start), _td(end)
+    conn = connect_default()
+    try:
+        instrument_id = ensure_instrument(conn, _SYMBOL)
+        ensure_bars_partitions(conn, "bars_1m", td_min=td_min, td_max=td_max)
+        t0 = time.perf_counter()
+        conn.execute(
+            _LOAD,
+            {
+                "instrument_id": instrument_id,
+                "epoch0": 1_420_066_800,  # 2014-12-31 17:00 CT
+                "start": start,
+                "days": (end - start).days + 1,
+            },
+        )
+        rebuild_bars_30m_range(
+            conn,
+            instrument_id=instrument_id,
+            td_min=td_min,
+            td_max=td_max,
+            derived_from_import_id=None,
+        )
+        rebuild_day_coverage(conn, instrument_id=instrument_id)
+        for table in ("bars_1m", "bars_30m", "bars_derived"):
+            conn.execute(f"ANALYZE {table};")
+        (rows,) = conn.execute(
+            "SELECT COUNT(*) FROM bars_1m WHERE instrument_id = %s;", (instrument_id,)
+        ).fetchone()
+        print(f"years={args.years} bars_1m rows={rows:,} (loaded in {time.perf_counter() - t0:.0f}s)")
+
+        policy = MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=0.05, y_tol=0.05)
+        print(
+            f"{'X / Y':>14} {'resolution':>16} {'days':>6} {'ms':>8} "
+            f"{'loop_ms':>8} {'numpy_ms':>8} {'target':>7}"
+        )
+        ok = True
+        for x, y in _PAIRS:
+            ms, report = _best(
+                lambda: run_range_break(
+                    conn,
+                    instrument_id=instrument_id,
+                    td_min=td_min,
+                    td_max=td_max,
+                    x=x,
+                    y=y,
+                    policy=policy,
+                ),
+                args.repeat,
+            )
+            ms_loop, looped = _best(lambda: _loop(report.days), args.repeat)
+            ms_np, vectorized = _best(
+                lambda: _vectorized(report.days, report.tick_size), args.repeat
+            )
+            assert looped == vectorized, f"{x.name}/{y.name}: {looped} != {vectorized}"
+            met = ms * 1e3 <= args.target_ms
+            ok &= met
+            print(
+                f"{x.name + ' / ' + y.name:>14} "
+                f"{_fragments(report.x_plan) + ' / ' + _fragments(report.y_plan):>16} "
+                f"{len(report.days):>6,} {ms * 1e3:>8.1f} {ms_loop * 1e3:>8.2f} "
+                f"{ms_np * 1e3:>8.2f} {'ok' if met else 'MISS':>7}"
+            )
+    finally:
+        conn.rollback()
+        conn.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
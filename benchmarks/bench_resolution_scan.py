@@ -0,0 +1,175 @@
+"""
+Benchmark: rows scanned per window set, 1m bars vs the resolution choose_resolution picks.
+
+Usage:
+  ES_STATS_DATABASE_URL=... python benchmarks/bench_resolution_scan.py \
+      [--days 250] [--repeat 3]
+
+Loads --days synthetic full trading days (1440 1m bars each) for one
+instrument into bars_1m, rebuilds bars_30m and every configured bars_derived
+resolution, then for typical window sets runs the per-day window range
+(MAX(high) - MIN(low) per trading date and window) twice: over bars_1m and
+over the chosen resolution (bars_30m or bars_derived). Both must return the
+same ranges. Reports the rows the scans returned (EXPLAIN ANALYZE actual
+rows x loops) and the best execution time.
+
+Runs inside a single transaction that is rolled back; nothing is persisted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import date, timedelta
+
+from es_stats.db.connection import connect_default
+from es_stats.domain.resolutions import BAR_30M
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
+from es_stats.repositories.derived_bars_repo import list_derived_resolutions
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
+from es_stats.services.resolution import choose_resolution
+
+_SYMBOL = "BENCH_RESOLUTION"
+_START = date(2024, 1, 2)
+
+# Trading date d, bar i covers CT minute (1020 + i) % 1440; prices in ticks.
+_LOAD = """
+INSERT INTO bars_1m (instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+                     open, high, low, close, volume, trades_count)
+SELECT %(instrument_id)s,
+       %(epoch0)s + d * 86400 + i * 60,
+       to_char(%(start)s::date + d, 'YYYYMMDD')::int,
+       (1020 + i) %% 1440,
+       mid, mid + 2, mid - 2, mid + 1,
+       10, 1
+FROM generate_series(0, %(days)s - 1) AS d,
+     generate_series(0, 1439) AS i,
+     LATERAL (SELECT 16000 + (hashint4(d * 1440 + i) %% 200) AS mid) p;
+"""
+
+_WINDOW_SETS: dict[str, list[tuple[str, int, int]]] = {
+    "rth+on": [("RTH", 510, 959), ("ON", 1020, 509)],
+    "ib_60m": [("IB", 510, 569)],
+    "hours": [("h09", 540, 599), ("h10", 600, 659), ("h11", 660, 719)],
+    "open_15m": [("open15", 510, 524), ("next15", 525, 539)],
+    "open_5m": [("open5", 510, 514)],
+    "day": [("day", 1020, 1019)],
+    "misaligned": [("0831_0914", 511, 554)],
+}
+
+# Windows are whole buckets of the chosen resolution, so selecting buckets
+# whose start lies in the window selects exactly the window's minutes.
+_QUERY = """
+SELECT b.trading_date_ct_int, w.name, MAX(b.high) - MIN(b.low)
+FROM {table} b
+JOIN (VALUES {values}) AS w(name, s, e)
+  ON CASE WHEN w.s <= w.e THEN b.{minute} BETWEEN w.s AND w.e
+          ELSE b.{minute} >= w.s OR b.{minute} <= w.e END
+WHERE b.instrument_id = %(instrument_id)s {extra}
+  AND b.{minute} = ANY(%(starts)s)
+GROUP BY 1, 2
+ORDER BY 1, 2;
+"""
+
+
+def _sources(resolution: str) -> tuple[str, str, str]:
+    if resolution == "1m":
+        return "bars_1m", "ct_minute_of_day", ""
+    if resolution == "30m":
+        return "bars_30m", "bucket_ct_minute_of_day", ""
+    return "bars_derived", "bucket_ct_minute_of_day", "AND b.resolution = %(resolution)s"
+
+
+def _scan_rows(node: dict) -> int:
+    rows = 0
+    if "Scan" in node.get("Node Type", "") and "Relation Name" in node:
+        rows += node.get("Actual Rows", 0) * node.get("Actual Loops", 0)
+    for child in node.get("Plans", []):
+        rows += _scan_rows(child)
+    return rows
+
+
+def _explain(conn, query: str, params: dict) -> tuple[float, int]:
+    (plan,) = conn.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + query, params).fetchone()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Execution Time"], _scan_rows(plan[0]["Plan"])
+
+
+def _td(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--days", type=int, default=250)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    td_min, td_max = _td(_START), _td(_START + timedelta(days=args.days - 1))
+    conn = connect_default()
+    try:
+        instrument_id = ensure_instrument(conn, _SYMBOL)
+        ensure_bars_partitions(conn, "bars_1m", td_min=td_min, td_max=td_max)
+        conn.execute(
+            _LOAD,
+            {
+                "instrument_id": instrument_id,
+                "epoch0": 1_704_157_200,  # 2024-01-01 17:00 CT
+                "start": _START,
+                "days": args.days,
+            },
+        )
+        rebuild_bars_30m_range(
+            conn,
+            instrument_id=instrument_id,
+            td_min=td_min,
+            td_max=td_max,
+            derived_from_import_id=None,
+        )
+        for table in ("bars_1m", "bars_30m", "bars_derived"):
+            conn.execute(f"ANALYZE {table};")
+        derived = list_derived_resolutions(conn)
+        layouts = {r.name: r for r in (BAR_30M, *derived)}
+
+        print(f"days={args.days} derived resolutions={', '.join(r.name for r in derived)}")
+        print(
+            f"{'window set':>11} {'chosen':>8} {'rows_1m':>10} {'rows':>9} "
+            f"{'reduction':>9} {'ms_1m':>8} {'ms':>7}"
+        )
+        for set_name, spec in _WINDOW_SETS.items():
+            windows = [WindowSpec(WindowAnchor.TRADING_DATE_CT, s, e, n) for n, s, e in spec]
+            chosen = choose_resolution(windows, derived)
+            values = ", ".join(f"('{n}', {s}, {e})" for n, s, e in spec)
+            minutes = sorted(set().union(*(w.covered_minutes() for w in windows)))
+
+            results = {}
+            for resolution in ("1m", chosen):
+                table, minute_col, extra = _sources(resolution)
+                if resolution == "1m":
+                    starts = minutes
+                else:
+                    starts = sorted({layouts[resolution].bucket_start(m) for m in minutes})
+                query = _QUERY.format(table=table, values=values, minute=minute_col, extra=extra)
+                params = {"instrument_id": instrument_id, "starts": starts, "resolution": resolution}
+                ranges = conn.execute(query, params).fetchall()
+                runs = [_explain(conn, query, params) for _ in range(args.repeat)]
+                results[resolution] = (ranges, min(ms for ms, _ in runs), runs[0][1])
+
+            ranges_1m, ms_1m, rows_1m = results["1m"]
+            ranges, ms, rows = results[chosen]
+            assert ranges == ranges_1m, f"{set_name}: {chosen} ranges differ from 1m"
+            print(
+                f"{set_name:>11} {chosen:>8} {rows_1m:>10,} {rows:>9,} "
+                f"{rows_1m / rows:>8.0f}x {ms_1m:>8.1f} {ms:>7.1f}"
+            )
+    finally:
+        conn.rollback()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
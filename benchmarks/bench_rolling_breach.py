@@ -0,0 +1,188 @@
+"""
+Benchmark: Rolling Breach Rate across symbols, serial vs process pool, O(1) vs per-window steps.
+
+Usage:
+  ES_STATS_DATABASE_URL=... python benchmarks/bench_rolling_breach.py \
+      [--symbols 4] [--years 5] [--length 20] [--workers 4] [--repeat 3]
+
+Loads --years of synthetic Monday-Friday sessions (1380 1m bars per trading
+date, about 2% missing) for --symbols instruments and rebuilds their
+bars_30m/bars_derived and day_coverage, then:
+- end to end: run_rolling_breach() over all symbols with workers=1 and
+  with --workers processes (each symbol on its own connection)
+- rolling step: rolling_breach() (prefix-sum differences, O(1) per date)
+  vs recounting every trailing window (O(length) per date) on one symbol's
+  days, at --length and at 250
+Each pair must agree. Reports the best of --repeat runs.
+
+Worker processes need committed data, so the bars are committed and then
+deleted again at the end (also on failure).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from es_stats.db.connection import connect_default
+from es_stats.domain.missing_policy import MissingPolicy, MissingPolicyMode
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
+from es_stats.repositories.day_coverage_repo import rebuild_day_coverage
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
+from es_stats.services.analyses.range_break import BreakDirection, run_range_break
+from es_stats.services.analyses.rolling_breach import rolling_breach, run_rolling_breach
+
+_SYMBOL = "BENCH_ROLLING_{}"
+
+# Trading date start + d, bar i covers CT minute (1020 + i) % 1440, weekdays only,
+# about 2% of bars missing; each symbol gets its own price path.
+_LOAD = """
+INSERT INTO bars_1m (instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+                     open, high, low, close, volume, trades_count)
+SELECT %(instrument_id)s,
+       %(epoch0)s + d * 86400 + i * 60,
+       to_char(%(start)s::date + d, 'YYYYMMDD')::int,
+       (1020 + i) %% 1440,
+       mid, mid + 2, mid - 2, mid + 1,
+       1 + (d + i) %% 9, 1
+FROM generate_series(0, %(days)s - 1) AS d,
+     generate_series(0, 1379) AS i,
+     LATERAL (SELECT 16000 + (hashint4(%(seed)s * 7919 + d * 1440 + i) %% 200) AS mid) p
+WHERE extract(isodow FROM %(start)s::date + d) <= 5
+  AND hashint4(d * 1440 + i) %% 50 <> 0;
+"""
+
+_CLEANUP_TABLES = (
+    "session_daily", "bars_derived", "bars_30m", "day_coverage", "bars_1m", "instruments"
+)
+
+IB = WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 569, "IB")
+REST = WindowSpec(WindowAnchor.TRADING_DATE_CT, 570, 959, "RTH-IB")
+
+
+def _td(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _best(fn, repeat: int) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def _per_window(days, length: int) -> list[int]:
+    """Breach count of every trailing window, recounted from scratch."""
+    flags = days.broke_either.tolist()
+    return [sum(flags[end - length:end]) for end in range(length, len(flags) + 1)]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--symbols", type=int, default=4)
+    ap.add_argument("--years", type=int, default=5)
+    ap.add_argument("--length", type=int, default=20)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    start = date(2015, 1, 1)
+    end = date(start.year + args.years, 1, 1) - timedelta(days=1)
+    td_min, td_max = _td(start), _td(end)
+    symbols = [_SYMBOL.format(i) for i in range(args.symbols)]
+    conn = connect_default()
+    ids: list[int] = []
+    try:
+        ensure_bars_partitions(conn, "bars_1m", td_min=td_min, td_max=td_max)
+        t0 = time.perf_counter()
+        for seed, symbol in enumerate(symbols):
+            instrument_id = ensure_instrument(conn, symbol)
+            ids.append(instrument_id)
+            conn.execute(
+                _LOAD,
+                {
+                    "instrument_id": instrument_id,
+                    "epoch0": 1_420_066_800,  # 2014-12-31 17:00 CT
+                    "start": start,
+                    "days": (end - start).days + 1,
+                    "seed": seed,
+                },
+            )
+            rebuild_bars_30m_range(
+                conn,
+                instrument_id=instrument_id,
+                td_min=td_min,
+                td_max=td_max,
+                derived_from_import_id=None,
+            )
+            rebuild_day_coverage(conn, instrument_id=instrument_id)
+        conn.commit()
+        for table in ("bars_1m", "bars_30m", "bars_derived"):
+            conn.execute(f"ANALYZE {table};")
+        conn.commit()
+        print(
+            f"symbols={args.symbols} years={args.years} length={args.length} "
+            f"cpus={os.cpu_count()} (loaded in {time.perf_counter() - t0:.0f}s)"
+        )
+
+        policy = MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=0.05, y_tol=0.05)
+        params = dict(
+            symbols=symbols,
+            td_min=td_min,
+            td_max=td_max,
+            x=REST,
+            y=IB,
+            policy=policy,
+            length=args.length,
+        )
+        t_serial, serial = _best(lambda: run_rolling_breach(**params), args.repeat)
+        t_pool, pooled = _best(
+            lambda: run_rolling_breach(**params, workers=args.workers), args.repeat
+        )
+        for symbol in symbols:
+            assert (
+                serial.series[symbol].rolling_breach_count.tolist()
+                == pooled.series[symbol].rolling_breach_count.tolist()
+            )
+        dates = len(serial.cross_symbol.trading_date_ct_int)
+        print(f"  run_rolling_breach, {dates:,} dates per symbol")
+        print(f"    workers=1          {t_serial * 1e3:>9.1f} ms")
+        print(f"    workers={args.workers:<10} {t_pool * 1e3:>9.1f} ms   ({t_serial / t_pool:.1f}x)")
+
+        days = run_range_break(
+            conn, instrument_id=ids[0], td_min=td_min, td_max=td_max, x=REST, y=IB, policy=policy
+        ).days
+        print(f"  rolling step, one symbol ({len(days):,} trading dates)")
+        for length in (args.length, 250):
+            t_naive, naive = _best(lambda: _per_window(days, length), args.repeat)
+            t_o1, series = _best(
+                lambda: rolling_breach(
+                    symbols[0], days, direction=BreakDirection.EITHER, length=length
+                ),
+                args.repeat,
+            )
+            assert naive == series.rolling_breach_count.tolist()
+            assert np.all(series.rolling_n <= length)
+            print(
+                f"    length={length:<5} per-window {t_naive * 1e3:>8.2f} ms"
+                f"   prefix sums {t_o1 * 1e3:>7.3f} ms   ({t_naive / t_o1:.0f}x)"
+            )
+    finally:
+        conn.rollback()
+        for table in _CLEANUP_TABLES:
+            conn.execute(f"DELETE FROM {table} WHERE instrument_id = ANY(%s);", (ids,))
+        conn.commit()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,173 @@
+"""
+Benchmark: ON/RTH/FULL_DAY per trading date, re-aggregating bars vs reading session_daily.
+
+Usage:
+  ES_STATS_DATABASE_URL=... python benchmarks/bench_session_daily.py \
+      [--years 5] [--repeat 3]
+
+Loads --years of synthetic Monday-Friday sessions (1380 1m bars per trading
+date, about 2% missing) for one instrument and rebuilds bars_30m (which
+rebuilds bars_derived and session_daily alongside), then gets every date's
+ON, RTH and FULL_DAY OHLCV three ways:
+- bars_1m:       GROUP BY trading date and session over the 1m bars
+- bars_30m:      the same over the session-labelled 30m buckets
+- session_daily: fetch_session_daily(), one stored row per date and session
+All must agree. Also reports what the session_daily step adds to the
+rebuild. Reports the best of --repeat runs.
+
+Runs inside a single transaction that is rolled back; nothing is persisted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from es_stats.db.connection import connect_default
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
+from es_stats.repositories.instruments_repo import ensure_instrument, get_tick_size
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
+from es_stats.repositories.session_daily_repo import fetch_session_daily, rebuild_session_daily
+
+_SYMBOL = "BENCH_SESSION_DAILY"
+
+# Trading date start + d, bar i covers CT minute (1020 + i) % 1440, weekdays only,
+# about 2% of bars missing.
+_LOAD = """
+INSERT INTO bars_1m (instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+                     open, high, low, close, volume, trades_count)
+SELECT %(instrument_id)s,
+       %(epoch0)s + d * 86400 + i * 60,
+       to_char(%(start)s::date + d, 'YYYYMMDD')::int,
+       (1020 + i) %% 1440,
+       mid, mid + 2, mid - 2, mid + 1,
+       1 + (d + i) %% 9, 1
+FROM generate_series(0, %(days)s - 1) AS d,
+     generate_series(0, 1379) AS i,
+     LATERAL (SELECT 16000 + (hashint4(d * 1440 + i) %% 200) AS mid) p
+WHERE extract(isodow FROM %(start)s::date + d) <= 5
+  AND hashint4(d * 1440 + i) %% 50 <> 0;
+"""
+
+# {source} is bars_1m (sessions from the CT minute) or bars_30m (its session label).
+_AGGREGATE = """
+SELECT * FROM (
+  SELECT trading_date_ct_int,
+         CASE WHEN GROUPING(session) = 1 THEN 'FULL_DAY' ELSE session END AS s,
+         (array_agg(open ORDER BY ts))[1], MAX(high), MIN(low),
+         (array_agg(close ORDER BY ts DESC))[1], SUM(volume), SUM(trades_count)
+  FROM ({source}) b
+  WHERE instrument_id = %(instrument_id)s
+    AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+  GROUP BY GROUPING SETS ((trading_date_ct_int, session), (trading_date_ct_int))
+  HAVING GROUPING(session) = 1 OR session IS NOT NULL
+) x
+ORDER BY trading_date_ct_int, array_position(ARRAY['ON', 'RTH', 'FULL_DAY'], s);
+"""
+_FROM_1M = """
+SELECT instrument_id, trading_date_ct_int, ts_start_utc AS ts, open, high, low, close,
+       volume, trades_count,
+       CASE WHEN ct_minute_of_day >= 1020 OR ct_minute_of_day < 510 THEN 'ON'
+            WHEN ct_minute_of_day < 960 THEN 'RTH' END AS session
+FROM bars_1m
+"""
+_FROM_30M = """
+SELECT instrument_id, trading_date_ct_int, bucket_start_utc AS ts, open, high, low, close,
+       volume, trades_count, session
+FROM bars_30m
+"""
+
+
+def _td(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _as_prices(rows: list[tuple], tick_size: float) -> list[tuple]:
+    """Aggregated rows with the tick OHLC columns as prices, as fetch_session_daily returns them."""
+    return [(td, s, *(t * tick_size for t in ohlc), v, n) for td, s, *ohlc, v, n in rows]
+
+
+def _best(fn, repeat: int) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--years", type=int, default=5)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    start = date(2015, 1, 1)
+    end = date(start.year + args.years, 1, 1) - timedelta(days=1)
+    td_min, td_max = _td(start), _td(end)
+    conn = connect_default()
+    try:
+        instrument_id = ensure_instrument(conn, _SYMBOL)
+        ensure_bars_partitions(conn, "bars_1m", td_min=td_min, td_max=td_max)
+        conn.execute(
+            _LOAD,
+            {
+                "instrument_id": instrument_id,
+                "epoch0": 1_420_066_800,  # 2014-12-31 17:00 CT
+                "start": start,
+                "days": (end - start).days + 1,
+            },
+        )
+        t0 = time.perf_counter()
+        counts = rebuild_bars_30m_range(
+            conn,
+            instrument_id=instrument_id,
+            td_min=td_min,
+            td_max=td_max,
+            derived_from_import_id=None,
+        )
+        t_rebuild = time.perf_counter() - t0
+        params = {
+            "instrument_id": instrument_id,
+            "td_min": td_min,
+            "td_max": td_max,
+            "derived_from_import_id": None,
+            "dirty_only": False,
+        }
+        t_sessions, _ = _best(lambda: rebuild_session_daily(conn, params), args.repeat)
+        for table in ("bars_1m", "bars_30m", "session_daily"):
+            conn.execute(f"ANALYZE {table};")
+
+        q = {"instrument_id": instrument_id, "td_min": td_min, "td_max": td_max}
+        t_1m, from_1m = _best(
+            lambda: conn.execute(_AGGREGATE.format(source=_FROM_1M), q).fetchall(), args.repeat
+        )
+        t_30m, from_30m = _best(
+            lambda: conn.execute(_AGGREGATE.format(source=_FROM_30M), q).fetchall(), args.repeat
+        )
+        t_stored, stored = _best(lambda: fetch_session_daily(conn, **q), args.repeat)
+        tick_size = get_tick_size(conn, instrument_id)
+        as_rows = [
+            (d.trading_date_ct_int, d.session, d.open, d.high, d.low, d.close, d.volume,
+             d.trades_count)
+            for d in stored
+        ]
+        assert _as_prices(from_1m, tick_size) == _as_prices(from_30m, tick_size) == as_rows
+
+        print(f"years={args.years} session rows={counts.session_inserted:,}")
+        print(
+            f"  rebuild bars_30m + derived + sessions {t_rebuild * 1e3:>9.1f} ms "
+            f"(session_daily step {t_sessions * 1e3:.1f} ms)"
+        )
+        print(f"  aggregate bars_1m      {t_1m * 1e3:>9.1f} ms")
+        print(f"  aggregate bars_30m     {t_30m * 1e3:>9.1f} ms")
+        print(f"  read session_daily     {t_stored * 1e3:>9.1f} ms   ({t_1m / t_stored:.0f}x)")
+    finally:
+        conn.rollback()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+"""
+Benchmark: bars_1m row size and 30m aggregate speed, float prices vs integer ticks.
+
+Usage:
+  ES_STATS_DATABASE_URL=... python benchmarks/bench_tick_prices.py \
+      [--years 3] [--minutes-per-day 1440] [--repeat 3]
+
+Builds two TEMP copies of the bars_1m layout holding the same synthetic
+multi-year ES-like series (0.25 tick): one with DOUBLE PRECISION OHLC (the
+old layout), one with INTEGER tick OHLC (the current layout), each with
+bars_1m's primary key and day/minute index. Reports heap and index sizes,
+then the best EXPLAIN ANALYZE execution time of:
+- agg_30m:   the 30m rebuild's GROUP BY (MAX(high), MIN(low), SUM(volume))
+- day_range: per-day MAX(high) - MIN(low), the range/break size shape
+
+Runs inside a single transaction that is rolled back; nothing is persisted.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from es_stats.db.connection import connect_default
+
+_TABLE = """
+CREATE TEMP TABLE {table} (
+  instrument_id       BIGINT NOT NULL,
+  ts_start_utc        BIGINT NOT NULL,
+  trading_date_ct_int INTEGER NOT NULL,
+  ct_minute_of_day    INTEGER NOT NULL,
+  open                {price} NOT NULL,
+  high                {price} NOT NULL,
+  low                 {price} NOT NULL,
+  close               {price} NOT NULL,
+  volume              BIGINT NOT NULL,
+  trades_count        BIGINT NOT NULL,
+  source_import_id    BIGINT NULL,
+  PRIMARY KEY (instrument_id, ts_start_utc, trading_date_ct_int)
+) ON COMMIT DROP;
+"""
+
+# Pseudo-random mid prices in whole ticks around 4000.00, shared by both layouts.
+_SERIES = """
+CREATE TEMP TABLE bench_ticks ON COMMIT DROP AS
+SELECT 1_577_923_200 + d * 86400 + m * 60 AS ts_start_utc,
+       to_char(DATE '2020-01-02' + d, 'YYYYMMDD')::int AS trading_date_ct_int,
+       m AS ct_minute_of_day,
+       16000 + (hashint4(d * 1440 + m) %% 400) AS mid
+FROM generate_series(0, %(days)s - 1) AS d,
+     generate_series(0, %(minutes)s - 1) AS m;
+"""
+
+_LOAD = """
+INSERT INTO {table}
+SELECT 1, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+       {scale} * mid, {scale} * (mid + 3), {scale} * (mid - 3), {scale} * (mid + 1),
+       10, 1, NULL
+FROM bench_ticks;
+"""
+
+_QUERIES = {
+    "agg_30m": """
+        SELECT trading_date_ct_int, ct_minute_of_day / 30, MAX(high), MIN(low), SUM(volume)
+        FROM {table}
+        WHERE instrument_id = 1
+        GROUP BY 1, 2;
+    """,
+    "day_range": """
+        SELECT trading_date_ct_int, MAX(high) - MIN(low)
+        FROM {table}
+        WHERE instrument_id = 1
+        GROUP BY 1;
+    """,
+}
+
+_LAYOUTS = {
+    "float8": ("DOUBLE PRECISION", "0.25::float8"),
+    "int4_ticks": ("INTEGER", "1"),
+}
+
+
+def _exec_ms(conn, query: str) -> float:
+    (plan,) = conn.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + query).fetchone()
+    return plan[0]["Execution Time"]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--years", type=int, default=3)
+    ap.add_argument("--minutes-per-day", type=int, default=1440)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    conn = connect_default()
+    try:
+        conn.execute(_SERIES, {"days": args.years * 365, "minutes": args.minutes_per_day})
+        for name, (price_type, scale) in _LAYOUTS.items():
+            table = f"bench_{name}"
+            conn.execute(_TABLE.format(table=table, price=price_type))
+            conn.execute(_LOAD.format(table=table, scale=scale))
+            conn.execute(
+                f"CREATE INDEX ON {table} "
+                "(instrument_id, trading_date_ct_int, ct_minute_of_day, ts_start_utc);"
+            )
+            conn.execute(f"ANALYZE {table};")
+
+        (rows,) = conn.execute("SELECT COUNT(*) FROM bench_ticks;").fetchone()
+        print(f"rows={rows:,} ({args.years} years x {args.minutes_per_day} minutes/day)")
+        print(f"{'layout':>11} {'heap_MB':>8} {'index_MB':>9} {'B/row':>6}", end="")
+        for q in _QUERIES:
+            print(f" {q + '_ms':>13}", end="")
+        print()
+        for name in _LAYOUTS:
+            table = f"bench_{name}"
+            heap, index = conn.execute(
+                "SELECT pg_relation_size(%s::regclass), pg_indexes_size(%s::regclass);",
+                (table, table),
+            ).fetchone()
+            print(f"{name:>11} {heap / 2**20:>8.1f} {index / 2**20:>9.1f} {heap / rows:>6.1f}", end="")
+            for q in _QUERIES.values():
+                best = min(_exec_ms(conn, q.format(table=table)) for _ in range(args.repeat))
+                print(f" {best:>13.1f}", end="")
+            print()
+    finally:
+        conn.rollback()
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+"""
+Benchmark: WindowSpec minute sets vs cached 1440-bit masks.
+
+Usage:
+  python benchmarks/bench_window_mask.py [--pairs 20000] [--minutes 1000000]
+
+Reports
+- overlap/containment over --pairs window pairs: set intersection/subset of
+  covered_minutes() (rebuilt per call, the old validate_pair shape) vs
+  overlaps()/contains() on the cached masks
+- membership of --minutes ct_minute_of_day values in a set of windows:
+  per-minute set lookups vs one window_membership() call
+
+Pure Python; nothing touches Postgres.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from es_stats.domain.windows import WindowAnchor, WindowSpec, window_membership
+
+
+def _windows(n: int, rng: random.Random) -> list[WindowSpec]:
+    return [
+        WindowSpec(WindowAnchor.TRADING_DATE_CT, rng.randrange(1440), rng.randrange(1440))
+        for _ in range(n)
+    ]
+
+
+def _time(fn) -> tuple[float, object]:
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--pairs", type=int, default=20_000)
+    ap.add_argument("--minutes", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    xs, ys = _windows(args.pairs, rng), _windows(args.pairs, rng)
+    pairs = list(zip(xs, ys))
+
+    def sets() -> list[tuple[bool, bool]]:
+        out = []
+        for x, y in pairs:
+            xm, ym = x.covered_minutes(), y.covered_minutes()
+            out.append((bool(xm & ym), ym <= xm))
+        return out
+
+    def masks() -> list[tuple[bool, bool]]:
+        return [(x.overlaps(y), x.contains(y)) for x, y in pairs]
+
+    t_masks_cold, _ = _time(masks)  # first call computes and caches the masks
+    t_sets, r_sets = _time(sets)
+    t_masks, r_masks = _time(masks)
+    assert r_sets == r_masks
+    print(f"pairs={args.pairs:,} overlap+contains")
+    print(f"  sets            {t_sets * 1e3:>9.1f} ms")
+    print(f"  masks (cold)    {t_masks_cold * 1e3:>9.1f} ms")
+    print(f"  masks (cached)  {t_masks * 1e3:>9.1f} ms")
+
+    windows = [
+        WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 509, "ON"),
+        WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 569, "IB"),
+        WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH"),
+    ]
+    minutes = [rng.randrange(1440) for _ in range(args.minutes)]
+
+    def per_minute_sets() -> list[int]:
+        covered = [w.covered_minutes() for w in windows]
+        return [
+            sum(1 << i for i, c in enumerate(covered) if m in c) for m in minutes
+        ]
+
+    t_loop, r_loop = _time(per_minute_sets)
+    t_vec, r_vec = _time(lambda: window_membership(minutes, windows))
+    assert r_loop == r_vec
+    print(f"minutes={args.minutes:,} membership in {len(windows)} windows")
+    print(f"  per-minute sets {t_loop * 1e3:>9.1f} ms")
+    print(f"  lookup table    {t_vec * 1e3:>9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+"""
+Benchmark: Window Range Metrics over years of 1m data, against a latency target.
+
+Usage:
+  ES_STATS_DATABASE_URL=... python benchmarks/bench_window_metrics.py \
+      [--years 10] [--repeat 3] [--target-ms 1000]
+
+Loads --years of synthetic Monday-Friday sessions (1380 1m bars per trading
+date, 17:00-15:59 CT) for one instrument, rebuilds bars_30m/bars_derived,
+day_coverage and the trading calendar, then runs run_window_metrics() for
+typical windows: as plan_window splits them (configured buckets plus 1m
+edges) and, for comparison, as pure 1m. Both must return identical days.
+Reports the best of --repeat runs and whether the planned run meets
+--target-ms.
+
+Runs inside a single transaction that is rolled back; nothing is persisted.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from es_stats.db.connection import connect_default
+from es_stats.domain.missing_policy import MissingPolicy, MissingPolicyMode
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
+from es_stats.repositories.day_coverage_repo import rebuild_day_coverage
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
+from es_stats.repositories.trading_calendar_repo import upsert_trading_calendar
+from es_stats.services.analyses.window_metrics import run_window_metrics
+from es_stats.services.trading_calendar import generate_sessions
+
+_SYMBOL = "BENCH_WINDOW_METRICS"
+
+# Trading date start + d, bar i covers CT minute (1020 + i) % 1440, weekdays only,
+# about 2% of bars missing.
+_LOAD = """
+INSERT INTO bars_1m (instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+                     open, high, low, close, volume, trades_count)
+SELECT %(instrument_id)s,
+       %(epoch0)s + d * 86400 + i * 60,
+       to_char(%(start)s::date + d, 'YYYYMMDD')::int,
+       (1020 + i) %% 1440,
+       mid, mid + 2, mid - 2, mid + 1,
+       1 + (d + i) %% 9, 1
+FROM generate_series(0, %(days)s - 1) AS d,
+     generate_series(0, 1379) AS i,
+     LATERAL (SELECT 16000 + (hashint4(d * 1440 + i) %% 200) AS mid) p
+WHERE extract(isodow FROM %(start)s::date + d) <= 5
+  AND hashint4(d * 1440 + i) %% 50 <> 0;
+"""
+
+_WINDOWS = [
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH"),
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 509, "ON"),
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 569, "IB"),
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 511, 554, "08:31-09:14"),
+]
+
+
+def _td(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _best(fn, repeat: int) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--target-ms", type=float, default=1000.0)
+    args = ap.parse_args()
+
+    start = date(2015, 1, 1)
+    end = date(start.year + args.years, 1, 1) - timedelta(days=1)
+    td_min, td_max = _td(start), _td(end)
+    conn = connect_default()
+    try:
+        instrument_id = ensure_instrument(conn, _SYMBOL)
+        ensure_bars_partitions(conn, "bars_1m", td_min=td_min, td_max=td_max)
+        t0 = time.perf_counter()
+        conn.execute(
+            _LOAD,
+            {
+                "instrument_id": instrument_id,
+                "epoch0": 1_420_066_800,  # 2014-12-31 17:00 CT
+                "start": start,
+                "days": (end - start).days + 1,
+            },
+        )
+        rebuild_bars_30m_range(
+            conn,
+            instrument_id=instrument_id,
+            td_min=td_min,
+            td_max=td_max,
+            derived_from_import_id=None,
+        )
+        rebuild_day_coverage(conn, instrument_id=instrument_id)
+        upsert_trading_calendar(
+            conn, instrument_id=instrument_id, sessions=generate_sessions(start, end)
+        )
+        for table in ("bars_1m", "bars_30m", "bars_derived", "trading_calendar"):
+            conn.execute(f"ANALYZE {table};")
+        (rows,) = conn.execute(
+            "SELECT COUNT(*) FROM bars_1m WHERE instrument_id = %s;", (instrument_id,)
+        ).fetchone()
+        print(f"years={args.years} bars_1m rows={rows:,} (loaded in {time.perf_counter() - t0:.0f}s)")
+
+        policy = MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=0.05)
+        print(f"{'window':>12} {'plan':>10} {'days':>6} {'ms':>8} {'ms_1m':>8} {'target':>7}")
+        ok = True
+        for window in _WINDOWS:
+            params = dict(
+                instrument_id=instrument_id,
+                td_min=td_min,
+                td_max=td_max,
+                window=window,
+                policy=policy,
+            )
+            ms, report = _best(lambda: run_window_metrics(conn, **params), args.repeat)
+            ms_1m, pure = _best(
+                lambda: run_window_metrics(conn, **params, resolutions=()), args.repeat
+            )
+            plan = "+".join(f.resolution for f in report.plan.fragments)
+            assert report.days == pure.days, f"{window.name}: {plan} differs from 1m"
+            met = ms * 1e3 <= args.target_ms
+            ok &= met
+            print(
+                f"{window.name:>12} {plan:>10} {report.days_in_range:>6,} "
+                f"{ms * 1e3:>8.1f} {ms_1m * 1e3:>8.1f} {'ok' if met else 'MISS':>7}"
+            )
+    finally:
+        conn.rollback()
+        conn.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,31 +4,179 @@ import argparse
 import logging
 import sys
 import time
+from datetime import date
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+import psycopg
+
 from es_stats.config.settings import settings
-from es_stats.db.connection import connection, execute_script
+from es_stats.db.connection import connection
 from es_stats.logging import configure_logging
-from es_stats.repositories.bars_1m_repo import upsert_bars_1m
-from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
-from es_stats.repositories.imports_repo import finalize_import_run, insert_import_run
-from es_stats.repositories.instruments_repo import ensure_instrument
-from es_stats.repositories.sql_loader import load_sql
-from es_stats.services.csv_parser import CsvValidationError, read_bars_csv
-from es_stats.services.time_fields import compute_time_fields
+from es_stats.repositories.bars_1m_repo import (
+    merge_staged_bars_1m,
+    prepare_bars_1m_staging,
+    stage_bars_1m,
+    staged_cadence,
+)
+from es_stats.repositories.bars_30m_repo import (
+    mark_import_dirty_30m,
+    rebuild_bars_30m_dirty,
+    rebuild_bars_30m_range,
+)
+from es_stats.repositories.day_coverage_repo import rebuild_day_coverage, verify_day_coverage
+from es_stats.repositories.imports_repo import (
+    ImportCheckpoint,
+    checkpoint_import_run,
+    finalize_import_run,
+    find_duplicate_import,
+    get_import_checkpoint,
+    insert_import_run,
+    mark_import_failed,
+    mark_import_skipped,
+    set_import_cadence,
+)
+from es_stats.repositories.instruments_repo import (
+    ensure_instrument,
+    find_instrument,
+    get_tick_size,
+    set_tick_size,
+)
+from es_stats.repositories.schema_repo import apply_schema
+from es_stats.repositories.trading_calendar_repo import upsert_trading_calendar
+from es_stats.services.arrow_reader import PYARROW_MISSING_HINT, pyarrow_available
+from es_stats.services.cadence import CadenceAnalyzer
+from es_stats.services.csv_parser import CsvValidationError
+from es_stats.services.import_pipeline import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_COMMIT_EVERY,
+    ImportBounds,
+    iter_bars_1m_chunks,
+    open_bar_reader,
+)
+from es_stats.services.source_files import (
+    ZSTD_MISSING_HINT,
+    compression_of,
+    source_format,
+    source_sha256,
+    zstd_available,
+)
+from es_stats.services.trading_calendar import (
+    DEFAULT_SESSION_HOURS,
+    generate_sessions,
+    parse_calendar_csv,
+    parse_session_hours,
+)
 
 logger = logging.getLogger(__name__)
 
 
 def init_db() -> int:
-    sql = load_sql("schema/001_init.sql")
     with connection() as conn:
-        execute_script(conn, sql)
+        apply_schema(conn)
     logger.info("Initialized database schema")
     return 0
 
 
+# Mismatching trading dates logged individually by verify-coverage.
+_MISMATCHES_SHOWN = 20
+
+
+def verify_coverage(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """
+    Rebuild the day_coverage bitmaps from bars_1m and compare them with the
+    stored ones; with --repair, replace the stored bitmaps. Returns 1 when a
+    mismatch is left unrepaired.
+    """
+    with connection() as conn:
+        instrument_id = None
+        if args.symbol is not None:
+            instrument_id = find_instrument(conn, args.symbol)
+            if instrument_id is None:
+                parser.error(f"Unknown symbol: {args.symbol!r}")
+
+        mismatches = verify_day_coverage(conn, instrument_id=instrument_id)
+        for m in mismatches[:_MISMATCHES_SHOWN]:
+            stored = 0 if m.stored_mask is None else m.stored_mask
+            rebuilt = 0 if m.rebuilt_mask is None else m.rebuilt_mask
+            logger.warning(
+                "day_coverage mismatch instrument_id=%s trading_date=%s "
+                "stored_minutes=%s bars_1m_minutes=%s unrecorded=%s stale=%s",
+                m.instrument_id,
+                m.trading_date_ct_int,
+                None if m.stored_mask is None else stored.bit_count(),
+                None if m.rebuilt_mask is None else rebuilt.bit_count(),
+                (rebuilt & ~stored).bit_count(),
+                (stored & ~rebuilt).bit_count(),
+            )
+        if len(mismatches) > _MISMATCHES_SHOWN:
+            logger.warning("... and %s more mismatching dates", len(mismatches) - _MISMATCHES_SHOWN)
+
+        if not mismatches:
+            logger.info("day_coverage matches bars_1m")
+            return 0
+        if not args.repair:
+            logger.error(
+                "day_coverage differs from bars_1m on %s trading date(s); rerun with --repair",
+                len(mismatches),
+            )
+            return 1
+        written = rebuild_day_coverage(conn, instrument_id=instrument_id)
+    logger.info(
+        "Repaired day_coverage: %s mismatching dates, %s dates rebuilt", len(mismatches), written
+    )
+    return 0
+
+
+def load_calendar(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """
+    Write an instrument's trading_calendar: sessions generated for every
+    date in --start..--end, with the rows of --file (holidays, early closes)
+    replacing generated days; --file alone loads just its own rows.
+    """
+    if (args.start is None) != (args.end is None):
+        parser.error("--start and --end must be given together")
+    if args.file is None and args.start is None:
+        parser.error("give --file, --start/--end, or both")
+
+    try:
+        open_minute, close_minute = parse_session_hours(args.session)
+        start = None if args.start is None else date.fromisoformat(args.start)
+        end = None if args.end is None else date.fromisoformat(args.end)
+        overrides = []
+        if args.file is not None:
+            path = Path(args.file)
+            if not path.is_file():
+                parser.error(f"Calendar file not found: {str(path)!r}")
+            with path.open(newline="") as f:
+                overrides = parse_calendar_csv(f)
+        if start is not None:
+            sessions = generate_sessions(
+                start,
+                end,
+                open_minute_ct=open_minute,
+                close_minute_ct=close_minute,
+                overrides={s.trading_date_ct_int: s for s in overrides},
+            )
+            inside = {s.trading_date_ct_int for s in sessions}
+            sessions += [s for s in overrides if s.trading_date_ct_int not in inside]
+        else:
+            sessions = overrides
+    except ValueError as e:
+        parser.error(str(e))
+
+    with connection() as conn:
+        instrument_id = ensure_instrument(conn, args.symbol)
+        written = upsert_trading_calendar(conn, instrument_id=instrument_id, sessions=sessions)
+    logger.info(
+        "Loaded trading calendar symbol=%s days=%s sessions=%s",
+        args.symbol,
+        written,
+        sum(s.is_open for s in sessions),
+    )
+    return 0
+
+
 def _validate_timezone(tz_name: str, parser: argparse.ArgumentParser) -> None:
     try:
         ZoneInfo(tz_name)
@@ -43,8 +191,25 @@ def _validate_import_args(args: argparse.Namespace, parser: argparse.ArgumentPar
     if not csv_path.exists() or not csv_path.is_file():
         parser.error(f"CSV file not found: {str(csv_path)!r}")
 
-    if csv_path.suffix.lower() != ".csv":
-        parser.error(f"Expected a .csv file, got: {csv_path.name!r}")
+    if args.format == "auto":
+        args.format = source_format(csv_path)
+        if args.format is None:
+            parser.error(
+                "Expected a .csv file (optionally .gz/.bz2/.xz/.zst compressed), "
+                f".parquet or .arrow/.feather file, got: {csv_path.name!r}"
+            )
+
+    if args.format == "csv":
+        if compression_of(csv_path) == ".zst" and not zstd_available():
+            parser.error(f"Cannot read {csv_path.name!r}: {ZSTD_MISSING_HINT}")
+    else:
+        if compression_of(csv_path) is not None:
+            parser.error(
+                f"Compressed {args.format} files are not supported (use the format's "
+                f"own compression instead), got: {csv_path.name!r}"
+            )
+        if not pyarrow_available():
+            parser.error(f"Cannot read {csv_path.name!r}: {PYARROW_MISSING_HINT}")
 
     _validate_timezone(args.timezone, parser)
 
@@ -52,49 +217,139 @@ def _validate_import_args(args: argparse.Namespace, parser: argparse.ArgumentPar
     if args.merge_policy not in ("skip", "overwrite"):
         parser.error("merge-policy must be one of: skip, overwrite")
 
+    if args.chunk_size <= 0:
+        parser.error(f"chunk-size must be > 0, got: {args.chunk_size}")
+
+    if args.workers < 1:
+        parser.error(f"workers must be >= 1, got: {args.workers}")
+
+    if args.commit_every is not None and args.commit_every <= 0:
+        parser.error(f"commit-every must be > 0, got: {args.commit_every}")
+
+    if args.tick_size is not None and args.tick_size <= 0:
+        parser.error(f"tick-size must be > 0, got: {args.tick_size}")
 
-def _median_delta_seconds(ts_start_utc_values: list[int]) -> int:
+
+def _check_cadence(unique_ts_count: int, median_delta: int | None) -> int:
     """
-    Compute median delta (seconds) between consecutive UNIQUE timestamps.
+    Validate the staged rows' median delta (seconds) between consecutive UNIQUE timestamps.
     Raises ValueError if delta cannot be computed deterministically.
     """
-    ts_unique_sorted = sorted(set(ts_start_utc_values))
-    if len(ts_unique_sorted) < 2:
+    if unique_ts_count < 2:
         raise ValueError(
             "Cannot validate 60s interval: fewer than 2 unique timestamps in accepted rows."
         )
-
-    deltas = [b - a for a, b in zip(ts_unique_sorted, ts_unique_sorted[1:]) if b > a]
-    if not deltas:
+    if median_delta is None:
         raise ValueError(
             "Cannot validate 60s interval: no positive timestamp deltas found."
         )
+    return median_delta
+
+
+def _chunk_cadence(
+    conn: psycopg.Connection, cadence: CadenceAnalyzer, validated: int | None
+) -> int:
+    """
+    Cadence check at a merge point (see _check_cadence).
+
+    While rows arrive in time order the streaming analyser holds the exact
+    deltas of everything read so far, so no timestamps need sorting. Once a row
+    arrives out of order, the rows currently staged are measured in SQL
+    instead. Either way, a chunk too small to judge (fewer than 2 timestamps)
+    passes once an earlier chunk of the same import has been validated.
+    """
+    if cadence.in_order:
+        unique_ts_count, median_delta = cadence.unique_ts_count, cadence.median_delta()
+    else:
+        unique_ts_count, median_delta = staged_cadence(conn)
+    if validated is not None and (unique_ts_count < 2 or median_delta is None):
+        return validated
+    median_delta = _check_cadence(unique_ts_count, median_delta)
+    if median_delta != 60:
+        raise ValueError(
+            f"Detected median bar interval {median_delta}s; expected 60s for canonical bars_1m import."
+        )
+    return median_delta
+
 
-    deltas.sort()
-    return deltas[len(deltas) // 2]
+def _failed_params(import_id: int, error: Exception) -> dict:
+    return {
+        "import_id": import_id,
+        "finished_at_utc": int(time.time()),
+        "ts_min_utc": None,
+        "ts_max_utc": None,
+        "row_count_read": 0,
+        "row_count_inserted": 0,
+        "row_count_updated": 0,
+        "row_count_rejected": 0,
+        "status": "failed",
+        "error_summary": str(error)[:500],
+    }
 
 
 def import_csv_contract_only(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
     """
-    Validate args, parse/validate CSV, compute time-derived fields,
-    enforce canonical 60s interval, upsert into bars_1m (skip/overwrite),
-    rebuild bars_30m for the affected trading-date range (set-based),
-    and finalize the import audit row with inserted/updated/rejected counts.
+    Validate args and hash the file (SHA-256, a full pre-pass over the source before the
+    import streams it); a file already imported successfully
+    with the same instrument/timezone/merge policy is recorded as 'skipped' without
+    touching bars. Otherwise stream the file (CSV, Parquet or Arrow IPC) through parse/validate
+    -> time-derived fields -> chunked staging, enforce canonical 60s interval, upsert into
+    bars_1m (skip/overwrite), rebuild the bars_30m buckets it touched (or the whole
+    trading-date range), and finalize the import audit row with inserted/updated/rejected counts.
+
+    By default the whole import is one transaction. With --commit-every N the
+    staged rows are merged and committed every ~N rows, recording a checkpoint
+    on the imports row; a failed chunked import can be continued from its last
+    commit with --resume <import_id>. bars_30m is rebuilt once, at the end.
     """
     _validate_import_args(args, parser)
 
     started_at_utc = int(time.time())
     source_name = Path(args.file).name
+    source_hash = source_sha256(Path(args.file))
 
     with connection() as conn:
+        if args.resume is not None:
+            checkpoint = _resumable_checkpoint(conn, args, parser, source_hash)
+            import_id = checkpoint.import_id
+            instrument_id = checkpoint.instrument_id
+            commit_every = args.commit_every or DEFAULT_COMMIT_EVERY
+            logger.info(
+                "Resuming import_id=%s after %d row(s) (timezone=%s merge_policy=%s)",
+                import_id,
+                checkpoint.checkpoint_rows,
+                checkpoint.input_timezone,
+                checkpoint.merge_policy,
+            )
+            return _run_import(
+                conn, args, parser, import_id, instrument_id, commit_every, checkpoint
+            )
+
         instrument_id = ensure_instrument(conn, args.symbol)
+        if args.tick_size is not None:
+            try:
+                set_tick_size(conn, instrument_id, args.tick_size)
+            except ValueError as e:
+                parser.error(str(e))
+
+        duplicate_of = None
+        if not args.force:
+            duplicate_of = find_duplicate_import(
+                conn,
+                {
+                    "instrument_id": instrument_id,
+                    "source_hash": source_hash,
+                    "input_timezone": args.timezone,
+                    "merge_policy": args.merge_policy,
+                },
+            )
 
         import_id = insert_import_run(
             conn,
             {
                 "instrument_id": instrument_id,
                 "source_name": source_name,
-                "source_hash": None,
+                "source_hash": source_hash,
                 "input_timezone": args.timezone,
                 "bar_interval_seconds": 60,
                 "merge_policy": args.merge_policy,
@@ -104,137 +359,295 @@ def import_csv_contract_only(args: argparse.Namespace, parser: argparse.Argument
             },
         )
 
-        try:
-            # Parse + row-level validation (skips invalid rows)
-            result = read_bars_csv(Path(args.file))
-            bars = result.bars
-
-            # Compute time-derived fields (per accepted bar)
-            derived = [compute_time_fields(b.dt, args.timezone) for b in bars]
-
-            # Enforce canonical 60s cadence
-            median_delta = _median_delta_seconds([t.ts_start_utc for t in derived])
-            if median_delta != 60:
-                raise ValueError(
-                    f"Detected median bar interval {median_delta}s; expected 60s for canonical bars_1m import."
-                )
-
-            # Build rows for bars_1m upsert
-            rows_1m: list[dict] = []
-            for b, t in zip(bars, derived):
-                rows_1m.append(
-                    {
-                        "instrument_id": instrument_id,
-                        "ts_start_utc": t.ts_start_utc,
-                        "trading_date_ct_int": t.trading_date_ct_int,
-                        "ct_minute_of_day": t.ct_minute_of_day,
-                        "open": b.open,
-                        "high": b.high,
-                        "low": b.low,
-                        "close": b.close,
-                        "volume": b.volume,
-                        "trades_count": b.trades_count,
-                        "source_import_id": import_id,
-                    }
-                )
-
-            counts_1m = upsert_bars_1m(conn, rows_1m, merge_policy=args.merge_policy)
-
-            ts_min = min(t.ts_start_utc for t in derived)
-            ts_max = max(t.ts_start_utc for t in derived)
-            td_min = min(t.trading_date_ct_int for t in derived)
-            td_max = max(t.trading_date_ct_int for t in derived)
-
-            # Rebuild derived 30m for affected trading-date range
-            counts_30m = rebuild_bars_30m_range(
-                conn,
-                instrument_id=instrument_id,
-                td_min=td_min,
-                td_max=td_max,
-                derived_from_import_id=import_id,
-            )
-
-            finished_at_utc = int(time.time())
-
-            finalize_import_run(
+        if duplicate_of is not None:
+            # Same content already imported successfully: record the skip, leave bars alone.
+            mark_import_skipped(
                 conn,
                 {
                     "import_id": import_id,
-                    "finished_at_utc": finished_at_utc,
-                    "ts_min_utc": ts_min,
-                    "ts_max_utc": ts_max,
-                    "row_count_read": result.row_count_read,
-                    "row_count_inserted": counts_1m.inserted,
-                    "row_count_updated": counts_1m.updated,
-                    "row_count_rejected": result.row_count_rejected,
-                    "status": "success",
-                    "error_summary": None,
+                    "finished_at_utc": int(time.time()),
+                    "duplicate_of_import_id": duplicate_of,
                 },
             )
-
             logger.info(
-                "Import OK: import_id=%s file=%s symbol=%s merge_policy=%s "
-                "read=%d accepted=%d rejected=%d inserted=%d updated=%d "
-                "ts_min=%s ts_max=%s trading_date_ct=%s..%s median_delta_s=%s "
-                "rebuilt_30m(deleted=%d inserted=%d)",
+                "Import skipped: import_id=%s file=%s symbol=%s sha256=%s "
+                "duplicate_of_import_id=%s (use --force to re-import)",
                 import_id,
                 args.file,
                 args.symbol,
-                args.merge_policy,
-                result.row_count_read,
-                len(bars),
-                result.row_count_rejected,
-                counts_1m.inserted,
-                counts_1m.updated,
-                ts_min,
-                ts_max,
-                td_min,
-                td_max,
-                median_delta,
-                counts_30m.deleted,
-                counts_30m.inserted,
+                source_hash,
+                duplicate_of,
             )
-
             return 0
 
-        except CsvValidationError as e:
-            # Fatal CSV error: missing required columns, no valid rows, etc.
-            finalize_import_run(
+        if args.commit_every:
+            # Make the audit row durable so a failure part-way can be resumed.
+            checkpoint_import_run(
                 conn,
                 {
                     "import_id": import_id,
-                    "finished_at_utc": int(time.time()),
+                    "checkpoint_rows": 0,
+                    "td_min": None,
+                    "td_max": None,
                     "ts_min_utc": None,
                     "ts_max_utc": None,
                     "row_count_read": 0,
                     "row_count_inserted": 0,
                     "row_count_updated": 0,
                     "row_count_rejected": 0,
-                    "status": "failed",
-                    "error_summary": str(e)[:500],
+                    "cadence_summary": None,
                 },
             )
-            parser.error(str(e))
-            return 2  # unreachable
+            conn.commit()
+
+        return _run_import(conn, args, parser, import_id, instrument_id, args.commit_every, None)
+
 
-        except Exception as e:
-            # Any other fatal error (interval mismatch, DB errors, etc.)
-            finalize_import_run(
+def _resumable_checkpoint(
+    conn: psycopg.Connection, args: argparse.Namespace, parser: argparse.ArgumentParser, source_hash: str
+) -> ImportCheckpoint:
+    """Load the import named by --resume and check it can continue with this file."""
+    checkpoint = get_import_checkpoint(conn, args.resume)
+    if checkpoint is None:
+        parser.error(f"Cannot resume import {args.resume}: no such import")
+    if checkpoint.status != "failed" or checkpoint.checkpoint_rows is None:
+        parser.error(
+            f"Cannot resume import {args.resume}: only failed chunked imports "
+            f"(--commit-every) can be resumed (status={checkpoint.status!r})"
+        )
+    if checkpoint.source_hash != source_hash:
+        parser.error(
+            f"Cannot resume import {args.resume}: {Path(args.file).name!r} does not match "
+            "the content of the original import (sha256 differs)"
+        )
+    if checkpoint.symbol != args.symbol:
+        parser.error(
+            f"Cannot resume import {args.resume}: it imports {checkpoint.symbol!r}, not {args.symbol!r}"
+        )
+    # Continue with the original import's settings.
+    args.timezone = checkpoint.input_timezone
+    args.merge_policy = checkpoint.merge_policy
+    return checkpoint
+
+
+def _run_import(
+    conn: psycopg.Connection,
+    args: argparse.Namespace,
+    parser: argparse.ArgumentParser,
+    import_id: int,
+    instrument_id: int,
+    commit_every: int | None,
+    resume_from: ImportCheckpoint | None,
+) -> int:
+    """Stream, stage, merge (in one or many transactions), rebuild bars_30m and finalize."""
+    base = resume_from
+    bounds = ImportBounds()
+    cadence = CadenceAnalyzer()
+    inserted = updated = 0
+    base_read = base_rejected = 0
+    median_delta = None
+    if base is not None:
+        bounds = ImportBounds(
+            row_count=base.row_count_read - base.row_count_rejected,
+            ts_min_utc=base.ts_min_utc,
+            ts_max_utc=base.ts_max_utc,
+            td_min=base.td_min,
+            td_max=base.td_max,
+        )
+        inserted, updated = base.row_count_inserted, base.row_count_updated
+        base_read, base_rejected = base.row_count_read, base.row_count_rejected
+        if base.cadence_summary is not None:
+            cadence = CadenceAnalyzer.from_summary(base.cadence_summary)
+        if bounds.row_count:
+            median_delta = 60  # committed chunks already passed the cadence check
+
+    try:
+        # Stream: parse + row-level validation -> time-derived fields -> stage
+        # into tmp_bars_1m in fixed-size columnar batches (peak memory ~ chunk size).
+        # Prices must be whole ticks of the instrument (bars store tick counts).
+        reader = open_bar_reader(
+            Path(args.file),
+            fmt=args.format,
+            workers=args.workers,
+            skip_rows=0 if base is None else base.checkpoint_rows,
+            tick_size=get_tick_size(conn, instrument_id),
+        )
+        prepare_bars_1m_staging(conn)
+        if base is not None and base.td_min is not None and args.rebuild == "dirty":
+            # Buckets written by the committed chunks still need the final rebuild.
+            mark_import_dirty_30m(
+                conn,
+                instrument_id=instrument_id,
+                import_id=import_id,
+                td_min=base.td_min,
+                td_max=base.td_max,
+            )
+
+        staged = 0
+        for rows_1m in iter_bars_1m_chunks(
+            reader.iter_batches(args.chunk_size),
+            input_timezone=args.timezone,
+            instrument_id=instrument_id,
+            import_id=import_id,
+            bounds=bounds,
+            cadence=cadence,
+        ):
+            staged += stage_bars_1m(conn, rows_1m, staging=args.staging)
+
+            # Commit only where the reader's counters match the rows staged so far.
+            if (
+                commit_every
+                and staged >= commit_every
+                and reader.rows_flushed == reader.row_count_read
+            ):
+                median_delta = _chunk_cadence(conn, cadence, median_delta)
+                counts = merge_staged_bars_1m(
+                    conn, merge_policy=args.merge_policy, changed_only=args.changed_only
+                )
+                inserted += counts.inserted
+                updated += counts.updated
+                checkpoint_import_run(
+                    conn,
+                    {
+                        "import_id": import_id,
+                        "checkpoint_rows": base_read + reader.row_count_read,
+                        "td_min": bounds.td_min,
+                        "td_max": bounds.td_max,
+                        "ts_min_utc": bounds.ts_min_utc,
+                        "ts_max_utc": bounds.ts_max_utc,
+                        "row_count_read": base_read + reader.row_count_read,
+                        "row_count_inserted": inserted,
+                        "row_count_updated": updated,
+                        "row_count_rejected": base_rejected + reader.row_count_rejected,
+                        "cadence_summary": cadence.summary(),
+                    },
+                )
+                conn.commit()
+                prepare_bars_1m_staging(conn)
+                staged = 0
+
+        # Enforce canonical 60s cadence (over everything read, or the staged rows)
+        median_delta = _chunk_cadence(conn, cadence, median_delta)
+
+        counts_1m = merge_staged_bars_1m(
+            conn, merge_policy=args.merge_policy, changed_only=args.changed_only
+        )
+        inserted += counts_1m.inserted
+        updated += counts_1m.updated
+        row_count_read = base_read + reader.row_count_read
+        row_count_rejected = base_rejected + reader.row_count_rejected
+
+        ts_min = bounds.ts_min_utc
+        ts_max = bounds.ts_max_utc
+        td_min = bounds.td_min
+        td_max = bounds.td_max
+
+        # Rebuild derived 30m (and bars_derived) once: only the buckets the merges
+        # touched (default), or every bucket in the affected trading-date range.
+        if args.rebuild == "full":
+            counts_30m = rebuild_bars_30m_range(
+                conn,
+                instrument_id=instrument_id,
+                td_min=td_min,
+                td_max=td_max,
+                derived_from_import_id=import_id,
+            )
+        else:
+            counts_30m = rebuild_bars_30m_dirty(
+                conn,
+                instrument_id=instrument_id,
+                derived_from_import_id=import_id,
+            )
+
+        finished_at_utc = int(time.time())
+
+        set_import_cadence(conn, import_id, cadence.summary())
+        finalize_import_run(
+            conn,
+            {
+                "import_id": import_id,
+                "finished_at_utc": finished_at_utc,
+                "ts_min_utc": ts_min,
+                "ts_max_utc": ts_max,
+                "row_count_read": row_count_read,
+                "row_count_inserted": inserted,
+                "row_count_updated": updated,
+                "row_count_rejected": row_count_rejected,
+                "status": "success",
+                "error_summary": None,
+            },
+        )
+
+        logger.info(
+            "Import OK: import_id=%s file=%s symbol=%s merge_policy=%s "
+            "read=%d accepted=%d rejected=%d inserted=%d updated=%d "
+            "ts_min=%s ts_max=%s trading_date_ct=%s..%s median_delta_s=%s "
+            "duplicates=%d out_of_order=%d largest_gap_s=%s "
+            "dt_format=%r dt_fallback=%d rebuilt_30m(mode=%s deleted=%d inserted=%d) "
+            "rebuilt_derived(deleted=%d inserted=%d) "
+            "rebuilt_sessions(deleted=%d inserted=%d)",
+            import_id,
+            args.file,
+            args.symbol,
+            args.merge_policy,
+            row_count_read,
+            bounds.row_count,
+            row_count_rejected,
+            inserted,
+            updated,
+            ts_min,
+            ts_max,
+            td_min,
+            td_max,
+            median_delta,
+            cadence.duplicate_count,
+            cadence.out_of_order_count,
+            cadence.largest_gaps()[0][0] if cadence.in_order and cadence.top_gaps else None,
+            reader.dt_format,
+            reader.dt_fallback_count,
+            counts_30m.mode,
+            counts_30m.deleted,
+            counts_30m.inserted,
+            counts_30m.derived_deleted,
+            counts_30m.derived_inserted,
+            counts_30m.session_deleted,
+            counts_30m.session_inserted,
+        )
+
+        if reader.dt_fallback_count:
+            logger.warning(
+                "Import %s: %d row(s) missed the %r timestamp fast path; formats seen: %s",
+                import_id,
+                reader.dt_fallback_count,
+                reader.dt_format,
+                dict(reader.dt_format_counts),
+            )
+
+        return 0
+
+    except Exception as e:
+        if commit_every:
+            # Keep the committed chunks and their checkpoint; drop the partial chunk.
+            conn.rollback()
+            mark_import_failed(
                 conn,
                 {
                     "import_id": import_id,
                     "finished_at_utc": int(time.time()),
-                    "ts_min_utc": None,
-                    "ts_max_utc": None,
-                    "row_count_read": 0,
-                    "row_count_inserted": 0,
-                    "row_count_updated": 0,
-                    "row_count_rejected": 0,
-                    "status": "failed",
                     "error_summary": str(e)[:500],
                 },
             )
-            raise
+            conn.commit()
+            logger.error(
+                "Import %s failed; continue it with --resume %s", import_id, import_id
+            )
+        else:
+            finalize_import_run(conn, _failed_params(import_id, e))
+        if isinstance(e, CsvValidationError):
+            # Fatal CSV error: missing required columns, no valid rows, etc.
+            parser.error(str(e))
+        # Any other fatal error (interval mismatch, DB errors, etc.)
+        raise
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -244,13 +657,33 @@ def build_parser() -> argparse.ArgumentParser:
     p_init = sub.add_parser("init-db", help="Create schema in the configured Postgres database.")
     p_init.set_defaults(_handler="init-db")
 
-    p_import = sub.add_parser("import-csv", help="Import bars from CSV into Postgres.")
+    p_import = sub.add_parser(
+        "import-csv",
+        help="Import bars from CSV (or Parquet/Arrow IPC) into Postgres.",
+        description="Import bars from CSV (or Parquet/Arrow IPC) into Postgres. The file is "
+        "read twice: a SHA-256 pre-pass (decompressing .gz/.zst sources) recognises content "
+        "that was already imported and checks --resume against the original file, then the "
+        "import itself streams it again.",
+    )
     p_import.add_argument(
         "-f", "--file", required=True, help="Path to CSV file (server/admin input)."
     )
+    p_import.add_argument(
+        "--format",
+        default="auto",
+        choices=["auto", "csv", "parquet", "arrow"],
+        help="Source file format; auto picks it from the file suffix (default: auto).",
+    )
     p_import.add_argument(
         "-s", "--symbol", required=True, help="Instrument symbol (e.g., ES, NQ)."
     )
+    p_import.add_argument(
+        "--tick-size",
+        type=float,
+        default=None,
+        help="Set the instrument's minimum price increment; rows with off-tick prices are "
+        "rejected (default: the instrument's stored tick size, 0.25 for new instruments).",
+    )
     p_import.add_argument(
         "-t",
         "--timezone",
@@ -264,8 +697,100 @@ def build_parser() -> argparse.ArgumentParser:
         choices=["skip", "overwrite"],
         help="On duplicate bar keys, either skip or overwrite existing records.",
     )
+    p_import.add_argument(
+        "--commit-every",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Merge and commit every ~N rows, recording a resumable checkpoint "
+        "(default: the whole import is one transaction).",
+    )
+    p_import.add_argument(
+        "--resume",
+        type=int,
+        default=None,
+        metavar="IMPORT_ID",
+        help="Continue a failed chunked import from its last committed chunk "
+        f"(commits every --commit-every rows, default {DEFAULT_COMMIT_EVERY}).",
+    )
+    p_import.add_argument(
+        "--force",
+        action="store_true",
+        help="Import even if the same file content was already imported successfully "
+        "(the file is still hashed up front, for the audit row and --resume).",
+    )
+    p_import.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="With --merge-policy overwrite, only rewrite (and count as updated) bars whose values changed.",
+    )
+    p_import.add_argument(
+        "--rebuild",
+        default="dirty",
+        choices=["dirty", "full"],
+        help="Rebuild only the 30m buckets the import changed (default) or every bucket in its date range.",
+    )
+    p_import.add_argument(
+        "--staging",
+        default="copy",
+        choices=["copy", "executemany"],
+        help="How rows are staged into Postgres: binary COPY (default) or per-row INSERT.",
+    )
+    p_import.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Rows parsed and staged per batch; bounds import memory (default: {DEFAULT_CHUNK_SIZE}).",
+    )
+    p_import.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to parse the CSV (default: 1). Rows are still merged in file order.",
+    )
     p_import.set_defaults(_handler="import-csv")
 
+    p_verify = sub.add_parser(
+        "verify-coverage",
+        help="Check the per-day minute coverage bitmaps against bars_1m.",
+    )
+    p_verify.add_argument(
+        "-s", "--symbol", default=None, help="Only check this instrument (default: all)."
+    )
+    p_verify.add_argument(
+        "--repair",
+        action="store_true",
+        help="Rebuild the bitmaps from bars_1m when they differ.",
+    )
+    p_verify.set_defaults(_handler="verify-coverage")
+
+    p_calendar = sub.add_parser(
+        "load-calendar",
+        help="Generate and/or load an instrument's trading calendar (expected bars per day).",
+    )
+    p_calendar.add_argument(
+        "-s", "--symbol", required=True, help="Instrument symbol (e.g., ES, NQ)."
+    )
+    p_calendar.add_argument(
+        "--start", default=None, help="First trading date to generate (YYYY-MM-DD)."
+    )
+    p_calendar.add_argument(
+        "--end", default=None, help="Last trading date to generate (YYYY-MM-DD)."
+    )
+    p_calendar.add_argument(
+        "--session",
+        default=DEFAULT_SESSION_HOURS,
+        help="Regular Monday-Friday session as OPEN-CLOSE in CT (default: %(default)s).",
+    )
+    p_calendar.add_argument(
+        "-f",
+        "--file",
+        default=None,
+        help="CSV with columns trading_date,open,close (HH:MM CT, both empty for a holiday); "
+        "its rows replace generated days.",
+    )
+    p_calendar.set_defaults(_handler="load-calendar")
+
     return parser
 
 
@@ -280,6 +805,10 @@ def main(argv: list[str] | None = None) -> int:
         return init_db()
     if handler == "import-csv":
         return import_csv_contract_only(args, parser)
+    if handler == "verify-coverage":
+        return verify_coverage(args, parser)
+    if handler == "load-calendar":
+        return load_calendar(args, parser)
 
     logger.error("No handler found for command: %s", args.command)
     return 2
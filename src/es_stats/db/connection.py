@@ -5,6 +5,7 @@ from contextlib import contextmanager
 from typing import Iterator
 
 import psycopg
+from psycopg import sql
 
 from es_stats.config.settings import settings
 
@@ -52,6 +53,15 @@ def execute_script(conn: psycopg.Connection, sql_script: str) -> None:
         conn.execute(f"{stmt};")
 
 
+def execute_composed_script(
+    conn: psycopg.Connection, sql_script: str, **params: sql.Composable
+) -> None:
+    """Execute a multi-statement SQL script whose {placeholders} are identifiers/literals."""
+    for statement in sql_script.split(";"):
+        if statement.strip():
+            conn.execute(sql.SQL(statement).format(**params))
+
+
 @contextmanager
 def connection(database_url: str | None = None) -> Iterator[psycopg.Connection]:
     """
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
+from array import array
+from dataclasses import dataclass, field, fields
+from datetime import UTC, datetime, timedelta
+from typing import Iterable, Iterator
 
 
 @dataclass(frozen=True)
@@ -18,3 +20,98 @@ class RawBar:
     close: float
     volume: int
     trades_count: int
+
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _NAIVE_EPOCH.toordinal()
+
+
+def timestamp_seconds(dt: datetime) -> tuple[int, bool]:
+    """(seconds, is_utc): UTC epoch seconds if aware, else wall seconds since the naive epoch."""
+    if dt.tzinfo is not None:
+        return int(dt.timestamp()), True
+    return (
+        (dt.toordinal() - _EPOCH_ORDINAL) * 86_400 + dt.hour * 3600 + dt.minute * 60 + dt.second,
+        False,
+    )
+
+
+@dataclass(frozen=True)
+class BarBatch:
+    """
+    Columnar block of 1-minute bars parsed from CSV (parallel arrays, file order).
+
+    Timestamps are whole seconds: ts_is_utc[i] == 1 means ts_seconds[i] is UTC
+    epoch seconds (timezone-aware input, e.g. epoch timestamps); 0 means it is a
+    wall-clock time in the input timezone, as seconds since 1970-01-01 00:00 on
+    the local clock. Indexing or iterating yields RawBar views.
+    """
+
+    ts_seconds: array = field(default_factory=lambda: array("q"))
+    ts_is_utc: array = field(default_factory=lambda: array("b"))
+    open: array = field(default_factory=lambda: array("d"))
+    high: array = field(default_factory=lambda: array("d"))
+    low: array = field(default_factory=lambda: array("d"))
+    close: array = field(default_factory=lambda: array("d"))
+    volume: array = field(default_factory=lambda: array("q"))
+    trades_count: array = field(default_factory=lambda: array("q"))
+
+    @classmethod
+    def from_bars(cls, bars: Iterable[RawBar]) -> BarBatch:
+        batch = cls()
+        for b in bars:
+            ts, is_utc = timestamp_seconds(b.dt)
+            batch.append(ts, is_utc, b.open, b.high, b.low, b.close, b.volume, b.trades_count)
+        return batch
+
+    def append(
+        self,
+        ts_seconds: int,
+        ts_is_utc: bool,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: int,
+        trades_count: int,
+    ) -> None:
+        self.ts_seconds.append(ts_seconds)
+        self.ts_is_utc.append(ts_is_utc)
+        self.open.append(open)
+        self.high.append(high)
+        self.low.append(low)
+        self.close.append(close)
+        self.volume.append(volume)
+        self.trades_count.append(trades_count)
+
+    def extend(self, other: BarBatch) -> None:
+        for name in _COLUMNS:
+            getattr(self, name).extend(getattr(other, name))
+
+    def slice(self, start: int, stop: int) -> BarBatch:
+        return BarBatch(*(getattr(self, name)[start:stop] for name in _COLUMNS))
+
+    def __len__(self) -> int:
+        return len(self.ts_seconds)
+
+    def __getitem__(self, i: int) -> RawBar:
+        s = self.ts_seconds[i]
+        if self.ts_is_utc[i]:
+            dt = datetime.fromtimestamp(s, UTC)
+        else:
+            dt = _NAIVE_EPOCH + timedelta(seconds=s)
+        return RawBar(
+            dt=dt,
+            open=self.open[i],
+            high=self.high[i],
+            low=self.low[i],
+            close=self.close[i],
+            volume=self.volume[i],
+            trades_count=self.trades_count[i],
+        )
+
+    def __iter__(self) -> Iterator[RawBar]:
+        return (self[i] for i in range(len(self)))
+
+
+_COLUMNS = tuple(f.name for f in fields(BarBatch))
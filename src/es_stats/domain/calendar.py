@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from es_stats.domain.windows import FULL_DAY_MASK, MINUTES_PER_DAY, WindowAnchor, WindowSpec
+
+
+@dataclass(frozen=True)
+class TradingSession:
+    """
+    One trading date of an instrument's calendar.
+
+    open_minute_ct/close_minute_ct are the first and last CT minutes of the
+    session (inclusive, wrapping past midnight like a WindowSpec); both are
+    None on a date with no session (holiday). expected_mask has bit m set for
+    each CT minute a 1m bar is expected at; it differs from the session
+    window only where the wall clock skips minutes (DST spring-forward).
+    """
+
+    trading_date_ct_int: int
+    open_minute_ct: int | None
+    close_minute_ct: int | None
+    expected_mask: int = 0
+
+    def __post_init__(self) -> None:
+        if (self.open_minute_ct is None) != (self.close_minute_ct is None):
+            raise ValueError("open_minute_ct and close_minute_ct must both be set or both be None")
+        for label, value in (
+            ("open_minute_ct", self.open_minute_ct),
+            ("close_minute_ct", self.close_minute_ct),
+        ):
+            if value is not None and not (0 <= value < MINUTES_PER_DAY):
+                raise ValueError(f"{label} must be in [0, 1439], got {value!r}")
+        if not (0 <= self.expected_mask <= FULL_DAY_MASK):
+            raise ValueError("expected_mask must be a 1440-bit minute mask")
+
+    @property
+    def is_open(self) -> bool:
+        return self.open_minute_ct is not None
+
+    @property
+    def session_window(self) -> WindowSpec | None:
+        if self.open_minute_ct is None or self.close_minute_ct is None:
+            return None
+        return WindowSpec(WindowAnchor.TRADING_DATE_CT, self.open_minute_ct, self.close_minute_ct)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import cached_property
+
+from es_stats.domain.windows import FULL_DAY_MASK, MINUTES_PER_DAY, WindowSpec
+
+# The CT trading day starts at 17:00 (previous calendar day) and runs 24 hours.
+TRADING_DAY_START_CT = 17 * 60
+
+
+@dataclass(frozen=True)
+class BarResolution:
+    """
+    Bucket layout of a bar resolution over the 1440 CT minutes of a trading day.
+
+    bucket_starts are the CT minutes-of-day that open a bucket; each bucket
+    runs up to the minute before the next start (wrapping past midnight), so
+    buckets need not be equal-sized (see SESSION).
+    """
+
+    name: str
+    bucket_starts: tuple[int, ...]
+
+    def __post_init__(self) -> None:
+        if not self.name:
+            raise ValueError("resolution name must not be empty")
+        if not self.bucket_starts:
+            raise ValueError(f"resolution {self.name!r} needs at least one bucket start")
+        if any(not (0 <= m < MINUTES_PER_DAY) for m in self.bucket_starts):
+            raise ValueError("bucket starts must be in [0, 1439]")
+        if len(set(self.bucket_starts)) != len(self.bucket_starts):
+            raise ValueError(f"resolution {self.name!r} has duplicate bucket starts")
+        object.__setattr__(self, "bucket_starts", tuple(sorted(self.bucket_starts)))
+
+    @property
+    def bucket_count(self) -> int:
+        return len(self.bucket_starts)
+
+    @cached_property
+    def start_mask(self) -> int:
+        """1440-bit mask of the bucket start minutes (bit m = CT minute m)."""
+        mask = 0
+        for m in self.bucket_starts:
+            mask |= 1 << m
+        return mask
+
+    def bucket_start(self, minute: int) -> int:
+        """Start minute of the bucket holding CT minute-of-day `minute`."""
+        i = bisect_right(self.bucket_starts, minute)
+        # Minutes before the first start belong to the last bucket (it wraps midnight).
+        return self.bucket_starts[i - 1]
+
+    def bucket_minutes(self, start: int) -> int:
+        """Length in minutes of the bucket opening at `start`."""
+        i = self.bucket_starts.index(start)
+        nxt = self.bucket_starts[(i + 1) % self.bucket_count]
+        return (nxt - start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+
+    def covers_exactly(self, window: WindowSpec) -> bool:
+        """
+        True iff the window is a whole number of buckets, i.e. every bucket
+        lies entirely inside or entirely outside it.
+
+        Buckets and windows are both contiguous (possibly wrapping) runs of
+        minutes, so this holds exactly when the window opens on a bucket start
+        and the minute after its end is a bucket start too.
+        """
+        after_end = (window.end_minute_ct + 1) % MINUTES_PER_DAY
+        return bool(self.start_mask >> window.start_minute_ct & self.start_mask >> after_end & 1)
+
+    def expected_bars(self, window: WindowSpec) -> int:
+        """
+        Bars of this resolution a full day has inside the window: buckets that
+        overlap it (for 1m, the window's duration).
+
+        Every bucket starting inside the window counts, plus the bucket that
+        was already open at the window's start.
+        """
+        starts_inside = (self.start_mask & window.minute_mask).bit_count()
+        if window.minute_mask == FULL_DAY_MASK or self.start_mask >> window.start_minute_ct & 1:
+            return starts_inside
+        return starts_inside + 1
+
+
+def fixed_resolution(minutes: int) -> BarResolution:
+    """
+    Equal `minutes`-long buckets aligned to the trading-day start (17:00 CT),
+    named like "15m". `minutes` must divide the 1440-minute day.
+    """
+    if minutes <= 0 or MINUTES_PER_DAY % minutes:
+        raise ValueError(f"bucket size must divide {MINUTES_PER_DAY} minutes, got {minutes}")
+    starts = tuple(
+        (TRADING_DAY_START_CT + k * minutes) % MINUTES_PER_DAY
+        for k in range(MINUTES_PER_DAY // minutes)
+    )
+    return BarResolution(f"{minutes}m", starts)
+
+
+BAR_1M = fixed_resolution(1)
+BAR_30M = fixed_resolution(30)
+
+# ON 17:00-08:29, RTH 08:30-15:59, 16:00-16:59 out of session (as in bucket_30m_dim).
+SESSION = BarResolution("session", (TRADING_DAY_START_CT, 510, 960))
+DAILY = BarResolution("daily", (TRADING_DAY_START_CT,))
+
+# Resolutions init-db configures for the bars_derived rebuild.
+DERIVED_RESOLUTIONS: tuple[BarResolution, ...] = (
+    fixed_resolution(5),
+    fixed_resolution(15),
+    fixed_resolution(60),
+    SESSION,
+    DAILY,
+)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+# Tick size of instruments that do not set one (ES, NQ: 0.25 index points).
+DEFAULT_TICK_SIZE = 0.25
+
+# A parsed price counts as on-tick when it is within this fraction of a tick
+# of a whole number of ticks (absorbs float noise such as 1.1 / 0.1).
+TICK_TOLERANCE = 1e-6
+
+
+def is_on_tick(price: float, tick_size: float) -> bool:
+    ticks = price / tick_size
+    return abs(ticks - round(ticks)) <= TICK_TOLERANCE
+
+
+def price_to_ticks(price: float, tick_size: float) -> int:
+    """
+    Whole number of ticks for a price (bars store prices this way, as int4).
+
+    Raises ValueError if the price is not a multiple of tick_size.
+    """
+    ticks = price / tick_size
+    n = round(ticks)
+    if abs(ticks - n) > TICK_TOLERANCE:
+        raise ValueError(f"price {price!r} is not a multiple of tick size {tick_size!r}")
+    return n
+
+
+def ticks_to_price(ticks: int, tick_size: float) -> float:
+    return ticks * tick_size
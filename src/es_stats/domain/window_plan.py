@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from es_stats.domain.resolutions import BAR_1M, BAR_30M
+from es_stats.domain.windows import WindowSpec
+
+
+@dataclass(frozen=True)
+class PlanFragment:
+    """
+    A contiguous run of equal-resolution buckets inside a window.
+
+    resolution is "1m" (bars_1m rows), "30m" (bars_30m) or a bars_derived
+    resolution name; bucket_starts are the CT minutes-of-day of its buckets.
+    """
+
+    resolution: str
+    start_minute_ct: int
+    end_minute_ct: int
+    bucket_starts: tuple[int, ...]
+
+    @property
+    def table(self) -> str:
+        if self.resolution == BAR_1M.name:
+            return "bars_1m"
+        if self.resolution == BAR_30M.name:
+            return "bars_30m"
+        return "bars_derived"
+
+    @property
+    def rows_per_day(self) -> int:
+        return len(self.bucket_starts)
+
+
+@dataclass(frozen=True)
+class WindowPlan:
+    window: WindowSpec
+    fragments: tuple[PlanFragment, ...]
+
+    @property
+    def rows_per_day(self) -> int:
+        return sum(f.rows_per_day for f in self.fragments)
+
+    def explain(self) -> str:
+        """
+        One line: each fragment's resolution, CT minutes, bucket count and
+        table, then rows read per trading date vs a pure-1m read.
+        """
+        w = self.window
+        parts = " + ".join(
+            f"{f.resolution} {_hhmm(f.start_minute_ct)}-{_hhmm(f.end_minute_ct)} "
+            f"x{f.rows_per_day} [{f.table}]"
+            for f in self.fragments
+        )
+        name = f"{w.name} " if w.name else ""
+        return (
+            f"{name}{_hhmm(w.start_minute_ct)}-{_hhmm(w.end_minute_ct)} "
+            f"({w.duration_minutes}m): {parts} = {self.rows_per_day} rows/day "
+            f"(1m: {w.duration_minutes})"
+        )
+
+
+def _hhmm(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from enum import StrEnum
+from functools import cached_property, lru_cache
 
 MINUTES_PER_DAY = 24 * 60
 
+# Bit m of a minute mask is CT minute-of-day m.
+FULL_DAY_MASK = (1 << MINUTES_PER_DAY) - 1
+
 
 class WindowAnchor(StrEnum):
     TRADING_DATE_CT = "TRADING_DATE_CT"
@@ -58,6 +63,58 @@ class WindowSpec:
             range(0, self.end_minute_ct + 1)
         )
 
+    @cached_property
+    def minute_mask(self) -> int:
+        """1440-bit mask of the covered minutes (bit m = CT minute m), computed once."""
+        from_start = FULL_DAY_MASK ^ ((1 << self.start_minute_ct) - 1)
+        to_end = (1 << (self.end_minute_ct + 1)) - 1
+        return from_start | to_end if self.spans_midnight else from_start & to_end
+
+    @cached_property
+    def minute_flags(self) -> bytes:
+        """1440 bytes, 1 at covered minutes: a lookup table indexed by minute."""
+        s, e = self.start_minute_ct, self.end_minute_ct
+        if self.spans_midnight:
+            return b"\x01" * (e + 1) + b"\x00" * (s - e - 1) + b"\x01" * (MINUTES_PER_DAY - s)
+        return b"\x00" * s + b"\x01" * (e - s + 1) + b"\x00" * (MINUTES_PER_DAY - e - 1)
+
+    def contains_minute(self, minute: int) -> bool:
+        return bool(self.minute_mask >> minute & 1)
+
+    def overlaps(self, other: WindowSpec) -> bool:
+        return bool(self.minute_mask & other.minute_mask)
+
+    def contains(self, other: WindowSpec) -> bool:
+        """True iff every minute of `other` is inside this window."""
+        return not other.minute_mask & ~self.minute_mask
+
+    def members(self, minutes: Iterable[int]) -> bytes:
+        """One byte per ct_minute_of_day in `minutes`: 1 if inside the window, else 0."""
+        return bytes(map(self.minute_flags.__getitem__, minutes))
+
+
+@lru_cache(maxsize=64)
+def _membership_table(windows: tuple[WindowSpec, ...]) -> tuple[int, ...]:
+    table = [0] * MINUTES_PER_DAY
+    for i, window in enumerate(windows):
+        bit = 1 << i
+        for m, flag in enumerate(window.minute_flags):
+            if flag:
+                table[m] |= bit
+    return tuple(table)
+
+
+def window_membership(minutes: Iterable[int], windows: Sequence[WindowSpec]) -> list[int]:
+    """
+    Map ct_minute_of_day values to window membership in one pass.
+
+    Returns one int per minute whose bit i is set iff windows[i] covers it
+    (0 = in no window). The per-minute table is built once per window set,
+    so a day or a whole column of minutes costs one C-level map.
+    """
+    table = _membership_table(tuple(windows))
+    return list(map(table.__getitem__, minutes))
+
 
 def _interval_for_ordering(window: WindowSpec) -> tuple[int, int]:
     """
@@ -78,9 +135,7 @@ def validate_pair(x: WindowSpec, y: WindowSpec, rule: WindowOrderRule) -> None:
     if rule == WindowOrderRule.ANY:
         return
 
-    x_minutes = x.covered_minutes()
-    y_minutes = y.covered_minutes()
-    if x_minutes & y_minutes:
+    if x.overlaps(y):
         raise ValueError("X and Y windows overlap, but rule requires strict ordering")
 
     if rule == WindowOrderRule.Y_ENDS_BEFORE_X_START:
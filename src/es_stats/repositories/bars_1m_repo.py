@@ -1,12 +1,47 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Any, Iterable, Iterator, Literal, Sequence
 
 import psycopg
 
+from es_stats.domain.ticks import TICK_TOLERANCE
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
 from es_stats.repositories.sql_loader import load_sql
 
+StagingMode = Literal["copy", "executemany"]
+
+# Column order for staged rows (tuples must follow this order).
+BARS_1M_COLUMNS = (
+    "instrument_id",
+    "ts_start_utc",
+    "trading_date_ct_int",
+    "ct_minute_of_day",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "trades_count",
+    "source_import_id",
+)
+
+# Postgres types of tmp_bars_1m, in BARS_1M_COLUMNS order (binary COPY needs exact types).
+_TMP_BARS_1M_TYPES = (
+    "int4",
+    "int4",
+    "int4",
+    "int4",
+    "float8",
+    "float8",
+    "float8",
+    "float8",
+    "int4",
+    "int4",
+    "int4",
+)
+
 
 @dataclass(frozen=True)
 class UpsertCounts:
@@ -14,79 +49,158 @@ class UpsertCounts:
     updated: int
 
 
-def upsert_bars_1m(
+def _as_tuple(row: Mapping[str, Any] | Sequence[Any]) -> Sequence[Any]:
+    if isinstance(row, Mapping):
+        return tuple(row[c] for c in BARS_1M_COLUMNS)
+    return row
+
+
+def _counted(rows: Iterable[Any], counter: list[int]) -> Iterator[Sequence[Any]]:
+    for row in rows:
+        counter[0] += 1
+        yield _as_tuple(row)
+
+
+def stage_bars_1m(
     conn: psycopg.Connection,
-    rows: Iterable[dict],
+    rows: Iterable[Mapping[str, Any] | Sequence[Any]],
     *,
-    merge_policy: str,  # "skip" | "overwrite"
-) -> UpsertCounts:
+    staging: StagingMode = "copy",
+) -> int:
     """
-    Upsert canonical 1-minute bars using a temp table + set-based DML.
+    Append rows to TEMP tmp_bars_1m and return how many were staged.
 
-    Strategy:
-    - load rows into TEMP tmp_bars_1m
-    - count how many are new vs existing (via joins)
-    - if overwrite: UPDATE existing rows from temp (set-based)
-    - INSERT new rows with ON CONFLICT DO NOTHING
+    Rows are tuples in BARS_1M_COLUMNS order (dicts keyed by column name are
+    also accepted); prices are in price units and become integer ticks of the
+    instrument's tick_size on merge. The iterable is consumed lazily in both modes:
+    - copy:        binary COPY ... FROM STDIN (default, fastest)
+    - executemany: per-row INSERT (fallback)
 
-    Counts:
-    - inserted = number of tmp rows that did not already exist in bars_1m
-    - updated  = number of tmp rows that already existed (when overwrite)
-      (counts key-matches; does not attempt to detect "no-op" updates)
+    The temp table must already exist (see prepare_bars_1m_staging).
+    """
+    if staging not in ("copy", "executemany"):
+        raise ValueError(f"staging must be 'copy' or 'executemany', got: {staging!r}")
+
+    counter = [0]
+    with conn.cursor() as cur:
+        if staging == "copy":
+            with cur.copy(load_sql("bars_1m/copy_temp.sql")) as copy:
+                copy.set_types(_TMP_BARS_1M_TYPES)
+                for row in _counted(rows, counter):
+                    copy.write_row(row)
+        else:
+            cur.executemany(load_sql("bars_1m/insert_temp_row.sql"), _counted(rows, counter))
+
+    return counter[0]
+
+
+def prepare_bars_1m_staging(conn: psycopg.Connection) -> None:
+    """
+    Create (if needed) and empty TEMP tmp_bars_1m for a new batch of rows.
+
+    Also ensures TEMP tmp_dirty_30m exists; merges record the 30m buckets they
+    touch there until an incremental bars_30m rebuild consumes them.
     """
+    conn.execute(load_sql("bars_1m/create_temp.sql"))
+    conn.execute(load_sql("bars_1m/clear_temp.sql"))
+    conn.execute(load_sql("bars_30m/create_dirty_temp.sql"))
+
+
+def staged_cadence(conn: psycopg.Connection) -> tuple[int, int | None]:
+    """
+    Cadence of the rows currently staged in tmp_bars_1m.
+
+    Returns (unique_ts_count, median_delta_seconds), where the median is taken
+    over positive deltas between consecutive UNIQUE timestamps (upper median
+    for an even count), or None when no positive delta exists.
+    """
+    row = conn.execute(load_sql("bars_1m/staged_cadence.sql")).fetchone()
+    unique_ts_count, median_delta = row
+    return int(unique_ts_count), None if median_delta is None else int(median_delta)
+
+
+def _check_merge_policy(merge_policy: str) -> None:
     if merge_policy not in ("skip", "overwrite"):
         raise ValueError(
             f"merge_policy must be 'skip' or 'overwrite', got: {merge_policy!r}"
         )
 
-    conn.execute(load_sql("bars_1m/create_temp.sql"))
-    conn.execute(load_sql("bars_1m/clear_temp.sql"))
 
-    rows_list = list(rows)
-    if not rows_list:
-        return UpsertCounts(inserted=0, updated=0)
+def merge_staged_bars_1m(
+    conn: psycopg.Connection,
+    *,
+    merge_policy: str,  # "skip" | "overwrite"
+    changed_only: bool = False,
+) -> UpsertCounts:
+    """
+    Merge everything staged in tmp_bars_1m into bars_1m.
 
-    # Stage into temp table (must include trades_count)
-    with conn.cursor() as cur:
-        cur.executemany(
-            """
-            INSERT INTO tmp_bars_1m (
-              instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
-              open, high, low, close, volume, trades_count, source_import_id
-            ) VALUES (
-              %(instrument_id)s, %(ts_start_utc)s, %(trading_date_ct_int)s, %(ct_minute_of_day)s,
-              %(open)s, %(high)s, %(low)s, %(close)s, %(volume)s, %(trades_count)s, %(source_import_id)s
-            );
-            """,
-            rows_list,
+    Strategy:
+    - refuse (ValueError) if any staged price is not a whole multiple of its
+      instrument's tick_size; bars_1m stores prices as integer ticks
+    - create any missing yearly bars_1m partitions for the staged trading dates
+    - one INSERT ... ON CONFLICT statement (DO NOTHING for skip, DO UPDATE for
+      overwrite); duplicate keys within the staged rows keep the first one
+    - counts come from RETURNING: for overwrite, returned keys that already
+      existed in the statement's snapshot were updated, the rest inserted
+    - every inserted/updated row's (trading date, 30m bucket) is added to
+      tmp_dirty_30m (see rebuild_bars_30m_dirty)
+
+    Counts:
+    - inserted = number of staged keys that did not already exist in bars_1m
+    - updated  = number of existing rows rewritten (overwrite only). By default
+      every key match counts; with changed_only=True rows whose bar values are
+      identical are neither rewritten nor counted.
+    """
+    _check_merge_policy(merge_policy)
+
+    if merge_policy == "skip":
+        sql = "bars_1m/upsert_skip.sql"
+    elif changed_only:
+        sql = "bars_1m/upsert_overwrite_changed.sql"
+    else:
+        sql = "bars_1m/upsert_overwrite.sql"
+
+    off_tick, first_ts = conn.execute(
+        load_sql("bars_1m/staged_off_tick.sql"), {"tolerance": TICK_TOLERANCE}
+    ).fetchone()
+    if off_tick:
+        raise ValueError(
+            f"{off_tick} staged bar(s) have prices that are not multiples of the "
+            f"instrument tick size (first at ts_start_utc={first_ts})"
         )
 
-    # Compute counts before mutating bars_1m
-    inserted = conn.execute(
-        """
-        SELECT COUNT(*)
-        FROM tmp_bars_1m t
-        LEFT JOIN bars_1m b
-          ON b.instrument_id = t.instrument_id
-         AND b.ts_start_utc  = t.ts_start_utc
-        WHERE b.instrument_id IS NULL;
-        """
-    ).fetchone()[0]
-
-    updated = 0
-    if merge_policy == "overwrite":
-        updated = conn.execute(
-            """
-            SELECT COUNT(*)
-            FROM tmp_bars_1m t
-            JOIN bars_1m b
-              ON b.instrument_id = t.instrument_id
-             AND b.ts_start_utc  = t.ts_start_utc;
-            """
-        ).fetchone()[0]
-
-        conn.execute(load_sql("bars_1m/update_existing.sql"))
-
-    conn.execute(load_sql("bars_1m/insert_new.sql"))
+    td_min, td_max = conn.execute(load_sql("bars_1m/staged_date_range.sql")).fetchone()
+    ensure_bars_partitions(conn, "bars_1m", td_min=td_min, td_max=td_max)
 
+    inserted, updated = conn.execute(load_sql(sql)).fetchone()
     return UpsertCounts(inserted=int(inserted), updated=int(updated))
+
+
+def upsert_bars_1m(
+    conn: psycopg.Connection,
+    rows: Iterable[Mapping[str, Any] | Sequence[Any]],
+    *,
+    merge_policy: str,  # "skip" | "overwrite"
+    staging: StagingMode = "copy",
+    changed_only: bool = False,
+) -> UpsertCounts:
+    """
+    Upsert canonical 1-minute bars using a temp table + set-based DML.
+
+    Strategy:
+    - stream rows into TEMP tmp_bars_1m (binary COPY by default, see stage_bars_1m)
+    - merge the temp table into bars_1m (see merge_staged_bars_1m)
+
+    Large imports can call prepare/stage (repeatedly)/merge themselves to
+    stage in bounded chunks.
+    """
+    _check_merge_policy(merge_policy)
+
+    prepare_bars_1m_staging(conn)
+
+    staged = stage_bars_1m(conn, rows, staging=staging)
+    if staged == 0:
+        return UpsertCounts(inserted=0, updated=0)
+
+    return merge_staged_bars_1m(conn, merge_policy=merge_policy, changed_only=changed_only)
@@ -1,16 +1,56 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Literal
 
 import psycopg
+from psycopg import sql
 
+from es_stats.db.connection import execute_composed_script, execute_script
+from es_stats.repositories.derived_bars_repo import rebuild_bars_derived
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
+from es_stats.repositories.session_daily_repo import rebuild_session_daily
 from es_stats.repositories.sql_loader import load_sql
 
 
+RebuildMode = Literal["full", "dirty"]
+
+
 @dataclass(frozen=True)
 class RebuildCounts:
     deleted: int
     inserted: int
+    mode: RebuildMode = "full"
+    # bars_derived rows (all configured resolutions) rebuilt alongside.
+    derived_deleted: int = 0
+    derived_inserted: int = 0
+    # session_daily rows (ON / RTH / FULL_DAY per trading date) rebuilt alongside.
+    session_deleted: int = 0
+    session_inserted: int = 0
+
+
+def _rebuild(
+    conn: psycopg.Connection, delete_sql: str, params: dict, mode: RebuildMode
+) -> RebuildCounts:
+    conn.execute(load_sql("bars_30m/create_dirty_temp.sql"))
+    ensure_bars_partitions(conn, "bars_30m", td_min=params["td_min"], td_max=params["td_max"])
+    deleted_cur = conn.execute(load_sql(delete_sql), params)
+    inserted_cur = conn.execute(load_sql("bars_30m/insert_range.sql"), params)
+    # Derived resolutions read the same dirty set, so rebuild them before clearing it.
+    derived_deleted, derived_inserted = rebuild_bars_derived(conn, params)
+    # Sessions roll up the freshly rebuilt bars_30m rows of the same dates.
+    session_deleted, session_inserted = rebuild_session_daily(conn, params)
+    # Rebuilt buckets are clean again.
+    conn.execute(load_sql("bars_30m/clear_dirty.sql"), params)
+    return RebuildCounts(
+        deleted=int(deleted_cur.rowcount),
+        inserted=int(inserted_cur.rowcount),
+        mode=mode,
+        derived_deleted=derived_deleted,
+        derived_inserted=derived_inserted,
+        session_deleted=session_deleted,
+        session_inserted=session_inserted,
+    )
 
 
 def rebuild_bars_30m_range(
@@ -27,18 +67,91 @@ def rebuild_bars_30m_range(
     Strategy:
       1) DELETE existing bars_30m rows in range
       2) INSERT freshly aggregated rows from bars_1m for that same range
+      3) the same for every configured bars_derived resolution
+      4) the same for session_daily, from the rebuilt bars_30m rows
     """
     params = {
         "instrument_id": instrument_id,
         "td_min": td_min,
         "td_max": td_max,
         "derived_from_import_id": derived_from_import_id,
+        "dirty_only": False,
     }
 
-    deleted_cur = conn.execute(load_sql("bars_30m/delete_range.sql"), params)
-    inserted_cur = conn.execute(load_sql("bars_30m/insert_range.sql"), params)
+    return _rebuild(conn, "bars_30m/delete_range.sql", params, "full")
 
-    return RebuildCounts(
-        deleted=int(deleted_cur.rowcount),
-        inserted=int(inserted_cur.rowcount),
+
+def rebuild_bars_30m_dirty(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    derived_from_import_id: int,
+) -> RebuildCounts:
+    """
+    Rebuild only the 30-minute buckets the bars_1m upsert actually touched.
+
+    The upsert records every (trading date, bucket) it inserts into or
+    changes in TEMP tmp_dirty_30m (same session); this DELETEs and
+    re-aggregates exactly those buckets for the instrument (and the
+    bars_derived buckets overlapping them, and the session_daily rows of
+    their trading dates), then clears them from the dirty set. A no-op when nothing is dirty.
+    """
+    conn.execute(load_sql("bars_30m/create_dirty_temp.sql"))
+    td_min, td_max, buckets = conn.execute(
+        load_sql("bars_30m/dirty_range.sql"), {"instrument_id": instrument_id}
+    ).fetchone()
+    if not buckets:
+        return RebuildCounts(deleted=0, inserted=0, mode="dirty")
+
+    params = {
+        "instrument_id": instrument_id,
+        "td_min": td_min,
+        "td_max": td_max,
+        "derived_from_import_id": derived_from_import_id,
+        "dirty_only": True,
+    }
+
+    return _rebuild(conn, "bars_30m/delete_dirty.sql", params, "dirty")
+
+
+def mark_import_dirty_30m(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    import_id: int,
+    td_min: int,
+    td_max: int,
+) -> None:
+    """
+    Add the buckets holding bars_1m rows written by `import_id` (within the
+    trading-date range) to TEMP tmp_dirty_30m.
+
+    Used when resuming a chunked import: chunks committed by an earlier
+    session recorded their buckets in that session's temp table, so they are
+    recovered from bars_1m.source_import_id before the final dirty rebuild.
+    """
+    conn.execute(load_sql("bars_30m/create_dirty_temp.sql"))
+    conn.execute(
+        load_sql("bars_30m/mark_import_dirty.sql"),
+        {"instrument_id": instrument_id, "import_id": import_id, "td_min": td_min, "td_max": td_max},
     )
+
+
+def add_bucket_end_utc(conn: psycopg.Connection) -> None:
+    """
+    Schema step: add bucket_end_utc (timestamp of a bucket's last 1m bar) to
+    bars_30m and bars_derived, backfill it from bars_1m and make it NOT NULL.
+
+    Idempotent: the backfill only runs while some row still lacks the value.
+    """
+    execute_script(conn, load_sql("schema/011_bucket_end_utc.sql"))
+    for table in ("bars_30m", "bars_derived"):
+        (missing,) = conn.execute(
+            sql.SQL(load_sql("bucket_end/missing.sql")).format(table=sql.Identifier(table))
+        ).fetchone()
+        if not missing:
+            continue
+        conn.execute(load_sql(f"bucket_end/backfill_{table}.sql"))
+        execute_composed_script(
+            conn, load_sql("bucket_end/set_not_null.sql"), table=sql.Identifier(table)
+        )
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import psycopg
+
+from es_stats.domain.windows import WindowSpec
+from es_stats.repositories.minute_bits import bits_from_mask, mask_from_bits
+from es_stats.repositories.sql_loader import load_sql
+
+
+@dataclass(frozen=True)
+class CoverageMismatch:
+    """
+    A trading date whose stored day_coverage bitmap differs from the one
+    rebuilt from bars_1m. Masks use WindowSpec.minute_mask bit order; None
+    means the row is missing on that side.
+    """
+
+    instrument_id: int
+    trading_date_ct_int: int
+    stored_mask: int | None
+    rebuilt_mask: int | None
+
+
+def fetch_day_coverage(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    td_min: int,
+    td_max: int,
+) -> dict[int, int]:
+    """
+    Minute-presence masks by trading date (dates without bars are absent).
+
+    Bit m of a mask is set when bars_1m has a bar at CT minute-of-day m, the
+    same layout as WindowSpec.minute_mask, so a window's observed bar count
+    is (mask & window.minute_mask).bit_count().
+    """
+    rows = conn.execute(
+        load_sql("day_coverage/fetch_range.sql"),
+        {"instrument_id": instrument_id, "td_min": td_min, "td_max": td_max},
+    ).fetchall()
+    return {int(td): mask_from_bits(bits) for td, bits in rows}
+
+
+def count_window_minutes(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    td_min: int,
+    td_max: int,
+    windows: Sequence[WindowSpec],
+) -> list[tuple[int, int, int]]:
+    """
+    (trading_date_ct_int, window_index, observed minutes) for every covered
+    trading date and window, counted in Postgres from day_coverage alone.
+    Rows come ordered by trading date, then window.
+    """
+    rows = conn.execute(
+        load_sql("day_coverage/window_counts.sql"),
+        {
+            "instrument_id": instrument_id,
+            "td_min": td_min,
+            "td_max": td_max,
+            "masks": [bits_from_mask(w.minute_mask) for w in windows],
+        },
+    ).fetchall()
+    return [(int(td), int(i), int(n)) for td, i, n in rows]
+
+
+def verify_day_coverage(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int | None = None,
+) -> list[CoverageMismatch]:
+    """
+    Rebuild every bitmap from bars_1m (one instrument, or all when None) and
+    return the trading dates where day_coverage disagrees; [] means in sync.
+    """
+    rows = conn.execute(
+        load_sql("day_coverage/verify.sql"), {"instrument_id": instrument_id}
+    ).fetchall()
+    return [
+        CoverageMismatch(
+            instrument_id=int(iid),
+            trading_date_ct_int=int(td),
+            stored_mask=mask_from_bits(stored),
+            rebuilt_mask=mask_from_bits(rebuilt),
+        )
+        for iid, td, stored, rebuilt in rows
+    ]
+
+
+def rebuild_day_coverage(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int | None = None,
+) -> int:
+    """
+    Replace day_coverage with bitmaps rebuilt from bars_1m (one instrument,
+    or all when None) and return the number of trading dates written.
+    """
+    params = {"instrument_id": instrument_id}
+    conn.execute(load_sql("day_coverage/delete_all.sql"), params)
+    return int(conn.execute(load_sql("day_coverage/insert_all.sql"), params).rowcount)
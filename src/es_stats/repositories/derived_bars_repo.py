@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import psycopg
+
+from es_stats.domain.resolutions import DERIVED_RESOLUTIONS, BarResolution
+from es_stats.domain.windows import MINUTES_PER_DAY
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
+from es_stats.repositories.sql_loader import load_sql
+
+
+def configure_derived_resolution(conn: psycopg.Connection, resolution: BarResolution) -> None:
+    """
+    Register (or re-lay out) a resolution for the bars_derived rebuild by
+    writing its minute-of-day -> bucket map into derived_buckets.
+
+    Existing trading dates only gain the new resolution when they are rebuilt
+    (e.g. rebuild_bars_30m_range over the instrument's history).
+    """
+    minutes = list(range(MINUTES_PER_DAY))
+    starts = [resolution.bucket_start(m) for m in minutes]
+    conn.execute(
+        load_sql("bars_derived/configure_resolution.sql"),
+        {
+            "resolution": resolution.name,
+            "minutes": minutes,
+            "bucket_starts": starts,
+            "bucket_minutes": [resolution.bucket_minutes(s) for s in starts],
+        },
+    )
+
+
+def seed_derived_resolutions(conn: psycopg.Connection) -> None:
+    """Schema step: configure the default DERIVED_RESOLUTIONS (idempotent)."""
+    for resolution in DERIVED_RESOLUTIONS:
+        configure_derived_resolution(conn, resolution)
+
+
+def list_derived_resolutions(conn: psycopg.Connection) -> list[BarResolution]:
+    """Resolutions configured in derived_buckets, e.g. for choose_resolution()."""
+    rows = conn.execute(load_sql("bars_derived/list_resolutions.sql")).fetchall()
+    return [BarResolution(name, tuple(starts)) for name, starts in rows]
+
+
+def rebuild_bars_derived(conn: psycopg.Connection, params: dict) -> tuple[int, int]:
+    """
+    Rebuild every configured resolution of bars_derived from bars_1m and
+    return (deleted, inserted).
+
+    Takes the bars_30m rebuild's params (instrument_id, td_min, td_max,
+    derived_from_import_id, dirty_only) and runs inside it, before the dirty
+    30m buckets are cleared: in dirty mode each derived bucket overlapping a
+    bucket in tmp_dirty_30m is deleted and re-aggregated whole, otherwise the
+    whole trading-date range is.
+    """
+    ensure_bars_partitions(conn, "bars_derived", td_min=params["td_min"], td_max=params["td_max"])
+    if params["dirty_only"]:
+        delete_sql = "bars_derived/delete_dirty.sql"
+    else:
+        delete_sql = "bars_derived/delete_range.sql"
+    deleted_cur = conn.execute(load_sql(delete_sql), params)
+    inserted_cur = conn.execute(load_sql("bars_derived/insert_range.sql"), params)
+    return int(deleted_cur.rowcount), int(inserted_cur.rowcount)
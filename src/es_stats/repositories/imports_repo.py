@@ -1,12 +1,41 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any
 
 import psycopg
+from psycopg.types.json import Jsonb
 
 from es_stats.repositories.sql_loader import load_sql
 
 
+@dataclass(frozen=True)
+class ImportCheckpoint:
+    """Where a chunked import got to: its settings plus totals as of the last commit."""
+
+    import_id: int
+    symbol: str
+    instrument_id: int
+    source_hash: str | None
+    input_timezone: str
+    merge_policy: str
+    status: str
+    checkpoint_rows: int | None
+    td_min: int | None
+    td_max: int | None
+    ts_min_utc: int | None
+    ts_max_utc: int | None
+    row_count_read: int
+    row_count_inserted: int
+    row_count_updated: int
+    row_count_rejected: int
+    cadence_summary: dict[str, Any] | None
+
+
+def _jsonb(value: dict[str, Any] | None) -> Jsonb | None:
+    return None if value is None else Jsonb(value)
+
+
 def insert_import_run(conn: psycopg.Connection, params: dict[str, Any]) -> int:
     sql = load_sql("imports/insert_import.sql")
     cur = conn.execute(sql, params)
@@ -20,3 +49,46 @@ def finalize_import_run(conn: psycopg.Connection, params: dict[str, Any]) -> Non
     """Finalize an import audit row with bounds, counts, and status."""
     sql = load_sql("imports/finalize_import.sql")
     conn.execute(sql, params)
+
+
+def find_duplicate_import(conn: psycopg.Connection, params: dict[str, Any]) -> int | None:
+    """
+    Earliest successful import of the same content (source_hash) for the same
+    instrument, input timezone and merge policy; None if there is none.
+    """
+    sql = load_sql("imports/find_duplicate_import.sql")
+    row = conn.execute(sql, params).fetchone()
+    return None if row is None else int(row[0])
+
+
+def mark_import_skipped(conn: psycopg.Connection, params: dict[str, Any]) -> None:
+    """Finalize an import audit row as 'skipped' (duplicate of an earlier import)."""
+    sql = load_sql("imports/mark_import_skipped.sql")
+    conn.execute(sql, params)
+
+
+def mark_import_failed(conn: psycopg.Connection, params: dict[str, Any]) -> None:
+    """Mark an import 'failed' with an error summary, keeping its counts and checkpoint."""
+    sql = load_sql("imports/mark_import_failed.sql")
+    conn.execute(sql, params)
+
+
+def checkpoint_import_run(conn: psycopg.Connection, params: dict[str, Any]) -> None:
+    """Record a chunked import's progress (rows done, running totals and bounds)."""
+    sql = load_sql("imports/checkpoint_import.sql")
+    conn.execute(sql, {**params, "cadence_summary": _jsonb(params["cadence_summary"])})
+
+
+def set_import_cadence(
+    conn: psycopg.Connection, import_id: int, cadence_summary: dict[str, Any] | None
+) -> None:
+    """Store an import's cadence/gap summary (see CadenceAnalyzer.summary)."""
+    sql = load_sql("imports/set_import_cadence.sql")
+    conn.execute(sql, {"import_id": import_id, "cadence_summary": _jsonb(cadence_summary)})
+
+
+def get_import_checkpoint(conn: psycopg.Connection, import_id: int) -> ImportCheckpoint | None:
+    """Settings and last checkpoint of an import run; None if it does not exist."""
+    sql = load_sql("imports/get_import_checkpoint.sql")
+    row = conn.execute(sql, {"import_id": import_id}).fetchone()
+    return None if row is None else ImportCheckpoint(*row)
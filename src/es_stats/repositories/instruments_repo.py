@@ -12,3 +12,42 @@ def ensure_instrument(conn: psycopg.Connection, symbol: str) -> int:
     if row is None:
         raise RuntimeError(f"Failed to resolve instrument_id for symbol={symbol!r}")
     return int(row[0])
+
+
+def find_instrument(conn: psycopg.Connection, symbol: str) -> int | None:
+    """instrument_id of `symbol`, or None if it was never imported (nothing is created)."""
+    row = conn.execute(load_sql("instruments/find_instrument.sql"), {"symbol": symbol}).fetchone()
+    return None if row is None else int(row[0])
+
+
+def get_tick_size(conn: psycopg.Connection, instrument_id: int) -> float:
+    row = conn.execute(
+        load_sql("instruments/get_tick_size.sql"), {"instrument_id": instrument_id}
+    ).fetchone()
+    if row is None:
+        raise RuntimeError(f"Unknown instrument_id={instrument_id!r}")
+    return float(row[0])
+
+
+def set_tick_size(conn: psycopg.Connection, instrument_id: int, tick_size: float) -> None:
+    """
+    Set an instrument's tick size. Stored bars are tick counts of it, so the
+    tick size of an instrument that already has bars cannot change (ValueError).
+    """
+    if tick_size <= 0:
+        raise ValueError(f"tick_size must be > 0, got {tick_size!r}")
+    current = get_tick_size(conn, instrument_id)
+    if current == tick_size:
+        return
+    (has_bars,) = conn.execute(
+        load_sql("instruments/has_bars.sql"), {"instrument_id": instrument_id}
+    ).fetchone()
+    if has_bars:
+        raise ValueError(
+            f"instrument_id={instrument_id} already has bars stored with tick size "
+            f"{current!r}; cannot change it to {tick_size!r}"
+        )
+    conn.execute(
+        load_sql("instruments/set_tick_size.sql"),
+        {"instrument_id": instrument_id, "tick_size": tick_size},
+    )
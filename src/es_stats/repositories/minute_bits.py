@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from es_stats.domain.windows import MINUTES_PER_DAY
+
+# Postgres bit(1440) strings put position 0 on the left, minute masks put
+# CT minute 0 in bit 0 (see WindowSpec.minute_mask).
+
+
+def bits_from_mask(mask: int) -> str:
+    """bit(1440) text for a minute mask, e.g. to pass as %s::text::bit(1440)."""
+    return format(mask, f"0{MINUTES_PER_DAY}b")[::-1]
+
+
+def mask_from_bits(bits: str | None) -> int | None:
+    """Minute mask of a bit(1440) value read back as text (None stays None)."""
+    return None if bits is None else int(bits[::-1], 2)
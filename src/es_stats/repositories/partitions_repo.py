@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import Literal
+
+import psycopg
+from psycopg import sql
+
+from es_stats.db.connection import execute_composed_script, execute_script
+from es_stats.repositories.sql_loader import load_sql
+
+BarsTable = Literal["bars_1m", "bars_30m", "bars_derived"]
+
+# Tables older schemas created unpartitioned with float prices (bars_derived
+# was created partitioned, with tick prices).
+BARS_TABLES: tuple[BarsTable, ...] = ("bars_1m", "bars_30m")
+
+
+def year_partition_name(table: BarsTable, year: int) -> str:
+    return f"{table}_y{year:04d}"
+
+
+def _partition_years(conn: psycopg.Connection, table: BarsTable) -> set[int]:
+    prefix = f"{table}_y"
+    rows = conn.execute(load_sql("partitions/list_partitions.sql"), {"table": table}).fetchall()
+    return {int(name[len(prefix):]) for (name,) in rows if name.startswith(prefix)}
+
+
+def _create_year_partition(conn: psycopg.Connection, table: BarsTable, year: int) -> None:
+    execute_composed_script(
+        conn,
+        load_sql("partitions/create_year_partition.sql"),
+        table=sql.Identifier(table),
+        partition=sql.Identifier(year_partition_name(table, year)),
+        default_partition=sql.Identifier(f"{table}_default"),
+        lo=sql.Literal(year * 10000 + 101),
+        hi=sql.Literal((year + 1) * 10000 + 101),
+    )
+
+
+def ensure_bars_partitions(
+    conn: psycopg.Connection,
+    table: BarsTable,
+    *,
+    td_min: int | None,
+    td_max: int | None,
+) -> list[str]:
+    """
+    Make sure yearly partitions of `table` cover trading dates td_min..td_max
+    (YYYYMMDD ints) and return the names of any that were created.
+
+    Rows outside every yearly partition land in the DEFAULT partition, so
+    writes never fail; creating a year later moves its rows out of DEFAULT.
+    Callers run this before writing a date range (merges and 30m rebuilds)
+    so imports keep the DEFAULT partition empty and scans prunable.
+    """
+    if td_min is None or td_max is None:
+        return []
+    have = _partition_years(conn, table)
+    created = []
+    for year in range(td_min // 10000, td_max // 10000 + 1):
+        if year not in have:
+            _create_year_partition(conn, table, year)
+            created.append(year_partition_name(table, year))
+    return created
+
+
+def partition_bars_tables(conn: psycopg.Connection) -> None:
+    """
+    Schema step: convert plain bars_1m/bars_30m tables into tables partitioned
+    by trading_date_ct_int range (one partition per year plus DEFAULT).
+
+    Existing rows are copied into yearly partitions created for the years
+    they cover. Idempotent: already-partitioned tables are left alone.
+    """
+    for table in BARS_TABLES:
+        (relkind,) = conn.execute(
+            load_sql("partitions/relkind.sql"), {"table": table}
+        ).fetchone() or (None,)
+        if relkind != "r":
+            continue
+
+        execute_script(conn, load_sql(f"partitions/{table}_begin_migration.sql"))
+        years = conn.execute(
+            sql.SQL(load_sql("partitions/years_in_table.sql")).format(
+                table=sql.Identifier(f"{table}_unpartitioned")
+            )
+        ).fetchall()
+        for (year,) in years:
+            _create_year_partition(conn, table, year)
+        execute_script(conn, load_sql(f"partitions/{table}_finish_migration.sql"))
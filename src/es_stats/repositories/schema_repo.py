@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import psycopg
+
+from es_stats.db.connection import execute_script
+from es_stats.repositories.bars_30m_repo import add_bucket_end_utc
+from es_stats.repositories.derived_bars_repo import seed_derived_resolutions
+from es_stats.repositories.partitions_repo import partition_bars_tables
+from es_stats.repositories.sql_loader import load_sql
+from es_stats.repositories.tick_prices_repo import convert_bar_prices_to_ticks
+
+# Schema steps in apply order: SQL scripts, or Python steps for changes that
+# need to inspect the database first. Each one is idempotent, so re-running
+# the whole list upgrades an existing database in place.
+SCHEMA_SCRIPTS: tuple[str | Callable[[psycopg.Connection], None], ...] = (
+    "schema/001_init.sql",
+    "schema/002_import_source_hash.sql",
+    "schema/003_import_checkpoints.sql",
+    "schema/004_import_cadence_summary.sql",
+    partition_bars_tables,  # 005: bars_1m/bars_30m partitioned by trading-date year
+    "schema/006_instrument_tick_size.sql",
+    convert_bar_prices_to_ticks,  # 007: bar prices stored as integer ticks
+    "schema/008_bucket_30m_dim.sql",
+    "schema/009_bars_derived.sql",
+    seed_derived_resolutions,  # 010: 5m, 15m, 60m, session and daily derived bars
+    add_bucket_end_utc,  # 011: last 1m bar timestamp per bars_30m/bars_derived bucket
+    "schema/012_dst_bar_counts.sql",
+    "schema/013_day_coverage.sql",
+    "schema/014_trading_calendar.sql",
+    "schema/015_session_daily.sql",
+)
+
+
+def apply_schema(conn: psycopg.Connection) -> None:
+    """Create or upgrade the database schema (all SCHEMA_SCRIPTS, in order)."""
+    for step in SCHEMA_SCRIPTS:
+        if callable(step):
+            step(conn)
+        else:
+            execute_script(conn, load_sql(step))
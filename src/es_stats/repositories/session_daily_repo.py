@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import psycopg
+
+from es_stats.domain.ticks import ticks_to_price
+from es_stats.repositories.instruments_repo import get_tick_size
+from es_stats.repositories.sql_loader import load_sql
+
+SESSIONS: tuple[str, ...] = ("ON", "RTH", "FULL_DAY")
+
+
+@dataclass(frozen=True)
+class SessionDay:
+    """
+    One session of one trading date from session_daily (prices converted
+    from the stored ticks with the instrument's tick_size).
+    """
+
+    trading_date_ct_int: int
+    session: str
+    first_bar_utc: int
+    last_bar_utc: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    trades_count: int
+    bar_count_1m: int
+    bucket_count_30m: int
+
+
+def rebuild_session_daily(conn: psycopg.Connection, params: dict) -> tuple[int, int]:
+    """
+    Rebuild session_daily from bars_30m and return (deleted, inserted).
+
+    Takes the bars_30m rebuild's params (instrument_id, td_min, td_max,
+    derived_from_import_id, dirty_only) and runs inside it, after bars_30m is
+    re-aggregated and before the dirty buckets are cleared: in dirty mode
+    every trading date with a dirty bucket is rebuilt whole, otherwise the
+    whole trading-date range is.
+    """
+    if params["dirty_only"]:
+        delete_sql = "session_daily/delete_dirty.sql"
+    else:
+        delete_sql = "session_daily/delete_range.sql"
+    deleted_cur = conn.execute(load_sql(delete_sql), params)
+    inserted_cur = conn.execute(load_sql("session_daily/insert_range.sql"), params)
+    return int(deleted_cur.rowcount), int(inserted_cur.rowcount)
+
+
+def fetch_session_daily(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    td_min: int,
+    td_max: int,
+    sessions: Sequence[str] = SESSIONS,
+) -> list[SessionDay]:
+    """
+    Session rows over a trading-date range, ordered by trading date and then
+    by the order of `sessions`. Dates or sessions without bars have no row.
+    """
+    unknown = set(sessions) - set(SESSIONS)
+    if unknown:
+        raise ValueError(f"unknown session(s) {sorted(unknown)!r}, expected one of {SESSIONS!r}")
+    tick_size = get_tick_size(conn, instrument_id)
+    rows = conn.execute(
+        load_sql("session_daily/fetch_range.sql"),
+        {
+            "instrument_id": instrument_id,
+            "td_min": td_min,
+            "td_max": td_max,
+            "sessions": list(sessions),
+        },
+    ).fetchall()
+    return [
+        SessionDay(
+            td, session, first, last, *(ticks_to_price(t, tick_size) for t in (o, h, lo, c)), *rest
+        )
+        for td, session, first, last, o, h, lo, c, *rest in rows
+    ]
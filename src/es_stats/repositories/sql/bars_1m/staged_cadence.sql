@@ -0,0 +1,19 @@
+WITH u AS (
+  SELECT DISTINCT ts_start_utc AS ts
+  FROM tmp_bars_1m
+),
+d AS (
+  SELECT ts - LAG(ts) OVER (ORDER BY ts) AS delta
+  FROM u
+),
+p AS (
+  SELECT
+    delta,
+    ROW_NUMBER() OVER (ORDER BY delta) - 1 AS rn,
+    COUNT(*) OVER () AS n
+  FROM d
+  WHERE delta > 0
+)
+SELECT
+  (SELECT COUNT(*) FROM u) AS unique_ts_count,
+  (SELECT delta FROM p WHERE rn = n / 2) AS median_delta_seconds;
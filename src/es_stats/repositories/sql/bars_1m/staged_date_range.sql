@@ -0,0 +1,2 @@
+SELECT MIN(trading_date_ct_int), MAX(trading_date_ct_int)
+FROM tmp_bars_1m;
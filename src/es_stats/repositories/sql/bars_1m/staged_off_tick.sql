@@ -0,0 +1,9 @@
+-- Staged prices that are not whole multiples of the instrument's tick_size
+-- (the readers reject these, so only direct callers can stage them).
+SELECT COUNT(*) AS off_tick_count, MIN(t.ts_start_utc) AS first_ts_start_utc
+FROM tmp_bars_1m t
+JOIN instruments i ON i.instrument_id = t.instrument_id
+WHERE abs(t.open  / i.tick_size - round(t.open  / i.tick_size)) > %(tolerance)s
+   OR abs(t.high  / i.tick_size - round(t.high  / i.tick_size)) > %(tolerance)s
+   OR abs(t.low   / i.tick_size - round(t.low   / i.tick_size)) > %(tolerance)s
+   OR abs(t.close / i.tick_size - round(t.close / i.tick_size)) > %(tolerance)s;
@@ -1,35 +0,0 @@
-UPDATE bars_1m
-SET
-  trading_date_ct_int = (SELECT t.trading_date_ct_int FROM tmp_bars_1m t
-                         WHERE t.instrument_id = bars_1m.instrument_id
-                           AND t.ts_start_utc  = bars_1m.ts_start_utc),
-  ct_minute_of_day    = (SELECT t.ct_minute_of_day FROM tmp_bars_1m t
-                         WHERE t.instrument_id = bars_1m.instrument_id
-                           AND t.ts_start_utc  = bars_1m.ts_start_utc),
-  open                = (SELECT t.open FROM tmp_bars_1m t
-                         WHERE t.instrument_id = bars_1m.instrument_id
-                           AND t.ts_start_utc  = bars_1m.ts_start_utc),
-  high                = (SELECT t.high FROM tmp_bars_1m t
-                         WHERE t.instrument_id = bars_1m.instrument_id
-                           AND t.ts_start_utc  = bars_1m.ts_start_utc),
-  low                 = (SELECT t.low FROM tmp_bars_1m t
-                         WHERE t.instrument_id = bars_1m.instrument_id
-                           AND t.ts_start_utc  = bars_1m.ts_start_utc),
-  close               = (SELECT t.close FROM tmp_bars_1m t
-                         WHERE t.instrument_id = bars_1m.instrument_id
-                           AND t.ts_start_utc  = bars_1m.ts_start_utc),
-  volume              = (SELECT t.volume FROM tmp_bars_1m t
-                         WHERE t.instrument_id = bars_1m.instrument_id
-                           AND t.ts_start_utc  = bars_1m.ts_start_utc),
-  trades_count        = (SELECT t.trades_count FROM tmp_bars_1m t
-                         WHERE t.instrument_id = bars_1m.instrument_id
-                           AND t.ts_start_utc  = bars_1m.ts_start_utc),
-  source_import_id    = (SELECT t.source_import_id FROM tmp_bars_1m t
-                         WHERE t.instrument_id = bars_1m.instrument_id
-                           AND t.ts_start_utc  = bars_1m.ts_start_utc)
-WHERE EXISTS (
-  SELECT 1 FROM tmp_bars_1m t
-  WHERE t.instrument_id = bars_1m.instrument_id
-    AND t.ts_start_utc  = bars_1m.ts_start_utc
-)
-RETURNING 1;
\ No newline at end of file
@@ -0,0 +1,113 @@
+WITH staged AS (
+  -- One row per key; duplicate keys in a batch keep the first staged row.
+  -- Prices are stored as whole ticks of the instrument's tick_size.
+  SELECT DISTINCT ON (t.instrument_id, t.ts_start_utc)
+    t.instrument_id,
+    t.ts_start_utc,
+    t.trading_date_ct_int,
+    t.ct_minute_of_day,
+    round(t.open  / i.tick_size)::integer AS open,
+    round(t.high  / i.tick_size)::integer AS high,
+    round(t.low   / i.tick_size)::integer AS low,
+    round(t.close / i.tick_size)::integer AS close,
+    t.volume,
+    t.trades_count,
+    t.source_import_id
+  FROM tmp_bars_1m t
+  JOIN instruments i ON i.instrument_id = t.instrument_id
+  ORDER BY t.instrument_id, t.ts_start_utc, t.ctid
+),
+existing AS (
+  -- Keys already present. Every CTE reads the snapshot from before the
+  -- INSERT, so this tells updates from inserts (RETURNING cannot expose
+  -- xmax for a partitioned table).
+  SELECT s.instrument_id, s.ts_start_utc
+  FROM staged s
+  JOIN bars_1m b
+    ON b.instrument_id       = s.instrument_id
+   AND b.ts_start_utc        = s.ts_start_utc
+   AND b.trading_date_ct_int = s.trading_date_ct_int
+),
+upserted AS (
+  INSERT INTO bars_1m (
+    instrument_id,
+    ts_start_utc,
+    trading_date_ct_int,
+    ct_minute_of_day,
+    open,
+    high,
+    low,
+    close,
+    volume,
+    trades_count,
+    source_import_id
+  )
+  SELECT
+    instrument_id,
+    ts_start_utc,
+    trading_date_ct_int,
+    ct_minute_of_day,
+    open,
+    high,
+    low,
+    close,
+    volume,
+    trades_count,
+    source_import_id
+  FROM staged
+  ON CONFLICT (instrument_id, ts_start_utc, trading_date_ct_int) DO UPDATE SET
+    ct_minute_of_day    = EXCLUDED.ct_minute_of_day,
+    open                = EXCLUDED.open,
+    high                = EXCLUDED.high,
+    low                 = EXCLUDED.low,
+    close               = EXCLUDED.close,
+    volume              = EXCLUDED.volume,
+    trades_count        = EXCLUDED.trades_count,
+    source_import_id    = EXCLUDED.source_import_id
+  -- Rows whose bar values are identical are left untouched (and not counted).
+  WHERE (
+    bars_1m.trading_date_ct_int,
+    bars_1m.ct_minute_of_day,
+    bars_1m.open,
+    bars_1m.high,
+    bars_1m.low,
+    bars_1m.close,
+    bars_1m.volume,
+    bars_1m.trades_count
+  ) IS DISTINCT FROM (
+    EXCLUDED.trading_date_ct_int,
+    EXCLUDED.ct_minute_of_day,
+    EXCLUDED.open,
+    EXCLUDED.high,
+    EXCLUDED.low,
+    EXCLUDED.close,
+    EXCLUDED.volume,
+    EXCLUDED.trades_count
+  )
+  RETURNING instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day
+),
+dirty AS (
+  -- Record touched 30m buckets for the incremental bars_30m rebuild.
+  -- (trading date and CT minute are functions of ts_start_utc, so an update
+  -- never moves a row to a different bucket.)
+  INSERT INTO tmp_dirty_30m (instrument_id, trading_date_ct_int, bucket_ct_minute_of_day)
+  SELECT DISTINCT instrument_id, trading_date_ct_int, ct_minute_of_day / 30 * 30
+  FROM upserted
+  ON CONFLICT DO NOTHING
+),
+coverage AS (
+  -- OR the touched minutes into each trading date's day_coverage bitmap.
+  INSERT INTO day_coverage (instrument_id, trading_date_ct_int, minute_bits)
+  SELECT instrument_id, trading_date_ct_int, bit_or(B'1'::bit(1440) >> ct_minute_of_day)
+  FROM upserted
+  GROUP BY instrument_id, trading_date_ct_int
+  ON CONFLICT (instrument_id, trading_date_ct_int) DO UPDATE
+    SET minute_bits = day_coverage.minute_bits | EXCLUDED.minute_bits
+)
+SELECT
+  COUNT(*) FILTER (WHERE e.ts_start_utc IS NULL) AS inserted,
+  COUNT(*) FILTER (WHERE e.ts_start_utc IS NOT NULL) AS updated
+FROM upserted u
+LEFT JOIN existing e
+  ON e.instrument_id = u.instrument_id
+ AND e.ts_start_utc  = u.ts_start_utc;
@@ -0,0 +1,70 @@
+WITH staged AS (
+  -- One row per key; duplicate keys in a batch keep the first staged row.
+  -- Prices are stored as whole ticks of the instrument's tick_size.
+  SELECT DISTINCT ON (t.instrument_id, t.ts_start_utc)
+    t.instrument_id,
+    t.ts_start_utc,
+    t.trading_date_ct_int,
+    t.ct_minute_of_day,
+    round(t.open  / i.tick_size)::integer AS open,
+    round(t.high  / i.tick_size)::integer AS high,
+    round(t.low   / i.tick_size)::integer AS low,
+    round(t.close / i.tick_size)::integer AS close,
+    t.volume,
+    t.trades_count,
+    t.source_import_id
+  FROM tmp_bars_1m t
+  JOIN instruments i ON i.instrument_id = t.instrument_id
+  ORDER BY t.instrument_id, t.ts_start_utc, t.ctid
+),
+upserted AS (
+  INSERT INTO bars_1m (
+    instrument_id,
+    ts_start_utc,
+    trading_date_ct_int,
+    ct_minute_of_day,
+    open,
+    high,
+    low,
+    close,
+    volume,
+    trades_count,
+    source_import_id
+  )
+  SELECT
+    instrument_id,
+    ts_start_utc,
+    trading_date_ct_int,
+    ct_minute_of_day,
+    open,
+    high,
+    low,
+    close,
+    volume,
+    trades_count,
+    source_import_id
+  FROM staged
+  ON CONFLICT (instrument_id, ts_start_utc, trading_date_ct_int) DO NOTHING
+  RETURNING instrument_id, trading_date_ct_int, ct_minute_of_day
+),
+dirty AS (
+  -- Record touched 30m buckets for the incremental bars_30m rebuild.
+  -- (trading date and CT minute are functions of ts_start_utc, so an update
+  -- never moves a row to a different bucket.)
+  INSERT INTO tmp_dirty_30m (instrument_id, trading_date_ct_int, bucket_ct_minute_of_day)
+  SELECT DISTINCT instrument_id, trading_date_ct_int, ct_minute_of_day / 30 * 30
+  FROM upserted
+  ON CONFLICT DO NOTHING
+),
+coverage AS (
+  -- OR the touched minutes into each trading date's day_coverage bitmap.
+  INSERT INTO day_coverage (instrument_id, trading_date_ct_int, minute_bits)
+  SELECT instrument_id, trading_date_ct_int, bit_or(B'1'::bit(1440) >> ct_minute_of_day)
+  FROM upserted
+  GROUP BY instrument_id, trading_date_ct_int
+  ON CONFLICT (instrument_id, trading_date_ct_int) DO UPDATE
+    SET minute_bits = day_coverage.minute_bits | EXCLUDED.minute_bits
+)
+-- DO NOTHING returns only inserted rows.
+SELECT COUNT(*) AS inserted, 0 AS updated
+FROM upserted;
@@ -0,0 +1,6 @@
+CREATE TEMP TABLE IF NOT EXISTS tmp_dirty_30m (
+  instrument_id            INTEGER NOT NULL,
+  trading_date_ct_int      INTEGER NOT NULL,
+  bucket_ct_minute_of_day  INTEGER NOT NULL,
+  PRIMARY KEY (instrument_id, trading_date_ct_int, bucket_ct_minute_of_day)
+);
@@ -0,0 +1,6 @@
+DELETE FROM bars_30m b
+USING tmp_dirty_30m d
+WHERE d.instrument_id = %(instrument_id)s
+  AND b.instrument_id = d.instrument_id
+  AND b.trading_date_ct_int = d.trading_date_ct_int
+  AND b.bucket_ct_minute_of_day = d.bucket_ct_minute_of_day;
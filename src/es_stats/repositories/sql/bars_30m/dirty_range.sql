@@ -0,0 +1,3 @@
+SELECT MIN(trading_date_ct_int), MAX(trading_date_ct_int), COUNT(*)
+FROM tmp_dirty_30m
+WHERE instrument_id = %(instrument_id)s;
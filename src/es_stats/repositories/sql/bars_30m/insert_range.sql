@@ -1,115 +1,54 @@
-WITH agg AS (
+WITH bucketed AS (
   SELECT
     instrument_id,
     trading_date_ct_int,
     (ct_minute_of_day - (ct_minute_of_day %% 30)) AS bucket_ct_minute_of_day,
-    MIN(ts_start_utc) AS bucket_start_utc,
-    MAX(ts_start_utc) AS bucket_last_utc,
-    MAX(high) AS high,
-    MIN(low)  AS low,
-    SUM(volume) AS volume,
-    SUM(trades_count) AS trades_count,
-    COUNT(*) AS bar_count_1m
+    ts_start_utc,
+    open, high, low, close,
+    volume,
+    trades_count
   FROM bars_1m
   WHERE instrument_id = %(instrument_id)s
     AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
-  GROUP BY instrument_id, trading_date_ct_int, bucket_ct_minute_of_day
+    /* dirty mode: only buckets recorded in tmp_dirty_30m by the bars_1m upsert */
+    AND (
+      NOT %(dirty_only)s
+      OR (trading_date_ct_int, ct_minute_of_day - (ct_minute_of_day %% 30)) IN (
+        SELECT d.trading_date_ct_int, d.bucket_ct_minute_of_day
+        FROM tmp_dirty_30m d
+        WHERE d.instrument_id = %(instrument_id)s
+      )
+    )
 ),
-oc AS (
-  SELECT
-    a.*,
-    bo.open  AS open,
-    bc.close AS close
-  FROM agg a
-  JOIN bars_1m bo
-    ON bo.instrument_id = a.instrument_id
-   AND bo.ts_start_utc  = a.bucket_start_utc
-  JOIN bars_1m bc
-    ON bc.instrument_id = a.instrument_id
-   AND bc.ts_start_utc  = a.bucket_last_utc
-),
-classified AS (
+windowed AS (
+  /* One ordered pass: every column shares window w (a single sort), so open
+     and close come from the bucket's first and last 1m bar without joining
+     bars_1m again. The first row of each bucket carries the whole bucket. */
   SELECT
     instrument_id,
-    bucket_start_utc,
     trading_date_ct_int,
     bucket_ct_minute_of_day,
-
-    CASE
-      WHEN bucket_ct_minute_of_day >= 1020 OR bucket_ct_minute_of_day < 510 THEN 'ON'
-      WHEN bucket_ct_minute_of_day >= 510 AND bucket_ct_minute_of_day <= 930 THEN 'RTH'
-      ELSE NULL
-    END AS session,
-
-    /* NOTE: force integer period_index */
-    CASE
-      WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
-      WHEN bucket_ct_minute_of_day < 510  THEN CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
-      WHEN bucket_ct_minute_of_day >= 510 AND bucket_ct_minute_of_day <= 930
-           THEN CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER)
-      ELSE NULL
-    END AS period_index,
-
-    /* Option A: base-26 Excel-style labels beyond 25: a..z, aa..az, ba.. ; A..Z, AA..AZ, ... */
-    CASE
-      WHEN (bucket_ct_minute_of_day >= 1020 OR bucket_ct_minute_of_day < 510) THEN
-        CASE
-          WHEN (
-            CASE
-              WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
-              ELSE CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
-            END
-          ) BETWEEN 0 AND 25 THEN
-            CHR(97 + (
-              CASE
-                WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
-                ELSE CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
-              END
-            ))
-          WHEN (
-            CASE
-              WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
-              ELSE CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
-            END
-          ) BETWEEN 26 AND 701 THEN
-            CHR(97 + (CAST((
-              CASE
-                WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
-                ELSE CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
-              END
-            ) / 26 AS INTEGER) - 1))
-            || CHR(97 + ((
-              CASE
-                WHEN bucket_ct_minute_of_day >= 1020 THEN CAST((bucket_ct_minute_of_day - 1020) / 30 AS INTEGER)
-                ELSE CAST((420 + bucket_ct_minute_of_day) / 30 AS INTEGER)
-              END
-            ) %% 26))
-          ELSE NULL
-        END
-
-      WHEN (bucket_ct_minute_of_day >= 510 AND bucket_ct_minute_of_day <= 930) THEN
-        CASE
-          WHEN CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER) BETWEEN 0 AND 25 THEN
-            CHR(65 + CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER))
-          WHEN CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER) BETWEEN 26 AND 701 THEN
-            CHR(65 + (CAST(CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER) / 26 AS INTEGER) - 1))
-            || CHR(65 + (CAST((bucket_ct_minute_of_day - 510) / 30 AS INTEGER) %% 26))
-          ELSE NULL
-        END
-
-      ELSE NULL
-    END AS tpo,
-
-    open, high, low, close,
-    volume,
-    trades_count,
-    bar_count_1m,
-    CASE WHEN bar_count_1m = 30 THEN 1 ELSE 0 END AS is_complete
-  FROM oc
+    ts_start_utc                    AS bucket_start_utc,
+    last_value(ts_start_utc) OVER w AS bucket_end_utc,
+    row_number()             OVER w AS bucket_row,
+    first_value(open)        OVER w AS open,
+    MAX(high)                OVER w AS high,
+    MIN(low)                 OVER w AS low,
+    last_value(close)        OVER w AS close,
+    SUM(volume)              OVER w AS volume,
+    SUM(trades_count)        OVER w AS trades_count,
+    COUNT(*)                 OVER w AS bar_count_1m
+  FROM bucketed
+  WINDOW w AS (
+    PARTITION BY trading_date_ct_int, bucket_ct_minute_of_day
+    ORDER BY ts_start_utc
+    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+  )
 )
 INSERT INTO bars_30m (
   instrument_id,
   bucket_start_utc,
+  bucket_end_utc,
   trading_date_ct_int,
   bucket_ct_minute_of_day,
   session,
@@ -123,17 +62,21 @@ INSERT INTO bars_30m (
   derived_from_import_id
 )
 SELECT
-  instrument_id,
-  bucket_start_utc,
-  trading_date_ct_int,
-  bucket_ct_minute_of_day,
-  session,
-  period_index,
-  tpo,
-  open, high, low, close,
-  volume,
-  trades_count,
-  bar_count_1m,
-  is_complete,
+  w.instrument_id,
+  w.bucket_start_utc,
+  w.bucket_end_utc,
+  w.trading_date_ct_int,
+  w.bucket_ct_minute_of_day,
+  /* session, period_index and TPO label per bucket minute (48-row dimension) */
+  d.session,
+  d.period_index,
+  d.tpo,
+  w.open, w.high, w.low, w.close,
+  w.volume,
+  w.trades_count,
+  w.bar_count_1m,
+  CASE WHEN w.bar_count_1m = 30 THEN 1 ELSE 0 END AS is_complete,
   %(derived_from_import_id)s
-FROM classified;
+FROM windowed w
+JOIN bucket_30m_dim d ON d.bucket_ct_minute_of_day = w.bucket_ct_minute_of_day
+WHERE w.bucket_row = 1;
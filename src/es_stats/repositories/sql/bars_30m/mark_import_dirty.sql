@@ -0,0 +1,9 @@
+-- Re-mark the 30m buckets holding rows an earlier (committed) chunk of this
+-- import wrote, so a resumed import still rebuilds them at the end.
+INSERT INTO tmp_dirty_30m (instrument_id, trading_date_ct_int, bucket_ct_minute_of_day)
+SELECT DISTINCT instrument_id, trading_date_ct_int, ct_minute_of_day / 30 * 30
+FROM bars_1m
+WHERE instrument_id = %(instrument_id)s
+  AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+  AND source_import_id = %(import_id)s
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,6 @@
+INSERT INTO derived_buckets (resolution, ct_minute_of_day, bucket_ct_minute_of_day, bucket_minutes)
+SELECT %(resolution)s, m, b, n
+FROM unnest(%(minutes)s::int[], %(bucket_starts)s::int[], %(bucket_minutes)s::int[]) AS t(m, b, n)
+ON CONFLICT (resolution, ct_minute_of_day) DO UPDATE SET
+  bucket_ct_minute_of_day = EXCLUDED.bucket_ct_minute_of_day,
+  bucket_minutes          = EXCLUDED.bucket_minutes;
@@ -0,0 +1,14 @@
+/* Every derived bucket overlapping a dirty 30m bucket (a 60m/session/daily
+   bucket is rebuilt whole even when only one of its 30m buckets changed). */
+DELETE FROM bars_derived b
+USING (
+  SELECT DISTINCT d.trading_date_ct_int, r.resolution, r.bucket_ct_minute_of_day
+  FROM tmp_dirty_30m d
+  JOIN derived_buckets r
+    ON r.ct_minute_of_day BETWEEN d.bucket_ct_minute_of_day AND d.bucket_ct_minute_of_day + 29
+  WHERE d.instrument_id = %(instrument_id)s
+) x
+WHERE b.instrument_id = %(instrument_id)s
+  AND b.trading_date_ct_int = x.trading_date_ct_int
+  AND b.resolution = x.resolution
+  AND b.bucket_ct_minute_of_day = x.bucket_ct_minute_of_day;
@@ -0,0 +1,86 @@
+WITH dirty AS (
+  /* dirty mode: derived buckets overlapping the buckets in tmp_dirty_30m */
+  SELECT DISTINCT d.trading_date_ct_int, r.resolution, r.bucket_ct_minute_of_day
+  FROM tmp_dirty_30m d
+  JOIN derived_buckets r
+    ON r.ct_minute_of_day BETWEEN d.bucket_ct_minute_of_day AND d.bucket_ct_minute_of_day + 29
+  WHERE d.instrument_id = %(instrument_id)s
+    AND %(dirty_only)s
+),
+bucketed AS (
+  /* each 1m bar once per configured resolution */
+  SELECT
+    b.instrument_id,
+    r.resolution,
+    b.trading_date_ct_int,
+    r.bucket_ct_minute_of_day,
+    r.bucket_minutes,
+    b.ts_start_utc,
+    b.open, b.high, b.low, b.close,
+    b.volume,
+    b.trades_count
+  FROM bars_1m b
+  JOIN derived_buckets r ON r.ct_minute_of_day = b.ct_minute_of_day
+  WHERE b.instrument_id = %(instrument_id)s
+    AND b.trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+    AND (
+      NOT %(dirty_only)s
+      OR (b.trading_date_ct_int, r.resolution, r.bucket_ct_minute_of_day) IN (
+        SELECT trading_date_ct_int, resolution, bucket_ct_minute_of_day FROM dirty
+      )
+    )
+),
+windowed AS (
+  /* same single-sort window pass as bars_30m/insert_range.sql */
+  SELECT
+    instrument_id,
+    resolution,
+    trading_date_ct_int,
+    bucket_ct_minute_of_day,
+    bucket_minutes,
+    ts_start_utc                    AS bucket_start_utc,
+    last_value(ts_start_utc) OVER w AS bucket_end_utc,
+    row_number()             OVER w AS bucket_row,
+    first_value(open)        OVER w AS open,
+    MAX(high)                OVER w AS high,
+    MIN(low)                 OVER w AS low,
+    last_value(close)        OVER w AS close,
+    SUM(volume)              OVER w AS volume,
+    SUM(trades_count)        OVER w AS trades_count,
+    COUNT(*)                 OVER w AS bar_count_1m
+  FROM bucketed
+  WINDOW w AS (
+    PARTITION BY resolution, trading_date_ct_int, bucket_ct_minute_of_day
+    ORDER BY ts_start_utc
+    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+  )
+)
+INSERT INTO bars_derived (
+  instrument_id,
+  resolution,
+  trading_date_ct_int,
+  bucket_ct_minute_of_day,
+  bucket_start_utc,
+  bucket_end_utc,
+  open, high, low, close,
+  volume,
+  trades_count,
+  bar_count_1m,
+  is_complete,
+  derived_from_import_id
+)
+SELECT
+  instrument_id,
+  resolution,
+  trading_date_ct_int,
+  bucket_ct_minute_of_day,
+  bucket_start_utc,
+  bucket_end_utc,
+  open, high, low, close,
+  volume,
+  trades_count,
+  bar_count_1m,
+  CASE WHEN bar_count_1m = bucket_minutes THEN 1 ELSE 0 END AS is_complete,
+  %(derived_from_import_id)s
+FROM windowed
+WHERE bucket_row = 1;
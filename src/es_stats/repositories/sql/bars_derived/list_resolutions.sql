@@ -0,0 +1,4 @@
+SELECT resolution, array_agg(DISTINCT bucket_ct_minute_of_day ORDER BY bucket_ct_minute_of_day)
+FROM derived_buckets
+GROUP BY resolution
+ORDER BY resolution;
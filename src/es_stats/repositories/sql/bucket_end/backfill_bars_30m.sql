@@ -0,0 +1,15 @@
+UPDATE bars_30m b
+SET bucket_end_utc = e.bucket_end_utc
+FROM (
+  SELECT
+    instrument_id,
+    trading_date_ct_int,
+    ct_minute_of_day - ct_minute_of_day % 30 AS bucket_ct_minute_of_day,
+    MAX(ts_start_utc) AS bucket_end_utc
+  FROM bars_1m
+  GROUP BY 1, 2, 3
+) e
+WHERE b.bucket_end_utc IS NULL
+  AND b.instrument_id = e.instrument_id
+  AND b.trading_date_ct_int = e.trading_date_ct_int
+  AND b.bucket_ct_minute_of_day = e.bucket_ct_minute_of_day;
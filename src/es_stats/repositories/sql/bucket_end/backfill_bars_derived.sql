@@ -0,0 +1,18 @@
+UPDATE bars_derived b
+SET bucket_end_utc = e.bucket_end_utc
+FROM (
+  SELECT
+    m.instrument_id,
+    r.resolution,
+    m.trading_date_ct_int,
+    r.bucket_ct_minute_of_day,
+    MAX(m.ts_start_utc) AS bucket_end_utc
+  FROM bars_1m m
+  JOIN derived_buckets r ON r.ct_minute_of_day = m.ct_minute_of_day
+  GROUP BY 1, 2, 3, 4
+) e
+WHERE b.bucket_end_utc IS NULL
+  AND b.instrument_id = e.instrument_id
+  AND b.resolution = e.resolution
+  AND b.trading_date_ct_int = e.trading_date_ct_int
+  AND b.bucket_ct_minute_of_day = e.bucket_ct_minute_of_day;
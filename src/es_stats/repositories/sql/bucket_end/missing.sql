@@ -0,0 +1 @@
+SELECT EXISTS (SELECT 1 FROM {table} WHERE bucket_end_utc IS NULL);
@@ -0,0 +1,4 @@
+-- Buckets with no 1m bars left behind them are stale cache rows.
+DELETE FROM {table} WHERE bucket_end_utc IS NULL;
+
+ALTER TABLE {table} ALTER COLUMN bucket_end_utc SET NOT NULL;
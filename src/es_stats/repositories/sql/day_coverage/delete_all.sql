@@ -0,0 +1,2 @@
+DELETE FROM day_coverage
+WHERE %(instrument_id)s::int IS NULL OR instrument_id = %(instrument_id)s;
@@ -0,0 +1,5 @@
+SELECT trading_date_ct_int, minute_bits::text
+FROM day_coverage
+WHERE instrument_id = %(instrument_id)s
+  AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+ORDER BY trading_date_ct_int;
@@ -0,0 +1,5 @@
+INSERT INTO day_coverage (instrument_id, trading_date_ct_int, minute_bits)
+SELECT instrument_id, trading_date_ct_int, bit_or(B'1'::bit(1440) >> ct_minute_of_day)
+FROM bars_1m
+WHERE %(instrument_id)s::int IS NULL OR instrument_id = %(instrument_id)s
+GROUP BY instrument_id, trading_date_ct_int;
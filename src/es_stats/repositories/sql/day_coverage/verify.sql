@@ -0,0 +1,24 @@
+-- Bitmaps rebuilt from bars_1m vs the stored ones. Dates present on only one
+-- side come back with NULL on the other.
+WITH rebuilt AS (
+  SELECT instrument_id, trading_date_ct_int,
+         bit_or(B'1'::bit(1440) >> ct_minute_of_day) AS minute_bits
+  FROM bars_1m
+  WHERE %(instrument_id)s::int IS NULL OR instrument_id = %(instrument_id)s
+  GROUP BY instrument_id, trading_date_ct_int
+),
+stored AS (
+  SELECT instrument_id, trading_date_ct_int, minute_bits
+  FROM day_coverage
+  WHERE %(instrument_id)s::int IS NULL OR instrument_id = %(instrument_id)s
+)
+SELECT COALESCE(s.instrument_id, r.instrument_id) AS instrument_id,
+       COALESCE(s.trading_date_ct_int, r.trading_date_ct_int) AS trading_date_ct_int,
+       s.minute_bits::text,
+       r.minute_bits::text
+FROM stored s
+FULL JOIN rebuilt r
+  ON r.instrument_id = s.instrument_id
+ AND r.trading_date_ct_int = s.trading_date_ct_int
+WHERE s.minute_bits IS DISTINCT FROM r.minute_bits
+ORDER BY 1, 2;
@@ -0,0 +1,10 @@
+-- Observed minutes of each window on each covered trading date: a popcount of
+-- the day's bitmap against the window's minute mask, no bars_1m scan.
+SELECT c.trading_date_ct_int,
+       (w.window_index - 1)::int AS window_index,
+       bit_count(c.minute_bits & w.mask)::int AS observed
+FROM day_coverage c
+CROSS JOIN unnest(%(masks)s::text[]::bit(1440)[]) WITH ORDINALITY AS w(mask, window_index)
+WHERE c.instrument_id = %(instrument_id)s
+  AND c.trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+ORDER BY 1, 2;
@@ -0,0 +1,13 @@
+UPDATE imports
+SET
+  checkpoint_rows    = %(checkpoint_rows)s,
+  checkpoint_td_min  = %(td_min)s,
+  checkpoint_td_max  = %(td_max)s,
+  ts_min_utc         = %(ts_min_utc)s,
+  ts_max_utc         = %(ts_max_utc)s,
+  row_count_read     = %(row_count_read)s,
+  row_count_inserted = %(row_count_inserted)s,
+  row_count_updated  = %(row_count_updated)s,
+  row_count_rejected = %(row_count_rejected)s,
+  cadence_summary    = %(cadence_summary)s
+WHERE import_id = %(import_id)s;
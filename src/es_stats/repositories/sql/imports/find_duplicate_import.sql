@@ -0,0 +1,9 @@
+SELECT import_id
+FROM imports
+WHERE instrument_id  = %(instrument_id)s
+  AND source_hash    = %(source_hash)s
+  AND input_timezone = %(input_timezone)s
+  AND merge_policy   = %(merge_policy)s
+  AND status         = 'success'
+ORDER BY import_id
+LIMIT 1;
@@ -0,0 +1,21 @@
+SELECT
+  i.import_id,
+  n.symbol,
+  i.instrument_id,
+  i.source_hash,
+  i.input_timezone,
+  i.merge_policy,
+  i.status,
+  i.checkpoint_rows,
+  i.checkpoint_td_min,
+  i.checkpoint_td_max,
+  i.ts_min_utc,
+  i.ts_max_utc,
+  i.row_count_read,
+  i.row_count_inserted,
+  i.row_count_updated,
+  i.row_count_rejected,
+  i.cadence_summary
+FROM imports i
+JOIN instruments n ON n.instrument_id = i.instrument_id
+WHERE i.import_id = %(import_id)s;
@@ -0,0 +1,6 @@
+UPDATE imports
+SET
+  finished_at_utc = %(finished_at_utc)s,
+  status          = 'failed',
+  error_summary   = %(error_summary)s
+WHERE import_id = %(import_id)s;
@@ -0,0 +1,7 @@
+UPDATE imports
+SET
+  finished_at_utc        = %(finished_at_utc)s,
+  status                 = 'skipped',
+  duplicate_of_import_id = %(duplicate_of_import_id)s,
+  error_summary          = NULL
+WHERE import_id = %(import_id)s;
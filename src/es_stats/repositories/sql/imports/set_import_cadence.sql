@@ -0,0 +1,3 @@
+UPDATE imports
+SET cadence_summary = %(cadence_summary)s
+WHERE import_id = %(import_id)s;
@@ -0,0 +1,3 @@
+SELECT instrument_id
+FROM instruments
+WHERE symbol = %(symbol)s;
@@ -0,0 +1,3 @@
+SELECT tick_size
+FROM instruments
+WHERE instrument_id = %(instrument_id)s;
@@ -0,0 +1,3 @@
+SELECT EXISTS (
+  SELECT 1 FROM bars_1m WHERE instrument_id = %(instrument_id)s
+);
@@ -0,0 +1,3 @@
+UPDATE instruments
+SET tick_size = %(tick_size)s
+WHERE instrument_id = %(instrument_id)s;
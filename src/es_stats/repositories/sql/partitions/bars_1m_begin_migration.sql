@@ -0,0 +1,9 @@
+-- Convert a plain bars_1m heap into a table partitioned by trading date
+-- (part 1: new parent + DEFAULT partition, the old rows stay in
+-- bars_1m_unpartitioned until part 2).
+ALTER TABLE bars_1m RENAME TO bars_1m_unpartitioned;
+
+CREATE TABLE bars_1m (LIKE bars_1m_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+  PARTITION BY RANGE (trading_date_ct_int);
+
+CREATE TABLE bars_1m_default PARTITION OF bars_1m DEFAULT;
@@ -0,0 +1,17 @@
+-- Part 2: copy rows into their yearly partitions, drop the old heap, then add
+-- keys and indexes on the parent (cascades to every partition). The primary
+-- key must contain the partition column. trading_date_ct_int is a function of
+-- ts_start_utc, so (instrument_id, ts_start_utc) stays unique.
+INSERT INTO bars_1m SELECT * FROM bars_1m_unpartitioned;
+
+DROP TABLE bars_1m_unpartitioned;
+
+ALTER TABLE bars_1m ADD PRIMARY KEY (instrument_id, ts_start_utc, trading_date_ct_int);
+ALTER TABLE bars_1m ADD FOREIGN KEY (instrument_id) REFERENCES instruments(instrument_id);
+ALTER TABLE bars_1m ADD FOREIGN KEY (source_import_id) REFERENCES imports(import_id);
+
+CREATE INDEX IF NOT EXISTS idx_bars_1m_inst_day_minute
+  ON bars_1m(instrument_id, trading_date_ct_int, ct_minute_of_day, ts_start_utc);
+
+CREATE INDEX IF NOT EXISTS idx_bars_1m_inst_day_ts
+  ON bars_1m(instrument_id, trading_date_ct_int, ts_start_utc);
@@ -0,0 +1,8 @@
+-- Convert a plain bars_30m heap into a table partitioned by trading date
+-- (part 1, see bars_1m_begin_migration.sql).
+ALTER TABLE bars_30m RENAME TO bars_30m_unpartitioned;
+
+CREATE TABLE bars_30m (LIKE bars_30m_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+  PARTITION BY RANGE (trading_date_ct_int);
+
+CREATE TABLE bars_30m_default PARTITION OF bars_30m DEFAULT;
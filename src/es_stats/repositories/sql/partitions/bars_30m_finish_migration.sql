@@ -0,0 +1,14 @@
+-- Part 2 (see bars_1m_finish_migration.sql).
+INSERT INTO bars_30m SELECT * FROM bars_30m_unpartitioned;
+
+DROP TABLE bars_30m_unpartitioned;
+
+ALTER TABLE bars_30m ADD PRIMARY KEY (instrument_id, bucket_start_utc, trading_date_ct_int);
+ALTER TABLE bars_30m ADD FOREIGN KEY (instrument_id) REFERENCES instruments(instrument_id);
+ALTER TABLE bars_30m ADD FOREIGN KEY (derived_from_import_id) REFERENCES imports(import_id);
+
+CREATE INDEX IF NOT EXISTS idx_bars_30m_inst_day_ts
+  ON bars_30m(instrument_id, trading_date_ct_int, bucket_start_utc);
+
+CREATE INDEX IF NOT EXISTS idx_bars_30m_inst_day_session_period
+  ON bars_30m(instrument_id, trading_date_ct_int, session, period_index);
@@ -0,0 +1,14 @@
+-- One yearly partition [lo, hi) of a bars table. Rows of that range already
+-- sitting in the DEFAULT partition are moved into it before it is attached
+-- (ATTACH would otherwise fail the default partition's constraint check).
+-- Attaching builds the parent's primary key and indexes on the new partition.
+CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS);
+
+WITH moved AS (
+  DELETE FROM {default_partition}
+  WHERE trading_date_ct_int >= {lo} AND trading_date_ct_int < {hi}
+  RETURNING *
+)
+INSERT INTO {partition} SELECT * FROM moved;
+
+ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES FROM ({lo}) TO ({hi});
@@ -0,0 +1,3 @@
+SELECT c.relkind
+FROM pg_class c
+WHERE c.oid = to_regclass(%(table)s);
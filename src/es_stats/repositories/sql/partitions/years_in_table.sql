@@ -0,0 +1,3 @@
+SELECT DISTINCT trading_date_ct_int / 10000 AS year
+FROM {table}
+ORDER BY year;
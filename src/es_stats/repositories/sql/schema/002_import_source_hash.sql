@@ -0,0 +1,12 @@
+-- Content-hash idempotent imports: a re-sent file whose hash already has a
+-- successful import is recorded as 'skipped' and points at that import.
+
+ALTER TABLE imports DROP CONSTRAINT IF EXISTS imports_status_check;
+ALTER TABLE imports ADD CONSTRAINT imports_status_check
+  CHECK (status IN ('success','failed','skipped'));
+
+ALTER TABLE imports
+  ADD COLUMN IF NOT EXISTS duplicate_of_import_id BIGINT NULL REFERENCES imports(import_id);
+
+CREATE INDEX IF NOT EXISTS idx_imports_instrument_source_hash
+  ON imports(instrument_id, source_hash);
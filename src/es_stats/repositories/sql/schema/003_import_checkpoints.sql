@@ -0,0 +1,8 @@
+-- Chunked (resumable) imports commit every N rows and record how far they got.
+-- checkpoint_rows counts source data rows fully merged (NULL for single-transaction
+-- imports). The row_count_*/ts_* columns hold running totals as of that checkpoint,
+-- and the trading-date bounds let a resumed import rebuild bars_30m once at the end.
+
+ALTER TABLE imports ADD COLUMN IF NOT EXISTS checkpoint_rows   BIGINT  NULL;
+ALTER TABLE imports ADD COLUMN IF NOT EXISTS checkpoint_td_min INTEGER NULL;
+ALTER TABLE imports ADD COLUMN IF NOT EXISTS checkpoint_td_max INTEGER NULL;
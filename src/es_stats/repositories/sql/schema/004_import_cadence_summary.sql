@@ -0,0 +1,5 @@
+-- Streaming cadence statistics of each import (see services/cadence.py): row and
+-- duplicate counts, delta histogram, median delta and the largest gaps, as JSON.
+-- The delta fields are null when rows arrived out of order ("in_order": false).
+
+ALTER TABLE imports ADD COLUMN IF NOT EXISTS cadence_summary JSONB NULL;
@@ -0,0 +1,6 @@
+-- Minimum price increment per instrument. bars_1m/bars_30m store prices as
+-- whole ticks (price / tick_size) in INTEGER columns, converted on merge.
+
+ALTER TABLE instruments
+  ADD COLUMN IF NOT EXISTS tick_size DOUBLE PRECISION NOT NULL DEFAULT 0.25
+  CHECK (tick_size > 0);
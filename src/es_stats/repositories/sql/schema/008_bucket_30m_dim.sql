@@ -0,0 +1,45 @@
+-- 30-minute bucket dimension: session, period_index and TPO label for each of
+-- the 48 CT buckets (keyed by bucket minute of day), joined once by the
+-- bars_30m rebuild instead of recomputing them per bucket.
+--
+-- Sessions (CT): ON 17:00-08:29, RTH 08:30-15:59, 16:00-16:59 out of session.
+-- TPO labels are base-26 Excel-style per session: ON a..z, aa.. and RTH A..Z, AA..
+
+CREATE TABLE IF NOT EXISTS bucket_30m_dim (
+  bucket_ct_minute_of_day INTEGER PRIMARY KEY
+    CHECK (bucket_ct_minute_of_day BETWEEN 0 AND 1439)
+    CHECK (bucket_ct_minute_of_day % 30 = 0),
+  session                 TEXT    NULL CHECK (session IN ('ON','RTH') OR session IS NULL),
+  period_index            INTEGER NULL,
+  tpo                     TEXT    NULL
+);
+
+INSERT INTO bucket_30m_dim (bucket_ct_minute_of_day, session, period_index, tpo)
+SELECT
+  m,
+  session,
+  period_index,
+  CASE
+    WHEN period_index IS NULL THEN NULL
+    WHEN period_index < 26 THEN CHR(base + period_index)
+    ELSE CHR(base + period_index / 26 - 1) || CHR(base + period_index % 26)
+  END
+FROM (
+  SELECT
+    m,
+    CASE
+      WHEN m >= 1020 OR m < 510 THEN 'ON'
+      WHEN m <= 930 THEN 'RTH'
+    END AS session,
+    CASE
+      WHEN m >= 1020 THEN (m - 1020) / 30
+      WHEN m < 510 THEN (420 + m) / 30
+      WHEN m <= 930 THEN (m - 510) / 30
+    END AS period_index,
+    CASE WHEN m >= 1020 OR m < 510 THEN 97 ELSE 65 END AS base
+  FROM generate_series(0, 1410, 30) AS m
+) b
+ON CONFLICT (bucket_ct_minute_of_day) DO UPDATE SET
+  session      = EXCLUDED.session,
+  period_index = EXCLUDED.period_index,
+  tpo          = EXCLUDED.tpo;
@@ -0,0 +1,44 @@
+-- Derived bars at any configured resolution (5m, 15m, 60m, session, daily, ...),
+-- rebuilt from bars_1m alongside bars_30m with the same full/dirty semantics.
+--
+-- derived_buckets maps every CT minute of day to its bucket for each configured
+-- resolution (1440 rows per resolution), so one rebuild pass joins bars_1m to it
+-- and aggregates all resolutions at once. Rows are written from the Python
+-- bucket layouts (es_stats.domain.resolutions) by configure_derived_resolution.
+
+CREATE TABLE IF NOT EXISTS derived_buckets (
+  resolution              TEXT    NOT NULL,
+  ct_minute_of_day        INTEGER NOT NULL CHECK (ct_minute_of_day BETWEEN 0 AND 1439),
+  bucket_ct_minute_of_day INTEGER NOT NULL CHECK (bucket_ct_minute_of_day BETWEEN 0 AND 1439),
+  bucket_minutes          INTEGER NOT NULL CHECK (bucket_minutes BETWEEN 1 AND 1440),
+  PRIMARY KEY (resolution, ct_minute_of_day)
+);
+
+-- Prices are integer ticks of instruments.tick_size, like bars_1m/bars_30m.
+-- bucket_start_utc is the first 1m bar's timestamp, and is_complete = 1 when every
+-- minute of the bucket has a 1m bar (bar_count_1m = bucket length).
+CREATE TABLE IF NOT EXISTS bars_derived (
+  instrument_id           BIGINT  NOT NULL REFERENCES instruments(instrument_id),
+  resolution              TEXT    NOT NULL,
+  trading_date_ct_int     INTEGER NOT NULL,
+  bucket_ct_minute_of_day INTEGER NOT NULL
+    CHECK (bucket_ct_minute_of_day BETWEEN 0 AND 1439),
+  bucket_start_utc        BIGINT  NOT NULL,
+
+  open                    INTEGER NOT NULL,
+  high                    INTEGER NOT NULL,
+  low                     INTEGER NOT NULL,
+  close                   INTEGER NOT NULL,
+  volume                  BIGINT  NOT NULL CHECK (volume >= 0),
+  trades_count            BIGINT  NOT NULL CHECK (trades_count >= 0),
+
+  bar_count_1m            INTEGER NOT NULL CHECK (bar_count_1m BETWEEN 1 AND 1440),
+  is_complete             INTEGER NOT NULL DEFAULT 0 CHECK (is_complete IN (0,1)),
+
+  derived_from_import_id  BIGINT  NULL REFERENCES imports(import_id),
+
+  PRIMARY KEY (instrument_id, resolution, trading_date_ct_int, bucket_ct_minute_of_day),
+  CHECK (high >= low)
+) PARTITION BY RANGE (trading_date_ct_int);
+
+CREATE TABLE IF NOT EXISTS bars_derived_default PARTITION OF bars_derived DEFAULT;
@@ -0,0 +1,8 @@
+-- Timestamp of the last 1m bar in each bars_30m/bars_derived bucket (the close
+-- bar), next to bucket_start_utc (the open bar). Lets readers combine buckets
+-- with 1m bars exactly: open/close follow bar time even on the DST fall-back
+-- day, when CT minutes 01:00-01:59 occur twice. Existing rows are backfilled
+-- from bars_1m by add_bucket_end_utc.
+
+ALTER TABLE bars_30m ADD COLUMN IF NOT EXISTS bucket_end_utc BIGINT NULL;
+ALTER TABLE bars_derived ADD COLUMN IF NOT EXISTS bucket_end_utc BIGINT NULL;
@@ -0,0 +1,11 @@
+-- The DST fall-back trading date has 25 hours: CT 01:00-01:59 occurs twice, so
+-- a 30m bucket there aggregates up to 60 1m bars and a daily bucket up to 1500.
+-- Rebuilding that date used to fail the bar_count_1m checks.
+
+ALTER TABLE bars_30m DROP CONSTRAINT IF EXISTS bars_30m_bar_count_1m_check;
+ALTER TABLE bars_30m ADD CONSTRAINT bars_30m_bar_count_1m_check
+  CHECK (bar_count_1m BETWEEN 0 AND 60);
+
+ALTER TABLE bars_derived DROP CONSTRAINT IF EXISTS bars_derived_bar_count_1m_check;
+ALTER TABLE bars_derived ADD CONSTRAINT bars_derived_bar_count_1m_check
+  CHECK (bar_count_1m BETWEEN 1 AND 1500);
@@ -0,0 +1,19 @@
+-- Which CT minutes of each trading date have a 1m bar: bit m (counting from
+-- the left, as get_bit/set_bit do) is set when bars_1m has a bar at
+-- ct_minute_of_day m. Merges into bars_1m OR their minutes in, so observed
+-- and missing minutes of any window are a bit_count against the window mask
+-- instead of a scan of bars_1m. The repeated CT hour of the DST fall-back date
+-- shares bits, so the bitmap counts distinct CT minutes.
+CREATE TABLE IF NOT EXISTS day_coverage (
+  instrument_id        integer   NOT NULL REFERENCES instruments(instrument_id),
+  trading_date_ct_int  integer   NOT NULL,
+  minute_bits          bit(1440) NOT NULL,
+  PRIMARY KEY (instrument_id, trading_date_ct_int)
+);
+
+-- Databases that already hold bars get their bitmaps built once.
+INSERT INTO day_coverage (instrument_id, trading_date_ct_int, minute_bits)
+SELECT instrument_id, trading_date_ct_int, bit_or(B'1'::bit(1440) >> ct_minute_of_day)
+FROM bars_1m
+WHERE NOT EXISTS (SELECT 1 FROM day_coverage)
+GROUP BY instrument_id, trading_date_ct_int;
@@ -0,0 +1,15 @@
+-- Expected sessions per instrument and trading date. session_open/close are
+-- the first and last CT minute of the session (inclusive, wrapping past
+-- midnight), both NULL on a date without a session. expected_bits has the
+-- day_coverage layout: bit m (from the left) is set when a 1m bar is expected
+-- at CT minute m, so holidays, early closes and skipped DST minutes are
+-- already applied and a window's expected bar count is a bit_count.
+CREATE TABLE IF NOT EXISTS trading_calendar (
+  instrument_id            integer   NOT NULL REFERENCES instruments(instrument_id),
+  trading_date_ct_int      integer   NOT NULL,
+  session_open_ct_minute   integer   CHECK (session_open_ct_minute BETWEEN 0 AND 1439),
+  session_close_ct_minute  integer   CHECK (session_close_ct_minute BETWEEN 0 AND 1439),
+  expected_bits            bit(1440) NOT NULL,
+  PRIMARY KEY (instrument_id, trading_date_ct_int),
+  CHECK ((session_open_ct_minute IS NULL) = (session_close_ct_minute IS NULL))
+);
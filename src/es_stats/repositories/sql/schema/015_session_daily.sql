@@ -0,0 +1,58 @@
+-- Session-level daily bars: one row per instrument, trading date and session
+-- (ON, RTH and FULL_DAY, the whole trading date including the unlabelled
+-- 16:00-16:59 bucket), aggregated from the session-labelled bars_30m rows by
+-- every bars_30m rebuild in the same transaction. Session analyses read one row
+-- per day instead of re-aggregating bars. Prices are integer ticks, like
+-- bars_30m. first_bar_utc / last_bar_utc are the first and last 1m bar
+-- timestamps, bucket_count_30m the number of 30m buckets holding bars.
+CREATE TABLE IF NOT EXISTS session_daily (
+  instrument_id           BIGINT  NOT NULL REFERENCES instruments(instrument_id),
+  trading_date_ct_int     INTEGER NOT NULL,
+  session                 TEXT    NOT NULL CHECK (session IN ('ON','RTH','FULL_DAY')),
+  first_bar_utc           BIGINT  NOT NULL,
+  last_bar_utc            BIGINT  NOT NULL,
+
+  open                    INTEGER NOT NULL,
+  high                    INTEGER NOT NULL,
+  low                     INTEGER NOT NULL,
+  close                   INTEGER NOT NULL,
+  volume                  BIGINT  NOT NULL CHECK (volume >= 0),
+  trades_count            BIGINT  NOT NULL CHECK (trades_count >= 0),
+
+  bar_count_1m            INTEGER NOT NULL CHECK (bar_count_1m BETWEEN 1 AND 1500),
+  bucket_count_30m        INTEGER NOT NULL CHECK (bucket_count_30m BETWEEN 1 AND 48),
+
+  derived_from_import_id  BIGINT  NULL REFERENCES imports(import_id),
+
+  PRIMARY KEY (instrument_id, trading_date_ct_int, session),
+  CHECK (high >= low)
+);
+
+-- Databases that already hold bars_30m get their session rows built once.
+INSERT INTO session_daily (
+  instrument_id, trading_date_ct_int, session, first_bar_utc, last_bar_utc,
+  open, high, low, close, volume, trades_count, bar_count_1m, bucket_count_30m,
+  derived_from_import_id
+)
+SELECT
+  instrument_id,
+  trading_date_ct_int,
+  CASE WHEN GROUPING(session) = 1 THEN 'FULL_DAY' ELSE session END,
+  MIN(bucket_start_utc),
+  MAX(bucket_end_utc),
+  (array_agg(open ORDER BY bucket_start_utc))[1],
+  MAX(high),
+  MIN(low),
+  (array_agg(close ORDER BY bucket_end_utc DESC))[1],
+  SUM(volume),
+  SUM(trades_count),
+  SUM(bar_count_1m),
+  COUNT(*),
+  NULL
+FROM bars_30m
+WHERE NOT EXISTS (SELECT 1 FROM session_daily)
+GROUP BY GROUPING SETS (
+  (instrument_id, trading_date_ct_int, session),
+  (instrument_id, trading_date_ct_int)
+)
+HAVING GROUPING(session) = 1 OR session IS NOT NULL;
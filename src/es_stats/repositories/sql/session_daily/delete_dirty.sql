@@ -0,0 +1,8 @@
+/* Every trading date with a dirty 30m bucket: its sessions are rebuilt whole. */
+DELETE FROM session_daily
+WHERE instrument_id = %(instrument_id)s
+  AND trading_date_ct_int IN (
+    SELECT d.trading_date_ct_int
+    FROM tmp_dirty_30m d
+    WHERE d.instrument_id = %(instrument_id)s
+  );
@@ -0,0 +1,3 @@
+DELETE FROM session_daily
+WHERE instrument_id = %(instrument_id)s
+  AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s;
@@ -0,0 +1,15 @@
+SELECT
+  trading_date_ct_int,
+  session,
+  first_bar_utc,
+  last_bar_utc,
+  open, high, low, close,
+  volume,
+  trades_count,
+  bar_count_1m,
+  bucket_count_30m
+FROM session_daily
+WHERE instrument_id = %(instrument_id)s
+  AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+  AND session = ANY(%(sessions)s::text[])
+ORDER BY trading_date_ct_int, array_position(%(sessions)s::text[], session);
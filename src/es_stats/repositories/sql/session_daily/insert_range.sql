@@ -0,0 +1,49 @@
+/* ON, RTH and FULL_DAY rows of the trading dates just rebuilt in bars_30m, in
+   one GROUPING SETS pass over their 30m buckets: (date, session) groups give
+   ON and RTH, the (date) group gives FULL_DAY. The 16:00 bucket has no
+   session, so it only counts toward FULL_DAY. Dirty mode rebuilds every
+   date with a dirty bucket whole. */
+INSERT INTO session_daily (
+  instrument_id,
+  trading_date_ct_int,
+  session,
+  first_bar_utc,
+  last_bar_utc,
+  open, high, low, close,
+  volume,
+  trades_count,
+  bar_count_1m,
+  bucket_count_30m,
+  derived_from_import_id
+)
+SELECT
+  instrument_id,
+  trading_date_ct_int,
+  CASE WHEN GROUPING(session) = 1 THEN 'FULL_DAY' ELSE session END,
+  MIN(bucket_start_utc),
+  MAX(bucket_end_utc),
+  (array_agg(open ORDER BY bucket_start_utc))[1],
+  MAX(high),
+  MIN(low),
+  (array_agg(close ORDER BY bucket_end_utc DESC))[1],
+  SUM(volume),
+  SUM(trades_count),
+  SUM(bar_count_1m),
+  COUNT(*),
+  %(derived_from_import_id)s
+FROM bars_30m
+WHERE instrument_id = %(instrument_id)s
+  AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+  AND (
+    NOT %(dirty_only)s
+    OR trading_date_ct_int IN (
+      SELECT d.trading_date_ct_int
+      FROM tmp_dirty_30m d
+      WHERE d.instrument_id = %(instrument_id)s
+    )
+  )
+GROUP BY GROUPING SETS (
+  (instrument_id, trading_date_ct_int, session),
+  (instrument_id, trading_date_ct_int)
+)
+HAVING GROUPING(session) = 1 OR session IS NOT NULL;
@@ -0,0 +1,10 @@
+-- USING cannot contain a subquery, so the tick size comes from a temp function.
+CREATE OR REPLACE FUNCTION pg_temp.instrument_tick_size(BIGINT) RETURNS DOUBLE PRECISION
+  LANGUAGE sql STABLE
+  AS 'SELECT tick_size FROM instruments WHERE instrument_id = $1';
+
+ALTER TABLE {table}
+  ALTER COLUMN open  TYPE INTEGER USING round(open  / pg_temp.instrument_tick_size(instrument_id))::integer,
+  ALTER COLUMN high  TYPE INTEGER USING round(high  / pg_temp.instrument_tick_size(instrument_id))::integer,
+  ALTER COLUMN low   TYPE INTEGER USING round(low   / pg_temp.instrument_tick_size(instrument_id))::integer,
+  ALTER COLUMN close TYPE INTEGER USING round(close / pg_temp.instrument_tick_size(instrument_id))::integer;
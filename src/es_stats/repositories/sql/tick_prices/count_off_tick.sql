@@ -0,0 +1,7 @@
+SELECT COUNT(*)
+FROM {table} b
+JOIN instruments i ON i.instrument_id = b.instrument_id
+WHERE abs(b.open  / i.tick_size - round(b.open  / i.tick_size)) > {tolerance}
+   OR abs(b.high  / i.tick_size - round(b.high  / i.tick_size)) > {tolerance}
+   OR abs(b.low   / i.tick_size - round(b.low   / i.tick_size)) > {tolerance}
+   OR abs(b.close / i.tick_size - round(b.close / i.tick_size)) > {tolerance};
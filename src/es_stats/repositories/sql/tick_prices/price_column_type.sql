@@ -0,0 +1,5 @@
+SELECT format_type(a.atttypid, a.atttypmod)
+FROM pg_attribute a
+WHERE a.attrelid = to_regclass(%(table)s)
+  AND a.attname = 'open'
+  AND NOT a.attisdropped;
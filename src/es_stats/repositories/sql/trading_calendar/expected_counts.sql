@@ -0,0 +1,10 @@
+-- Expected 1m bars of each window on each calendar date: a popcount of the
+-- date's expected-minute bitmap against the window's minute mask.
+SELECT c.trading_date_ct_int,
+       (w.window_index - 1)::int AS window_index,
+       bit_count(c.expected_bits & w.mask)::int AS expected
+FROM trading_calendar c
+CROSS JOIN unnest(%(masks)s::text[]::bit(1440)[]) WITH ORDINALITY AS w(mask, window_index)
+WHERE c.instrument_id = %(instrument_id)s
+  AND c.trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+ORDER BY 1, 2;
@@ -0,0 +1,5 @@
+SELECT trading_date_ct_int, session_open_ct_minute, session_close_ct_minute, expected_bits::text
+FROM trading_calendar
+WHERE instrument_id = %(instrument_id)s
+  AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+ORDER BY trading_date_ct_int;
@@ -0,0 +1,18 @@
+INSERT INTO trading_calendar (
+  instrument_id,
+  trading_date_ct_int,
+  session_open_ct_minute,
+  session_close_ct_minute,
+  expected_bits
+)
+SELECT %(instrument_id)s, td, open_minute, close_minute, bits::bit(1440)
+FROM unnest(
+  %(trading_dates)s::int[],
+  %(open_minutes)s::int[],
+  %(close_minutes)s::int[],
+  %(expected_bits)s::text[]
+) AS c(td, open_minute, close_minute, bits)
+ON CONFLICT (instrument_id, trading_date_ct_int) DO UPDATE SET
+  session_open_ct_minute  = EXCLUDED.session_open_ct_minute,
+  session_close_ct_minute = EXCLUDED.session_close_ct_minute,
+  expected_bits           = EXCLUDED.expected_bits;
@@ -0,0 +1,90 @@
+/* Per-day metrics, completeness and per-window aggregates of planned
+   windows in one statement. Completeness is evaluate_window_coverage's
+   rule: missing = max(0, expected - observed), complete when
+   missing / expected (0 when nothing is expected) is within the window's
+   tolerance. Day rows come first, ordered by trading date, then window;
+   then one summary row per window (trading_date_ct_int NULL) whose jsonb
+   holds the day counts, exclusion reason counts and mean/median/percentiles
+   of range (in price units), volume and trades over complete days with
+   bars. */
+WITH tolerances AS (
+  SELECT (t.i - 1)::int AS window_index, t.tolerance
+  FROM unnest(%(tolerances)s::float8[]) WITH ORDINALITY AS t(tolerance, i)
+),
+days AS MATERIALIZED (
+  SELECT d.*,
+         m.missing_bar_count,
+         r.missing_ratio,
+         r.missing_ratio <= t.tolerance AS is_complete,
+         CASE WHEN r.missing_ratio > t.tolerance THEN 'MISSING_EXCEEDS_TOLERANCE' END
+           AS exclusion_reason
+  FROM (
+{window_days}
+  ) d
+  JOIN tolerances t USING (window_index)
+  CROSS JOIN LATERAL (
+    SELECT GREATEST(0, d.expected_bar_count - d.observed_bar_count) AS missing_bar_count
+  ) m
+  CROSS JOIN LATERAL (
+    SELECT CASE WHEN d.expected_bar_count = 0 THEN 0.0
+                ELSE m.missing_bar_count::float8 / d.expected_bar_count END AS missing_ratio
+  ) r
+),
+summaries AS (
+  SELECT t.window_index,
+         jsonb_build_object(
+           'days_in_range', count(d.window_index),
+           'included_days', count(*) FILTER (WHERE d.is_complete),
+           'exclusion_reasons', (
+             SELECT COALESCE(jsonb_object_agg(x.exclusion_reason, x.n), '{{}}'::jsonb)
+             FROM (
+               SELECT exclusion_reason, count(*) AS n
+               FROM days e
+               WHERE e.window_index = t.window_index AND e.exclusion_reason IS NOT NULL
+               GROUP BY exclusion_reason
+             ) x
+           ),
+           'range', jsonb_build_object(
+             'mean', avg(s.range) FILTER (WHERE s.priced),
+             'median', percentile_cont(0.5) WITHIN GROUP (ORDER BY s.range)
+               FILTER (WHERE s.priced),
+             'percentiles', percentile_cont(%(fractions)s::float8[])
+               WITHIN GROUP (ORDER BY s.range) FILTER (WHERE s.priced)
+           ),
+           'volume', jsonb_build_object(
+             'mean', avg(s.volume) FILTER (WHERE s.priced),
+             'median', percentile_cont(0.5) WITHIN GROUP (ORDER BY s.volume)
+               FILTER (WHERE s.priced),
+             'percentiles', percentile_cont(%(fractions)s::float8[])
+               WITHIN GROUP (ORDER BY s.volume) FILTER (WHERE s.priced)
+           ),
+           'trades_count', jsonb_build_object(
+             'mean', avg(s.trades_count) FILTER (WHERE s.priced),
+             'median', percentile_cont(0.5) WITHIN GROUP (ORDER BY s.trades_count)
+               FILTER (WHERE s.priced),
+             'percentiles', percentile_cont(%(fractions)s::float8[])
+               WITHIN GROUP (ORDER BY s.trades_count) FILTER (WHERE s.priced)
+           )
+         ) AS summary
+  FROM tolerances t
+  LEFT JOIN days d USING (window_index)
+  -- A complete day can lack bars only when nothing was required of it.
+  CROSS JOIN LATERAL (
+    SELECT d.is_complete AND d.range IS NOT NULL AS priced,
+           d.range * %(tick_size)s::float8 AS range,
+           d.volume::float8 AS volume,
+           d.trades_count::float8 AS trades_count
+  ) s
+  GROUP BY t.window_index
+)
+SELECT window_index, trading_date_ct_int,
+       open, high, low, close, range, volume, trades_count,
+       bar_count, observed_bar_count, expected_bar_count,
+       missing_bar_count, missing_ratio, is_complete, exclusion_reason,
+       NULL::jsonb AS summary
+FROM days
+UNION ALL
+SELECT window_index, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL,
+       NULL, NULL, NULL, NULL, NULL, NULL, NULL, summary
+FROM summaries
+ORDER BY 2 NULLS LAST, 1;
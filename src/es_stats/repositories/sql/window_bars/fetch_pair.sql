@@ -0,0 +1,23 @@
+/* Windows 0 (X) and 1 (Y) side by side, one row per trading date either has
+   a day row for. Highs and lows are converted to prices and are NaN where a
+   window has no bars, so the columns load straight into float arrays;
+   coverage counts are 0 where a window has no row. */
+WITH days AS (
+{window_days}
+)
+SELECT trading_date_ct_int,
+       COALESCE(MAX(high) FILTER (WHERE window_index = 0) * %(tick_size)s::float8, 'NaN')
+         AS x_high,
+       COALESCE(MIN(low) FILTER (WHERE window_index = 0) * %(tick_size)s::float8, 'NaN')
+         AS x_low,
+       COALESCE(MAX(observed_bar_count) FILTER (WHERE window_index = 0), 0) AS x_observed,
+       COALESCE(MAX(expected_bar_count) FILTER (WHERE window_index = 0), 0) AS x_expected,
+       COALESCE(MAX(high) FILTER (WHERE window_index = 1) * %(tick_size)s::float8, 'NaN')
+         AS y_high,
+       COALESCE(MIN(low) FILTER (WHERE window_index = 1) * %(tick_size)s::float8, 'NaN')
+         AS y_low,
+       COALESCE(MAX(observed_bar_count) FILTER (WHERE window_index = 1), 0) AS y_observed,
+       COALESCE(MAX(expected_bar_count) FILTER (WHERE window_index = 1), 0) AS y_expected
+FROM days
+GROUP BY trading_date_ct_int
+ORDER BY trading_date_ct_int;
@@ -0,0 +1,5 @@
+SELECT *
+FROM (
+{planned_bars}
+) w
+ORDER BY trading_date_ct_int, window_index;
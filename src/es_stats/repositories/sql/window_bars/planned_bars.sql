@@ -0,0 +1,87 @@
+/* One row per planned bucket that has data: 1m bars for (window, minute
+   range) pairs, bars_30m / bars_derived buckets for (window, bucket) pairs. A
+   window's pieces cover disjoint minutes, so combining them reproduces the
+   1m aggregate exactly: open of the earliest bar, close of the latest bar
+   (bucket_start_utc / bucket_end_utc for buckets), extremes and sums.
+   bars_1m and bars_derived are probed per covered trading date (OFFSET 0
+   keeps each probe an index lookup) instead of hashing every row in range,
+   so a few edge minutes do not cost a scan of years of bars. */
+WITH covered AS (
+  SELECT trading_date_ct_int
+  FROM day_coverage
+  WHERE instrument_id = %(instrument_id)s
+    AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+),
+parts AS (
+  SELECT
+    p.window_index,
+    c.trading_date_ct_int,
+    b.ts_start_utc AS first_utc,
+    b.ts_start_utc AS last_utc,
+    b.open, b.high, b.low, b.close,
+    b.volume,
+    b.trades_count,
+    1 AS bar_count_1m
+  FROM unnest(%(m_window)s::int[], %(m_first)s::int[], %(m_last)s::int[])
+    AS p(window_index, first_minute, last_minute)
+  CROSS JOIN covered c
+  CROSS JOIN LATERAL (
+    SELECT * FROM bars_1m b
+    WHERE b.instrument_id = %(instrument_id)s
+      AND b.trading_date_ct_int = c.trading_date_ct_int
+      AND b.ct_minute_of_day BETWEEN p.first_minute AND p.last_minute
+    OFFSET 0
+  ) b
+
+  UNION ALL
+
+  SELECT
+    p.window_index,
+    b.trading_date_ct_int,
+    b.bucket_start_utc,
+    b.bucket_end_utc,
+    b.open, b.high, b.low, b.close,
+    b.volume,
+    b.trades_count,
+    b.bar_count_1m
+  FROM unnest(%(h_window)s::int[], %(h_minute)s::int[]) AS p(window_index, minute)
+  JOIN bars_30m b
+    ON b.instrument_id = %(instrument_id)s
+   AND b.trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+   AND b.bucket_ct_minute_of_day = p.minute
+
+  UNION ALL
+
+  SELECT
+    p.window_index,
+    b.trading_date_ct_int,
+    b.bucket_start_utc,
+    b.bucket_end_utc,
+    b.open, b.high, b.low, b.close,
+    b.volume,
+    b.trades_count,
+    b.bar_count_1m
+  FROM unnest(%(d_window)s::int[], %(d_resolution)s::text[], %(d_minute)s::int[])
+    AS p(window_index, resolution, minute)
+  CROSS JOIN covered c
+  CROSS JOIN LATERAL (
+    SELECT * FROM bars_derived b
+    WHERE b.instrument_id = %(instrument_id)s
+      AND b.resolution = p.resolution
+      AND b.trading_date_ct_int = c.trading_date_ct_int
+      AND b.bucket_ct_minute_of_day = p.minute
+    OFFSET 0
+  ) b
+)
+SELECT
+  window_index,
+  trading_date_ct_int,
+  (array_agg(open ORDER BY first_utc))[1]      AS open,
+  MAX(high)                                    AS high,
+  MIN(low)                                     AS low,
+  (array_agg(close ORDER BY last_utc DESC))[1] AS close,
+  SUM(volume)::bigint                          AS volume,
+  SUM(trades_count)::bigint                    AS trades_count,
+  SUM(bar_count_1m)::int                       AS bar_count_1m
+FROM parts
+GROUP BY window_index, trading_date_ct_int
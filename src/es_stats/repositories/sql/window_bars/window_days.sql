@@ -0,0 +1,53 @@
+/* Per-day bars and 1m coverage counts of planned windows. A date's expected
+   minutes come from trading_calendar where it has a row, else the default
+   session bitmap; observed minutes are the expected ones day_coverage marks
+   as having a bar. Both are popcounts against the window mask, as in
+   evaluate_day_coverage, so bars outside the session never make up for
+   missing ones inside it. Dates expecting bars in a window but holding none
+   still get a row. */
+WITH bars AS (
+{planned_bars}
+),
+windows AS (
+  SELECT (w.i - 1)::int AS window_index, w.mask::bit(1440) AS mask
+  FROM unnest(%(masks)s::text[]) WITH ORDINALITY AS w(mask, i)
+),
+days AS (
+  SELECT COALESCE(c.trading_date_ct_int, v.trading_date_ct_int) AS trading_date_ct_int,
+         COALESCE(c.expected_bits, %(default_expected)s::bit(1440)) AS expected_bits,
+         COALESCE(v.minute_bits, repeat('0', 1440)::bit(1440)) AS minute_bits
+  FROM (
+    SELECT trading_date_ct_int, expected_bits
+    FROM trading_calendar
+    WHERE instrument_id = %(instrument_id)s
+      AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+  ) c
+  FULL JOIN (
+    SELECT trading_date_ct_int, minute_bits
+    FROM day_coverage
+    WHERE instrument_id = %(instrument_id)s
+      AND trading_date_ct_int BETWEEN %(td_min)s AND %(td_max)s
+  ) v USING (trading_date_ct_int)
+),
+coverage AS (
+  SELECT w.window_index,
+         d.trading_date_ct_int,
+         bit_count(d.minute_bits & d.expected_bits & w.mask)::int AS observed,
+         bit_count(d.expected_bits & w.mask)::int AS expected
+  FROM days d
+  CROSS JOIN windows w
+)
+SELECT COALESCE(b.window_index, cv.window_index)               AS window_index,
+       COALESCE(b.trading_date_ct_int, cv.trading_date_ct_int) AS trading_date_ct_int,
+       b.open, b.high, b.low, b.close,
+       b.high - b.low                AS range,
+       COALESCE(b.volume, 0)         AS volume,
+       COALESCE(b.trades_count, 0)   AS trades_count,
+       COALESCE(b.bar_count_1m, 0)   AS bar_count,
+       COALESCE(cv.observed, 0)      AS observed_bar_count,
+       COALESCE(cv.expected, 0)      AS expected_bar_count
+FROM bars b
+FULL JOIN coverage cv
+  ON cv.window_index = b.window_index
+ AND cv.trading_date_ct_int = b.trading_date_ct_int
+WHERE b.window_index IS NOT NULL OR cv.expected > 0
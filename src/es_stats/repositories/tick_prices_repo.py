@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import psycopg
+from psycopg import sql
+
+from es_stats.db.connection import execute_composed_script
+from es_stats.domain.ticks import TICK_TOLERANCE
+from es_stats.repositories.partitions_repo import BARS_TABLES
+from es_stats.repositories.sql_loader import load_sql
+
+
+def convert_bar_prices_to_ticks(conn: psycopg.Connection) -> None:
+    """
+    Schema step: store bars_1m/bars_30m OHLC as INTEGER ticks of the
+    instrument's tick_size instead of DOUBLE PRECISION prices.
+
+    Refuses (RuntimeError) to convert a table holding prices that are not
+    whole multiples of their instrument's tick_size, rather than rounding
+    them; set instruments.tick_size first. Idempotent: tables whose prices
+    are already integers are left alone.
+    """
+    for table in BARS_TABLES:
+        (col_type,) = conn.execute(
+            load_sql("tick_prices/price_column_type.sql"), {"table": table}
+        ).fetchone() or (None,)
+        if col_type != "double precision":
+            continue
+
+        (off_tick,) = conn.execute(
+            sql.SQL(load_sql("tick_prices/count_off_tick.sql")).format(
+                table=sql.Identifier(table), tolerance=sql.Literal(TICK_TOLERANCE)
+            )
+        ).fetchone()
+        if off_tick:
+            raise RuntimeError(
+                f"Cannot convert {table} prices to ticks: {off_tick} row(s) are not "
+                "multiples of their instrument's tick_size (fix instruments.tick_size first)"
+            )
+        execute_composed_script(
+            conn, load_sql("tick_prices/convert_prices.sql"), table=sql.Identifier(table)
+        )
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import psycopg
+
+from es_stats.domain.calendar import TradingSession
+from es_stats.domain.windows import WindowSpec
+from es_stats.repositories.minute_bits import bits_from_mask, mask_from_bits
+from es_stats.repositories.sql_loader import load_sql
+
+
+def upsert_trading_calendar(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    sessions: Sequence[TradingSession],
+) -> int:
+    """Insert or replace calendar days in one statement; returns the number written."""
+    if not sessions:
+        return 0
+    cur = conn.execute(
+        load_sql("trading_calendar/upsert.sql"),
+        {
+            "instrument_id": instrument_id,
+            "trading_dates": [s.trading_date_ct_int for s in sessions],
+            "open_minutes": [s.open_minute_ct for s in sessions],
+            "close_minutes": [s.close_minute_ct for s in sessions],
+            "expected_bits": [bits_from_mask(s.expected_mask) for s in sessions],
+        },
+    )
+    return int(cur.rowcount)
+
+
+def fetch_trading_calendar(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    td_min: int,
+    td_max: int,
+) -> list[TradingSession]:
+    """Calendar days in [td_min, td_max], ordered by trading date."""
+    rows = conn.execute(
+        load_sql("trading_calendar/fetch_range.sql"),
+        {"instrument_id": instrument_id, "td_min": td_min, "td_max": td_max},
+    ).fetchall()
+    return [
+        TradingSession(int(td), open_minute, close_minute, mask_from_bits(bits))
+        for td, open_minute, close_minute, bits in rows
+    ]
+
+
+def expected_bar_counts(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    td_min: int,
+    td_max: int,
+    windows: Sequence[WindowSpec],
+) -> list[tuple[int, int, int]]:
+    """
+    (trading_date_ct_int, window_index, expected 1m bars) for every calendar
+    date in the range and every window, in one query. Dates with no session
+    expect 0; dates missing from the calendar are omitted. Rows come ordered
+    by trading date, then window, matching count_window_minutes().
+    """
+    rows = conn.execute(
+        load_sql("trading_calendar/expected_counts.sql"),
+        {
+            "instrument_id": instrument_id,
+            "td_min": td_min,
+            "td_max": td_max,
+            "masks": [bits_from_mask(w.minute_mask) for w in windows],
+        },
+    ).fetchall()
+    return [(int(td), int(i), int(n)) for td, i, n in rows]
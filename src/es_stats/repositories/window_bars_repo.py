@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import psycopg
+from psycopg import sql
+
+from es_stats.domain.ticks import ticks_to_price
+from es_stats.domain.window_plan import WindowPlan
+from es_stats.repositories.instruments_repo import get_tick_size
+from es_stats.repositories.minute_bits import bits_from_mask
+from es_stats.repositories.sql_loader import load_sql
+
+
+@dataclass(frozen=True)
+class WindowBar:
+    """
+    OHLCV of one planned window on one trading date (prices converted from
+    the stored ticks with the instrument's tick_size). window_index is the
+    plan's position in the list passed to fetch_window_bars.
+    """
+
+    window_index: int
+    trading_date_ct_int: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    trades_count: int
+    bar_count_1m: int
+
+
+@dataclass(frozen=True)
+class WindowDayMetrics:
+    """
+    One planned window on one trading date with its 1m coverage counts
+    (prices and range converted from ticks, as WindowBar). Prices and range
+    are None on a date that expected bars in the window but has none.
+    observed/expected_bar_count feed evaluate_window_coverage; bar_count is
+    every 1m bar read, including any outside the expected minutes.
+    """
+
+    window_index: int
+    trading_date_ct_int: int
+    open: float | None
+    high: float | None
+    low: float | None
+    close: float | None
+    range: float | None
+    volume: int
+    trades_count: int
+    bar_count: int
+    observed_bar_count: int
+    expected_bar_count: int
+    missing_bar_count: int
+    missing_ratio: float
+    is_complete: bool
+    exclusion_reason: str | None
+
+
+@dataclass(frozen=True)
+class MetricSummary:
+    """mean/median/pXX of one per-day metric over the included days."""
+
+    mean: float
+    median: float
+    percentiles: dict[int, float]
+
+
+@dataclass(frozen=True)
+class WindowSummary:
+    """
+    Aggregates of one planned window over the days fetch_window_metrics
+    returned for it. exclusion_reasons counts the excluded days by
+    CoverageExclusionReason value; the metric summaries cover the complete
+    days with bars and are None when there are none.
+    """
+
+    window_index: int
+    days_in_range: int
+    included_days: int
+    exclusion_reasons: dict[str, int]
+    range: MetricSummary | None
+    volume: MetricSummary | None
+    trades_count: MetricSummary | None
+
+
+def _planned(template: str) -> sql.Composed:
+    planned_bars = sql.SQL(load_sql("window_bars/planned_bars.sql"))
+    return sql.SQL(load_sql(template)).format(
+        planned_bars=planned_bars,
+        window_days=sql.SQL(load_sql("window_bars/window_days.sql")).format(
+            planned_bars=planned_bars
+        ),
+    )
+
+
+def _price(ticks: int | None, tick_size: float) -> float | None:
+    return None if ticks is None else ticks_to_price(ticks, tick_size)
+
+
+def _metric_summary(stats: dict, percentiles: Sequence[int]) -> MetricSummary | None:
+    if stats["mean"] is None:
+        return None
+    return MetricSummary(
+        mean=float(stats["mean"]),
+        median=float(stats["median"]),
+        percentiles=dict(zip(percentiles, map(float, stats["percentiles"]))),
+    )
+
+
+def _minute_runs(minutes: Sequence[int]) -> list[tuple[int, int]]:
+    """(first, last) of each run of consecutive CT minutes, in order."""
+    runs: list[tuple[int, int]] = []
+    for m in minutes:
+        if runs and m == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], m)
+        else:
+            runs.append((m, m))
+    return runs
+
+
+def _plan_params(plans: Sequence[WindowPlan]) -> dict[str, list]:
+    params: dict[str, list] = {
+        "m_window": [], "m_first": [], "m_last": [],
+        "h_window": [], "h_minute": [],
+        "d_window": [], "d_resolution": [], "d_minute": [],
+    }
+    for i, plan in enumerate(plans):
+        for fragment in plan.fragments:
+            if fragment.table == "bars_1m":
+                # 1m bars are read as minute ranges, split where a run wraps past midnight.
+                for first, last in _minute_runs(fragment.bucket_starts):
+                    params["m_window"].append(i)
+                    params["m_first"].append(first)
+                    params["m_last"].append(last)
+                continue
+            for start in fragment.bucket_starts:
+                if fragment.table == "bars_30m":
+                    params["h_window"].append(i)
+                    params["h_minute"].append(start)
+                else:
+                    params["d_window"].append(i)
+                    params["d_resolution"].append(fragment.resolution)
+                    params["d_minute"].append(start)
+    return params
+
+
+def fetch_window_bars(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    td_min: int,
+    td_max: int,
+    plans: Sequence[WindowPlan],
+) -> list[WindowBar]:
+    """
+    Evaluate planned windows over a trading-date range in one statement.
+
+    Each plan's fragments are read from bars_1m, bars_30m or bars_derived and
+    combined per (window, trading date); the result equals evaluating the
+    same windows over bars_1m alone (see plan_window with resolutions=()),
+    provided the derived tables and day_coverage are up to date (only dates
+    with a day_coverage row are read). Dates with no bars in a window are
+    omitted. Rows come ordered by trading date, then window.
+    """
+    params = {
+        "instrument_id": instrument_id,
+        "td_min": td_min,
+        "td_max": td_max,
+        **_plan_params(plans),
+    }
+    tick_size = get_tick_size(conn, instrument_id)
+    rows = conn.execute(_planned("window_bars/fetch_planned.sql"), params).fetchall()
+    return [
+        WindowBar(i, td, *(ticks_to_price(t, tick_size) for t in (o, h, lo, c)), *rest)
+        for i, td, o, h, lo, c, *rest in rows
+    ]
+
+
+def fetch_window_metrics(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    td_min: int,
+    td_max: int,
+    plans: Sequence[WindowPlan],
+    tolerances: Sequence[float],
+    default_expected_mask: int,
+    percentiles: Sequence[int],
+) -> tuple[list[WindowDayMetrics], list[WindowSummary]]:
+    """
+    fetch_window_bars plus 1m coverage, completeness and per-window
+    aggregates, for every plan and trading date in one statement.
+
+    A date's expected minutes are its trading_calendar expected_bits, or
+    default_expected_mask (WindowSpec.minute_mask bit order) when the
+    calendar has no row for it. Counts follow evaluate_day_coverage:
+    expected is the popcount of those minutes in the window, observed of the
+    ones day_coverage marks as having a bar. Dates expecting bars in a
+    window but holding none are included (with no prices). tolerances[i] is
+    the allowed missing ratio of plans[i] (MissingPolicy.tolerance_for its
+    role); the rule is evaluate_window_coverage's, applied in SQL, as are
+    the summaries' mean, median and `percentiles` (percentile_cont).
+    """
+    if len(tolerances) != len(plans):
+        raise ValueError("fetch_window_metrics() needs one tolerance per plan")
+    for p in percentiles:
+        if not (0 <= p <= 100):
+            raise ValueError(f"percentile must be in [0, 100], got {p!r}")
+    tick_size = get_tick_size(conn, instrument_id)
+    params = {
+        "instrument_id": instrument_id,
+        "td_min": td_min,
+        "td_max": td_max,
+        "masks": [bits_from_mask(p.window.minute_mask) for p in plans],
+        "default_expected": bits_from_mask(default_expected_mask),
+        "tolerances": list(tolerances),
+        "fractions": [p / 100 for p in percentiles],
+        "tick_size": tick_size,
+        **_plan_params(plans),
+    }
+    rows = conn.execute(_planned("window_bars/fetch_metrics.sql"), params).fetchall()
+    days = [
+        WindowDayMetrics(i, td, *(_price(t, tick_size) for t in (o, h, lo, c, rng)), *rest)
+        for i, td, o, h, lo, c, rng, *rest, summary in rows
+        if summary is None
+    ]
+    summaries = [
+        WindowSummary(
+            window_index=i,
+            days_in_range=summary["days_in_range"],
+            included_days=summary["included_days"],
+            exclusion_reasons=summary["exclusion_reasons"],
+            range=_metric_summary(summary["range"], percentiles),
+            volume=_metric_summary(summary["volume"], percentiles),
+            trades_count=_metric_summary(summary["trades_count"], percentiles),
+        )
+        for i, *_, summary in rows[len(days):]
+    ]
+    return days, summaries
+
+
+def fetch_window_pair(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    td_min: int,
+    td_max: int,
+    x: WindowPlan,
+    y: WindowPlan,
+    default_expected_mask: int,
+) -> list[tuple[int, float, float, int, int, float, float, int, int]]:
+    """
+    Two planned windows side by side, in one statement: (trading_date_ct_int,
+    x_high, x_low, x_observed, x_expected, y_high, y_low, y_observed,
+    y_expected) per trading date with bars in either window or a session
+    expecting some, ordered by date. Highs and lows are prices, NaN where the
+    window has no bars; coverage counts are as in fetch_window_metrics and
+    0 where the window has no day. Plain tuples, so callers can load the
+    columns straight into arrays.
+    """
+    tick_size = get_tick_size(conn, instrument_id)
+    params = {
+        "instrument_id": instrument_id,
+        "td_min": td_min,
+        "td_max": td_max,
+        "masks": [bits_from_mask(p.window.minute_mask) for p in (x, y)],
+        "default_expected": bits_from_mask(default_expected_mask),
+        "tick_size": tick_size,
+        **_plan_params([x, y]),
+    }
+    return conn.execute(_planned("window_bars/fetch_pair.sql"), params).fetchall()
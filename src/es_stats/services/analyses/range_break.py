@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from enum import StrEnum
+
+import psycopg
+
+from es_stats.domain.missing_policy import MissingPolicy, WindowRole
+from es_stats.domain.resolutions import BarResolution
+from es_stats.domain.ticks import is_on_tick
+from es_stats.domain.window_plan import WindowPlan
+from es_stats.domain.windows import WindowOrderRule, WindowSpec, validate_pair
+from es_stats.repositories.instruments_repo import get_tick_size
+from es_stats.repositories.window_bars_repo import fetch_window_pair
+from es_stats.services.analyses.window_metrics import configured_resolutions
+from es_stats.services.trading_calendar import DEFAULT_SESSION_MASK
+from es_stats.services.window_planner import plan_window
+
+try:  # optional dependency: pip install 'es-stats[analyses]'
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_MISSING_HINT = (
+    "Range break analyses need the optional 'numpy' package (pip install 'es-stats[analyses]')."
+)
+
+
+# Column layout of fetch_window_pair rows.
+_PAIR_DTYPE = [
+    ("trading_date_ct_int", "i8"),
+    ("x_high", "f8"),
+    ("x_low", "f8"),
+    ("x_observed", "i8"),
+    ("x_expected", "i8"),
+    ("y_high", "f8"),
+    ("y_low", "f8"),
+    ("y_observed", "i8"),
+    ("y_expected", "i8"),
+]
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class BreakDirection(StrEnum):
+    UP = "up"
+    DOWN = "down"
+    EITHER = "either"
+    BOTH = "both"
+
+
+@dataclass(frozen=True, eq=False)
+class RangeBreakDays:
+    """
+    Per-day Range Break columns, one entry per trading date (ascending).
+
+    Highs, lows and break sizes are in points (price units); highs and lows
+    are NaN where the window has no bars. Break flags are only set on
+    included days, i.e. days where both windows are complete under the
+    policy and have bars.
+    """
+
+    trading_date_ct_int: np.ndarray
+    x_high: np.ndarray
+    x_low: np.ndarray
+    y_high: np.ndarray
+    y_low: np.ndarray
+    x_complete: np.ndarray
+    y_complete: np.ndarray
+    included: np.ndarray
+    break_up_size: np.ndarray
+    break_down_size: np.ndarray
+    broke_up: np.ndarray
+    broke_down: np.ndarray
+    broke_either: np.ndarray
+    broke_both: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.trading_date_ct_int)
+
+    def broke(self, direction: BreakDirection) -> np.ndarray:
+        return {
+            BreakDirection.UP: self.broke_up,
+            BreakDirection.DOWN: self.broke_down,
+            BreakDirection.EITHER: self.broke_either,
+            BreakDirection.BOTH: self.broke_both,
+        }[BreakDirection(direction)]
+
+
+@dataclass(frozen=True)
+class BreakCount:
+    count: int
+    pct: float | None
+
+
+@dataclass(frozen=True)
+class RangeBreakReport:
+    """
+    Range Break, X breaches Y (docs/phase4_analyses.md #2). Percentages are
+    of total_days_evaluated (the included days) and None when it is 0.
+    min_break_size, like every level and size in days, is in points.
+    excluded_by_role counts the days each window failed; a day where both
+    failed counts under both.
+    """
+
+    x: WindowSpec
+    y: WindowSpec
+    x_plan: WindowPlan
+    y_plan: WindowPlan
+    direction: BreakDirection
+    min_break_size: float
+    tick_size: float
+    days: RangeBreakDays
+    total_days_evaluated: int
+    excluded_days: int
+    excluded_by_role: dict[WindowRole, int]
+    breached: BreakCount
+    break_up: BreakCount
+    break_down: BreakCount
+    break_either: BreakCount
+    break_both: BreakCount
+    no_break: BreakCount
+
+
+def complete_days(
+    observed: np.ndarray,
+    expected: np.ndarray,
+    *,
+    role: WindowRole,
+    policy: MissingPolicy,
+) -> np.ndarray:
+    """
+    evaluate_window_coverage(...).is_complete over aligned columns of
+    observed and expected bar counts, as one array expression.
+    """
+    if np is None:
+        raise RuntimeError(NUMPY_MISSING_HINT)
+    missing = np.maximum(expected - observed, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(expected == 0, 0.0, missing / expected)
+    return ratio <= policy.tolerance_for(role)
+
+
+def _min_break_ticks(min_break_size: float, tick_size: float) -> int:
+    if min_break_size < 0:
+        raise ValueError(f"min_break_size must be >= 0, got {min_break_size!r}")
+    if not is_on_tick(min_break_size, tick_size):
+        raise ValueError(
+            f"min_break_size {min_break_size!r} is not a multiple of tick size {tick_size!r}"
+        )
+    return round(min_break_size / tick_size)
+
+
+def compute_breaks(
+    trading_date_ct_int: np.ndarray,
+    *,
+    x_high: np.ndarray,
+    x_low: np.ndarray,
+    x_complete: np.ndarray,
+    y_high: np.ndarray,
+    y_low: np.ndarray,
+    y_complete: np.ndarray,
+    tick_size: float,
+    min_break_size: float = 0.0,
+) -> RangeBreakDays:
+    """
+    Breach flags and sizes for aligned per-day columns of prices.
+
+    break_up_size is max(0, x_high - y_high) and break_down_size
+    max(0, y_low - x_low), in points snapped to whole ticks; a side breaks
+    when its size is positive and at least min_break_size, which must be a
+    multiple of tick_size. Sizes and flags are 0/False on excluded days.
+    """
+    if np is None:
+        raise RuntimeError(NUMPY_MISSING_HINT)
+    min_ticks = _min_break_ticks(min_break_size, tick_size)
+    included = x_complete & y_complete & ~np.isnan(x_high) & ~np.isnan(y_high)
+    # Compared in whole ticks, so float noise in the prices cannot flip a flag.
+    with np.errstate(invalid="ignore"):
+        up = np.where(included, np.rint(np.maximum(x_high - y_high, 0.0) / tick_size), 0.0)
+        down = np.where(included, np.rint(np.maximum(y_low - x_low, 0.0) / tick_size), 0.0)
+    broke_up = (up > 0) & (up >= min_ticks)
+    broke_down = (down > 0) & (down >= min_ticks)
+    return RangeBreakDays(
+        trading_date_ct_int=trading_date_ct_int,
+        x_high=x_high,
+        x_low=x_low,
+        y_high=y_high,
+        y_low=y_low,
+        x_complete=x_complete,
+        y_complete=y_complete,
+        included=included,
+        break_up_size=up * tick_size,
+        break_down_size=down * tick_size,
+        broke_up=broke_up,
+        broke_down=broke_down,
+        broke_either=broke_up | broke_down,
+        broke_both=broke_up & broke_down,
+    )
+
+
+def _count(flags: np.ndarray, total: int) -> BreakCount:
+    n = int(np.count_nonzero(flags))
+    return BreakCount(count=n, pct=100.0 * n / total if total else None)
+
+
+def summarize_breaks(
+    days: RangeBreakDays,
+    direction: BreakDirection,
+) -> dict[str, BreakCount]:
+    """Aggregate counts/percentages keyed like RangeBreakReport's fields."""
+    total = int(np.count_nonzero(days.included))
+    return {
+        "breached": _count(days.broke(direction), total),
+        "break_up": _count(days.broke_up, total),
+        "break_down": _count(days.broke_down, total),
+        "break_either": _count(days.broke_either, total),
+        "break_both": _count(days.broke_both, total),
+        "no_break": _count(days.included & ~days.broke_either, total),
+    }
+
+
+def run_range_break(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    td_min: int,
+    td_max: int,
+    x: WindowSpec,
+    y: WindowSpec,
+    policy: MissingPolicy,
+    direction: BreakDirection = BreakDirection.EITHER,
+    min_break_size: float = 0.0,
+    order_rule: WindowOrderRule = WindowOrderRule.Y_ENDS_BEFORE_X_START,
+    resolutions: Sequence[BarResolution] | None = None,
+) -> RangeBreakReport:
+    """
+    How often window X breaches window Y's high/low over [td_min, td_max].
+
+    The pair must satisfy `order_rule` (validate_pair). Both windows are
+    read side by side in one statement (fetch_window_pair), each planned by
+    plan_window over the configured resolutions (or `resolutions`; () reads
+    pure 1m), straight into columns. X and Y completeness (complete_days,
+    evaluate_window_coverage's rule under the policy's X / Y tolerance, with
+    dates missing from the trading calendar expected to trade the regular
+    session), breaches and the aggregates are then computed column-wise.
+    min_break_size is in points (price units) and must be a multiple of the
+    instrument's tick size.
+    """
+    if np is None:
+        raise RuntimeError(NUMPY_MISSING_HINT)
+    validate_pair(x, y, order_rule)
+    if resolutions is None:
+        resolutions = configured_resolutions(conn)
+    x_plan = plan_window(x, resolutions)
+    y_plan = plan_window(y, resolutions)
+    tick_size = get_tick_size(conn, instrument_id)
+    _min_break_ticks(min_break_size, tick_size)  # reject a bad threshold before the query
+    pair = np.array(
+        fetch_window_pair(
+            conn,
+            instrument_id=instrument_id,
+            td_min=td_min,
+            td_max=td_max,
+            x=x_plan,
+            y=y_plan,
+            default_expected_mask=DEFAULT_SESSION_MASK,
+        ),
+        dtype=_PAIR_DTYPE,
+    )
+    x_complete = complete_days(
+        pair["x_observed"], pair["x_expected"], role=WindowRole.X, policy=policy
+    )
+    y_complete = complete_days(
+        pair["y_observed"], pair["y_expected"], role=WindowRole.Y, policy=policy
+    )
+    days = compute_breaks(
+        pair["trading_date_ct_int"],
+        x_high=pair["x_high"],
+        x_low=pair["x_low"],
+        x_complete=x_complete,
+        y_high=pair["y_high"],
+        y_low=pair["y_low"],
+        y_complete=y_complete,
+        tick_size=tick_size,
+        min_break_size=min_break_size,
+    )
+    total = int(np.count_nonzero(days.included))
+    return RangeBreakReport(
+        x=x,
+        y=y,
+        x_plan=x_plan,
+        y_plan=y_plan,
+        direction=BreakDirection(direction),
+        min_break_size=min_break_size,
+        tick_size=tick_size,
+        days=days,
+        total_days_evaluated=total,
+        excluded_days=len(days) - total,
+        excluded_by_role={
+            WindowRole.X: int(np.count_nonzero(~(x_complete & ~np.isnan(days.x_high)))),
+            WindowRole.Y: int(np.count_nonzero(~(y_complete & ~np.isnan(days.y_high)))),
+        },
+        **summarize_breaks(days, direction),
+    )
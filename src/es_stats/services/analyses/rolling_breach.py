@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from math import isnan, sqrt
+
+from es_stats.db.connection import connection
+from es_stats.domain.missing_policy import MissingPolicy
+from es_stats.domain.windows import WindowOrderRule, WindowSpec
+from es_stats.repositories.instruments_repo import find_instrument
+from es_stats.services.analyses.range_break import (
+    NUMPY_MISSING_HINT,
+    BreakDirection,
+    RangeBreakDays,
+    run_range_break,
+)
+
+try:  # optional dependency: pip install 'es-stats[analyses]'
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@dataclass(frozen=True, eq=False)
+class RollingBreachSeries:
+    """
+    One symbol's rolling breach rate over the last `length` trading dates,
+    one entry per date that closes a full window (ascending). rolling_n is
+    the included days in the window and rolling_breach_rate is NaN when it
+    is 0.
+    """
+
+    symbol: str
+    trading_date_ct_int: np.ndarray
+    rolling_n: np.ndarray
+    rolling_breach_count: np.ndarray
+    rolling_breach_rate: np.ndarray
+    rolling_excluded_days: np.ndarray
+
+
+@dataclass(frozen=True, eq=False)
+class CrossSymbolRates:
+    """
+    Per trading date, the spread of the rolling rate across the symbols
+    that have one (population std; NaN rates are skipped). symbol_count is
+    how many symbols contributed a rate on that date.
+    """
+
+    trading_date_ct_int: np.ndarray
+    symbol_count: np.ndarray
+    mean_rate: np.ndarray
+    std_rate: np.ndarray
+    min_rate: np.ndarray
+    max_rate: np.ndarray
+
+
+@dataclass(frozen=True)
+class RollingBreachReport:
+    """Rolling Breach Rate (docs/phase4_analyses.md #3); series keeps the symbols' order."""
+
+    x: WindowSpec
+    y: WindowSpec
+    direction: BreakDirection
+    length: int
+    series: dict[str, RollingBreachSeries]
+    cross_symbol: CrossSymbolRates
+
+
+def _window_sums(flags: np.ndarray, length: int) -> np.ndarray:
+    # Sum over each trailing window as a difference of prefix sums: O(1) per date.
+    prefix = np.concatenate(([0], np.cumsum(flags, dtype=np.int64)))
+    return prefix[length:] - prefix[:-length]
+
+
+def rolling_breach(
+    symbol: str,
+    days: RangeBreakDays,
+    *,
+    direction: BreakDirection,
+    length: int,
+) -> RollingBreachSeries:
+    """Rolling count, exclusions and rate of `direction` breaches over `length` dates."""
+    if np is None:
+        raise RuntimeError(NUMPY_MISSING_HINT)
+    if length < 1:
+        raise ValueError(f"rolling length must be >= 1, got {length!r}")
+    n = _window_sums(days.included, length)
+    count = _window_sums(days.broke(direction), length)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = np.where(n > 0, count / n, np.nan)
+    return RollingBreachSeries(
+        symbol=symbol,
+        trading_date_ct_int=days.trading_date_ct_int[length - 1:],
+        rolling_n=n,
+        rolling_breach_count=count,
+        rolling_breach_rate=rate,
+        rolling_excluded_days=length - n,
+    )
+
+
+class RateMoments:
+    """
+    Running mean/variance/min/max of rolling rates per trading date.
+
+    Series are merged one at a time (Welford's update per date), so the
+    cross-symbol summary never holds more than one accumulator per date.
+    """
+
+    def __init__(self) -> None:
+        self._by_date: dict[int, list[float]] = {}
+
+    def add(self, series: RollingBreachSeries) -> None:
+        for td, rate in zip(
+            series.trading_date_ct_int.tolist(), series.rolling_breach_rate.tolist()
+        ):
+            if isnan(rate):  # no included day in the window
+                continue
+            acc = self._by_date.get(td)
+            if acc is None:
+                self._by_date[td] = [1, rate, 0.0, rate, rate]
+                continue
+            acc[0] += 1
+            delta = rate - acc[1]
+            acc[1] += delta / acc[0]
+            acc[2] += delta * (rate - acc[1])
+            acc[3] = min(acc[3], rate)
+            acc[4] = max(acc[4], rate)
+
+    def result(self) -> CrossSymbolRates:
+        dates = sorted(self._by_date)
+        accs = [self._by_date[td] for td in dates]
+        return CrossSymbolRates(
+            trading_date_ct_int=np.array(dates, dtype=np.int64),
+            symbol_count=np.array([int(a[0]) for a in accs], dtype=np.int64),
+            mean_rate=np.array([a[1] for a in accs]),
+            std_rate=np.array([sqrt(a[2] / a[0]) for a in accs]),
+            min_rate=np.array([a[3] for a in accs]),
+            max_rate=np.array([a[4] for a in accs]),
+        )
+
+
+def _symbol_rolling_breach(
+    database_url: str | None,
+    symbol: str,
+    td_min: int,
+    td_max: int,
+    x: WindowSpec,
+    y: WindowSpec,
+    policy: MissingPolicy,
+    direction: BreakDirection,
+    length: int,
+    min_break_size: float,
+    order_rule: WindowOrderRule,
+) -> RollingBreachSeries:
+    # Runs in a worker process: one connection and one bars read per symbol.
+    with connection(database_url) as conn:
+        instrument_id = find_instrument(conn, symbol)
+        if instrument_id is None:
+            raise ValueError(f"unknown symbol {symbol!r}")
+        report = run_range_break(
+            conn,
+            instrument_id=instrument_id,
+            td_min=td_min,
+            td_max=td_max,
+            x=x,
+            y=y,
+            policy=policy,
+            direction=direction,
+            min_break_size=min_break_size,
+            order_rule=order_rule,
+        )
+    return rolling_breach(symbol, report.days, direction=direction, length=length)
+
+
+def run_rolling_breach(
+    *,
+    symbols: Sequence[str],
+    td_min: int,
+    td_max: int,
+    x: WindowSpec,
+    y: WindowSpec,
+    policy: MissingPolicy,
+    direction: BreakDirection = BreakDirection.EITHER,
+    length: int = 20,
+    min_break_size: float = 0.0,
+    order_rule: WindowOrderRule = WindowOrderRule.Y_ENDS_BEFORE_X_START,
+    workers: int = 1,
+    database_url: str | None = None,
+) -> RollingBreachReport:
+    """
+    Rolling breach rate of X over Y for each symbol, plus the cross-symbol
+    spread per trading date.
+
+    Each symbol is one run_range_break (both windows read in one statement)
+    on its own connection; with workers > 1 symbols run in a process pool.
+    Rolling sums are prefix-sum differences, so every date costs O(1)
+    whatever `length` is.
+    """
+    if np is None:
+        raise RuntimeError(NUMPY_MISSING_HINT)
+    if not symbols:
+        raise ValueError("run_rolling_breach() needs at least one symbol")
+    repeated = sorted({s for s in symbols if symbols.count(s) > 1})
+    if repeated:
+        raise ValueError(f"repeated symbol(s): {', '.join(repeated)}")
+    if length < 1:
+        raise ValueError(f"rolling length must be >= 1, got {length!r}")
+    args = (
+        td_min, td_max, x, y, policy, BreakDirection(direction), length, min_break_size, order_rule
+    )
+    moments = RateMoments()
+    series: dict[str, RollingBreachSeries] = {}
+
+    def collect(results: Iterable[RollingBreachSeries]) -> None:
+        for s in results:
+            series[s.symbol] = s
+            moments.add(s)
+
+    if workers <= 1 or len(symbols) == 1:
+        collect(_symbol_rolling_breach(database_url, symbol, *args) for symbol in symbols)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(symbols))) as pool:
+            futures = [
+                pool.submit(_symbol_rolling_breach, database_url, symbol, *args)
+                for symbol in symbols
+            ]
+            collect(f.result() for f in futures)
+    return RollingBreachReport(
+        x=x,
+        y=y,
+        direction=BreakDirection(direction),
+        length=length,
+        series=series,
+        cross_symbol=moments.result(),
+    )
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import psycopg
+
+from es_stats.domain.missing_policy import MissingPolicy, WindowRole
+from es_stats.domain.resolutions import BAR_30M, BarResolution
+from es_stats.domain.window_plan import WindowPlan
+from es_stats.domain.windows import WindowSpec
+from es_stats.repositories.derived_bars_repo import list_derived_resolutions
+from es_stats.repositories.window_bars_repo import (
+    MetricSummary,
+    WindowDayMetrics,
+    fetch_window_metrics,
+)
+from es_stats.services.completeness import CoverageExclusionReason
+from es_stats.services.trading_calendar import DEFAULT_SESSION_MASK
+from es_stats.services.window_planner import plan_window
+
+DEFAULT_PERCENTILES: tuple[int, ...] = (10, 25, 75, 90)
+
+
+@dataclass(frozen=True)
+class WindowMetricsReport:
+    """
+    Window Range Metrics (docs/phase4_analyses.md #1). Prices, range and the
+    range summary are in price units (the stored ticks times tick_size).
+
+    days holds every trading date with bars in the window or a session
+    expecting some; the summaries cover the complete ones only and are None
+    when no day is included.
+    """
+
+    window: WindowSpec
+    plan: WindowPlan
+    days: list[WindowDayMetrics]
+    days_in_range: int
+    included_days: int
+    excluded_days: int
+    exclusion_reasons: dict[CoverageExclusionReason, int]
+    range: MetricSummary | None
+    volume: MetricSummary | None
+    trades_count: MetricSummary | None
+
+
+def configured_resolutions(conn: psycopg.Connection) -> tuple[BarResolution, ...]:
+    """The bucketed resolutions plan_window may read: bars_30m plus the configured derived ones."""
+    return (BAR_30M, *list_derived_resolutions(conn))
+
+
+def run_window_metrics(
+    conn: psycopg.Connection,
+    *,
+    instrument_id: int,
+    td_min: int,
+    td_max: int,
+    window: WindowSpec,
+    policy: MissingPolicy,
+    role: WindowRole = WindowRole.X,
+    percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+    resolutions: Sequence[BarResolution] | None = None,
+) -> WindowMetricsReport:
+    """
+    Per-day and aggregate metrics of one window over [td_min, td_max].
+
+    The window is read as plan_window splits it: whole buckets of the
+    configured resolutions (or `resolutions`; () reads pure 1m) with 1m bars
+    at the edges. Every day's OHLC, volume, trades and completeness under
+    `policy` (evaluate_window_coverage's rule), the included/excluded counts
+    and the mean/median/`percentiles` summaries all come from one SQL
+    statement (see fetch_window_metrics). Dates missing from the trading
+    calendar are expected to trade the regular session (DEFAULT_SESSION_MASK),
+    so load a calendar to account for holidays, early closes and DST. A
+    window spanning midnight belongs to the trading date it ends on, like
+    every CT-anchored window.
+    """
+    if resolutions is None:
+        resolutions = configured_resolutions(conn)
+    plan = plan_window(window, resolutions)
+    days, (summary,) = fetch_window_metrics(
+        conn,
+        instrument_id=instrument_id,
+        td_min=td_min,
+        td_max=td_max,
+        plans=[plan],
+        tolerances=[policy.tolerance_for(role)],
+        default_expected_mask=DEFAULT_SESSION_MASK,
+        percentiles=percentiles,
+    )
+    return WindowMetricsReport(
+        window=window,
+        plan=plan,
+        days=days,
+        days_in_range=summary.days_in_range,
+        included_days=summary.included_days,
+        excluded_days=summary.days_in_range - summary.included_days,
+        exclusion_reasons={
+            CoverageExclusionReason(reason): n for reason, n in summary.exclusion_reasons.items()
+        },
+        range=summary.range,
+        volume=summary.volume,
+        trades_count=summary.trades_count,
+    )
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from itertools import compress, islice
+from pathlib import Path
+from typing import Any, Iterator, Literal
+
+from es_stats.domain.bars import BarBatch, RawBar
+from es_stats.domain.ticks import TICK_TOLERANCE
+from es_stats.services.csv_parser import (
+    _EPOCH_FORMAT,
+    _FIELD_LABELS,
+    DEFAULT_BATCH_SIZE,
+    CsvIssue,
+    CsvValidationError,
+    TimestampParser,
+    resolve_bar_columns,
+)
+
+try:  # optional dependency: pip install 'es-stats[arrow]'
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+ArrowFormat = Literal["parquet", "arrow"]
+
+PYARROW_MISSING_HINT = (
+    "Parquet/Arrow import needs the optional 'pyarrow' package (pip install 'es-stats[arrow]')."
+)
+
+# Values sampled from a text timestamp column to pick the fast-path layout.
+_SNIFF_ROWS = 100
+
+_UNIT_DIVISOR = {"s": 1, "ms": 1_000, "us": 1_000_000, "ns": 1_000_000_000}
+
+
+def pyarrow_available() -> bool:
+    return pa is not None
+
+
+def _column_array(typecode: str, values: Any) -> array:
+    """Copy a null-free, fixed-width Arrow array into an array-module column."""
+    out = array(typecode)
+    size = out.itemsize
+    buf = values.buffers()[1]
+    out.frombytes(memoryview(buf)[values.offset * size : (values.offset + len(values)) * size])
+    return out
+
+
+def _iter_record_batches(path: Path, fmt: ArrowFormat, batch_size: int) -> tuple[Any, Iterator]:
+    """(schema, record batches) for a Parquet file or an Arrow IPC file/stream."""
+    if fmt == "parquet":
+        pf = pq.ParquetFile(path)
+        return pf.schema_arrow, pf.iter_batches(batch_size=batch_size)
+
+    source = pa.memory_map(str(path), "r")
+    try:
+        reader = ipc.open_file(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        source.seek(0)
+        reader = ipc.open_stream(source)
+        batches = iter(reader)
+    return reader.schema, batches
+
+
+class ArrowBarReader:
+    """
+    Stream validated bars from a Parquet or Arrow IPC file as BarBatch blocks.
+
+    Columns are matched with the same header synonyms as the CSV reader and
+    rows are checked with the same rules (see read_bars_csv): nulls reject a
+    row as "missing <field>", volume/trades_count must be >= 0 and high >= low.
+    Validation is vectorised per record batch with pyarrow.compute; accepted
+    rows are copied column-wise into BarBatch arrays.
+
+    Timestamp columns may be Arrow timestamps (naive = wall clock in the import
+    timezone, tz-aware = absolute instants), integers (UTC epoch seconds) or
+    strings (parsed like CSV timestamps). Issue line numbers count a virtual
+    header as line 1, so row N of the file is reported as line N + 1, the same
+    as the equivalent CSV.
+
+    Same counters, skip_rows/rows_flushed, tick_size check and iteration
+    contract as CsvBarReader.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        fmt: ArrowFormat,
+        skip_rows: int = 0,
+        tick_size: float | None = None,
+    ):
+        if pa is None:
+            raise RuntimeError(PYARROW_MISSING_HINT)
+        if skip_rows < 0:
+            raise ValueError(f"skip_rows must be >= 0, got {skip_rows!r}")
+        self.path = path
+        self.fmt = fmt
+        self.skip_rows = skip_rows
+        self.tick_size = tick_size
+        self.rows_flushed = 0
+        self.row_count_read = 0
+        self.row_count_rejected = 0
+        self.row_count_accepted = 0
+        self.issues: list[CsvIssue] = []
+        self._ts_parser = TimestampParser()
+        self._sniffed = False
+
+    @property
+    def dt_format(self) -> str | None:
+        return self._ts_parser.dt_format
+
+    @property
+    def dt_format_counts(self) -> Counter[str]:
+        return self._ts_parser.format_counts
+
+    @property
+    def dt_fallback_count(self) -> int:
+        return self._ts_parser.fallback_count
+
+    def __iter__(self) -> Iterator[RawBar]:
+        for batch in self.iter_batches():
+            yield from batch
+
+    def iter_batches(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[BarBatch]:
+        if batch_size <= 0:
+            raise ValueError(f"batch size must be > 0, got {batch_size!r}")
+
+        schema, batches = _iter_record_batches(self.path, self.fmt, batch_size)
+        names = resolve_bar_columns(schema.names)
+        self._check_types(schema, names)
+
+        skip = self.skip_rows
+        for rb in batches:
+            if skip >= rb.num_rows:
+                skip -= rb.num_rows
+                continue
+            rb, skip = rb.slice(skip), 0
+            for start in range(0, rb.num_rows, batch_size):
+                part = rb.slice(start, batch_size)
+                bars = self._convert([part.column(n) for n in names])
+                self.rows_flushed = self.row_count_read
+                if len(bars):
+                    yield bars
+
+        # If we parsed nothing usable, treat as fatal (a resumed import already has rows).
+        if self.row_count_accepted == 0 and self.skip_rows == 0:
+            raise CsvValidationError(
+                self.issues
+                or [CsvIssue(line=1, message="No valid data rows parsed (all rows rejected).")]
+            )
+
+    def _check_types(self, schema: Any, names: tuple[str, ...]) -> None:
+        ts_type = schema.field(names[0]).type
+        bad = []
+        if not (
+            pa.types.is_timestamp(ts_type)
+            or pa.types.is_integer(ts_type)
+            or pa.types.is_string(ts_type)
+            or pa.types.is_large_string(ts_type)
+        ):
+            bad.append(f"{names[0]} ({ts_type})")
+        for name in names[1:]:
+            t = schema.field(name).type
+            if not (pa.types.is_integer(t) or pa.types.is_floating(t)):
+                bad.append(f"{name} ({t})")
+        if bad:
+            raise CsvValidationError(
+                [CsvIssue(line=1, message=f"Unsupported column types: {', '.join(bad)}")]
+            )
+
+    def _timestamps(self, col: Any) -> tuple[Any, array, str | list[str | None], dict[int, str]]:
+        """
+        Timestamp column as (int64 seconds, null where unusable; is_utc flags;
+        format label for the whole column or per row; parse errors by row).
+        """
+        n = len(col)
+        t = col.type
+        if pa.types.is_timestamp(t):
+            secs = pc.divide(pc.cast(col, pa.int64()), _UNIT_DIVISOR[t.unit])
+            flag = 1 if t.tz is not None else 0
+            return secs, array("b", [flag]) * n, str(t), {}
+        if pa.types.is_integer(t):
+            return pc.cast(col, pa.int64()), array("b", [1]) * n, _EPOCH_FORMAT, {}
+
+        # Text timestamps: same layouts and fast paths as the CSV reader.
+        raw = [None if v is None else v.strip() for v in col.to_pylist()]
+        if not self._sniffed:
+            self._ts_parser = TimestampParser.sniff(islice(filter(None, raw), _SNIFF_ROWS))
+            self._sniffed = True
+        values: list[int | None] = []
+        flags = array("b")
+        formats: list[str | None] = []
+        errors: dict[int, str] = {}
+        for i, v in enumerate(raw):
+            ts, is_utc, fmt = None, False, None
+            if v:
+                try:
+                    ts, is_utc, fmt = self._ts_parser.parse(v)
+                except ValueError as e:
+                    errors[i] = str(e)
+            values.append(ts)
+            flags.append(is_utc)
+            formats.append(fmt)
+        return pa.array(values, pa.int64()), flags, formats, errors
+
+    def _convert(self, cols: list[Any]) -> BarBatch:
+        n = len(cols[0])
+        line0 = self.skip_rows + self.row_count_read + 2  # header is line 1
+        self.row_count_read += n
+
+        ts, ts_flags, formats, ts_errors = self._timestamps(cols[0])
+        o, h, l, c = (pc.cast(x, pa.float64()) for x in cols[1:5])
+        v, t = (pc.cast(x, pa.int64(), safe=False) for x in cols[5:7])
+
+        missing = [x.is_null() for x in cols]
+        if not isinstance(formats, str):  # text timestamps: blank counts as missing, like CSV
+            missing[0] = pc.or_(missing[0], pc.equal(pc.utf8_trim_whitespace(cols[0]), ""))
+        bad = pc.is_null(ts)
+        for m in missing:
+            bad = pc.or_(bad, m)
+        off_tick = []
+        if self.tick_size is not None:
+            off_tick = [_off_tick(x, self.tick_size) for x in (o, h, l, c)]
+        for cond in (pc.less(v, 0), pc.less(t, 0), pc.less(h, l), *off_tick):
+            bad = pc.or_(bad, pc.fill_null(cond, False))
+
+        rejected = pc.sum(bad).as_py() or 0
+        for i in pc.indices_nonzero(bad).to_pylist():
+            message = _reason(i, missing, ts_errors, v, t, (o, h, l, c), off_tick, self.tick_size)
+            self.issues.append(CsvIssue(line=line0 + i, message=message))
+        self.row_count_rejected += rejected
+        self.row_count_accepted += n - rejected
+
+        keep = pc.invert(bad)
+        if isinstance(formats, str):
+            self._ts_parser.accept(formats, n - rejected)
+        else:
+            for fmt in compress(formats, keep.to_pylist()):
+                self._ts_parser.accept(fmt)
+        if rejected:
+            ts_flags = array("b", compress(ts_flags, keep.to_pylist()))
+
+        return BarBatch(
+            ts_seconds=_column_array("q", pc.filter(ts, keep)),
+            ts_is_utc=ts_flags,
+            open=_column_array("d", pc.filter(o, keep)),
+            high=_column_array("d", pc.filter(h, keep)),
+            low=_column_array("d", pc.filter(l, keep)),
+            close=_column_array("d", pc.filter(c, keep)),
+            volume=_column_array("q", pc.filter(v, keep)),
+            trades_count=_column_array("q", pc.filter(t, keep)),
+        )
+
+
+def _off_tick(prices: Any, tick_size: float) -> Any:
+    """Mask of prices that are not whole multiples of tick_size (see is_on_tick)."""
+    ticks = pc.divide(prices, tick_size)
+    return pc.greater(pc.abs(pc.subtract(ticks, pc.round(ticks))), TICK_TOLERANCE)
+
+
+def _reason(
+    i: int,
+    missing: list[Any],
+    ts_errors: dict[int, str],
+    v: Any,
+    t: Any,
+    prices: tuple[Any, ...],
+    off_tick: list[Any],
+    tick_size: float | None,
+) -> str:
+    """First rejection message for row i, in the order the CSV reader checks."""
+    for label, m in zip(_FIELD_LABELS, missing):
+        if m[i].as_py():
+            return f"missing {label}"
+    if i in ts_errors:
+        return ts_errors[i]
+    if v[i].as_py() < 0:
+        return "volume must be >= 0"
+    if t[i].as_py() < 0:
+        return "trades_count must be >= 0"
+    if prices[1][i].as_py() < prices[2][i].as_py():
+        return "high must be >= low"
+    for label, p, m in zip(_FIELD_LABELS[1:5], prices, off_tick):
+        if m[i].as_py():
+            return f"{label} {p[i].as_py()!r} is not a multiple of tick size {tick_size!r}"
+    raise AssertionError("unreachable")
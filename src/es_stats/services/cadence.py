@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+# Largest gaps kept in the summary.
+DEFAULT_TOP_GAPS = 10
+
+
+@dataclass
+class CadenceAnalyzer:
+    """
+    Single-pass cadence and gap statistics over bar timestamps (UTC seconds).
+
+    Fed batch by batch while an import streams (see iter_bars_1m_chunks), it
+    keeps O(distinct deltas + top gaps) state instead of the timestamps:
+    - delta_counts: histogram of positive deltas between consecutive new
+      timestamps (each one compared with the latest timestamp seen so far)
+    - duplicate_count: rows repeating the latest timestamp
+    - out_of_order_count: rows older than the latest timestamp
+    - top_gaps: the largest deltas as (seconds, ts_before_utc)
+
+    While no row arrived out of order, the histogram is exactly the set of
+    deltas between consecutive unique timestamps in sorted order, so
+    unique_ts_count and median_delta() match the SQL staged_cadence check.
+    Once a row arrives out of order (in_order is False) that no longer holds
+    and callers must measure the cadence on sorted data instead; summary()
+    then leaves the delta-derived fields null.
+    """
+
+    top_n: int = DEFAULT_TOP_GAPS
+    row_count: int = 0
+    duplicate_count: int = 0
+    out_of_order_count: int = 0
+    first_ts_utc: int | None = None
+    last_ts_utc: int | None = None
+    delta_counts: Counter[int] = field(default_factory=Counter)
+    top_gaps: list[tuple[int, int]] = field(default_factory=list)  # min-heap
+
+    @property
+    def in_order(self) -> bool:
+        return self.out_of_order_count == 0
+
+    @property
+    def unique_ts_count(self) -> int:
+        """Distinct timestamps seen (exact while in_order)."""
+        if self.last_ts_utc is None:
+            return 0
+        return 1 + sum(self.delta_counts.values())
+
+    def observe(self, ts_utc: Iterable[int]) -> None:
+        last = self.last_ts_utc
+        deltas = self.delta_counts
+        gaps = self.top_gaps
+        top_n = self.top_n
+        n = dup = ooo = 0
+        for ts in ts_utc:
+            n += 1
+            if last is None:
+                self.first_ts_utc = last = ts
+            elif ts > last:
+                d = ts - last
+                deltas[d] += 1
+                if len(gaps) < top_n:
+                    heapq.heappush(gaps, (d, last))
+                elif d > gaps[0][0]:
+                    heapq.heapreplace(gaps, (d, last))
+                last = ts
+            elif ts == last:
+                dup += 1
+            else:
+                ooo += 1
+        self.last_ts_utc = last
+        self.row_count += n
+        self.duplicate_count += dup
+        self.out_of_order_count += ooo
+
+    def median_delta(self) -> int | None:
+        """
+        Upper median of the positive deltas (element n // 2 in sorted order),
+        or None when there are none. Read off the histogram in O(distinct deltas).
+        """
+        n = sum(self.delta_counts.values())
+        if n == 0:
+            return None
+        rank = n // 2
+        for delta in sorted(self.delta_counts):
+            rank -= self.delta_counts[delta]
+            if rank < 0:
+                return delta
+        raise AssertionError("unreachable")
+
+    def largest_gaps(self) -> list[tuple[int, int]]:
+        """(seconds, ts_before_utc) of the largest gaps, largest first."""
+        return sorted(self.top_gaps, reverse=True)
+
+    def summary(self) -> dict[str, Any]:
+        """
+        JSON-ready summary, stored as imports.cadence_summary. Unless in_order,
+        unique_ts_count, median_delta_seconds, delta_counts and largest_gaps
+        are None: deltas against the latest timestamp are not the data's gaps.
+        """
+        in_order = self.in_order
+        return {
+            "row_count": self.row_count,
+            "in_order": in_order,
+            "unique_ts_count": self.unique_ts_count if in_order else None,
+            "duplicate_count": self.duplicate_count,
+            "out_of_order_count": self.out_of_order_count,
+            "first_ts_utc": self.first_ts_utc,
+            "last_ts_utc": self.last_ts_utc,
+            "median_delta_seconds": self.median_delta() if in_order else None,
+            "delta_counts": (
+                {str(d): c for d, c in sorted(self.delta_counts.items())} if in_order else None
+            ),
+            "largest_gaps": (
+                [{"seconds": d, "after_ts_utc": ts} for d, ts in self.largest_gaps()]
+                if in_order
+                else None
+            ),
+        }
+
+    @classmethod
+    def from_summary(cls, summary: dict[str, Any], *, top_n: int = DEFAULT_TOP_GAPS) -> CadenceAnalyzer:
+        """
+        Continue from a stored summary (e.g. when resuming a chunked import).
+        A summary written out of order has no deltas to continue, and the
+        result stays out of order.
+        """
+        gaps = [(g["seconds"], g["after_ts_utc"]) for g in summary["largest_gaps"] or ()][:top_n]
+        heapq.heapify(gaps)
+        return cls(
+            top_n=top_n,
+            row_count=summary["row_count"],
+            duplicate_count=summary["duplicate_count"],
+            out_of_order_count=summary["out_of_order_count"],
+            first_ts_utc=summary["first_ts_utc"],
+            last_ts_utc=summary["last_ts_utc"],
+            delta_counts=Counter({int(d): c for d, c in (summary["delta_counts"] or {}).items()}),
+            top_gaps=gaps,
+        )
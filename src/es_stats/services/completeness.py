@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from enum import StrEnum
 
 from es_stats.domain.missing_policy import MissingPolicy, WindowRole
+from es_stats.domain.windows import FULL_DAY_MASK, WindowSpec
 
 
 class CoverageExclusionReason(StrEnum):
@@ -59,3 +60,29 @@ def evaluate_window_coverage(
             else CoverageExclusionReason.MISSING_EXCEEDS_TOLERANCE
         ),
     )
+
+
+def evaluate_day_coverage(
+    *,
+    minute_mask: int,
+    window: WindowSpec,
+    role: WindowRole,
+    policy: MissingPolicy,
+    expected_mask: int = FULL_DAY_MASK,
+) -> CoverageResult:
+    """
+    Evaluate a window's 1m coverage on one trading date from the date's
+    minute-presence mask (see fetch_day_coverage) and, optionally, its
+    trading_calendar expected-minute mask (default: every minute expected).
+
+    Expected bars are the window's expected minutes and observed bars those
+    of them that have a bar, both popcounts; bars outside the session do not
+    make up for missing ones inside it.
+    """
+    expected = expected_mask & window.minute_mask
+    return evaluate_window_coverage(
+        observed_bar_count=(minute_mask & expected).bit_count(),
+        expected_bar_count=expected.bit_count(),
+        role=role,
+        policy=policy,
+    )
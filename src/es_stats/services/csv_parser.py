@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 import csv
-from dataclasses import dataclass
-from datetime import UTC, datetime
+import io
+import mmap
+import os
+import re
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from functools import lru_cache
+from itertools import chain, islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Iterable
+from typing import IO, Callable, Iterable, Iterator
 
-from es_stats.domain.bars import RawBar
+from es_stats.domain.bars import BarBatch, RawBar, timestamp_seconds
+from es_stats.domain.ticks import is_on_tick
+from es_stats.services.source_files import compression_of, open_source_text
 
 
 # Accept common header variants (lowercased/normalized via _norm)
@@ -18,6 +29,33 @@ _CLOSE_KEYS = ("close", "last", "c")
 _VOL_KEYS = ("volume", "vol", "v")
 _TRADES_KEYS = ("#_of_trades",)
 
+# Timestamp formats accepted by _parse_dt, in the order they are tried.
+_EPOCH_FORMAT = "epoch"
+_DT_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%Y%m%d %H:%M:%S",
+    "%Y%m%d %H:%M",
+)
+
+# Rows inspected to pick the per-file timestamp fast path.
+_SNIFF_ROWS = 100
+
+# Target size of the byte ranges handed to each worker when parsing in parallel.
+_PARALLEL_RANGE_BYTES = 4 * 1024 * 1024
+
+# A CR not followed by LF: old-Mac line endings, which raw newline splitting would miss.
+_BARE_CR = re.compile(rb"\r(?!\n)")
+
+# Bars per BarBatch yielded by CsvBarReader.iter_batches.
+DEFAULT_BATCH_SIZE = 50_000
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Largest epoch value datetime can represent (9999-12-31 23:59:59 UTC).
+_MAX_EPOCH_SECONDS = 253_402_300_799
+
 
 @dataclass(frozen=True)
 class CsvIssue:
@@ -27,10 +65,16 @@ class CsvIssue:
 
 @dataclass(frozen=True)
 class CsvParseResult:
-    bars: list[RawBar]
+    bars: BarBatch
     row_count_read: int
     row_count_rejected: int
     issues: list[CsvIssue]
+    # Timestamp format picked for the fast path (None if nothing matched the sample).
+    dt_format: str | None = None
+    # Rows parsed per timestamp format ("epoch" or a strptime format).
+    dt_format_counts: dict[str, int] = field(default_factory=dict)
+    # Rows that missed the fast path and went through the full format list.
+    dt_fallback_count: int = 0
 
 
 class CsvValidationError(ValueError):
@@ -72,35 +116,125 @@ def _find_col(fieldnames: Iterable[str], candidates: tuple[str, ...]) -> str | N
     return None
 
 
-def _parse_dt(value: str) -> datetime:
+def _parse_dt_with_format(value: str) -> tuple[datetime, str]:
     v = value.strip()
 
     # Epoch seconds (string of digits)
     if v.isdigit():
-        return datetime.fromtimestamp(int(v), tz=UTC)
-
-    fmts = (
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M",
-        "%m/%d/%Y %H:%M:%S",
-        "%m/%d/%Y %H:%M",
-        "%Y%m%d %H:%M:%S",
-        "%Y%m%d %H:%M",
-    )
-    for fmt in fmts:
+        return datetime.fromtimestamp(int(v), tz=UTC), _EPOCH_FORMAT
+
+    for fmt in _DT_FORMATS:
         try:
-            return datetime.strptime(v, fmt)
+            return datetime.strptime(v, fmt), fmt
         except ValueError:
             pass
 
     raise ValueError(f"Unrecognized datetime format: {value!r}")
 
 
-def _req(row: dict, col: str, label: str) -> str:
+def _parse_dt(value: str) -> datetime:
+    return _parse_dt_with_format(value)[0]
+
+
+@lru_cache(maxsize=4096)
+def _day_number(yyyymmdd: str) -> int | None:
+    """Days since 1970-01-01 for 'YYYYMMDD' digits; None if not a valid date."""
+    try:
+        d = date(int(yyyymmdd[0:4]), int(yyyymmdd[4:6]), int(yyyymmdd[6:8]))
+    except ValueError:
+        return None
+    return d.toordinal() - _EPOCH_ORDINAL
+
+
+def _wall_from_digits(d: str) -> int | None:
+    """Wall-clock seconds since the naive epoch from 'YYYYMMDDHHMM[SS]' ASCII digits."""
+    if not (d.isascii() and d.isdigit()):
+        return None
+    day = _day_number(d[0:8])
+    hour, minute = int(d[8:10]), int(d[10:12])
+    second = int(d[12:14]) if len(d) == 14 else 0
+    if day is None or hour > 23 or minute > 59 or second > 59:
+        return None
+    return day * 86_400 + hour * 3600 + minute * 60 + second
+
+
+# Fast paths: fixed-width, zero-padded layouts only, returning whole seconds
+# (UTC epoch seconds for "epoch", naive-epoch wall seconds otherwise; see
+# BarBatch). Anything else returns None and is re-parsed with the full format
+# list, so results always match _parse_dt.
+def _fast_epoch(v: str) -> int | None:
+    if not (v.isascii() and v.isdigit()):
+        return None
+    n = int(v)
+    return n if n <= _MAX_EPOCH_SECONDS else None
+
+
+def _fast_iso_seconds(v: str) -> int | None:  # %Y-%m-%d %H:%M:%S
+    if len(v) != 19 or v[4] != "-" or v[7] != "-" or v[10] != " " or v[13] != ":" or v[16] != ":":
+        return None
+    return _wall_from_digits(v[0:4] + v[5:7] + v[8:10] + v[11:13] + v[14:16] + v[17:19])
+
+
+def _fast_iso_minutes(v: str) -> int | None:  # %Y-%m-%d %H:%M
+    if len(v) != 16 or v[4] != "-" or v[7] != "-" or v[10] != " " or v[13] != ":":
+        return None
+    return _wall_from_digits(v[0:4] + v[5:7] + v[8:10] + v[11:13] + v[14:16])
+
+
+def _fast_us_seconds(v: str) -> int | None:  # %m/%d/%Y %H:%M:%S
+    if len(v) != 19 or v[2] != "/" or v[5] != "/" or v[10] != " " or v[13] != ":" or v[16] != ":":
+        return None
+    return _wall_from_digits(v[6:10] + v[0:2] + v[3:5] + v[11:13] + v[14:16] + v[17:19])
+
+
+def _fast_us_minutes(v: str) -> int | None:  # %m/%d/%Y %H:%M
+    if len(v) != 16 or v[2] != "/" or v[5] != "/" or v[10] != " " or v[13] != ":":
+        return None
+    return _wall_from_digits(v[6:10] + v[0:2] + v[3:5] + v[11:13] + v[14:16])
+
+
+def _fast_compact_seconds(v: str) -> int | None:  # %Y%m%d %H:%M:%S
+    if len(v) != 17 or v[8] != " " or v[11] != ":" or v[14] != ":":
+        return None
+    return _wall_from_digits(v[0:8] + v[9:11] + v[12:14] + v[15:17])
+
+
+def _fast_compact_minutes(v: str) -> int | None:  # %Y%m%d %H:%M
+    if len(v) != 14 or v[8] != " " or v[11] != ":":
+        return None
+    return _wall_from_digits(v[0:8] + v[9:11] + v[12:14])
+
+
+_FAST_DT_PARSERS: dict[str, Callable[[str], int | None]] = {
+    _EPOCH_FORMAT: _fast_epoch,
+    "%Y-%m-%d %H:%M:%S": _fast_iso_seconds,
+    "%Y-%m-%d %H:%M": _fast_iso_minutes,
+    "%m/%d/%Y %H:%M:%S": _fast_us_seconds,
+    "%m/%d/%Y %H:%M": _fast_us_minutes,
+    "%Y%m%d %H:%M:%S": _fast_compact_seconds,
+    "%Y%m%d %H:%M": _fast_compact_minutes,
+}
+
+
+def _sniff_dt_format(samples: Iterable[str]) -> str | None:
+    """
+    Pick the timestamp format whose fast path matches the most sample values
+    (ties go to the earlier format in _parse_dt order). None if nothing matches.
+    """
+    values = [v.strip() for v in samples]
+    best, best_hits = None, 0
+    for fmt, fast in _FAST_DT_PARSERS.items():
+        hits = sum(1 for v in values if fast(v) is not None)
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+    return best
+
+
+def _req(values: list[str], idx: int, label: str) -> str:
     """
     Require a non-empty value; raise ValueError for row-level rejection.
     """
-    val = row.get(col)
+    val = values[idx] if idx < len(values) else None
     if val is None:
         raise ValueError(f"missing {label}")
     s = str(val).strip()
@@ -109,9 +243,437 @@ def _req(row: dict, col: str, label: str) -> str:
     return s
 
 
-def read_bars_csv(path: Path) -> CsvParseResult:
+@dataclass(frozen=True)
+class _Columns:
+    """Record positions of the required columns (resolved once from the header)."""
+
+    ts: int
+    open: int
+    high: int
+    low: int
+    close: int
+    volume: int
+    trades: int
+    # Picks all seven values in field order with a single call (IndexError on short rows).
+    take: Callable[[list[str]], tuple[str, ...]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "take", itemgetter(*self.indexes))
+
+    @property
+    def indexes(self) -> tuple[int, ...]:
+        return (self.ts, self.open, self.high, self.low, self.close, self.volume, self.trades)
+
+
+# Row-level labels for _Columns fields, in field order.
+_FIELD_LABELS = ("timestamp", "open", "high", "low", "close/last", "volume", "trades_count")
+
+
+def resolve_bar_columns(fieldnames: list[str] | None) -> tuple[str, ...]:
+    """
+    Source column names for (timestamp, open, high, low, close, volume, trades),
+    matched via the header synonyms. Raises CsvValidationError if any are missing.
+    """
+    if not fieldnames:
+        raise CsvValidationError(
+            [CsvIssue(line=1, message="Missing header row (no fieldnames found).")]
+        )
+
+    labels = (
+        ("datetime/timestamp", _TS_KEYS),
+        ("open", _OPEN_KEYS),
+        ("high", _HIGH_KEYS),
+        ("low", _LOW_KEYS),
+        ("close/last", _CLOSE_KEYS),
+        ("volume", _VOL_KEYS),
+        ("trades_count", _TRADES_KEYS),
+    )
+    found = [(label, _find_col(fieldnames, keys)) for label, keys in labels]
+
+    # Fatal: missing required columns
+    missing = [label for label, col in found if col is None]
+    if missing:
+        raise CsvValidationError(
+            [CsvIssue(line=1, message=f"Missing required columns: {', '.join(missing)}")]
+        )
+
+    return tuple(col for _, col in found)
+
+
+def _resolve_columns(fieldnames: list[str] | None) -> _Columns:
+    """Map header names to record positions; raise CsvValidationError if any are missing."""
+    names = resolve_bar_columns(fieldnames)
+    # Duplicate header names resolve to the last occurrence (csv.DictReader semantics).
+    last_index = {name: i for i, name in enumerate(fieldnames)}
+    return _Columns(*(last_index[col] for col in names))
+
+
+def _no_fast_path(value: str) -> None:
+    return None
+
+
+class TimestampParser:
+    """
+    Timestamp parsing for one source file.
+
+    Tries the sniffed layout's fast path first and falls back to the full
+    format list (same results as _parse_dt). Tracks accepted rows per format
+    (recorded by the caller via accept) and how many values needed the fallback.
+    """
+
+    def __init__(self, dt_format: str | None = None):
+        self.dt_format = dt_format
+        self.format_counts: Counter[str] = Counter()
+        self.fallback_count = 0
+        self._fast = _FAST_DT_PARSERS.get(dt_format, _no_fast_path)
+
+    @classmethod
+    def sniff(cls, samples: Iterable[str]) -> TimestampParser:
+        return cls(_sniff_dt_format(samples))
+
+    def parse(self, raw: str) -> tuple[int, bool, str]:
+        """(seconds, is_utc, format) for a stripped value; see BarBatch for the encoding."""
+        ts = self._fast(raw)
+        if ts is not None:
+            return ts, self.dt_format == _EPOCH_FORMAT, self.dt_format
+        self.fallback_count += 1
+        dt, dt_format = _parse_dt_with_format(raw)
+        ts, is_utc = timestamp_seconds(dt)
+        return ts, is_utc, dt_format
+
+    def accept(self, dt_format: str, n: int = 1) -> None:
+        self.format_counts[dt_format] += n
+
+    def merge(self, other: TimestampParser) -> None:
+        self.format_counts.update(other.format_counts)
+        self.fallback_count += other.fallback_count
+
+
+def _parse_record(
+    values: list[str],
+    cols: _Columns,
+    ts_parser: TimestampParser,
+    out: BarBatch,
+    tick_size: float | None = None,
+) -> None:
+    """
+    Validate one CSV record and append it to `out`, updating `ts_parser` counters.
+    With a tick_size, prices must also be whole multiples of it.
+
+    Raises ValueError (or a parse error) for row-level rejection; nothing is
+    appended in that case.
+    """
+    try:
+        raw = [v.strip() for v in cols.take(values)]
+    except IndexError:
+        raw = []
+    if len(raw) != len(_FIELD_LABELS) or not all(raw):
+        # Slow path only to report the first missing field.
+        raw = [_req(values, idx, label) for idx, label in zip(cols.indexes, _FIELD_LABELS)]
+    dt_raw, o_raw, h_raw, l_raw, c_raw, v_raw, t_raw = raw
+
+    ts, is_utc, dt_format = ts_parser.parse(dt_raw)
+    o = float(o_raw)
+    h = float(h_raw)
+    l = float(l_raw)
+    c = float(c_raw)
+    v = int(float(v_raw))  # handle "100.0"
+    t = int(float(t_raw))  # handle "10.0"
+
+    if v < 0:
+        raise ValueError("volume must be >= 0")
+    if t < 0:
+        raise ValueError("trades_count must be >= 0")
+    if h < l:
+        raise ValueError("high must be >= low")
+    if tick_size is not None:
+        _check_ticks((o, h, l, c), tick_size)
+
+    ts_parser.accept(dt_format)
+    out.append(ts, is_utc, o, h, l, c, v, t)
+
+
+def _check_ticks(prices: tuple[float, ...], tick_size: float) -> None:
+    for label, p in zip(_FIELD_LABELS[1:5], prices):
+        if not is_on_tick(p, tick_size):
+            raise ValueError(f"{label} {p!r} is not a multiple of tick size {tick_size!r}")
+
+
+def _records(f: IO[str]) -> Iterator[list[str]]:
+    """CSV records, skipping blank lines (as csv.DictReader does)."""
+    return (r for r in csv.reader(f) if r)
+
+
+@dataclass(frozen=True)
+class _RangeResult:
+    """Parse output for one byte range (record indexes are local to the range)."""
+
+    bars: BarBatch
+    record_count: int
+    issues: list[tuple[int, str]]
+    ts_parser: TimestampParser
+
+
+def _parse_range(
+    path: str,
+    start: int,
+    end: int,
+    cols: _Columns,
+    dt_format: str | None,
+    tick_size: float | None,
+) -> _RangeResult:
+    """Process-pool worker: parse the records in bytes [start, end) of the file."""
+    with open(path, "rb") as fb:
+        fb.seek(start)
+        data = fb.read(end - start)
+
+    ts_parser = TimestampParser(dt_format)
+    bars = BarBatch()
+    issues: list[tuple[int, str]] = []
+    record_count = 0
+    text = io.TextIOWrapper(io.BytesIO(data), encoding="locale", newline="")
+    for record_count, values in enumerate(_records(text), start=1):
+        try:
+            _parse_record(values, cols, ts_parser, bars, tick_size)
+        except Exception as e:
+            issues.append((record_count, str(e)))
+
+    return _RangeResult(
+        bars=bars,
+        record_count=record_count,
+        issues=issues,
+        ts_parser=ts_parser,
+    )
+
+
+def _split_ranges(path: Path, start: int, target_bytes: int) -> list[tuple[int, int]]:
+    """Split bytes [start, EOF) into ranges of ~target_bytes that end on a newline."""
+    ranges: list[tuple[int, int]] = []
+    with path.open("rb") as fb:
+        size = os.fstat(fb.fileno()).st_size
+        pos = start
+        while pos < size:
+            end = min(pos + target_bytes, size)
+            if end < size:
+                fb.seek(end)
+                fb.readline()
+                end = fb.tell()
+            ranges.append((pos, end))
+            pos = end
+    return ranges
+
+
+def _skip_records(fb: IO[bytes], n: int) -> None:
+    """Advance past n records of an unquoted file (blank lines are not records)."""
+    while n > 0:
+        line = fb.readline()
+        if not line:
+            return
+        if line not in (b"\n", b"\r\n"):
+            n -= 1
+
+
+def _splittable(path: Path) -> bool:
+    """
+    Whether records can be split on raw newlines: an uncompressed file with no
+    quote characters (which could hide embedded newlines) and no bare
+    carriage-return line endings.
+    """
+    if compression_of(path) is not None:
+        return False
+    with path.open("rb") as fb:
+        if os.fstat(fb.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(fb.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(b'"') == -1 and _BARE_CR.search(mm) is None
+
+
+class CsvBarReader:
+    """
+    Stream validated bars from a CSV file as columnar BarBatch blocks.
+
+    iter_batches() yields accepted bars in file order, at most batch_size per
+    block; iterating the reader itself yields RawBar views of the same rows.
+    Counters and issues are filled in as rows are consumed, so they are final
+    once iteration completes. Fatal problems (missing header/columns, no valid
+    rows at all) raise CsvValidationError from the iterator.
+
+    With workers > 1 the file is split into newline-aligned byte ranges that
+    are parsed in a process pool and merged back in file order; line numbers
+    and counters are identical to the single-process result. Files that
+    cannot be split safely on newlines (compressed input, quoted fields, bare
+    CR line endings) are parsed in-process.
+
+    Compressed files (.csv.gz/.bz2/.xz/.zst) are decompressed while streaming.
+
+    With a tick_size, rows with any price that is not a whole multiple of it
+    are rejected (bars store prices as integer ticks of the instrument).
+
+    skip_rows resumes after that many data records (see --resume): they are
+    not parsed or counted, line numbers stay absolute, and running out of
+    rows after the skip is not fatal. rows_flushed is the number of records
+    whose accepted bars have all been yielded; the counters describe exactly
+    those records whenever rows_flushed == row_count_read.
+
+    Rules are the same as read_bars_csv (see there).
     """
-    Parse and validate a CSV file into RawBar rows (in-memory only).
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        workers: int = 1,
+        skip_rows: int = 0,
+        tick_size: float | None = None,
+    ):
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers!r}")
+        if skip_rows < 0:
+            raise ValueError(f"skip_rows must be >= 0, got {skip_rows!r}")
+        self.path = path
+        self.workers = workers
+        self.skip_rows = skip_rows
+        self.tick_size = tick_size
+        self.row_count_read = 0
+        self.row_count_rejected = 0
+        self.row_count_accepted = 0
+        self.rows_flushed = 0
+        self.issues: list[CsvIssue] = []
+        self._ts_parser = TimestampParser()
+
+    @property
+    def dt_format(self) -> str | None:
+        """Timestamp layout sniffed for the fast path (None if nothing matched)."""
+        return self._ts_parser.dt_format
+
+    @property
+    def dt_format_counts(self) -> Counter[str]:
+        """Accepted rows per timestamp format."""
+        return self._ts_parser.format_counts
+
+    @property
+    def dt_fallback_count(self) -> int:
+        """Rows whose timestamp missed the sniffed fast path."""
+        return self._ts_parser.fallback_count
+
+    def __iter__(self) -> Iterator[RawBar]:
+        for batch in self.iter_batches():
+            yield from batch
+
+    def iter_batches(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[BarBatch]:
+        if batch_size <= 0:
+            raise ValueError(f"batch size must be > 0, got {batch_size!r}")
+
+        if self.workers > 1 and _splittable(self.path):
+            yield from self._iter_parallel(batch_size)
+        else:
+            yield from self._iter_serial(batch_size)
+
+        # If we parsed nothing usable, treat as fatal (a resumed import already has rows).
+        if self.row_count_accepted == 0 and self.skip_rows == 0:
+            raise CsvValidationError(
+                self.issues
+                or [CsvIssue(line=1, message="No valid data rows parsed (all rows rejected).")]
+            )
+
+    def _sniff(self, head: list[list[str]], cols: _Columns) -> None:
+        # Detect the timestamp layout once from the first rows; every row then
+        # tries that fast path first and only falls back to the full format list
+        # when it does not match.
+        self._ts_parser = TimestampParser.sniff(
+            r[cols.ts] if cols.ts < len(r) else "" for r in head
+        )
+
+    def _iter_serial(self, batch_size: int) -> Iterator[BarBatch]:
+        with open_source_text(self.path) as f:
+            reader = csv.reader(f)
+            cols = _resolve_columns(next(reader, None))
+            records = (r for r in reader if r)
+
+            head = list(islice(records, _SNIFF_ROWS))
+            self._sniff(head, cols)
+
+            batch = BarBatch()
+            # line numbers: header is line 1
+            rows = islice(chain(head, records), self.skip_rows, None)
+            for idx, values in enumerate(rows, start=2 + self.skip_rows):
+                self.row_count_read += 1
+                try:
+                    _parse_record(values, cols, self._ts_parser, batch, self.tick_size)
+                except Exception as e:
+                    self.row_count_rejected += 1
+                    self.issues.append(CsvIssue(line=idx, message=str(e)))
+                    continue
+
+                self.row_count_accepted += 1
+                if len(batch) == batch_size:
+                    self.rows_flushed = self.row_count_read
+                    yield batch
+                    batch = BarBatch()
+            self.rows_flushed = self.row_count_read
+            if len(batch):
+                yield batch
+
+    def _iter_parallel(self, batch_size: int) -> Iterator[BarBatch]:
+        with open_source_text(self.path) as f:
+            reader = csv.reader(f)
+            cols = _resolve_columns(next(reader, None))
+            self._sniff(list(islice((r for r in reader if r), _SNIFF_ROWS)), cols)
+
+        # Without quotes a record never spans lines, so data starts after the first line.
+        with self.path.open("rb") as fb:
+            fb.readline()
+            _skip_records(fb, self.skip_rows)
+            data_start = fb.tell()
+
+        ranges = iter(_split_ranges(self.path, data_start, _PARALLEL_RANGE_BYTES))
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            # Keep a bounded number of ranges in flight; results are consumed in file order.
+            pending = deque(
+                pool.submit(
+                    _parse_range, str(self.path), a, b, cols, self.dt_format, self.tick_size
+                )
+                for a, b in islice(ranges, 2 * self.workers)
+            )
+            records_before = self.skip_rows
+            while pending:
+                result: _RangeResult = pending.popleft().result()
+                nxt = next(ranges, None)
+                if nxt is not None:
+                    pending.append(
+                        pool.submit(
+                            _parse_range,
+                            str(self.path),
+                            *nxt,
+                            cols,
+                            self.dt_format,
+                            self.tick_size,
+                        )
+                    )
+
+                self.row_count_read += result.record_count
+                self.row_count_rejected += len(result.issues)
+                self.row_count_accepted += len(result.bars)
+                self._ts_parser.merge(result.ts_parser)
+                # line numbers: header is line 1
+                self.issues.extend(
+                    CsvIssue(line=1 + records_before + i, message=msg)
+                    for i, msg in result.issues
+                )
+                records_before += result.record_count
+                for start in range(0, len(result.bars), batch_size):
+                    if start + batch_size >= len(result.bars):
+                        self.rows_flushed = self.row_count_read
+                    yield result.bars.slice(start, start + batch_size)
+                self.rows_flushed = self.row_count_read
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def read_bars_csv(path: Path, *, workers: int = 1) -> CsvParseResult:
+    """
+    Parse and validate a CSV file into a BarBatch (in-memory only).
 
     Requirements (v1):
     - Must contain datetime/timestamp + O/H/L/(C or Last)/V + Trades columns
@@ -125,102 +687,23 @@ def read_bars_csv(path: Path) -> CsvParseResult:
     Returns:
       CsvParseResult with bars + read/rejected counts + issues list.
       Row-level issues are NOT fatal unless all rows are rejected.
-    """
-    issues: list[CsvIssue] = []
-    bars: list[RawBar] = []
-    row_count_read = 0
-    row_count_rejected = 0
-
-    with path.open("r", newline="") as f:
-        reader = csv.DictReader(f)
-        if not reader.fieldnames:
-            raise CsvValidationError(
-                [CsvIssue(line=1, message="Missing header row (no fieldnames found).")]
-            )
-
-        ts_col = _find_col(reader.fieldnames, _TS_KEYS)
-        o_col = _find_col(reader.fieldnames, _OPEN_KEYS)
-        h_col = _find_col(reader.fieldnames, _HIGH_KEYS)
-        l_col = _find_col(reader.fieldnames, _LOW_KEYS)
-        c_col = _find_col(reader.fieldnames, _CLOSE_KEYS)
-        v_col = _find_col(reader.fieldnames, _VOL_KEYS)
-        t_col = _find_col(reader.fieldnames, _TRADES_KEYS)
-
-        missing = []
-        if ts_col is None:
-            missing.append("datetime/timestamp")
-        if o_col is None:
-            missing.append("open")
-        if h_col is None:
-            missing.append("high")
-        if l_col is None:
-            missing.append("low")
-        if c_col is None:
-            missing.append("close/last")
-        if v_col is None:
-            missing.append("volume")
-        if t_col is None:
-            missing.append("trades_count")
-
-        # Fatal: missing required columns
-        if missing:
-            raise CsvValidationError(
-                [CsvIssue(line=1, message=f"Missing required columns: {
-                          ', '.join(missing)}")]
-            )
 
-        # line numbers: header is line 1
-        for idx, row in enumerate(reader, start=2):
-            row_count_read += 1
-            try:
-                dt_raw = _req(row, ts_col, "timestamp")
-                o_raw = _req(row, o_col, "open")
-                h_raw = _req(row, h_col, "high")
-                l_raw = _req(row, l_col, "low")
-                c_raw = _req(row, c_col, "close/last")
-                v_raw = _req(row, v_col, "volume")
-                t_raw = _req(row, t_col, "trades_count")
-
-                dt = _parse_dt(dt_raw)
-                o = float(o_raw)
-                h = float(h_raw)
-                l = float(l_raw)
-                c = float(c_raw)
-                v = int(float(v_raw))  # handle "100.0"
-                t = int(float(t_raw))  # handle "10.0"
-
-                if v < 0:
-                    raise ValueError("volume must be >= 0")
-                if t < 0:
-                    raise ValueError("trades_count must be >= 0")
-                if h < l:
-                    raise ValueError("high must be >= low")
-
-                bars.append(
-                    RawBar(
-                        dt=dt,
-                        open=o,
-                        high=h,
-                        low=l,
-                        close=c,
-                        volume=v,
-                        trades_count=t,
-                    )
-                )
-            except Exception as e:
-                row_count_rejected += 1
-                issues.append(CsvIssue(line=idx, message=str(e)))
-
-    # If we parsed nothing usable, treat as fatal.
-    if not bars:
-        raise CsvValidationError(
-            issues
-            or [CsvIssue(line=1, message="No valid data rows parsed (all rows rejected).")]
-        )
+    .gz/.bz2/.xz (and .zst when available) files are decompressed while
+    streaming. workers > 1 parses newline-aligned byte ranges in a process
+    pool (see CsvBarReader). Use CsvBarReader.iter_batches to stream bars without
+    materialising the file.
+    """
+    reader = CsvBarReader(path, workers=workers)
+    bars = BarBatch()
+    for batch in reader.iter_batches():
+        bars.extend(batch)
 
     return CsvParseResult(
         bars=bars,
-        row_count_read=row_count_read,
-        row_count_rejected=row_count_rejected,
-        issues=issues,
+        row_count_read=reader.row_count_read,
+        row_count_rejected=reader.row_count_rejected,
+        issues=reader.issues,
+        dt_format=reader.dt_format,
+        dt_format_counts=dict(reader.dt_format_counts),
+        dt_fallback_count=reader.dt_fallback_count,
     )
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import islice, repeat
+from pathlib import Path
+from typing import Iterable, Iterator, TypeVar
+
+from es_stats.domain.bars import BarBatch
+from es_stats.services.arrow_reader import ArrowBarReader
+from es_stats.services.cadence import CadenceAnalyzer
+from es_stats.services.csv_parser import CsvBarReader
+from es_stats.services.source_files import SourceFormat
+from es_stats.services.time_fields import TimeFieldsBatch, compute_time_fields_for_bars
+
+T = TypeVar("T")
+
+# Rows parsed and staged per batch; bounds peak memory of the import.
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Rows merged per transaction by chunked (resumable) imports unless given.
+DEFAULT_COMMIT_EVERY = 500_000
+
+
+@dataclass
+class ImportBounds:
+    """
+    Running counts and bounds over the rows that flow through an import.
+
+    Updated row by row so nothing needs to be materialised to report
+    ts_min/ts_max and the trading-date range at the end.
+    """
+
+    row_count: int = 0
+    ts_min_utc: int | None = None
+    ts_max_utc: int | None = None
+    td_min: int | None = None
+    td_max: int | None = None
+
+    def observe(self, batch: TimeFieldsBatch) -> None:
+        if len(batch) == 0:
+            return
+        self.row_count += len(batch)
+        self.ts_min_utc = _min(self.ts_min_utc, min(batch.ts_start_utc))
+        self.ts_max_utc = _max(self.ts_max_utc, max(batch.ts_start_utc))
+        self.td_min = _min(self.td_min, min(batch.trading_date_ct_int))
+        self.td_max = _max(self.td_max, max(batch.trading_date_ct_int))
+
+
+def _min(current: int | None, value: int) -> int:
+    return value if current is None else min(current, value)
+
+
+def _max(current: int | None, value: int) -> int:
+    return value if current is None else max(current, value)
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Yield consecutive lists of at most `size` items."""
+    if size <= 0:
+        raise ValueError(f"chunk size must be > 0, got {size!r}")
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def open_bar_reader(
+    path: Path,
+    *,
+    fmt: SourceFormat,
+    workers: int = 1,
+    skip_rows: int = 0,
+    tick_size: float | None = None,
+) -> CsvBarReader | ArrowBarReader:
+    """
+    Bar reader for a source file in the given format.
+
+    Both readers apply the same column synonyms and row validation and expose
+    the same counters and iter_batches(); `workers` only applies to CSV.
+    `skip_rows` starts after that many data rows (resuming a chunked import);
+    with a `tick_size`, rows with off-tick prices are rejected.
+    """
+    if fmt == "csv":
+        return CsvBarReader(path, workers=workers, skip_rows=skip_rows, tick_size=tick_size)
+    if fmt in ("parquet", "arrow"):
+        return ArrowBarReader(path, fmt=fmt, skip_rows=skip_rows, tick_size=tick_size)
+    raise ValueError(f"format must be 'csv', 'parquet' or 'arrow', got: {fmt!r}")
+
+
+def iter_bars_1m_chunks(
+    batches: Iterable[BarBatch],
+    *,
+    input_timezone: str,
+    instrument_id: int,
+    import_id: int,
+    bounds: ImportBounds,
+    cadence: CadenceAnalyzer | None = None,
+) -> Iterator[Iterator[tuple]]:
+    """
+    Turn a stream of parsed BarBatch blocks into chunks of bars_1m rows.
+
+    Each chunk is a lazy iterator of tuples in BARS_1M_COLUMNS order, zipped
+    straight from the batch columns and its time-derived fields (computed for
+    the whole batch at once, see compute_time_fields_for_bars), so no per-row
+    objects are built before staging. Chunk size follows the batch size;
+    `bounds` (and `cadence`, if given) are updated as batches are consumed.
+    """
+    for bars in batches:
+        t = compute_time_fields_for_bars(bars, input_timezone)
+        bounds.observe(t)
+        if cadence is not None:
+            cadence.observe(t.ts_start_utc)
+        n = len(bars)
+        yield zip(
+            repeat(instrument_id, n),
+            t.ts_start_utc,
+            t.trading_date_ct_int,
+            t.ct_minute_of_day,
+            bars.open,
+            bars.high,
+            bars.low,
+            bars.close,
+            bars.volume,
+            bars.trades_count,
+            repeat(import_id, n),
+        )
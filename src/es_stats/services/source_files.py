@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import hashlib
+import io
+import lzma
+from pathlib import Path
+from typing import IO, Callable, Literal
+
+try:  # Python 3.14+ ships zstd in the stdlib
+    from compression import zstd as _zstd_stdlib
+except ImportError:
+    _zstd_stdlib = None
+
+try:  # optional dependency: pip install 'es-stats[zstd]'
+    import zstandard as _zstandard
+except ImportError:
+    _zstandard = None
+
+ZSTD_MISSING_HINT = (
+    "zstd support needs Python 3.14+ or the optional 'zstandard' package "
+    "(pip install 'es-stats[zstd]')."
+)
+
+SourceFormat = Literal["csv", "parquet", "arrow"]
+
+# Data suffix -> source format (see source_format).
+_FORMAT_SUFFIXES: dict[str, SourceFormat] = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+# Bytes per read when hashing a source stream.
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _open_zstd(path: Path) -> IO[bytes]:
+    if _zstd_stdlib is not None:
+        return _zstd_stdlib.open(path, "rb")
+    if _zstandard is not None:
+        return _zstandard.open(path, "rb")
+    raise ValueError(f"Cannot read {path.name!r}: {ZSTD_MISSING_HINT}")
+
+
+# Compression suffix -> opener returning a decompressing binary stream.
+_DECOMPRESSORS: dict[str, Callable[[Path], IO[bytes]]] = {
+    ".gz": lambda p: gzip.open(p, "rb"),
+    ".bz2": lambda p: bz2.open(p, "rb"),
+    ".xz": lambda p: lzma.open(p, "rb"),
+    ".zst": _open_zstd,
+}
+
+
+def zstd_available() -> bool:
+    return _zstd_stdlib is not None or _zstandard is not None
+
+
+def compression_of(path: Path) -> str | None:
+    """Compression suffix of a source file ('.gz', '.bz2', '.xz', '.zst'), or None."""
+    suffix = path.suffix.lower()
+    return suffix if suffix in _DECOMPRESSORS else None
+
+
+def data_suffix(path: Path) -> str:
+    """Suffix of the decompressed content, e.g. '.csv' for both bars.csv and bars.csv.gz."""
+    if compression_of(path) is not None:
+        path = path.with_suffix("")
+    return path.suffix.lower()
+
+
+def source_format(path: Path) -> SourceFormat | None:
+    """Format implied by a source file's suffix ('csv', 'parquet', 'arrow'), or None."""
+    return _FORMAT_SUFFIXES.get(data_suffix(path))
+
+
+def open_source_binary(path: Path) -> IO[bytes]:
+    """Open a source file for reading, decompressing on the fly when it is compressed."""
+    opener = _DECOMPRESSORS.get(compression_of(path) or "")
+    return opener(path) if opener is not None else path.open("rb")
+
+
+def open_source_text(path: Path) -> IO[str]:
+    """Text stream over the (decompressed) source, as csv expects it (newline='')."""
+    if compression_of(path) is None:
+        return path.open("r", newline="")
+    return io.TextIOWrapper(open_source_binary(path), encoding="locale", newline="")
+
+
+def source_sha256(path: Path) -> str:
+    """
+    Hex SHA-256 of a source file's content, streamed in fixed-size blocks.
+
+    Compressed files are hashed after decompression, so the same data hashes
+    the same whether it arrives as .csv or .csv.gz. Stored as
+    imports.source_hash to recognise re-sent files.
+    """
+    h = hashlib.sha256()
+    with open_source_binary(path) as f:
+        while block := f.read(_HASH_BLOCK_SIZE):
+            h.update(block)
+    return h.hexdigest()
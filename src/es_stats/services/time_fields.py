@@ -1,11 +1,25 @@
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
+from functools import lru_cache
+from typing import Sequence
 from zoneinfo import ZoneInfo
 
+from es_stats.domain.bars import BarBatch
+
 CT_TZ = ZoneInfo("America/Chicago")
 
+_SECONDS_PER_DAY = 86_400
+_ROLLOVER_SECOND_OF_DAY = 17 * 3600
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+# Probe step used to locate UTC-offset transitions; transitions closer together
+# than this (none in the IANA data for modern years) would be missed.
+_TRANSITION_PROBE_SECONDS = 6 * 3600
+
 
 @dataclass(frozen=True)
 class TimeFields:
@@ -80,3 +94,226 @@ def compute_time_fields(dt: datetime, input_timezone: str) -> TimeFields:
         trading_date_ct_int=trading_date_ct_int,
         ct_minute_of_day=ct_minute_of_day,
     )
+
+
+@dataclass(frozen=True)
+class TimeFieldsBatch:
+    """
+    Column-oriented TimeFields for many bars (parallel arrays, same order as the input).
+    """
+
+    ts_start_utc: array
+    trading_date_ct_int: array
+    ct_minute_of_day: array
+
+    def __len__(self) -> int:
+        return len(self.ts_start_utc)
+
+    def __getitem__(self, i: int) -> TimeFields:
+        return TimeFields(
+            ts_start_utc=self.ts_start_utc[i],
+            trading_date_ct_int=self.trading_date_ct_int[i],
+            ct_minute_of_day=self.ct_minute_of_day[i],
+        )
+
+
+@dataclass(frozen=True)
+class _OffsetTable:
+    """
+    UTC-offset transition table for one zone over a span of years.
+
+    Interval i covers UTC seconds [starts_utc[i], starts_utc[i + 1]) with offset
+    offsets[i]. local_starts/local_ends are the same intervals seen on the local
+    wall clock (as seconds since the naive epoch).
+    """
+
+    starts_utc: list[int]
+    offsets: list[int]
+    local_starts: list[int]
+    local_ends: list[int]
+
+
+def _utcoffset_seconds(tz: ZoneInfo, ts: int) -> int:
+    return int(datetime.fromtimestamp(ts, tz).utcoffset().total_seconds())
+
+
+@lru_cache(maxsize=None)
+def _year_transitions(tz_key: str, year: int) -> tuple[tuple[int, int], ...]:
+    """(utc_second, new_offset) for every offset change during a UTC calendar year."""
+    tz = ZoneInfo(tz_key)
+    lo = int(datetime(year, 1, 1, tzinfo=UTC).timestamp())
+    hi = int(datetime(year + 1, 1, 1, tzinfo=UTC).timestamp())
+
+    out: list[tuple[int, int]] = []
+    prev_ts, prev_off = lo, _utcoffset_seconds(tz, lo)
+    ts = lo
+    while ts < hi:
+        ts = min(ts + _TRANSITION_PROBE_SECONDS, hi)
+        off = _utcoffset_seconds(tz, ts)
+        if off != prev_off:
+            # Bisect to the first second with the new offset.
+            a, b = prev_ts, ts
+            while b - a > 1:
+                mid = (a + b) // 2
+                if _utcoffset_seconds(tz, mid) == prev_off:
+                    a = mid
+                else:
+                    b = mid
+            out.append((b, off))
+        prev_ts, prev_off = ts, off
+    return tuple(out)
+
+
+@lru_cache(maxsize=64)
+def _offset_table(tz_key: str, year_min: int, year_max: int) -> _OffsetTable:
+    tz = ZoneInfo(tz_key)
+    first = int(datetime(year_min, 1, 1, tzinfo=UTC).timestamp())
+
+    starts_utc = [first]
+    offsets = [_utcoffset_seconds(tz, first)]
+    for year in range(year_min, year_max + 1):
+        for ts, off in _year_transitions(tz_key, year):
+            starts_utc.append(ts)
+            offsets.append(off)
+
+    n = len(starts_utc)
+    local_starts = [starts_utc[i] + offsets[i] for i in range(n)]
+    local_ends = [starts_utc[i + 1] + offsets[i] for i in range(n - 1)]
+    local_ends.append(2**63)
+    # Values before the table start use the first offset.
+    local_starts[0] = -(2**63)
+    starts_utc[0] = -(2**63)
+    return _OffsetTable(
+        starts_utc=starts_utc,
+        offsets=offsets,
+        local_starts=local_starts,
+        local_ends=local_ends,
+    )
+
+
+def _year_span(seconds: Sequence[int]) -> tuple[int, int]:
+    # +/- one year of margin covers any local/UTC offset at the edges.
+    lo = datetime(1970, 1, 1) + timedelta(seconds=min(seconds))
+    hi = datetime(1970, 1, 1) + timedelta(seconds=max(seconds))
+    return lo.year - 1, hi.year + 1
+
+
+@lru_cache(maxsize=4096)
+def _yyyymmdd_from_day(day_number: int) -> int:
+    d = date.fromordinal(day_number + _EPOCH_ORDINAL)
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _wall_seconds(dt: datetime) -> int:
+    return (
+        (dt.toordinal() - _EPOCH_ORDINAL) * _SECONDS_PER_DAY
+        + dt.hour * 3600
+        + dt.minute * 60
+        + dt.second
+    )
+
+
+def _ct_fields_from_epoch(ts_utc: array) -> TimeFieldsBatch:
+    trading_dates = array("i")
+    minutes = array("h")
+    if len(ts_utc) == 0:
+        return TimeFieldsBatch(ts_utc, trading_dates, minutes)
+
+    table = _offset_table(CT_TZ.key, *_year_span(ts_utc))
+    starts, offsets = table.starts_utc, table.offsets
+    for ts in ts_utc:
+        local = ts + offsets[bisect_right(starts, ts) - 1]
+        day, second_of_day = divmod(local, _SECONDS_PER_DAY)
+        minutes.append(second_of_day // 60)
+        # CT 17:00 rollover: >= 17:00 belongs to next trading date
+        trading_dates.append(
+            _yyyymmdd_from_day(day + 1 if second_of_day >= _ROLLOVER_SECOND_OF_DAY else day)
+        )
+    return TimeFieldsBatch(ts_utc, trading_dates, minutes)
+
+
+def compute_time_fields_from_epoch(epoch_seconds: Sequence[int]) -> TimeFieldsBatch:
+    """Batch TimeFields for absolute instants given as UTC epoch seconds."""
+    return _ct_fields_from_epoch(array("q", epoch_seconds))
+
+
+def compute_time_fields_from_wall_seconds(
+    wall_seconds: Sequence[int], input_timezone: str
+) -> TimeFieldsBatch:
+    """
+    Batch TimeFields for naive local timestamps in input_timezone.
+
+    Each value is a wall-clock time expressed as seconds since the naive epoch
+    (1970-01-01 00:00 on the local clock). Semantics match compute_time_fields:
+    ambiguous (fall-back) times resolve to fold=0 and nonexistent (spring-forward
+    gap) times raise ValueError.
+    """
+    ts_utc = array("q")
+    if len(wall_seconds) == 0:
+        return _ct_fields_from_epoch(ts_utc)
+
+    tz_key = ZoneInfo(input_timezone).key
+    table = _offset_table(tz_key, *_year_span(wall_seconds))
+    local_starts, local_ends, offsets = table.local_starts, table.local_ends, table.offsets
+    for wall in wall_seconds:
+        i = bisect_right(local_starts, wall) - 1
+        if i > 0 and wall < local_ends[i - 1]:
+            # Ambiguous (fall-back): fold=0 is the earlier instant.
+            i -= 1
+        elif wall >= local_ends[i]:
+            dt_naive = _NAIVE_EPOCH + timedelta(seconds=wall)
+            raise ValueError(
+                f"Nonexistent local time in {tz_key}: {dt_naive!r} (DST transition gap)"
+            )
+        ts_utc.append(wall - offsets[i])
+    return _ct_fields_from_epoch(ts_utc)
+
+
+def _mixed_time_fields(
+    seconds: Sequence[int], is_utc: Sequence[bool], input_timezone: str
+) -> TimeFieldsBatch:
+    """Localize the wall-clock values (is_utc false) as a batch; keep UTC ones as-is."""
+    naive_idx = [i for i, utc in enumerate(is_utc) if not utc]
+    local_utc = compute_time_fields_from_wall_seconds(
+        [seconds[i] for i in naive_idx], input_timezone
+    ).ts_start_utc
+    ts_utc = array("q", seconds)
+    for i, ts in zip(naive_idx, local_utc):
+        ts_utc[i] = ts
+    return _ct_fields_from_epoch(ts_utc)
+
+
+def compute_time_fields_batch(dts: Sequence[datetime], input_timezone: str) -> TimeFieldsBatch:
+    """
+    Batch equivalent of compute_time_fields for a column of datetimes.
+
+    Naive datetimes are interpreted in input_timezone (see
+    compute_time_fields_from_wall_seconds); timezone-aware datetimes are treated
+    as absolute instants. Uses precomputed UTC-offset transition tables for the
+    input zone and America/Chicago instead of per-row zoneinfo round trips.
+    """
+    if all(dt.tzinfo is None for dt in dts):
+        return compute_time_fields_from_wall_seconds(
+            [_wall_seconds(dt) for dt in dts], input_timezone
+        )
+
+    is_utc = [dt.tzinfo is not None for dt in dts]
+    seconds = [
+        int(dt.astimezone(UTC).timestamp()) if utc else _wall_seconds(dt)
+        for dt, utc in zip(dts, is_utc)
+    ]
+    return _mixed_time_fields(seconds, is_utc, input_timezone)
+
+
+def compute_time_fields_for_bars(bars: BarBatch, input_timezone: str) -> TimeFieldsBatch:
+    """
+    Batch TimeFields straight from a BarBatch's timestamp columns.
+
+    Wall-clock timestamps are interpreted in input_timezone, UTC ones are taken
+    as-is; no per-row datetime objects are created.
+    """
+    if not any(bars.ts_is_utc):
+        return compute_time_fields_from_wall_seconds(bars.ts_seconds, input_timezone)
+    if all(bars.ts_is_utc):
+        return compute_time_fields_from_epoch(bars.ts_seconds)
+    return _mixed_time_fields(bars.ts_seconds, bars.ts_is_utc, input_timezone)
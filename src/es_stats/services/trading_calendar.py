@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import Iterable, Mapping
+from datetime import UTC, date, datetime, timedelta
+from functools import lru_cache
+
+from es_stats.domain.calendar import TradingSession
+from es_stats.domain.resolutions import TRADING_DAY_START_CT
+from es_stats.domain.windows import FULL_DAY_MASK, MINUTES_PER_DAY, WindowAnchor, WindowSpec
+from es_stats.services.time_fields import CT_TZ
+
+# CME Globex equity index hours: 17:00 CT (previous day) to 16:00 CT, with
+# Monday-Friday trading dates (Monday's session opens Sunday evening).
+DEFAULT_SESSION_HOURS = "17:00-16:00"
+DEFAULT_SESSION_OPEN_CT = TRADING_DAY_START_CT
+DEFAULT_SESSION_LAST_CT = 16 * 60 - 1
+DEFAULT_WEEKDAYS = frozenset(range(5))
+# Minutes of the regular session (the 16:00-16:59 CT halt excluded): what a
+# date is expected to trade when the instrument's calendar has no row for it.
+DEFAULT_SESSION_MASK = WindowSpec(
+    WindowAnchor.TRADING_DATE_CT, DEFAULT_SESSION_OPEN_CT, DEFAULT_SESSION_LAST_CT
+).minute_mask
+
+CALENDAR_CSV_COLUMNS = ("trading_date", "open", "close")
+
+# CT minutes 17:00-23:59 of trading date D fall on calendar day D - 1.
+_EVENING_MASK = FULL_DAY_MASK >> TRADING_DAY_START_CT << TRADING_DAY_START_CT
+
+
+def parse_ct_time(text: str) -> int:
+    """CT minute-of-day of an "HH:MM" wall-clock time."""
+    try:
+        hh, mm = text.strip().split(":")
+        hour, minute = int(hh), int(mm)
+    except ValueError:
+        raise ValueError(f"expected an HH:MM time, got {text!r}") from None
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"expected an HH:MM time, got {text!r}")
+    return hour * 60 + minute
+
+
+def _session_minutes(open_text: str, close_text: str) -> tuple[int, int]:
+    # Exchanges publish the close exclusively: a 12:00 close's last bar is 11:59.
+    return parse_ct_time(open_text), (parse_ct_time(close_text) - 1) % MINUTES_PER_DAY
+
+
+def parse_session_hours(text: str) -> tuple[int, int]:
+    """(first, last) CT minute of an "HH:MM-HH:MM" session, close exclusive."""
+    open_text, sep, close_text = text.partition("-")
+    if not sep:
+        raise ValueError(f"expected session hours as HH:MM-HH:MM, got {text!r}")
+    return _session_minutes(open_text, close_text)
+
+
+def trading_date_int(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+@lru_cache(maxsize=None)
+def _skipped_minutes(day: date) -> int:
+    """Mask of the CT wall-clock minutes that do not exist on `day` (0 unless DST starts)."""
+    midnight = datetime(day.year, day.month, day.day, tzinfo=CT_TZ)
+    if midnight.utcoffset() == (midnight + timedelta(hours=23, minutes=59)).utcoffset():
+        return 0
+    mask = 0
+    for m in range(MINUTES_PER_DAY):
+        local = midnight + timedelta(minutes=m)  # wall-clock arithmetic
+        wall = local.replace(tzinfo=None)
+        if local.astimezone(UTC).astimezone(CT_TZ).replace(tzinfo=None) != wall:
+            mask |= 1 << m
+    return mask
+
+
+def trading_session(
+    trading_date: date,
+    open_minute_ct: int | None,
+    close_minute_ct: int | None,
+) -> TradingSession:
+    """
+    Session of `trading_date` from its first to its last CT minute (both
+    inclusive, None for no session), with the expected-minute mask computed:
+    every session minute that exists on the wall clock that day.
+    """
+    if open_minute_ct is None or close_minute_ct is None:
+        return TradingSession(trading_date_int(trading_date), open_minute_ct, close_minute_ct)
+    session = WindowSpec(WindowAnchor.TRADING_DATE_CT, open_minute_ct, close_minute_ct)
+    skipped = (_skipped_minutes(trading_date - timedelta(days=1)) & _EVENING_MASK) | (
+        _skipped_minutes(trading_date) & ~_EVENING_MASK
+    )
+    return TradingSession(
+        trading_date_int(trading_date),
+        open_minute_ct,
+        close_minute_ct,
+        session.minute_mask & ~skipped,
+    )
+
+
+def generate_sessions(
+    start: date,
+    end: date,
+    *,
+    open_minute_ct: int = DEFAULT_SESSION_OPEN_CT,
+    close_minute_ct: int = DEFAULT_SESSION_LAST_CT,
+    weekdays: frozenset[int] = DEFAULT_WEEKDAYS,
+    overrides: Mapping[int, TradingSession] | None = None,
+) -> list[TradingSession]:
+    """
+    One TradingSession per date in [start, end]: the regular session on
+    `weekdays` (date.weekday() numbers), no session on other days, and
+    `overrides` (keyed by trading_date_ct_int, e.g. holidays and early closes
+    from parse_calendar_csv) in place of the generated day.
+    """
+    if end < start:
+        raise ValueError(f"end {end} is before start {start}")
+    overrides = overrides or {}
+    sessions = []
+    d = start
+    while d <= end:
+        td = trading_date_int(d)
+        if td in overrides:
+            sessions.append(overrides[td])
+        elif d.weekday() in weekdays:
+            sessions.append(trading_session(d, open_minute_ct, close_minute_ct))
+        else:
+            sessions.append(trading_session(d, None, None))
+        d += timedelta(days=1)
+    return sessions
+
+
+def parse_calendar_csv(lines: Iterable[str]) -> list[TradingSession]:
+    """
+    Parse calendar rows with columns trading_date (YYYY-MM-DD), open and
+    close (HH:MM CT, close exclusive: a 12:00 early close has 11:59 as its
+    last minute). Empty open and close mean no session that day.
+    """
+    reader = csv.DictReader(lines)
+    missing = set(CALENDAR_CSV_COLUMNS) - set(reader.fieldnames or ())
+    if missing:
+        raise ValueError(f"calendar CSV is missing column(s): {', '.join(sorted(missing))}")
+    sessions = []
+    for row in reader:
+        line = reader.line_num
+        try:
+            # DictReader fills the fields a short row lacks with None.
+            short = [c for c in CALENDAR_CSV_COLUMNS if row[c] is None]
+            if short:
+                raise ValueError(f"missing value(s) for {', '.join(short)}")
+            d = date.fromisoformat(row["trading_date"].strip())
+            opens, closes = row["open"].strip(), row["close"].strip()
+            if not opens and not closes:
+                sessions.append(trading_session(d, None, None))
+                continue
+            if not opens or not closes:
+                raise ValueError("open and close must both be set or both be empty")
+            sessions.append(trading_session(d, *_session_minutes(opens, closes)))
+        except ValueError as e:
+            raise ValueError(f"calendar CSV line {line}: {e}") from None
+    return sessions
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from es_stats.domain.resolutions import BAR_1M, BAR_30M, DERIVED_RESOLUTIONS, BarResolution
+from es_stats.domain.window_plan import PlanFragment, WindowPlan
+from es_stats.domain.windows import MINUTES_PER_DAY, WindowSpec
+
+# Bucketed sources the planner reads by default: bars_30m, then bars_derived.
+COARSE_RESOLUTIONS: tuple[BarResolution, ...] = (BAR_30M, *DERIVED_RESOLUTIONS)
+
+
+def plan_window(
+    window: WindowSpec,
+    resolutions: Sequence[BarResolution] = COARSE_RESOLUTIONS,
+) -> WindowPlan:
+    """
+    Split a window into whole buckets, coarse first, with 1m bars filling
+    whatever no bucket fits (typically the edges).
+
+    Walks the window's minutes in time order; at each minute takes the
+    longest bucket among `resolutions` that starts there and ends inside the
+    window, else one 1m bar. Consecutive picks of the same resolution form one
+    fragment. resolutions=() plans the window as pure 1m.
+    """
+    picks: list[tuple[str, int, int]] = []  # (resolution, bucket start, bucket minutes)
+    minute, remaining = window.start_minute_ct, window.duration_minutes
+    while remaining:
+        best = BAR_1M.name, 1
+        for r in resolutions:
+            if r.start_mask >> minute & 1:
+                length = r.bucket_minutes(minute)
+                if best[1] < length <= remaining:
+                    best = r.name, length
+        picks.append((best[0], minute, best[1]))
+        minute = (minute + best[1]) % MINUTES_PER_DAY
+        remaining -= best[1]
+
+    fragments: list[PlanFragment] = []
+    run: list[tuple[str, int, int]] = []
+    for pick in picks + [("", 0, 0)]:
+        if run and pick[0] != run[0][0]:
+            last_start, last_len = run[-1][1], run[-1][2]
+            fragments.append(
+                PlanFragment(
+                    resolution=run[0][0],
+                    start_minute_ct=run[0][1],
+                    end_minute_ct=(last_start + last_len - 1) % MINUTES_PER_DAY,
+                    bucket_starts=tuple(p[1] for p in run),
+                )
+            )
+            run = []
+        run.append(pick)
+    return WindowPlan(window=window, fragments=tuple(fragments))
+
+
+def plan_windows(
+    windows: list[WindowSpec],
+    resolutions: Sequence[BarResolution] = COARSE_RESOLUTIONS,
+) -> list[WindowPlan]:
+    """
+    Plan every window of an analysis run (see plan_window). Pass
+    (BAR_30M, *list_derived_resolutions(conn)) to plan against the
+    resolutions configured in the database.
+    """
+    if not windows:
+        raise ValueError("plan_windows() requires at least one window")
+    return [plan_window(w, resolutions) for w in windows]
+
+
+def explain_plans(plans: Sequence[WindowPlan]) -> str:
+    """Explain-style breakdown: one line per window, then rows/day per table."""
+    per_table: dict[str, int] = {}
+    for plan in plans:
+        for f in plan.fragments:
+            per_table[f.table] = per_table.get(f.table, 0) + f.rows_per_day
+    total = sum(per_table.values())
+    pure_1m = sum(p.window.duration_minutes for p in plans)
+    tables = ", ".join(f"{t}={n}" for t, n in sorted(per_table.items()))
+    lines = [p.explain() for p in plans]
+    lines.append(f"rows/day by table: {tables} (total {total}, pure 1m {pure_1m})")
+    return "\n".join(lines)
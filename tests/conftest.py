@@ -6,16 +6,23 @@ from urllib.parse import urlparse
 import psycopg
 import pytest
 
-from es_stats.db.connection import execute_script
-from es_stats.repositories.sql_loader import load_sql
+from es_stats.repositories.schema_repo import apply_schema
 
 _INTEGRATION_MODULES = {
     "test_bars_1m_upsert.py",
     "test_bars_30m_rebuild.py",
+    "test_bars_derived.py",
     "test_constraints.py",
+    "test_day_coverage.py",
+    "test_expected_bar_counts.py",
     "test_import_audit.py",
     "test_import_end_to_end.py",
+    "test_range_break.py",
+    "test_rolling_breach_symbols.py",
     "test_schema_init.py",
+    "test_session_daily.py",
+    "test_window_bars.py",
+    "test_window_metrics.py",
 }
 
 
@@ -83,11 +90,16 @@ def pg_conn(postgres_url: str) -> psycopg.Connection:
     conn = psycopg.connect(postgres_url)
     try:
         conn.execute("SET TIME ZONE 'UTC';")
+        conn.execute("DROP TABLE IF EXISTS session_daily CASCADE;")
+        conn.execute("DROP TABLE IF EXISTS trading_calendar CASCADE;")
+        conn.execute("DROP TABLE IF EXISTS day_coverage CASCADE;")
+        conn.execute("DROP TABLE IF EXISTS bars_derived CASCADE;")
+        conn.execute("DROP TABLE IF EXISTS derived_buckets CASCADE;")
         conn.execute("DROP TABLE IF EXISTS bars_30m CASCADE;")
         conn.execute("DROP TABLE IF EXISTS bars_1m CASCADE;")
         conn.execute("DROP TABLE IF EXISTS imports CASCADE;")
         conn.execute("DROP TABLE IF EXISTS instruments CASCADE;")
-        execute_script(conn, load_sql("schema/001_init.sql"))
+        apply_schema(conn)
         conn.commit()
         yield conn
     finally:
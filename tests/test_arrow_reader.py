@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from es_stats.services.csv_parser import CsvBarReader, CsvValidationError
+from es_stats.services.import_pipeline import open_bar_reader
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+ipc = pytest.importorskip("pyarrow.ipc")
+
+_HEADER = "datetime,open,high,low,last,volume,# of Trades\n"
+_ROWS = [
+    ("2025-01-01 08:30", 100.0, 101.0, 99.0, 100.5, 10, 7),
+    ("2025-01-01 08:31", 100.0, 99.0, 101.0, 100.5, 10, 7),  # high < low
+    ("2025-01-01 08:32", 100.0, 101.0, 99.0, None, 10, 7),  # missing close
+    ("not a time", 100.0, 101.0, 99.0, 100.5, 10, 7),
+    ("2025-01-01 08:34", 100.0, 101.0, 99.0, 100.5, -1, 7),
+    ("2025-01-01 08:35", 100.25, 102.0, 98.5, 101.0, 12, None),  # missing trades
+    ("2025-01-01 08:36", 100.25, 102.0, 98.5, 101.0, 12, 3),
+]
+
+
+def _write_csv(path: Path) -> None:
+    lines = [",".join("" if v is None else str(v) for v in row) for row in _ROWS]
+    path.write_text(_HEADER + "\n".join(lines) + "\n")
+
+
+def _table():
+    cols = list(zip(*_ROWS))
+    return pa.table(
+        {
+            "datetime": pa.array(cols[0], pa.string()),
+            "open": pa.array(cols[1], pa.float64()),
+            "high": pa.array(cols[2], pa.float64()),
+            "low": pa.array(cols[3], pa.float64()),
+            "last": pa.array(cols[4], pa.float64()),
+            "volume": pa.array(cols[5], pa.int64()),
+            "# of Trades": pa.array(cols[6], pa.int32()),
+        }
+    )
+
+
+def _write(path: Path, fmt: str, table) -> None:
+    if fmt == "parquet":
+        pq.write_table(table, path, row_group_size=3)
+    else:
+        with ipc.new_file(path, table.schema) as w:
+            w.write_table(table, max_chunksize=3)
+
+
+def _drain(reader, batch_size: int):
+    bars = [b for batch in reader.iter_batches(batch_size) for b in batch]
+    issues = [(i.line, i.message) for i in reader.issues]
+    counts = (reader.row_count_read, reader.row_count_accepted, reader.row_count_rejected)
+    return bars, issues, counts
+
+
+@pytest.mark.parametrize("fmt, suffix", [("parquet", ".parquet"), ("arrow", ".arrow")])
+def test_arrow_reader_matches_csv_reader(tmp_path: Path, fmt: str, suffix: str):
+    csv_path = tmp_path / "bars.csv"
+    _write_csv(csv_path)
+    path = tmp_path / f"bars{suffix}"
+    _write(path, fmt, _table())
+
+    expected = _drain(CsvBarReader(csv_path), 2)
+    got = _drain(open_bar_reader(path, fmt=fmt), 2)
+
+    assert got == expected
+    assert expected[2] == (7, 2, 5)
+
+    # Resuming mid-file skips the same rows and keeps absolute line numbers.
+    assert _drain(open_bar_reader(path, fmt=fmt, skip_rows=4), 2) == _drain(
+        CsvBarReader(csv_path, skip_rows=4), 2
+    )
+
+
+@pytest.mark.parametrize("fmt, suffix", [("parquet", ".parquet"), ("arrow", ".arrow")])
+def test_arrow_reader_rejects_off_tick_prices_like_csv(tmp_path: Path, fmt: str, suffix: str):
+    csv_path = tmp_path / "bars.csv"
+    _write_csv(csv_path)
+    path = tmp_path / f"bars{suffix}"
+    _write(path, fmt, _table())
+
+    expected = _drain(CsvBarReader(csv_path, tick_size=0.5), 2)
+    got = _drain(open_bar_reader(path, fmt=fmt, tick_size=0.5), 2)
+
+    assert got == expected
+    assert expected[1][-1] == (8, "open 100.25 is not a multiple of tick size 0.5")
+    assert expected[2] == (7, 1, 6)
+
+
+@pytest.mark.parametrize(
+    "ts_type, is_utc",
+    [
+        (pa.timestamp("us"), False),  # naive: wall clock in the import timezone
+        (pa.timestamp("ms", tz="UTC"), True),
+        (pa.int64(), True),  # epoch seconds
+    ],
+)
+def test_arrow_reader_typed_timestamps(tmp_path: Path, ts_type, is_utc: bool):
+    seconds = [1_735_720_200, 1_735_720_260]  # 2025-01-01 08:30/08:31 UTC
+    ts = pa.array(seconds, pa.int64())
+    if pa.types.is_timestamp(ts_type):
+        ts = pa.array(seconds, pa.timestamp("s")).cast(ts_type)
+    path = tmp_path / "bars.parquet"
+    pq.write_table(
+        pa.table(
+            {
+                "timestamp": ts,
+                "open": [1.0, 1.0],
+                "high": [2.0, 2.0],
+                "low": [0.5, 0.5],
+                "close": [1.5, 1.5],
+                "volume": [1, 2],
+                "# of trades": [1, 1],
+            }
+        ),
+        path,
+    )
+
+    bars = list(open_bar_reader(path, fmt="parquet"))
+
+    assert [b.dt.strftime("%Y-%m-%d %H:%M") for b in bars] == [
+        "2025-01-01 08:30",
+        "2025-01-01 08:31",
+    ]
+    assert [b.dt.tzinfo is not None for b in bars] == [is_utc, is_utc]
+
+
+def test_arrow_reader_missing_column_and_bad_type_are_fatal(tmp_path: Path):
+    path = tmp_path / "bars.parquet"
+    pq.write_table(_table().drop(["# of Trades"]), path)
+    with pytest.raises(CsvValidationError) as e:
+        list(open_bar_reader(path, fmt="parquet"))
+    assert "trades_count" in str(e.value).lower()
+
+    pq.write_table(_table().set_column(1, "open", pa.array(["x"] * len(_ROWS))), path)
+    with pytest.raises(CsvValidationError) as e:
+        list(open_bar_reader(path, fmt="parquet"))
+    assert "unsupported column types" in str(e.value).lower()
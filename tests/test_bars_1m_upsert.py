@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import psycopg
+import pytest
 
+from es_stats.domain.ticks import ticks_to_price
 from es_stats.repositories.bars_1m_repo import upsert_bars_1m
 from es_stats.repositories.imports_repo import insert_import_run
-from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.instruments_repo import ensure_instrument, set_tick_size
 
 
 def test_upsert_bars_1m_skip_and_overwrite(pg_conn: psycopg.Connection):
@@ -48,7 +50,7 @@ def test_upsert_bars_1m_skip_and_overwrite(pg_conn: psycopg.Connection):
     assert c2.updated == 0
 
     changed = dict(base)
-    changed["close"] = 9.9
+    changed["close"] = 9.75
     changed["trades_count"] = 99
     c3 = upsert_bars_1m(pg_conn, [changed], merge_policy="overwrite")
     assert c3.inserted == 0
@@ -59,5 +61,117 @@ def test_upsert_bars_1m_skip_and_overwrite(pg_conn: psycopg.Connection):
         (instrument_id, 1700000000),
     ).fetchone()
     assert row is not None
-    assert float(row[0]) == 9.9
+    assert row[0] == 39  # prices are stored as ticks: 9.75 / 0.25
     assert int(row[1]) == 99
+
+
+def test_upsert_bars_1m_copy_and_executemany_staging_agree(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+
+    import_id = insert_import_run(
+        pg_conn,
+        {
+            "instrument_id": instrument_id,
+            "source_name": "test.csv",
+            "source_hash": None,
+            "input_timezone": "America/Chicago",
+            "bar_interval_seconds": 60,
+            "merge_policy": "skip",
+            "started_at_utc": 1700000000,
+            "status": "failed",
+            "error_summary": None,
+        },
+    )
+
+    def rows(offset: int):
+        for i in range(5):
+            yield (
+                instrument_id,
+                1700000000 + 60 * (i + offset),
+                20250101,
+                i + offset,
+                100.0,
+                101.0,
+                99.0,
+                100.5,
+                10,
+                2,
+                import_id,
+            )
+
+    c1 = upsert_bars_1m(pg_conn, rows(0), merge_policy="skip", staging="copy")
+    c2 = upsert_bars_1m(pg_conn, rows(3), merge_policy="overwrite", staging="executemany")
+
+    assert (c1.inserted, c1.updated) == (5, 0)
+    assert (c2.inserted, c2.updated) == (3, 2)
+
+    count = pg_conn.execute(
+        "SELECT COUNT(*) FROM bars_1m WHERE instrument_id = %s;", (instrument_id,)
+    ).fetchone()[0]
+    assert count == 8
+
+
+def test_upsert_bars_1m_rejects_unknown_staging(pg_conn: psycopg.Connection):
+    with pytest.raises(ValueError, match="staging"):
+        upsert_bars_1m(pg_conn, [], merge_policy="skip", staging="bulk")
+
+
+def test_upsert_bars_1m_changed_only_counts_real_changes(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+
+    def rows(closes: list[float]):
+        return [
+            (instrument_id, 1700000000 + 60 * i, 20250101, i, 100.0, 101.0, 99.0, c, 10, 2, None)
+            for i, c in enumerate(closes)
+        ]
+
+    c1 = upsert_bars_1m(pg_conn, rows([100.5, 100.5, 100.5]), merge_policy="overwrite")
+    assert (c1.inserted, c1.updated) == (3, 0)
+
+    # Same values + one changed close + one new key.
+    again = rows([100.5, 100.75, 100.5, 100.5])
+    c2 = upsert_bars_1m(pg_conn, again, merge_policy="overwrite", changed_only=True)
+    assert (c2.inserted, c2.updated) == (1, 1)
+
+    c3 = upsert_bars_1m(pg_conn, again, merge_policy="overwrite")
+    assert (c3.inserted, c3.updated) == (0, 4)
+
+
+def test_upsert_bars_1m_duplicate_keys_in_batch_keep_first_row(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    row = (instrument_id, 1700000000, 20250101, 0, 100.0, 101.0, 99.0, 100.5, 10, 2, None)
+    dup = row[:7] + (100.75,) + row[8:]
+
+    c = upsert_bars_1m(pg_conn, [row, dup], merge_policy="overwrite")
+    assert (c.inserted, c.updated) == (1, 0)
+
+    close = pg_conn.execute(
+        "SELECT close FROM bars_1m WHERE instrument_id = %s;", (instrument_id,)
+    ).fetchone()[0]
+    assert close == 402  # 100.5 / 0.25
+
+
+def test_upsert_bars_1m_stores_ticks_of_the_instrument_tick_size(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "CL")
+    set_tick_size(pg_conn, instrument_id, 0.01)
+    row = (instrument_id, 1700000000, 20250101, 0, 71.1, 71.23, 70.99, 71.2, 10, 2, None)
+
+    upsert_bars_1m(pg_conn, [row], merge_policy="skip")
+
+    stored = pg_conn.execute(
+        "SELECT open, high, low, close FROM bars_1m WHERE instrument_id = %s;", (instrument_id,)
+    ).fetchone()
+    assert stored == (7110, 7123, 7099, 7120)
+    assert [ticks_to_price(t, 0.01) for t in stored] == pytest.approx([71.1, 71.23, 70.99, 71.2])
+
+    # Bars are tick counts now, so the tick size is fixed.
+    with pytest.raises(ValueError, match="cannot change it"):
+        set_tick_size(pg_conn, instrument_id, 0.05)
+
+
+def test_upsert_bars_1m_rejects_off_tick_prices(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    row = (instrument_id, 1700000000, 20250101, 0, 100.0, 101.1, 99.0, 100.5, 10, 2, None)
+
+    with pytest.raises(ValueError, match="not multiples of the instrument tick size"):
+        upsert_bars_1m(pg_conn, [row], merge_policy="skip")
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import psycopg
 
+from es_stats.domain.ticks import ticks_to_price
 from es_stats.repositories.bars_1m_repo import upsert_bars_1m
-from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_dirty, rebuild_bars_30m_range
 from es_stats.repositories.imports_repo import insert_import_run
 from es_stats.repositories.instruments_repo import ensure_instrument
 
@@ -134,3 +135,98 @@ def test_rebuild_bars_30m_partial_bucket_is_incomplete(pg_conn: psycopg.Connecti
     assert int(r[1]) == 0
     assert int(r[2]) == 100
     assert int(r[3]) == 30
+
+
+def test_rebuild_bars_30m_dirty_only_touches_changed_buckets(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+
+    def rows(last_close: float):
+        out = []
+        for td, base_ts in ((20250101, 1700000000), (20250102, 1700086400)):
+            for i in range(60):  # two full buckets per day: 510 and 540
+                minute = 510 + i
+                close = last_close if (td, minute) == (20250102, 569) else 100.5
+                out.append(
+                    (instrument_id, base_ts + 60 * i, td, minute, 100.0, 101.0, 99.0, close, 10, 2, None)
+                )
+        return out
+
+    upsert_bars_1m(pg_conn, rows(100.5), merge_policy="skip")
+    full = rebuild_bars_30m_range(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=20250101,
+        td_max=20250102,
+        derived_from_import_id=None,
+    )
+    assert (full.mode, full.deleted, full.inserted) == ("full", 0, 4)
+
+    # The full rebuild consumed the dirty set.
+    noop = rebuild_bars_30m_dirty(pg_conn, instrument_id=instrument_id, derived_from_import_id=None)
+    assert (noop.mode, noop.deleted, noop.inserted) == ("dirty", 0, 0)
+
+    # Re-import with one changed minute: only its bucket is rebuilt.
+    upsert_bars_1m(pg_conn, rows(100.75), merge_policy="overwrite", changed_only=True)
+    dirty = rebuild_bars_30m_dirty(pg_conn, instrument_id=instrument_id, derived_from_import_id=None)
+    assert (dirty.mode, dirty.deleted, dirty.inserted) == ("dirty", 1, 1)
+
+    closes = pg_conn.execute(
+        """
+        SELECT trading_date_ct_int, bucket_ct_minute_of_day, close, bar_count_1m
+        FROM bars_30m
+        WHERE instrument_id = %s
+        ORDER BY 1, 2;
+        """,
+        (instrument_id,),
+    ).fetchall()
+    assert [(td, m, ticks_to_price(c, 0.25), int(n)) for td, m, c, n in closes] == [
+        (20250101, 510, 100.5, 30),
+        (20250101, 540, 100.5, 30),
+        (20250102, 510, 100.5, 30),
+        (20250102, 540, 100.75, 30),
+    ]
+
+
+def test_rebuild_bars_30m_labels_buckets_and_takes_open_close_in_time_order(
+    pg_conn: psycopg.Connection,
+):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    # One bar every 10 minutes across a whole CT day (17:00 -> 16:50), inserted
+    # in reverse so open/close must follow ts_start_utc, not insertion order.
+    minutes = [(1020 + 10 * i) % 1440 for i in range(144)]
+    rows = [
+        (instrument_id, 1_735_772_400 + 600 * i, 20250102, m, 100 + i, 200, 50, 100.25 + i, 1, 1, None)
+        for i, m in reversed(list(enumerate(minutes)))
+    ]
+    upsert_bars_1m(pg_conn, rows, merge_policy="skip")
+    rebuild_bars_30m_range(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=20250102,
+        td_max=20250102,
+        derived_from_import_id=None,
+    )
+
+    got = {
+        r[0]: r[1:]
+        for r in pg_conn.execute(
+            """
+            SELECT bucket_ct_minute_of_day, session, period_index, tpo, open, close, bar_count_1m
+            FROM bars_30m WHERE instrument_id = %s;
+            """,
+            (instrument_id,),
+        ).fetchall()
+    }
+    assert len(got) == 48
+    assert pg_conn.execute("SELECT COUNT(*) FROM bucket_30m_dim;").fetchone() == (48,)
+    assert {m: got[m][:3] for m in (1020, 0, 480, 510, 930, 960, 990)} == {
+        1020: ("ON", 0, "a"),
+        0: ("ON", 14, "o"),
+        480: ("ON", 30, "ae"),
+        510: ("RTH", 0, "A"),
+        930: ("RTH", 14, "O"),
+        960: (None, None, None),
+        990: (None, None, None),
+    }
+    # 17:00 bucket: bars 0..2 (prices in ticks of 0.25).
+    assert got[1020][3:] == (400, 409, 3)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import psycopg
+
+from es_stats.domain.resolutions import DERIVED_RESOLUTIONS, fixed_resolution
+from es_stats.domain.ticks import price_to_ticks
+from es_stats.repositories.bars_1m_repo import upsert_bars_1m
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_dirty, rebuild_bars_30m_range
+from es_stats.repositories.derived_bars_repo import (
+    configure_derived_resolution,
+    list_derived_resolutions,
+)
+from es_stats.repositories.instruments_repo import ensure_instrument
+
+_TD = 20250102
+_TS0 = 1_735_772_400  # 2025-01-01 17:00 CT, start of trading date 2025-01-02
+
+
+def _day_rows(instrument_id: int, *, changed_close: float | None = None) -> list[tuple]:
+    """A full 1440-minute trading day; minute i is CT minute (1020 + i) % 1440."""
+    rows = []
+    for i in range(1440):
+        minute = (1020 + i) % 1440
+        open_ = 1000 + 0.25 * (i % 40)
+        close = open_ + 0.25
+        if changed_close is not None and minute == 569:
+            close = changed_close
+        rows.append(
+            (instrument_id, _TS0 + 60 * i, _TD, minute, open_, open_ + 1, open_ - 1, close, 1, 1, None)
+        )
+    return rows
+
+
+def _derived(conn: psycopg.Connection, instrument_id: int) -> dict[tuple[str, int], tuple]:
+    return {
+        (r[0], r[1]): r[2:]
+        for r in conn.execute(
+            """
+            SELECT resolution, bucket_ct_minute_of_day, open, high, low, close,
+                   volume, bar_count_1m, is_complete
+            FROM bars_derived
+            WHERE instrument_id = %s AND trading_date_ct_int = %s;
+            """,
+            (instrument_id, _TD),
+        ).fetchall()
+    }
+
+
+def test_rebuild_builds_every_configured_resolution(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    upsert_bars_1m(pg_conn, _day_rows(instrument_id), merge_policy="skip")
+
+    counts = rebuild_bars_30m_range(
+        pg_conn, instrument_id=instrument_id, td_min=_TD, td_max=_TD, derived_from_import_id=None
+    )
+    assert (counts.inserted, counts.derived_deleted, counts.derived_inserted) == (
+        48,
+        0,
+        288 + 96 + 24 + 3 + 1,
+    )
+
+    got = _derived(pg_conn, instrument_id)
+    per_resolution = {}
+    for name, _ in got:
+        per_resolution[name] = per_resolution.get(name, 0) + 1
+    assert per_resolution == {"5m": 288, "15m": 96, "60m": 24, "session": 3, "daily": 1}
+    assert all(row[-1] == 1 for row in got.values())
+
+    t = lambda p: price_to_ticks(p, 0.25)  # noqa: E731
+    # Daily: open of 17:00, close of 16:59 (i = 1439), full range, 1440 bars.
+    assert got[("daily", 1020)] == (t(1000), t(1010.75), t(999), t(1010), 1440, 1440, 1)
+    # Session buckets: ON 930 minutes, RTH 450, 16:00-16:59 60.
+    assert [got[("session", m)][5] for m in (1020, 510, 960)] == [930, 450, 60]
+    # 60m bucket 09:00 is i = 960..1019: opens at i % 40 == 0.
+    assert got[("60m", 540)][0] == t(1000)
+
+
+def test_dirty_rebuild_reaggregates_whole_derived_buckets(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    upsert_bars_1m(pg_conn, _day_rows(instrument_id), merge_policy="skip")
+    rebuild_bars_30m_range(
+        pg_conn, instrument_id=instrument_id, td_min=_TD, td_max=_TD, derived_from_import_id=None
+    )
+    before = _derived(pg_conn, instrument_id)
+
+    # Change the close of 09:29 (last minute of the 09:00 30m bucket).
+    upsert_bars_1m(
+        pg_conn,
+        _day_rows(instrument_id, changed_close=1005.0),
+        merge_policy="overwrite",
+        changed_only=True,
+    )
+    dirty = rebuild_bars_30m_dirty(pg_conn, instrument_id=instrument_id, derived_from_import_id=None)
+    # Everything overlapping the dirty 30m bucket: six 5m, two 15m, 60m 09:00,
+    # session RTH and daily.
+    assert (dirty.deleted, dirty.inserted) == (1, 1)
+    assert (dirty.derived_deleted, dirty.derived_inserted) == (11, 11)
+
+    after = _derived(pg_conn, instrument_id)
+    assert after.keys() == before.keys()
+    changed = {k for k in after if after[k] != before[k]}
+    assert changed == {("5m", 565), ("15m", 555)}
+    # The 60m bucket (09:00-09:59) was rebuilt from all 60 bars, not just the dirty half.
+    assert after[("60m", 540)] == before[("60m", 540)]
+    assert after[("60m", 540)][5] == 60
+    assert after[("5m", 565)][3] == price_to_ticks(1005.0, 0.25)
+
+
+def test_configured_resolution_is_built_on_next_rebuild(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    assert {r.name for r in list_derived_resolutions(pg_conn)} == {
+        r.name for r in DERIVED_RESOLUTIONS
+    }
+
+    configure_derived_resolution(pg_conn, fixed_resolution(10))
+    listed = {r.name: r for r in list_derived_resolutions(pg_conn)}
+    assert listed["10m"] == fixed_resolution(10)
+    assert listed["session"].bucket_starts == (510, 960, 1020)
+
+    upsert_bars_1m(pg_conn, _day_rows(instrument_id)[:600], merge_policy="skip")
+    rebuild_bars_30m_range(
+        pg_conn, instrument_id=instrument_id, td_min=_TD, td_max=_TD, derived_from_import_id=None
+    )
+    got = _derived(pg_conn, instrument_id)
+    assert sum(1 for name, _ in got if name == "10m") == 60
+    # 600 bars run to 02:59 CT: the ON session bucket is partial.
+    assert got[("session", 1020)][5:] == (600, 0)
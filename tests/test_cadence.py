@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import random
+
+from es_stats.services.cadence import CadenceAnalyzer
+
+
+def _sorted_unique_median(ts: list[int]) -> int | None:
+    """Reference: upper median of deltas between consecutive unique timestamps."""
+    u = sorted(set(ts))
+    deltas = sorted(b - a for a, b in zip(u, u[1:]))
+    return deltas[len(deltas) // 2] if deltas else None
+
+
+def test_cadence_matches_sorted_reference_and_counts_duplicates():
+    rng = random.Random(7)
+    ts, t = [], 1_700_000_000
+    for _ in range(5_000):
+        t += rng.choice([60, 60, 60, 60, 120, 3600, 0])
+        ts.append(t)
+
+    c = CadenceAnalyzer(top_n=3)
+    for i in range(0, len(ts), 777):
+        c.observe(ts[i : i + 777])
+
+    assert c.in_order
+    assert c.row_count == 5_000
+    assert c.unique_ts_count == len(set(ts))
+    assert c.duplicate_count == 5_000 - len(set(ts))
+    assert c.median_delta() == _sorted_unique_median(ts) == 60
+    u = sorted(set(ts))
+    assert [g for g, _ in c.largest_gaps()] == sorted((b - a for a, b in zip(u, u[1:])), reverse=True)[:3]
+
+
+def test_cadence_flags_out_of_order_rows():
+    c = CadenceAnalyzer()
+    c.observe([0, 60, 120, 60, 180, 30])
+
+    assert not c.in_order
+    assert c.out_of_order_count == 2
+    assert c.duplicate_count == 0
+
+
+def test_cadence_summary_leaves_gaps_null_out_of_order():
+    c = CadenceAnalyzer()
+    c.observe(range(6000, -60, -60))  # descending: no delta against the latest timestamp
+
+    summary = c.summary()
+    assert (summary["in_order"], summary["out_of_order_count"]) == (False, 100)
+    for name in ("unique_ts_count", "median_delta_seconds", "delta_counts", "largest_gaps"):
+        assert summary[name] is None
+
+    resumed = CadenceAnalyzer.from_summary(summary)
+    resumed.observe([6060])
+    assert not resumed.in_order
+    assert resumed.summary()["delta_counts"] is None
+
+
+def test_cadence_median_empty_and_gap_positions():
+    c = CadenceAnalyzer()
+    assert c.median_delta() is None
+    c.observe([100])
+    assert (c.unique_ts_count, c.median_delta()) == (1, None)
+    c.observe([160, 1000, 1060])
+    assert c.median_delta() == 60
+    assert c.largest_gaps()[0] == (840, 160)
+
+
+def test_cadence_summary_round_trip_continues_identically():
+    ts = [i * 60 + (3600 if i > 50 else 0) for i in range(100)] + [6000, 6000]
+    whole = CadenceAnalyzer(top_n=2)
+    whole.observe(ts)
+
+    head = CadenceAnalyzer(top_n=2)
+    head.observe(ts[:60])
+    resumed = CadenceAnalyzer.from_summary(head.summary(), top_n=2)
+    resumed.observe(ts[60:])
+
+    assert resumed.summary() == whole.summary()
+    assert whole.delta_counts[60] == 98
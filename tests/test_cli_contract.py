@@ -65,3 +65,15 @@ def test_import_csv_rejects_invalid_timezone(tmp_path: Path):
     with pytest.raises(SystemExit) as exc:
         import_csv_contract_only(args, parser)
     assert exc.value.code == 2
+
+
+def test_import_csv_rejects_non_csv_inside_compression(tmp_path: Path):
+    f = tmp_path / "bars.json.gz"
+    f.write_bytes(b"")
+
+    parser = build_parser()
+    args = parser.parse_args(["import-csv", "--file", str(f), "--symbol", "ES"])
+
+    with pytest.raises(SystemExit) as exc:
+        import_csv_contract_only(args, parser)
+    assert exc.value.code == 2
@@ -4,7 +4,14 @@ from pathlib import Path
 
 import pytest
 
-from es_stats.services.csv_parser import CsvValidationError, read_bars_csv
+from es_stats.domain.bars import timestamp_seconds
+from es_stats.services import csv_parser, source_files
+from es_stats.services.csv_parser import (
+    _FAST_DT_PARSERS,
+    CsvValidationError,
+    _parse_dt,
+    read_bars_csv,
+)
 
 
 def test_read_bars_csv_valid_with_trades(tmp_path: Path):
@@ -44,3 +51,185 @@ def test_read_bars_csv_row_missing_trades_is_rejected(tmp_path: Path):
     assert res.row_count_rejected == 1
     assert len(res.bars) == 1
     assert res.bars[0].trades_count == 5
+
+
+def test_read_bars_csv_sniffs_vendor_format_and_counts_fallbacks(tmp_path: Path):
+    p = tmp_path / "bars.csv"
+    p.write_text(
+        "Date,Open,High,Low,Close,Volume,# of Trades\n"
+        "01/02/2025 08:30,100,101,99,100.5,10,7\n"
+        "01/02/2025 08:31,100,101,99,100.5,10,7\n"
+        "1/2/2025 8:32,100,101,99,100.5,10,7\n"
+        "2025-01-02 08:33:00,100,101,99,100.5,10,7\n"
+        "02/30/2025 08:34,100,101,99,100.5,10,7\n"
+    )
+
+    res = read_bars_csv(p)
+    assert res.dt_format == "%m/%d/%Y %H:%M"
+    assert res.dt_format_counts == {"%m/%d/%Y %H:%M": 3, "%Y-%m-%d %H:%M:%S": 1}
+    assert res.dt_fallback_count == 3
+    assert res.row_count_rejected == 1
+    assert "Unrecognized datetime format" in res.issues[0].message
+    assert [b.dt.minute for b in res.bars] == [30, 31, 32, 33]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2025-01-02 08:30:15",
+        "2025-01-02 08:30",
+        "01/02/2025 08:30:15",
+        "01/02/2025 08:30",
+        "20250102 08:30:15",
+        "20250102 08:30",
+        "1735828200",
+        "2025-13-02 08:30",
+        "2025-01-02 24:00",
+        "2025-01-02T08:30",
+        "2025-01-02  08:30",
+        "+025-01-02 08:30",
+    ],
+)
+def test_fast_datetime_paths_agree_with_full_format_list(value: str):
+    try:
+        expected = timestamp_seconds(_parse_dt(value))[0]
+    except ValueError:
+        expected = None
+
+    for fast in _FAST_DT_PARSERS.values():
+        got = fast(value)
+        assert got is None or got == expected
+
+
+def test_read_bars_csv_parallel_matches_serial(tmp_path: Path, monkeypatch):
+    lines = ["datetime,open,high,low,last,volume,# of Trades"]
+    for i in range(300):
+        ts = f"2025-01-01 {8 + i // 60:02d}:{i % 60:02d}"
+        if i % 37 == 5:
+            lines.append(f"{ts},100,99,101,100,10,7")  # high < low
+        elif i % 53 == 11:
+            lines.append("")  # blank lines are skipped, not counted
+        elif i % 61 == 7:
+            lines.append(f"{ts},100,101,99,100,10")  # short row: missing trades
+        elif i % 71 == 3:
+            lines.append(f"01/01/2025 {8 + i // 60:02d}:{i % 60:02d},100,101,99,100,10,7")
+        else:
+            lines.append(f"{ts},100,101,99,100.25,10,7")
+    p = tmp_path / "bars.csv"
+    p.write_text("\n".join(lines) + "\n")
+
+    # Small ranges so the file is split across many worker tasks.
+    monkeypatch.setattr(csv_parser, "_PARALLEL_RANGE_BYTES", 512)
+
+    serial = read_bars_csv(p)
+    parallel = read_bars_csv(p, workers=3)
+
+    assert parallel.row_count_read == serial.row_count_read
+    assert parallel.row_count_rejected == serial.row_count_rejected
+    assert parallel.issues == serial.issues
+    assert parallel.bars == serial.bars
+    assert parallel.dt_format_counts == serial.dt_format_counts
+    assert parallel.dt_fallback_count == serial.dt_fallback_count
+    assert serial.row_count_rejected > 0
+    assert {i.line for i in serial.issues} >= {7}
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_csv_bar_reader_skip_rows_resumes_mid_file(tmp_path: Path, monkeypatch, workers: int):
+    lines = ["datetime,open,high,low,last,volume,# of Trades"]
+    for i in range(120):
+        ts = f"2025-01-01 {8 + i // 60:02d}:{i % 60:02d}"
+        if i % 17 == 4:
+            lines.append(f"{ts},100,99,101,100,10,7")  # high < low
+        elif i % 29 == 9:
+            lines.append("")
+        else:
+            lines.append(f"{ts},100,101,99,100.25,10,7")
+    p = tmp_path / "bars.csv"
+    p.write_text("\n".join(lines) + "\n")
+    monkeypatch.setattr(csv_parser, "_PARALLEL_RANGE_BYTES", 512)
+
+    full = csv_parser.CsvBarReader(p)
+    full_bars = [b for batch in full.iter_batches(25) for b in batch]
+
+    # Stop where the counters match what was yielded, as a chunked import commits.
+    first = csv_parser.CsvBarReader(p, workers=workers)
+    done = []
+    for batch in first.iter_batches(25):
+        done.extend(batch)
+        if len(done) >= 40 and first.rows_flushed == first.row_count_read:
+            break
+    skip = first.rows_flushed
+
+    rest = csv_parser.CsvBarReader(p, workers=workers, skip_rows=skip)
+    rest_bars = [b for batch in rest.iter_batches(25) for b in batch]
+
+    assert done + rest_bars == full_bars
+    assert first.row_count_read + rest.row_count_read == full.row_count_read
+    assert [i for i in full.issues if i.line > skip + 1] == rest.issues
+
+
+def test_read_bars_csv_parallel_falls_back_for_quoted_fields(tmp_path: Path):
+    p = tmp_path / "bars.csv"
+    p.write_text(
+        'datetime,open,high,low,last,volume,# of Trades\n'
+        '"2025-01-01 08:30",100,101,99,100.5,10,7\n'
+        '2025-01-01 08:31,100,101,99,100.5,10,"\n7"\n'
+    )
+
+    serial = read_bars_csv(p)
+    parallel = read_bars_csv(p, workers=2)
+
+    assert parallel.row_count_read == serial.row_count_read == 2
+    assert parallel.bars == serial.bars
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz", ".zst"])
+def test_read_bars_csv_decompresses_while_streaming(tmp_path: Path, suffix: str):
+    import bz2
+    import gzip
+    import lzma
+
+    openers = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+    if suffix == ".zst":
+        openers[".zst"] = pytest.importorskip("zstandard").open
+
+    content = (
+        "datetime,open,high,low,last,volume,# of Trades\n"
+        "2025-01-01 08:30,100,101,99,100.5,10,7\n"
+        "2025-01-01 08:31,100,99,101,100.5,10,7\n"
+    )
+    plain = tmp_path / "bars.csv"
+    plain.write_text(content)
+    packed = tmp_path / f"bars.csv{suffix}"
+    with openers[suffix](packed, "wb") as f:
+        f.write(content.encode())
+
+    expected = read_bars_csv(plain)
+    res = read_bars_csv(packed, workers=2)
+    assert res.bars == expected.bars
+    assert res.issues == expected.issues
+    assert source_files.source_sha256(packed) == source_files.source_sha256(plain)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_csv_bar_reader_rejects_off_tick_prices(tmp_path: Path, monkeypatch, workers: int):
+    monkeypatch.setattr(csv_parser, "_PARALLEL_RANGE_BYTES", 64)
+    p = tmp_path / "bars.csv"
+    p.write_text(
+        "datetime,open,high,low,last,volume,# of Trades\n"
+        "2025-01-01 08:30,100,101,99,100.5,10,7\n"
+        "2025-01-01 08:31,100,101.1,99,100.5,10,7\n"
+        "2025-01-01 08:32,100.25,101,99.75,100.75,10,7\n"
+    )
+
+    reader = csv_parser.CsvBarReader(p, workers=workers, tick_size=0.25)
+    bars = [b for batch in reader.iter_batches() for b in batch]
+
+    assert [b.high for b in bars] == [101.0, 101.0]
+    assert (reader.row_count_read, reader.row_count_rejected) == (3, 1)
+    assert [(i.line, i.message) for i in reader.issues] == [
+        (3, "high 101.1 is not a multiple of tick size 0.25")
+    ]
+    # Without a tick size every price is accepted.
+    assert len(read_bars_csv(p).bars) == 3
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import psycopg
+import pytest
+
+from es_stats.cli.main import main
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.repositories.bars_1m_repo import upsert_bars_1m
+from es_stats.repositories.day_coverage_repo import (
+    count_window_minutes,
+    fetch_day_coverage,
+    rebuild_day_coverage,
+    verify_day_coverage,
+)
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.schema_repo import apply_schema
+
+_DATES = (20250106, 20250107)
+
+
+def _rows(instrument_id: int, td: int, minutes) -> list[tuple]:
+    day = _DATES.index(td)
+    return [
+        (instrument_id, 1_736_118_000 + day * 86400 + m * 60, td, m, 1.0, 1.25, 0.75, 1.0, 1, 1, None)
+        for m in minutes
+    ]
+
+
+def _mask(minutes) -> int:
+    return sum(1 << m for m in set(minutes))
+
+
+def test_upserts_maintain_day_coverage_incrementally(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    first = [m for m in range(1440) if m % 7]
+    upsert_bars_1m(pg_conn, _rows(instrument_id, 20250106, first), merge_policy="skip")
+    upsert_bars_1m(pg_conn, _rows(instrument_id, 20250107, range(510, 960)), merge_policy="skip")
+    # A later batch fills some gaps and rewrites bars that already exist.
+    later = [0, 7, 14, 1435, 1, 2]
+    upsert_bars_1m(pg_conn, _rows(instrument_id, 20250106, later), merge_policy="overwrite")
+    upsert_bars_1m(
+        pg_conn, _rows(instrument_id, 20250106, [3]), merge_policy="overwrite", changed_only=True
+    )
+
+    coverage = fetch_day_coverage(pg_conn, instrument_id=instrument_id, td_min=20250101, td_max=20250131)
+
+    assert coverage == {
+        20250106: _mask(first + later),
+        20250107: _mask(range(510, 960)),
+    }
+    assert verify_day_coverage(pg_conn) == []
+
+
+def test_window_counts_come_from_the_bitmaps(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    minutes = [m for m in range(1440) if m % 5 and m % 11]
+    for td in _DATES:
+        upsert_bars_1m(pg_conn, _rows(instrument_id, td, minutes), merge_policy="skip")
+    windows = [
+        WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH"),
+        WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 509, "ON"),
+        WindowSpec(WindowAnchor.TRADING_DATE_CT, 1439, 0, "midnight"),
+    ]
+
+    counts = count_window_minutes(
+        pg_conn, instrument_id=instrument_id, td_min=20250101, td_max=20250131, windows=windows
+    )
+
+    scanned = {
+        (td, i): pg_conn.execute(
+            """
+            SELECT COUNT(*) FROM bars_1m
+            WHERE instrument_id = %s AND trading_date_ct_int = %s AND ct_minute_of_day = ANY(%s);
+            """,
+            (instrument_id, td, sorted(w.covered_minutes())),
+        ).fetchone()[0]
+        for td in _DATES
+        for i, w in enumerate(windows)
+    }
+    assert counts == [(td, i, scanned[td, i]) for td in _DATES for i in range(len(windows))]
+    assert counts[0] == (20250106, 0, len([m for m in minutes if 510 <= m <= 959]))
+
+
+def test_verify_and_rebuild_day_coverage(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    other_id = ensure_instrument(pg_conn, "NQ")
+    upsert_bars_1m(pg_conn, _rows(instrument_id, 20250106, range(100)), merge_policy="skip")
+    upsert_bars_1m(pg_conn, _rows(instrument_id, 20250107, range(100)), merge_policy="skip")
+    upsert_bars_1m(pg_conn, _rows(other_id, 20250106, range(10)), merge_policy="skip")
+    # Bars removed behind the bitmap's back, and a bitmap row with no bars.
+    pg_conn.execute(
+        "DELETE FROM bars_1m WHERE instrument_id = %s AND trading_date_ct_int = 20250106 "
+        "AND ct_minute_of_day >= 90;",
+        (instrument_id,),
+    )
+    pg_conn.execute("DELETE FROM day_coverage WHERE instrument_id = %s;", (other_id,))
+    pg_conn.execute(
+        "INSERT INTO day_coverage VALUES (%s, 20250108, B'1'::bit(1440));", (instrument_id,)
+    )
+
+    mismatches = verify_day_coverage(pg_conn)
+    assert [(m.instrument_id, m.trading_date_ct_int) for m in mismatches] == [
+        (instrument_id, 20250106),
+        (instrument_id, 20250108),
+        (other_id, 20250106),
+    ]
+    assert mismatches[0].stored_mask == _mask(range(100))
+    assert mismatches[0].rebuilt_mask == _mask(range(90))
+    assert mismatches[1].rebuilt_mask is None
+    assert mismatches[2].stored_mask is None
+    assert len(verify_day_coverage(pg_conn, instrument_id=other_id)) == 1
+
+    assert rebuild_day_coverage(pg_conn, instrument_id=other_id) == 1
+    assert len(verify_day_coverage(pg_conn)) == 2
+    assert rebuild_day_coverage(pg_conn) == 3
+    assert verify_day_coverage(pg_conn) == []
+
+
+def test_apply_schema_builds_missing_day_coverage(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    upsert_bars_1m(pg_conn, _rows(instrument_id, 20250106, range(0, 1440, 3)), merge_policy="skip")
+    pg_conn.execute("DELETE FROM day_coverage;")
+
+    apply_schema(pg_conn)
+
+    assert verify_day_coverage(pg_conn) == []
+
+
+def test_verify_coverage_cli(pg_conn: psycopg.Connection, postgres_url: str, monkeypatch):
+    monkeypatch.setenv("ES_STATS_DATABASE_URL", postgres_url)
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    upsert_bars_1m(pg_conn, _rows(instrument_id, 20250106, range(60)), merge_policy="skip")
+    pg_conn.execute("UPDATE day_coverage SET minute_bits = B'1'::bit(1440);")
+    pg_conn.commit()
+
+    assert main(["verify-coverage", "--symbol", "ES"]) == 1
+    assert main(["verify-coverage", "--repair"]) == 0
+    assert main(["verify-coverage"]) == 0
+    with pytest.raises(SystemExit):
+        main(["verify-coverage", "--symbol", "NOPE"])
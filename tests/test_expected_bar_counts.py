@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import psycopg
+import pytest
+
+from es_stats.cli.main import main
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.repositories.instruments_repo import ensure_instrument, find_instrument
+from es_stats.repositories.trading_calendar_repo import (
+    expected_bar_counts,
+    fetch_trading_calendar,
+    upsert_trading_calendar,
+)
+from es_stats.services.trading_calendar import generate_sessions, trading_session
+
+_WINDOWS = [
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH"),
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 509, "ON"),
+    WindowSpec(WindowAnchor.TRADING_DATE_CT, 60, 239, "01:00-03:59"),
+]
+
+
+def test_expected_bar_counts_for_a_date_range(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    sessions = generate_sessions(
+        date(2025, 3, 6),
+        date(2025, 3, 10),
+        weekdays=frozenset({0, 1, 2, 3, 4, 6}),
+        overrides={20250307: trading_session(date(2025, 3, 7), 1020, 719)},
+    )
+    assert upsert_trading_calendar(pg_conn, instrument_id=instrument_id, sessions=sessions) == 5
+
+    counts = expected_bar_counts(
+        pg_conn, instrument_id=instrument_id, td_min=20250101, td_max=20251231, windows=_WINDOWS
+    )
+
+    assert counts == [
+        (20250306, 0, 450), (20250306, 1, 930), (20250306, 2, 180),
+        (20250307, 0, 210), (20250307, 1, 930), (20250307, 2, 180),  # closes 12:00
+        (20250308, 0, 0), (20250308, 1, 0), (20250308, 2, 0),  # Saturday
+        (20250309, 0, 450), (20250309, 1, 870), (20250309, 2, 120),  # 02:00-02:59 skipped
+        (20250310, 0, 450), (20250310, 1, 930), (20250310, 2, 180),
+    ]
+    # Python-side popcounts agree with the query.
+    assert counts == [
+        (s.trading_date_ct_int, i, (s.expected_mask & w.minute_mask).bit_count())
+        for s in sessions
+        for i, w in enumerate(_WINDOWS)
+    ]
+    assert fetch_trading_calendar(
+        pg_conn, instrument_id=instrument_id, td_min=20250101, td_max=20251231
+    ) == sessions
+
+
+def test_upsert_trading_calendar_replaces_days(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    upsert_trading_calendar(
+        pg_conn,
+        instrument_id=instrument_id,
+        sessions=generate_sessions(date(2025, 12, 24), date(2025, 12, 26)),
+    )
+    closed = trading_session(date(2025, 12, 25), None, None)
+    upsert_trading_calendar(pg_conn, instrument_id=instrument_id, sessions=[closed])
+
+    days = fetch_trading_calendar(
+        pg_conn, instrument_id=instrument_id, td_min=20251224, td_max=20251226
+    )
+    assert [d.is_open for d in days] == [True, False, True]
+    assert upsert_trading_calendar(pg_conn, instrument_id=instrument_id, sessions=[]) == 0
+
+
+def test_load_calendar_cli(
+    pg_conn: psycopg.Connection, postgres_url: str, monkeypatch, tmp_path: Path
+):
+    monkeypatch.setenv("ES_STATS_DATABASE_URL", postgres_url)
+    f = tmp_path / "holidays.csv"
+    f.write_text(
+        "trading_date,open,close\n"
+        "2025-11-27,,\n"
+        "2025-11-28,17:00,12:15\n"
+        "2026-01-01,,\n"
+    )
+
+    argv = ["load-calendar", "--symbol", "ES", "--start", "2025-11-24", "--end", "2025-11-30"]
+    assert main([*argv, "--file", str(f)]) == 0
+
+    instrument_id = find_instrument(pg_conn, "ES")
+    days = fetch_trading_calendar(
+        pg_conn, instrument_id=instrument_id, td_min=20250101, td_max=20261231
+    )
+    assert [(d.trading_date_ct_int, d.expected_mask.bit_count()) for d in days] == [
+        (20251124, 1380),
+        (20251125, 1380),
+        (20251126, 1380),
+        (20251127, 0),
+        (20251128, 1155),
+        (20251129, 0),
+        (20251130, 0),
+        (20260101, 0),  # outside --start/--end, still loaded from --file
+    ]
+
+    with pytest.raises(SystemExit):
+        main(["load-calendar", "--symbol", "ES", "--start", "2025-11-24"])
+    with pytest.raises(SystemExit):
+        main(["load-calendar", "--symbol", "ES"])
+    with pytest.raises(SystemExit):
+        main(["load-calendar", "--symbol", "ES", "--file", str(f), "--session", "17:00"])
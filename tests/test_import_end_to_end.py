@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import psycopg
+import pytest
 
+from es_stats.cli import main as cli_main
 from es_stats.cli.main import build_parser, import_csv_contract_only
+from es_stats.domain.ticks import DEFAULT_TICK_SIZE, price_to_ticks
 
 
 def test_import_end_to_end_imports_1m_and_rebuilds_30m(
@@ -84,10 +87,10 @@ def test_import_end_to_end_imports_1m_and_rebuilds_30m(
         assert r_0830 is not None
         assert int(r_0830[1]) == 30
         assert int(r_0830[2]) == 1
-        assert float(r_0830[3]) == 100.0
-        assert float(r_0830[6]) == 129.5
-        assert float(r_0830[4]) == 130.0
-        assert float(r_0830[5]) == 99.0
+        assert r_0830[3] == price_to_ticks(100.0, DEFAULT_TICK_SIZE)
+        assert r_0830[6] == price_to_ticks(129.5, DEFAULT_TICK_SIZE)
+        assert r_0830[4] == price_to_ticks(130.0, DEFAULT_TICK_SIZE)
+        assert r_0830[5] == price_to_ticks(99.0, DEFAULT_TICK_SIZE)
         assert int(r_0830[7]) == 30
         assert int(r_0830[8]) == 30
         assert r_0830[9] == "RTH"
@@ -106,11 +109,340 @@ def test_import_end_to_end_imports_1m_and_rebuilds_30m(
         assert r_0900 is not None
         assert int(r_0900[1]) == 2
         assert int(r_0900[2]) == 0
-        assert float(r_0900[3]) == 130.0
-        assert float(r_0900[6]) == 131.5
-        assert float(r_0900[4]) == 132.0
-        assert float(r_0900[5]) == 129.0
+        assert r_0900[3] == price_to_ticks(130.0, DEFAULT_TICK_SIZE)
+        assert r_0900[6] == price_to_ticks(131.5, DEFAULT_TICK_SIZE)
+        assert r_0900[4] == price_to_ticks(132.0, DEFAULT_TICK_SIZE)
+        assert r_0900[5] == price_to_ticks(129.0, DEFAULT_TICK_SIZE)
         assert int(r_0900[7]) == 2
         assert int(r_0900[8]) == 2
         assert r_0900[9] == "RTH"
         assert int(r_0900[10]) == 1
+
+        # The import created the 2025 partitions; nothing fell into DEFAULT.
+        for table in ("bars_1m", "bars_30m"):
+            assert conn.execute(f"SELECT COUNT(*) FROM {table}_y2025;").fetchone()[0] > 0
+            assert conn.execute(f"SELECT COUNT(*) FROM {table}_default;").fetchone()[0] == 0
+
+
+def test_import_small_chunks_match_single_chunk_bounds(
+    tmp_path,
+    monkeypatch,
+    postgres_url: str,
+    pg_conn: psycopg.Connection,
+):
+    monkeypatch.setenv("ES_STATS_DATABASE_URL", postgres_url)
+
+    csv_path = tmp_path / "bars.csv"
+    lines = ["datetime,open,high,low,last,volume,# of Trades\n"]
+    for i in range(40):
+        total_min = 16 * 60 + 50 + i  # 16:50 CT -> crosses the 17:00 rollover
+        lines.append(f"2025-01-01 {total_min // 60:02d}:{total_min % 60:02d},100,101,99,100.5,1,1\n")
+    lines.append("2025-01-01 18:00,100,99,101,100.5,1,1\n")  # rejected: high < low
+    csv_path.write_text("".join(lines))
+
+    parser = build_parser()
+    args = parser.parse_args(
+        ["import-csv", "--file", str(csv_path), "--symbol", "ES", "--chunk-size", "7"]
+    )
+    assert import_csv_contract_only(args, parser) == 0
+
+    with psycopg.connect(postgres_url) as conn:
+        imp = conn.execute(
+            """
+            SELECT status, row_count_read, row_count_inserted, row_count_rejected,
+                   ts_max_utc - ts_min_utc
+            FROM imports
+            ORDER BY import_id DESC
+            LIMIT 1;
+            """
+        ).fetchone()
+        assert imp == ("success", 41, 40, 1, 39 * 60)
+
+        days = conn.execute(
+            "SELECT MIN(trading_date_ct_int), MAX(trading_date_ct_int) FROM bars_1m;"
+        ).fetchone()
+        assert days == (20250101, 20250102)
+
+
+def test_reimport_of_same_content_is_skipped_and_audited(
+    tmp_path,
+    monkeypatch,
+    postgres_url: str,
+    pg_conn: psycopg.Connection,
+):
+    monkeypatch.setenv("ES_STATS_DATABASE_URL", postgres_url)
+
+    csv_path = tmp_path / "bars.csv"
+    lines = ["datetime,open,high,low,last,volume,# of Trades\n"]
+    for i in range(5):
+        lines.append(f"2025-01-01 08:{30 + i:02d},100,101,99,100.5,1,1\n")
+    csv_path.write_text("".join(lines))
+    resent = tmp_path / "resent.csv"
+    resent.write_bytes(csv_path.read_bytes())
+
+    parser = build_parser()
+    base = ["import-csv", "--symbol", "ES", "--merge-policy", "overwrite"]
+    for argv in (
+        [*base, "--file", str(csv_path)],
+        [*base, "--file", str(resent)],
+        [*base, "--file", str(resent), "--timezone", "America/New_York"],
+        [*base, "--file", str(resent), "--force"],
+    ):
+        assert import_csv_contract_only(parser.parse_args(argv), parser) == 0
+
+    with psycopg.connect(postgres_url) as conn:
+        runs = conn.execute(
+            """
+            SELECT import_id, status, duplicate_of_import_id, row_count_read, row_count_updated,
+                   source_hash
+            FROM imports
+            ORDER BY import_id;
+            """
+        ).fetchall()
+
+        first_id = runs[0][0]
+        assert [r[1:5] for r in runs] == [
+            ("success", None, 5, 0),
+            ("skipped", first_id, 0, 0),
+            ("success", None, 5, 0),  # different timezone: not a duplicate
+            ("success", None, 5, 5),  # --force
+        ]
+        assert len({r[5] for r in runs}) == 1
+        assert len(runs[0][5]) == 64
+
+        assert conn.execute("SELECT COUNT(*) FROM bars_1m;").fetchone()[0] == 10
+
+
+def test_import_end_to_end_parquet_matches_csv(
+    tmp_path,
+    monkeypatch,
+    postgres_url: str,
+    pg_conn: psycopg.Connection,
+):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setenv("ES_STATS_DATABASE_URL", postgres_url)
+
+    dts = [f"2025-01-01 {8 + (30 + i) // 60:02d}:{(30 + i) % 60:02d}" for i in range(32)]
+    opens = [100.0 + i for i in range(32)]
+    pq_path = tmp_path / "bars.parquet"
+    pq.write_table(
+        pa.table(
+            {
+                "datetime": dts,
+                "open": opens,
+                "high": [o + 1.0 for o in opens],
+                "low": [o - 1.0 for o in opens],
+                "last": [o + 0.5 for o in opens],
+                "volume": [1] * 32,
+                "# of Trades": [1] * 32,
+            }
+        ),
+        pq_path,
+    )
+
+    parser = build_parser()
+    args = parser.parse_args(["import-csv", "--file", str(pq_path), "--symbol", "ES"])
+    assert import_csv_contract_only(args, parser) == 0
+    assert args.format == "parquet"
+
+    with psycopg.connect(postgres_url) as conn:
+        status, read, inserted = conn.execute(
+            "SELECT status, row_count_read, row_count_inserted FROM imports "
+            "ORDER BY import_id DESC LIMIT 1;"
+        ).fetchone()
+        assert (status, read, inserted) == ("success", 32, 32)
+        assert conn.execute("SELECT COUNT(*) FROM bars_30m;").fetchone()[0] == 2
+        assert conn.execute(
+            "SELECT open, close FROM bars_30m WHERE bucket_ct_minute_of_day = 510;"
+        ).fetchone() == (400, 518)  # ticks of 0.25: 100.0, 129.5
+
+
+def test_chunked_import_resumes_from_last_checkpoint(
+    tmp_path,
+    monkeypatch,
+    postgres_url: str,
+    pg_conn: psycopg.Connection,
+):
+    monkeypatch.setenv("ES_STATS_DATABASE_URL", postgres_url)
+
+    csv_path = tmp_path / "bars.csv"
+    lines = ["datetime,open,high,low,last,volume,# of Trades\n"]
+    for i in range(95):
+        total_min = 8 * 60 + i
+        o = 100.0 + i
+        hhmm = f"{total_min // 60:02d}:{total_min % 60:02d}"
+        lines.append(f"2025-01-01 {hhmm},{o},{o + 1},{o - 1},{o},1,1\n")
+    lines.insert(30, "2025-01-01 09:30,100,99,101,100,1,1\n")  # rejected: high < low
+    csv_path.write_text("".join(lines))
+
+    parser = build_parser()
+    reference = parser.parse_args(["import-csv", "--file", str(csv_path), "--symbol", "REF"])
+    assert import_csv_contract_only(reference, parser) == 0
+
+    calls = []
+    real_merge = cli_main.merge_staged_bars_1m
+
+    def failing_merge(conn, **kwargs):
+        calls.append(1)
+        if len(calls) == 3:
+            raise RuntimeError("connection lost")
+        return real_merge(conn, **kwargs)
+
+    monkeypatch.setattr(cli_main, "merge_staged_bars_1m", failing_merge)
+    args = parser.parse_args(
+        [
+            "import-csv",
+            "--file",
+            str(csv_path),
+            "--symbol",
+            "ES",
+            "--chunk-size",
+            "10",
+            "--commit-every",
+            "20",
+        ]
+    )
+    with pytest.raises(RuntimeError, match="connection lost"):
+        import_csv_contract_only(args, parser)
+
+    with psycopg.connect(postgres_url) as conn:
+        import_id, status, checkpoint, read, inserted, rejected = conn.execute(
+            """
+            SELECT import_id, status, checkpoint_rows, row_count_read,
+                   row_count_inserted, row_count_rejected
+            FROM imports ORDER BY import_id DESC LIMIT 1;
+            """
+        ).fetchone()
+        # Two chunks of 20 accepted rows were committed; the rejected row is in the second.
+        assert (status, checkpoint, read, inserted, rejected) == ("failed", 41, 41, 40, 1)
+        assert conn.execute(
+            "SELECT COUNT(*) FROM bars_1m WHERE source_import_id = %s;", (import_id,)
+        ).fetchone()[0] == 40
+
+    monkeypatch.setattr(cli_main, "merge_staged_bars_1m", real_merge)
+    resume = parser.parse_args(
+        ["import-csv", "--file", str(csv_path), "--symbol", "ES", "--resume", str(import_id)]
+    )
+    assert import_csv_contract_only(resume, parser) == 0
+
+    with psycopg.connect(postgres_url) as conn:
+        imp = conn.execute(
+            """
+            SELECT status, row_count_read, row_count_inserted, row_count_rejected
+            FROM imports WHERE import_id = %s;
+            """,
+            (import_id,),
+        ).fetchone()
+        assert imp == ("success", 96, 95, 1)
+
+        def snapshot(table: str, minute_col: str, symbol: str) -> list[tuple]:
+            return conn.execute(
+                f"""
+                SELECT b.trading_date_ct_int, b.{minute_col},
+                       b.open, b.high, b.low, b.close, b.volume
+                FROM {table} b JOIN instruments i USING (instrument_id)
+                WHERE i.symbol = %s ORDER BY 1, 2;
+                """,
+                (symbol,),
+            ).fetchall()
+
+        bars_30m = snapshot("bars_30m", "bucket_ct_minute_of_day", "ES")
+        assert len(bars_30m) == 4
+        assert bars_30m == snapshot("bars_30m", "bucket_ct_minute_of_day", "REF")
+        assert snapshot("bars_1m", "ct_minute_of_day", "ES") == snapshot(
+            "bars_1m", "ct_minute_of_day", "REF"
+        )
+
+    # A successful import cannot be resumed again.
+    with pytest.raises(SystemExit):
+        import_csv_contract_only(
+            parser.parse_args(
+                ["import-csv", "--file", str(csv_path), "--symbol", "ES", "--resume", str(import_id)]
+            ),
+            parser,
+        )
+
+
+def test_import_records_cadence_summary_and_handles_unsorted_rows(
+    tmp_path,
+    monkeypatch,
+    postgres_url: str,
+    pg_conn: psycopg.Connection,
+):
+    monkeypatch.setenv("ES_STATS_DATABASE_URL", postgres_url)
+
+    minutes = [8 * 60 + i for i in range(30)] + [10 * 60 + i for i in range(30)]
+    rows = [f"2025-01-01 {m // 60:02d}:{m % 60:02d},100,101,99,100.5,1,1\n" for m in minutes]
+    header = "datetime,open,high,low,last,volume,# of Trades\n"
+
+    sorted_path = tmp_path / "sorted.csv"
+    sorted_path.write_text(header + "".join(rows) + rows[-1])  # one duplicate row
+    unsorted_path = tmp_path / "unsorted.csv"
+    unsorted_path.write_text(header + "".join(rows[30:] + rows[:30]))
+
+    parser = build_parser()
+    for path, symbol in ((sorted_path, "ES"), (unsorted_path, "NQ")):
+        args = parser.parse_args(["import-csv", "--file", str(path), "--symbol", symbol])
+        assert import_csv_contract_only(args, parser) == 0
+
+    with psycopg.connect(postgres_url) as conn:
+        summaries = dict(
+            conn.execute(
+                """
+                SELECT n.symbol, i.cadence_summary
+                FROM imports i JOIN instruments n USING (instrument_id);
+                """
+            ).fetchall()
+        )
+
+    es = summaries["ES"]
+    assert (es["row_count"], es["unique_ts_count"], es["duplicate_count"]) == (61, 60, 1)
+    assert es["out_of_order_count"] == 0
+    assert es["median_delta_seconds"] == 60
+    assert es["delta_counts"] == {"60": 58, "5460": 1}
+    assert es["largest_gaps"][0]["seconds"] == 5460
+
+    assert es["in_order"] is True
+
+    # Out-of-order input is still checked (in SQL) and flagged in the summary,
+    # which leaves the gap statistics null instead of recording running-max deltas.
+    nq = summaries["NQ"]
+    assert (nq["in_order"], nq["out_of_order_count"]) == (False, 30)
+    assert nq["delta_counts"] is None
+    assert nq["largest_gaps"] is None
+    assert nq["median_delta_seconds"] is None
+
+
+def test_import_rejects_off_tick_prices_of_the_instrument(
+    tmp_path,
+    monkeypatch,
+    postgres_url: str,
+    pg_conn: psycopg.Connection,
+):
+    monkeypatch.setenv("ES_STATS_DATABASE_URL", postgres_url)
+
+    csv_path = tmp_path / "bars.csv"
+    rows = [f"2025-01-01 08:{30 + i:02d},71.1,71.25,70.95,71.2,1,1\n" for i in range(6)]
+    rows[2] = "2025-01-01 08:32,71.1,71.255,70.95,71.2,1,1\n"  # half a cent
+    csv_path.write_text("datetime,open,high,low,last,volume,# of Trades\n" + "".join(rows))
+
+    parser = build_parser()
+    args = parser.parse_args(
+        ["import-csv", "--file", str(csv_path), "--symbol", "CL", "--tick-size", "0.01"]
+    )
+    assert import_csv_contract_only(args, parser) == 0
+
+    with psycopg.connect(postgres_url) as conn:
+        assert conn.execute(
+            "SELECT row_count_read, row_count_inserted, row_count_rejected FROM imports;"
+        ).fetchone() == (6, 5, 1)
+        assert conn.execute("SELECT tick_size FROM instruments;").fetchone() == (0.01,)
+        assert conn.execute("SELECT DISTINCT high FROM bars_1m;").fetchall() == [(7125,)]
+
+    # The tick size of an instrument with bars is fixed.
+    args = parser.parse_args(
+        ["import-csv", "--file", str(csv_path), "--symbol", "CL", "--tick-size", "0.05", "--force"]
+    )
+    with pytest.raises(SystemExit):
+        import_csv_contract_only(args, parser)
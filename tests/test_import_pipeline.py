@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from es_stats.domain.bars import BarBatch, RawBar
+from es_stats.services.csv_parser import CsvBarReader, CsvValidationError
+from es_stats.services.import_pipeline import ImportBounds, chunked, iter_bars_1m_chunks
+
+
+def _bar(minute: int) -> RawBar:
+    return RawBar(
+        dt=datetime(2025, 1, 2, 8, 30 + minute),
+        open=100.0,
+        high=101.0,
+        low=99.0,
+        close=100.5,
+        volume=10,
+        trades_count=2,
+    )
+
+
+def test_chunked_splits_into_bounded_lists() -> None:
+    assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+    with pytest.raises(ValueError, match="chunk size"):
+        list(chunked(range(3), 0))
+
+
+def test_iter_bars_1m_chunks_tracks_bounds_across_chunks() -> None:
+    bounds = ImportBounds()
+    batches = (BarBatch.from_bars(c) for c in chunked((_bar(i) for i in range(5)), 2))
+    chunks = [
+        list(c)
+        for c in iter_bars_1m_chunks(
+            batches,
+            input_timezone="America/Chicago",
+            instrument_id=1,
+            import_id=7,
+            bounds=bounds,
+        )
+    ]
+
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    first = chunks[0][0]
+    assert first[0] == 1
+    assert first[3] == 510
+    assert first[4:10] == (100.0, 101.0, 99.0, 100.5, 10, 2)
+    assert first[-1] == 7
+
+    assert bounds.row_count == 5
+    assert bounds.ts_max_utc - bounds.ts_min_utc == 4 * 60
+    assert bounds.td_min == bounds.td_max == 20250102
+
+
+def test_bar_batch_round_trips_raw_bars() -> None:
+    bars = [_bar(0), replace(_bar(1), dt=datetime(2025, 1, 2, 14, 31, tzinfo=UTC))]
+    batch = BarBatch.from_bars(bars)
+
+    assert len(batch) == 2
+    assert list(batch) == bars
+    assert list(batch.ts_is_utc) == [0, 1]
+    assert batch.slice(1, 2)[0] == bars[1]
+
+
+def test_csv_bar_reader_yields_bounded_batches(tmp_path: Path) -> None:
+    p = tmp_path / "bars.csv"
+    p.write_text(
+        "datetime,open,high,low,last,volume,# of Trades\n"
+        + "".join(f"2025-01-01 08:{30 + i},100,101,99,100.5,10,7\n" for i in range(5))
+    )
+
+    batches = list(CsvBarReader(p).iter_batches(2))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert batches[2][0].dt == datetime(2025, 1, 1, 8, 34)
+
+
+def test_csv_bar_reader_streams_and_counts(tmp_path: Path) -> None:
+    p = tmp_path / "bars.csv"
+    p.write_text(
+        "datetime,open,high,low,last,volume,# of Trades\n"
+        "2025-01-01 08:30,100,101,99,100.5,10,7\n"
+        "2025-01-01 08:31,100,99,101,100.5,10,7\n"
+        "2025-01-01 08:32,100,101,99,100.5,10,7\n"
+    )
+
+    reader = CsvBarReader(p)
+    it = reader.iter_batches(1)
+    next(it)
+    assert reader.row_count_read == 1
+
+    rest = list(it)
+    assert len(rest) == 1
+    assert reader.row_count_read == 3
+    assert reader.row_count_rejected == 1
+    assert reader.issues[0].line == 3
+
+
+def test_csv_bar_reader_all_rows_rejected_is_fatal(tmp_path: Path) -> None:
+    p = tmp_path / "bars.csv"
+    p.write_text(
+        "datetime,open,high,low,last,volume,# of Trades\n"
+        "2025-01-01 08:30,100,99,101,100.5,10,7\n"
+    )
+    with pytest.raises(CsvValidationError, match="high must be >= low"):
+        list(CsvBarReader(p))
@@ -3,8 +3,10 @@ from __future__ import annotations
 import pytest
 
 from es_stats.domain.missing_policy import MissingPolicy, MissingPolicyMode, WindowRole
+from es_stats.domain.windows import WindowAnchor, WindowSpec
 from es_stats.services.completeness import (
     CoverageExclusionReason,
+    evaluate_day_coverage,
     evaluate_window_coverage,
 )
 
@@ -99,3 +101,38 @@ def test_evaluate_window_coverage_rejects_negative_counts() -> None:
             role=WindowRole.X,
             policy=policy,
         )
+
+
+def test_evaluate_day_coverage_counts_minutes_from_the_mask() -> None:
+    policy = MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=0.05, y_tol=0.0)
+    window = WindowSpec(WindowAnchor.TRADING_DATE_CT, 1430, 9)  # 20 minutes over midnight
+    mask = sum(1 << m for m in range(1440) if m not in (1431, 5, 600))
+
+    x = evaluate_day_coverage(minute_mask=mask, window=window, role=WindowRole.X, policy=policy)
+    assert (x.observed_bar_count, x.expected_bar_count, x.missing_bar_count) == (18, 20, 2)
+    assert x.is_complete is False
+    assert x.exclusion_reason == CoverageExclusionReason.MISSING_EXCEEDS_TOLERANCE
+
+    full = evaluate_day_coverage(
+        minute_mask=mask | 1 << 1431 | 1 << 5, window=window, role=WindowRole.Y, policy=policy
+    )
+    assert full.missing_bar_count == 0
+    assert full.is_complete is True
+
+
+def test_evaluate_day_coverage_expects_only_calendar_minutes() -> None:
+    policy = MissingPolicy(mode=MissingPolicyMode.STRICT)
+    rth = WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959)
+    early_close = sum(1 << m for m in range(510, 720))  # session ends 12:00
+    bars = sum(1 << m for m in range(510, 960) if m != 600)
+
+    r = evaluate_day_coverage(
+        minute_mask=bars, window=rth, role=WindowRole.X, policy=policy, expected_mask=early_close
+    )
+    assert (r.observed_bar_count, r.expected_bar_count, r.missing_bar_count) == (209, 210, 1)
+    assert r.is_complete is False
+
+    holiday = evaluate_day_coverage(
+        minute_mask=bars, window=rth, role=WindowRole.X, policy=policy, expected_mask=0
+    )
+    assert (holiday.expected_bar_count, holiday.is_complete) == (0, True)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import psycopg
+import pytest
+
+from es_stats.domain.missing_policy import MissingPolicy, MissingPolicyMode, WindowRole
+from es_stats.domain.windows import WindowAnchor, WindowOrderRule, WindowSpec
+from es_stats.repositories.bars_1m_repo import upsert_bars_1m
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.services.analyses.range_break import BreakCount, BreakDirection, run_range_break
+
+pytest.importorskip("numpy")
+
+IB = WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 569, "IB")
+REST = WindowSpec(WindowAnchor.TRADING_DATE_CT, 570, 959, "RTH after IB")
+ODD = WindowSpec(WindowAnchor.TRADING_DATE_CT, 571, 958, "09:31-15:58")
+
+# Trading date -> (ticks X trades above IB high, ticks below IB low).
+_BREAKS = {
+    20250303: (0, 0),
+    20250304: (4, 0),
+    20250305: (0, 2),
+    20250306: (3, 5),
+    20250307: (1, 0),
+    20250310: (4, 4),
+}
+_POLICY = MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=0.05, y_tol=0.05)
+
+
+@pytest.fixture()
+def instrument_id(pg_conn: psycopg.Connection) -> int:
+    """
+    RTH bars (08:30-15:59 CT) trading in [999, 1001] ticks except one X bar
+    at 11:40 reaching _BREAKS above/below; 03-10 misses 10 of its IB bars.
+    """
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    rows = []
+    for day, (td, (up, down)) in enumerate(_BREAKS.items()):
+        for minute in range(510, 960):
+            if td == 20250310 and minute < 520:
+                continue
+            high, low = (1001 + up, 999 - down) if minute == 700 else (1001, 999)
+            ts = 1_740_960_000 + day * 86400 + minute * 60
+            rows.append(
+                (instrument_id, ts, td, minute, 250.0, high * 0.25, low * 0.25, 250.0, 1, 1, None)
+            )
+    upsert_bars_1m(pg_conn, rows, merge_policy="skip")
+    rebuild_bars_30m_range(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=20250301,
+        td_max=20250331,
+        derived_from_import_id=None,
+    )
+    return instrument_id
+
+
+def _run(conn: psycopg.Connection, instrument_id: int, **kwargs):
+    return run_range_break(
+        conn,
+        instrument_id=instrument_id,
+        td_min=20250301,
+        td_max=20250331,
+        policy=_POLICY,
+        **{"x": REST, "y": IB, **kwargs},
+    )
+
+
+def test_range_break_per_day_and_aggregates(pg_conn: psycopg.Connection, instrument_id: int):
+    report = _run(pg_conn, instrument_id)
+
+    days = report.days
+    assert [f.resolution for f in report.x_plan.fragments] == ["30m", "60m"]
+    assert [f.resolution for f in report.y_plan.fragments] == ["30m"]
+    assert days.trading_date_ct_int.tolist() == list(_BREAKS)
+    # Levels and sizes are in points: 1001 ticks of 0.25 is 250.25.
+    assert days.y_high.tolist() == [250.25] * 6
+    assert days.x_high.tolist() == [250.25, 251.25, 250.25, 251.0, 250.5, 251.25]
+    assert days.included.tolist() == [True] * 5 + [False]
+    assert days.break_up_size.tolist() == [0, 1.0, 0, 0.75, 0.25, 0]
+    assert days.break_down_size.tolist() == [0, 0, 0.5, 1.25, 0, 0]
+    assert (report.total_days_evaluated, report.excluded_days) == (5, 1)
+    assert report.excluded_by_role == {WindowRole.X: 0, WindowRole.Y: 1}
+    assert report.breached == report.break_either == BreakCount(4, 80.0)
+    assert report.break_up == BreakCount(3, 60.0)
+    assert report.break_down == BreakCount(2, 40.0)
+    assert report.break_both == BreakCount(1, 20.0)
+    assert report.no_break == BreakCount(1, 20.0)
+
+
+def test_range_break_min_size_and_direction(pg_conn: psycopg.Connection, instrument_id: int):
+    # Tick size 0.25: 0.5 points = 2 ticks, so 03-07's 1-tick break no longer counts.
+    report = _run(pg_conn, instrument_id, min_break_size=0.5, direction=BreakDirection.UP)
+
+    assert report.days.broke_up.tolist() == [False, True, False, True, False, False]
+    assert report.breached == report.break_up == BreakCount(2, 40.0)
+    assert report.break_either == BreakCount(3, 60.0)
+    with pytest.raises(ValueError, match="not a multiple of tick size 0.25"):
+        _run(pg_conn, instrument_id, min_break_size=0.3)
+
+
+def test_range_break_resolution_does_not_change_results(
+    pg_conn: psycopg.Connection, instrument_id: int
+):
+    chosen = _run(pg_conn, instrument_id)
+    pure_1m = _run(pg_conn, instrument_id, resolutions=())
+    odd = _run(pg_conn, instrument_id, x=ODD)
+
+    for name in ("x_high", "x_low", "y_high", "y_low", "included", "broke_either"):
+        assert getattr(chosen.days, name).tolist() == getattr(pure_1m.days, name).tolist()
+    assert odd.x_plan.fragments[0].resolution == "1m"
+    assert odd.break_either == chosen.break_either
+
+
+def test_range_break_validates_the_window_pair(pg_conn: psycopg.Connection, instrument_id: int):
+    with pytest.raises(ValueError, match="Y must complete before X begins"):
+        _run(pg_conn, instrument_id, x=IB, y=REST)
+    with pytest.raises(ValueError, match="overlap"):
+        _run(pg_conn, instrument_id, y=ODD)
+
+    swapped = _run(pg_conn, instrument_id, x=IB, y=REST, order_rule=WindowOrderRule.ANY)
+    assert swapped.total_days_evaluated == 5
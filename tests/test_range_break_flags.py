@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import pytest
+
+from es_stats.domain.missing_policy import MissingPolicy, MissingPolicyMode, WindowRole
+from es_stats.services.analyses.range_break import (
+    BreakCount,
+    BreakDirection,
+    complete_days,
+    compute_breaks,
+    summarize_breaks,
+)
+from es_stats.services.completeness import evaluate_window_coverage
+
+np = pytest.importorskip("numpy")
+
+_NAN = np.nan
+
+
+def _days(min_break_size: float = 0.0):
+    return compute_breaks(
+        np.array([1, 2, 3, 4, 5, 6]),
+        x_high=np.array([10.0, 14.0, 10.0, 13.0, 11.0, _NAN]),
+        x_low=np.array([5.0, 5.0, 3.0, 0.0, 5.0, _NAN]),
+        x_complete=np.array([True, True, True, True, True, True]),
+        y_high=np.array([10.0, 10.0, 10.0, 10.0, 10.0, 10.0]),
+        y_low=np.array([5.0, 5.0, 5.0, 5.0, 5.0, 5.0]),
+        y_complete=np.array([True, True, True, True, True, False]),
+        tick_size=1.0,
+        min_break_size=min_break_size,
+    )
+
+
+def test_compute_breaks_flags_and_sizes() -> None:
+    days = _days()
+
+    assert days.included.tolist() == [True, True, True, True, True, False]
+    assert days.break_up_size.tolist() == [0, 4, 0, 3, 1, 0]
+    assert days.break_down_size.tolist() == [0, 0, 2, 5, 0, 0]
+    assert days.broke_up.tolist() == [False, True, False, True, True, False]
+    assert days.broke_down.tolist() == [False, False, True, True, False, False]
+    assert days.broke_either.tolist() == [False, True, True, True, True, False]
+    assert days.broke_both.tolist() == [False, False, False, True, False, False]
+    assert days.broke(BreakDirection.DOWN) is days.broke_down
+
+
+def test_min_break_size_filters_small_breaks() -> None:
+    days = _days(min_break_size=2)
+
+    assert days.broke_up.tolist() == [False, True, False, True, False, False]
+    assert days.broke_down.tolist() == [False, False, True, True, False, False]
+    # Sizes are reported whether or not they pass the filter.
+    assert days.break_up_size[4] == 1
+    with pytest.raises(ValueError, match=">= 0"):
+        _days(min_break_size=-1)
+    with pytest.raises(ValueError, match="not a multiple of tick size"):
+        _days(min_break_size=1.5)
+
+
+def test_break_sizes_are_whole_ticks_in_points() -> None:
+    # At tick 0.1 the prices carry float noise; 0.3 points is still 3 ticks.
+    days = compute_breaks(
+        np.array([1, 2]),
+        x_high=np.array([40433, 40432]) * 0.1,
+        x_low=np.array([40400, 40400]) * 0.1,
+        x_complete=np.array([True, True]),
+        y_high=np.array([40430, 40430]) * 0.1,
+        y_low=np.array([40400, 40400]) * 0.1,
+        y_complete=np.array([True, True]),
+        tick_size=0.1,
+        min_break_size=0.3,
+    )
+
+    assert days.broke_up.tolist() == [True, False]
+    np.testing.assert_allclose(days.break_up_size, [0.3, 0.2])
+
+
+def test_summarize_breaks() -> None:
+    summary = summarize_breaks(_days(), BreakDirection.UP)
+
+    assert summary == {
+        "breached": BreakCount(3, 60.0),
+        "break_up": BreakCount(3, 60.0),
+        "break_down": BreakCount(2, 40.0),
+        "break_either": BreakCount(4, 80.0),
+        "break_both": BreakCount(1, 20.0),
+        "no_break": BreakCount(1, 20.0),
+    }
+    none_included = compute_breaks(
+        np.array([1]),
+        x_high=np.array([_NAN]),
+        x_low=np.array([_NAN]),
+        x_complete=np.array([False]),
+        y_high=np.array([1.0]),
+        y_low=np.array([0.0]),
+        y_complete=np.array([True]),
+        tick_size=1.0,
+    )
+    assert summarize_breaks(none_included, BreakDirection.EITHER)["no_break"] == BreakCount(0, None)
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [
+        MissingPolicy(mode=MissingPolicyMode.STRICT),
+        MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO),
+        MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=0.05, y_tol=0.1),
+        MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=1 / 3, y_tol=0.2),
+        MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=1.0, y_tol=0.5),
+    ],
+)
+def test_complete_days_matches_evaluate_window_coverage(policy: MissingPolicy) -> None:
+    pairs = [(o, e) for e in range(61) for o in range(e + 3)]
+    observed = np.array([o for o, _ in pairs])
+    expected = np.array([e for _, e in pairs])
+
+    for role in WindowRole:
+        assert complete_days(observed, expected, role=role, policy=policy).tolist() == [
+            evaluate_window_coverage(
+                observed_bar_count=o, expected_bar_count=e, role=role, policy=policy
+            ).is_complete
+            for o, e in pairs
+        ]
@@ -2,20 +2,43 @@ from __future__ import annotations
 
 import pytest
 
+from es_stats.domain.resolutions import (
+    BAR_1M,
+    BAR_30M,
+    DAILY,
+    SESSION,
+    BarResolution,
+    fixed_resolution,
+)
 from es_stats.domain.windows import WindowAnchor, WindowSpec
 from es_stats.services.resolution import choose_resolution
 
 
+def _w(start: int, end: int) -> WindowSpec:
+    return WindowSpec(WindowAnchor.TRADING_DATE_CT, start, end)
+
+
 def test_choose_resolution_prefers_30m_when_all_windows_align() -> None:
     windows = [
         WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH"),
         WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 509, "ON"),
     ]
-    assert choose_resolution(windows) == "30m"
+    assert choose_resolution(windows, derived=()) == "30m"
+
+
+def test_choose_resolution_picks_coarsest_exact_derived_resolution() -> None:
+    rth_on = [_w(510, 959), _w(1020, 509)]
+    assert choose_resolution(rth_on) == "session"
+    assert choose_resolution([_w(1020, 1019)]) == "daily"
+    assert choose_resolution([_w(540, 554)]) == "15m"
+    assert choose_resolution([_w(540, 599)]) == "60m"
+    assert choose_resolution([_w(510, 569)]) == "30m"  # 60m buckets start on the hour
+    assert choose_resolution([_w(515, 524)]) == "5m"
+    assert choose_resolution([_w(540, 554), _w(510, 959)]) == "15m"
 
 
 def test_choose_resolution_uses_1m_for_non_aligned_start() -> None:
-    windows = [WindowSpec(WindowAnchor.TRADING_DATE_CT, 515, 959, "misaligned")]
+    windows = [WindowSpec(WindowAnchor.TRADING_DATE_CT, 517, 959, "misaligned")]
     assert choose_resolution(windows) == "1m"
 
 
@@ -27,7 +50,7 @@ def test_choose_resolution_uses_1m_for_non_aligned_end() -> None:
 def test_choose_resolution_uses_1m_if_any_window_needs_it() -> None:
     windows = [
         WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH"),
-        WindowSpec(WindowAnchor.TRADING_DATE_CT, 540, 554, "15m slice"),
+        WindowSpec(WindowAnchor.TRADING_DATE_CT, 540, 553, "14m slice"),
     ]
     assert choose_resolution(windows) == "1m"
 
@@ -35,3 +58,55 @@ def test_choose_resolution_uses_1m_if_any_window_needs_it() -> None:
 def test_choose_resolution_rejects_empty_windows() -> None:
     with pytest.raises(ValueError, match="at least one window"):
         choose_resolution([])
+
+
+def test_fixed_resolution_buckets_align_to_trading_day_start() -> None:
+    r15 = fixed_resolution(15)
+    assert r15.name == "15m"
+    assert r15.bucket_count == 96
+    assert r15.bucket_start(1020) == 1020
+    assert r15.bucket_start(554) == 540
+    assert r15.bucket_minutes(540) == 15
+
+
+@pytest.mark.parametrize("minutes", [0, -5, 7, 1441])
+def test_fixed_resolution_rejects_sizes_not_dividing_the_day(minutes: int) -> None:
+    with pytest.raises(ValueError, match="must divide"):
+        fixed_resolution(minutes)
+
+
+def test_session_and_daily_buckets_wrap_midnight() -> None:
+    assert SESSION.bucket_start(0) == 1020
+    assert SESSION.bucket_start(509) == 1020
+    assert SESSION.bucket_start(510) == 510
+    assert SESSION.bucket_start(1019) == 960
+    assert [SESSION.bucket_minutes(s) for s in (1020, 510, 960)] == [930, 450, 60]
+    assert DAILY.bucket_start(1019) == 1020
+    assert DAILY.bucket_minutes(1020) == 1440
+
+
+def test_covers_exactly_needs_both_window_edges_on_bucket_boundaries() -> None:
+    assert SESSION.covers_exactly(_w(1020, 959))  # ON + RTH
+    assert not SESSION.covers_exactly(_w(1020, 929))
+    assert not SESSION.covers_exactly(_w(540, 959))
+    assert DAILY.covers_exactly(_w(1020, 1019))
+    assert not DAILY.covers_exactly(_w(510, 959))
+
+
+def test_bar_resolution_rejects_bad_layouts() -> None:
+    with pytest.raises(ValueError, match="at least one"):
+        BarResolution("empty", ())
+    with pytest.raises(ValueError, match="duplicate"):
+        BarResolution("dup", (0, 0))
+    with pytest.raises(ValueError, match=r"\[0, 1439\]"):
+        BarResolution("late", (1440,))
+
+
+def test_expected_bars_counts_buckets_overlapping_the_window() -> None:
+    assert BAR_1M.expected_bars(_w(515, 614)) == 100
+    assert BAR_30M.expected_bars(_w(510, 959)) == 15
+    assert BAR_30M.expected_bars(_w(515, 614)) == 4  # 08:30, 09:00, 09:30, 10:00
+    assert SESSION.expected_bars(_w(500, 520)) == 2  # ON and RTH
+    assert DAILY.expected_bars(_w(0, 5)) == 1
+    assert DAILY.expected_bars(_w(1020, 1019)) == 1
+    assert fixed_resolution(60).expected_bars(_w(1, 0)) == 24
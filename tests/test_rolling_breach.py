@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+from es_stats.services.analyses.range_break import BreakDirection, compute_breaks
+from es_stats.services.analyses.rolling_breach import RateMoments, rolling_breach
+
+np = pytest.importorskip("numpy")
+
+
+def _days(seed: int, n: int = 60):
+    rng = np.random.default_rng(seed)
+    y_high = np.full(n, 100.0)
+    x_high = 100.0 + rng.integers(-3, 4, n)
+    x_high[rng.random(n) < 0.1] = np.nan
+    return compute_breaks(
+        np.arange(20250101, 20250101 + n),
+        x_high=x_high,
+        x_low=x_high - 10,
+        x_complete=rng.random(n) > 0.1,
+        y_high=y_high,
+        y_low=y_high - 5,
+        y_complete=np.ones(n, dtype=bool),
+        tick_size=1.0,
+    )
+
+
+def test_rolling_breach_matches_per_window_counts() -> None:
+    days = _days(1)
+    length = 7
+
+    s = rolling_breach("ES", days, direction=BreakDirection.UP, length=length)
+
+    assert len(s.trading_date_ct_int) == len(days) - length + 1
+    assert s.trading_date_ct_int[0] == days.trading_date_ct_int[length - 1]
+    for i, end in enumerate(range(length, len(days) + 1)):
+        window = slice(end - length, end)
+        n = int(days.included[window].sum())
+        count = int(days.broke_up[window].sum())
+        assert (s.rolling_n[i], s.rolling_breach_count[i]) == (n, count)
+        assert s.rolling_excluded_days[i] == length - n
+        if n:
+            assert s.rolling_breach_rate[i] == count / n
+        else:
+            assert np.isnan(s.rolling_breach_rate[i])
+
+
+def test_rolling_breach_short_history_and_bad_length() -> None:
+    days = _days(2, n=5)
+    assert len(rolling_breach("ES", days, direction=BreakDirection.EITHER, length=6).rolling_n) == 0
+    with pytest.raises(ValueError, match=">= 1"):
+        rolling_breach("ES", days, direction=BreakDirection.EITHER, length=0)
+
+
+def test_rate_moments_match_numpy() -> None:
+    series = [
+        rolling_breach(f"S{seed}", _days(seed), direction=BreakDirection.EITHER, length=5)
+        for seed in range(4)
+    ]
+    moments = RateMoments()
+    for s in series:
+        moments.add(s)
+    cross = moments.result()
+
+    rates = np.vstack([s.rolling_breach_rate for s in series])
+    assert cross.trading_date_ct_int.tolist() == series[0].trading_date_ct_int.tolist()
+    assert cross.symbol_count.tolist() == (~np.isnan(rates)).sum(axis=0).tolist()
+    np.testing.assert_allclose(cross.mean_rate, np.nanmean(rates, axis=0))
+    np.testing.assert_allclose(cross.std_rate, np.nanstd(rates, axis=0), atol=1e-12)
+    np.testing.assert_array_equal(cross.min_rate, np.nanmin(rates, axis=0))
+    np.testing.assert_array_equal(cross.max_rate, np.nanmax(rates, axis=0))
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import psycopg
+import pytest
+
+from es_stats.domain.missing_policy import MissingPolicy, MissingPolicyMode
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.repositories.bars_1m_repo import upsert_bars_1m
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.services.analyses.range_break import BreakDirection, run_range_break
+from es_stats.services.analyses.rolling_breach import rolling_breach, run_rolling_breach
+
+np = pytest.importorskip("numpy")
+
+IB = WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 569, "IB")
+REST = WindowSpec(WindowAnchor.TRADING_DATE_CT, 570, 959, "RTH after IB")
+_POLICY = MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=0.05, y_tol=0.05)
+_DATES = (20250303, 20250304, 20250305, 20250306, 20250307, 20250310, 20250311, 20250312)
+
+# Per symbol and date: ticks the X window trades above the IB high (None = IB bars missing).
+_UP = {
+    "ES": (0, 2, 0, 1, None, 3, 0, 1),
+    "NQ": (1, 1, 0, 0, 0, 2, None, 0),
+}
+
+
+def _load(conn: psycopg.Connection, symbol: str) -> int:
+    instrument_id = ensure_instrument(conn, symbol)
+    rows = []
+    for day, (td, up) in enumerate(zip(_DATES, _UP[symbol])):
+        for minute in range(510 if up is not None else 530, 960):
+            high = 1001 + (up or 0) if minute == 700 else 1001
+            ts = 1_740_960_000 + day * 86400 + minute * 60
+            rows.append(
+                (instrument_id, ts, td, minute, 250.0, high * 0.25, 249.75, 250.0, 1, 1, None)
+            )
+    upsert_bars_1m(conn, rows, merge_policy="skip")
+    rebuild_bars_30m_range(
+        conn,
+        instrument_id=instrument_id,
+        td_min=20250301,
+        td_max=20250331,
+        derived_from_import_id=None,
+    )
+    return instrument_id
+
+
+def _run(postgres_url: str, **kwargs):
+    return run_rolling_breach(
+        td_min=20250301,
+        td_max=20250331,
+        x=REST,
+        y=IB,
+        policy=_POLICY,
+        direction=BreakDirection.UP,
+        length=3,
+        database_url=postgres_url,
+        **{"symbols": ["ES", "NQ"], **kwargs},
+    )
+
+
+def test_rolling_breach_per_symbol_and_across(pg_conn: psycopg.Connection, postgres_url: str):
+    es_id = _load(pg_conn, "ES")
+    _load(pg_conn, "NQ")
+    pg_conn.commit()
+
+    report = _run(postgres_url)
+    pooled = _run(postgres_url, workers=2)
+
+    assert list(report.series) == ["ES", "NQ"]
+    es = report.series["ES"]
+    assert es.trading_date_ct_int.tolist() == list(_DATES[2:])
+    assert es.rolling_n.tolist() == [3, 3, 2, 2, 2, 3]
+    assert es.rolling_excluded_days.tolist() == [0, 0, 1, 1, 1, 0]
+    assert es.rolling_breach_count.tolist() == [1, 2, 1, 2, 1, 2]
+    np.testing.assert_allclose(es.rolling_breach_rate, [1 / 3, 2 / 3, 1 / 2, 1, 1 / 2, 2 / 3])
+    nq = report.series["NQ"].rolling_breach_rate
+    np.testing.assert_allclose(nq, [2 / 3, 1 / 3, 0, 1 / 3, 1 / 2, 1 / 2])
+
+    expected = rolling_breach(
+        "ES",
+        run_range_break(
+            pg_conn,
+            instrument_id=es_id,
+            td_min=20250301,
+            td_max=20250331,
+            x=REST,
+            y=IB,
+            policy=_POLICY,
+        ).days,
+        direction=BreakDirection.UP,
+        length=3,
+    )
+    np.testing.assert_array_equal(es.rolling_breach_count, expected.rolling_breach_count)
+
+    cross = report.cross_symbol
+    rates = np.vstack([es.rolling_breach_rate, nq])
+    assert cross.trading_date_ct_int.tolist() == list(_DATES[2:])
+    assert cross.symbol_count.tolist() == [2] * 6
+    np.testing.assert_allclose(cross.mean_rate, rates.mean(axis=0))
+    np.testing.assert_allclose(cross.std_rate, rates.std(axis=0), atol=1e-12)
+
+    for name in ("rolling_n", "rolling_breach_count", "rolling_excluded_days"):
+        for symbol in ("ES", "NQ"):
+            assert getattr(pooled.series[symbol], name).tolist() == getattr(
+                report.series[symbol], name
+            ).tolist()
+    np.testing.assert_allclose(pooled.cross_symbol.std_rate, cross.std_rate)
+
+
+def test_rolling_breach_unknown_symbol(pg_conn: psycopg.Connection, postgres_url: str):
+    with pytest.raises(ValueError, match="unknown symbol 'ES'"):
+        _run(postgres_url)
+    with pytest.raises(ValueError, match="at least one symbol"):
+        _run(postgres_url, symbols=[])
+
+
+def test_rolling_breach_rejects_repeated_symbols(postgres_url: str):
+    with pytest.raises(ValueError, match="repeated symbol"):
+        _run(postgres_url, symbols=["ES", "NQ", "ES"])
@@ -1,6 +1,15 @@
 from __future__ import annotations
 
 import psycopg
+import pytest
+
+from es_stats.db.connection import execute_script
+from es_stats.repositories.bars_1m_repo import upsert_bars_1m
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.partitions_repo import ensure_bars_partitions
+from es_stats.repositories.schema_repo import apply_schema
+from es_stats.repositories.sql_loader import load_sql
 
 
 def test_schema_init_creates_tables(pg_conn: psycopg.Connection):
@@ -18,3 +27,147 @@ def test_schema_init_creates_tables(pg_conn: psycopg.Connection):
     assert "imports" in table_names
     assert "bars_1m" in table_names
     assert "bars_30m" in table_names
+
+
+def test_apply_schema_is_idempotent_and_indexes_source_hash(pg_conn: psycopg.Connection):
+    apply_schema(pg_conn)
+    apply_schema(pg_conn)
+
+    index_names = {
+        r[0]
+        for r in pg_conn.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'imports';"
+        ).fetchall()
+    }
+    assert "idx_imports_instrument_source_hash" in index_names
+
+
+def _partitions(conn: psycopg.Connection, table: str) -> set[str]:
+    return {
+        r[0]
+        for r in conn.execute(
+            """
+            SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass;
+            """,
+            (table,),
+        ).fetchall()
+    }
+
+
+def test_apply_schema_migrates_plain_bars_tables_into_partitions(pg_conn: psycopg.Connection):
+    # Recreate the pre-partitioning layout with some data in it.
+    pg_conn.execute("DROP TABLE bars_30m CASCADE;")
+    pg_conn.execute("DROP TABLE bars_1m CASCADE;")
+    execute_script(pg_conn, load_sql("schema/001_init.sql"))
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    for ts, td in ((1_704_100_000, 20231231), (1_704_200_000, 20240102), (1_735_800_000, 20250102)):
+        pg_conn.execute(
+            """
+            INSERT INTO bars_1m (instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+                                 open, high, low, close, volume, trades_count)
+            VALUES (%s, %s, %s, 0, 1, 2, 0.5, 1.5, 1, 1);
+            """,
+            (instrument_id, ts, td),
+        )
+
+    apply_schema(pg_conn)
+    apply_schema(pg_conn)
+
+    relkind = pg_conn.execute("SELECT relkind FROM pg_class WHERE relname = 'bars_1m';").fetchone()
+    assert relkind == ("p",)
+    assert _partitions(pg_conn, "bars_1m") == {
+        "bars_1m_default",
+        "bars_1m_y2023",
+        "bars_1m_y2024",
+        "bars_1m_y2025",
+    }
+    assert _partitions(pg_conn, "bars_30m") == {"bars_30m_default"}
+    assert pg_conn.execute("SELECT COUNT(*) FROM bars_1m_y2024;").fetchone() == (1,)
+    assert pg_conn.execute("SELECT COUNT(*) FROM bars_1m;").fetchone() == (3,)
+    # Prices became integer ticks of the default 0.25 tick size.
+    prices = pg_conn.execute("SELECT open, high, low, close FROM bars_1m_y2024;").fetchone()
+    assert prices == (4, 8, 2, 6)
+
+
+def test_apply_schema_refuses_to_round_off_tick_prices(pg_conn: psycopg.Connection):
+    pg_conn.execute("DROP TABLE bars_30m CASCADE;")
+    pg_conn.execute("DROP TABLE bars_1m CASCADE;")
+    execute_script(pg_conn, load_sql("schema/001_init.sql"))
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    pg_conn.execute(
+        """
+        INSERT INTO bars_1m (instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+                             open, high, low, close, volume, trades_count)
+        VALUES (%s, 1_704_200_000, 20240102, 0, 1, 2.1, 0.5, 1.5, 1, 1);
+        """,
+        (instrument_id,),
+    )
+
+    with pytest.raises(RuntimeError, match="not multiples of their instrument's tick_size"):
+        apply_schema(pg_conn)
+
+
+def test_new_year_partition_takes_rows_out_of_default(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    pg_conn.execute(
+        """
+        INSERT INTO bars_1m (instrument_id, ts_start_utc, trading_date_ct_int, ct_minute_of_day,
+                             open, high, low, close, volume, trades_count)
+        VALUES (%s, 1_900_000_000, 20300321, 0, 1, 2, 0.5, 1.5, 1, 1);
+        """,
+        (instrument_id,),
+    )
+    assert pg_conn.execute("SELECT COUNT(*) FROM bars_1m_default;").fetchone() == (1,)
+
+    created = ensure_bars_partitions(pg_conn, "bars_1m", td_min=20291231, td_max=20300321)
+
+    assert created == ["bars_1m_y2029", "bars_1m_y2030"]
+    assert ensure_bars_partitions(pg_conn, "bars_1m", td_min=20300101, td_max=20301231) == []
+    assert pg_conn.execute("SELECT COUNT(*) FROM bars_1m_default;").fetchone() == (0,)
+    assert pg_conn.execute("SELECT COUNT(*) FROM bars_1m_y2030;").fetchone() == (1,)
+
+
+def test_apply_schema_backfills_bucket_end_utc(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    rows = [
+        (instrument_id, 1_735_830_000 + 60 * i, 20250102, 510 + i, 100, 101, 99, 100, 1, 1, None)
+        for i in range(0, 40, 3)
+    ]
+    upsert_bars_1m(pg_conn, rows, merge_policy="skip")
+    rebuild_bars_30m_range(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=20250102,
+        td_max=20250102,
+        derived_from_import_id=None,
+    )
+    expected = pg_conn.execute(
+        "SELECT bucket_ct_minute_of_day, bucket_end_utc FROM bars_30m ORDER BY 1;"
+    ).fetchall()
+    assert expected == [(510, 1_735_830_000 + 60 * 27), (540, 1_735_830_000 + 60 * 39)]
+
+    # A database from before bucket_end_utc: nullable, unset, plus a stale bucket.
+    for table in ("bars_30m", "bars_derived"):
+        pg_conn.execute(f"ALTER TABLE {table} ALTER COLUMN bucket_end_utc DROP NOT NULL;")
+        pg_conn.execute(f"UPDATE {table} SET bucket_end_utc = NULL;")
+    pg_conn.execute(
+        """
+        INSERT INTO bars_30m (instrument_id, bucket_start_utc, trading_date_ct_int,
+                              bucket_ct_minute_of_day, open, high, low, close, volume,
+                              trades_count, bar_count_1m)
+        VALUES (%s, 1_735_840_000, 20250102, 600, 1, 1, 1, 1, 1, 1, 1);
+        """,
+        (instrument_id,),
+    )
+
+    apply_schema(pg_conn)
+
+    assert pg_conn.execute(
+        "SELECT bucket_ct_minute_of_day, bucket_end_utc FROM bars_30m ORDER BY 1;"
+    ).fetchall() == expected
+    assert pg_conn.execute(
+        "SELECT bucket_end_utc FROM bars_derived WHERE resolution = 'daily';"
+    ).fetchall() == [(1_735_830_000 + 60 * 39,)]
+    with pytest.raises(psycopg.errors.NotNullViolation):
+        pg_conn.execute("UPDATE bars_30m SET bucket_end_utc = NULL;")
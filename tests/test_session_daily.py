@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import psycopg
+import pytest
+
+from es_stats.repositories.bars_1m_repo import upsert_bars_1m
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_dirty, rebuild_bars_30m_range
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.schema_repo import apply_schema
+from es_stats.repositories.session_daily_repo import SessionDay, fetch_session_daily
+
+_TD = 20250102
+_TS0 = 1_735_772_400  # 2025-01-01 17:00 CT, start of trading date 2025-01-02
+
+
+def _rows(
+    instrument_id: int, td: int = _TD, *, minutes=None, bump: int | None = None
+) -> list[tuple]:
+    """Minute i of the trading day is CT minute (1020 + i) % 1440; `bump` raises one bar's high."""
+    day = td - _TD
+    rows = []
+    for i in range(1440):
+        minute = (1020 + i) % 1440
+        if minutes is not None and minute not in minutes:
+            continue
+        open_ = 1000 + 0.25 * (i % 40)
+        high = open_ + (10 if minute == bump else 1)
+        rows.append(
+            (instrument_id, _TS0 + day * 86400 + 60 * i, td, minute,
+             open_, high, open_ - 1, open_ + 0.25, 1 + i % 3, 1, None)
+        )
+    return rows
+
+
+def _from_bars_derived(conn: psycopg.Connection, instrument_id: int) -> dict[str, tuple]:
+    """Same sessions via the 'session' and 'daily' bars_derived buckets (ticks as prices)."""
+    rows = conn.execute(
+        """
+        SELECT resolution, bucket_ct_minute_of_day, open, high, low, close,
+               volume, trades_count, bar_count_1m
+        FROM bars_derived
+        WHERE instrument_id = %s AND trading_date_ct_int = %s
+          AND resolution IN ('session', 'daily');
+        """,
+        (instrument_id, _TD),
+    ).fetchall()
+    by_bucket = {(r[0], r[1]): (*(t * 0.25 for t in r[2:6]), *r[6:]) for r in rows}
+    return {
+        "ON": by_bucket[("session", 1020)],
+        "RTH": by_bucket[("session", 510)],
+        "FULL_DAY": by_bucket[("daily", 1020)],
+    }
+
+
+def _ohlc(days: list[SessionDay]) -> dict[str, tuple]:
+    return {
+        d.session: (d.open, d.high, d.low, d.close, d.volume, d.trades_count, d.bar_count_1m)
+        for d in days
+    }
+
+
+def test_rebuild_writes_on_rth_and_full_day(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    upsert_bars_1m(pg_conn, _rows(instrument_id), merge_policy="skip")
+
+    counts = rebuild_bars_30m_range(
+        pg_conn, instrument_id=instrument_id, td_min=_TD, td_max=_TD, derived_from_import_id=None
+    )
+
+    assert (counts.session_deleted, counts.session_inserted) == (0, 3)
+    days = fetch_session_daily(pg_conn, instrument_id=instrument_id, td_min=_TD, td_max=_TD)
+    assert [d.session for d in days] == ["ON", "RTH", "FULL_DAY"]
+    assert [d.bucket_count_30m for d in days] == [31, 15, 48]
+    assert days[0].first_bar_utc == _TS0
+    assert days[2].last_bar_utc == _TS0 + 1439 * 60
+    assert _ohlc(days) == _from_bars_derived(pg_conn, instrument_id)
+
+    rerun = rebuild_bars_30m_range(
+        pg_conn, instrument_id=instrument_id, td_min=_TD, td_max=_TD, derived_from_import_id=None
+    )
+    assert (rerun.session_deleted, rerun.session_inserted) == (3, 3)
+
+
+def test_dirty_rebuild_refreshes_the_touched_dates(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    upsert_bars_1m(pg_conn, _rows(instrument_id), merge_policy="skip")
+    upsert_bars_1m(pg_conn, _rows(instrument_id, _TD + 1), merge_policy="skip")
+    rebuild_bars_30m_range(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=_TD,
+        td_max=_TD + 1,
+        derived_from_import_id=None,
+    )
+    next_day = dict(instrument_id=instrument_id, td_min=_TD + 1, td_max=_TD + 1)
+    other_day = fetch_session_daily(pg_conn, **next_day)
+
+    # Raise the high of 10:00 on the first date only.
+    upsert_bars_1m(
+        pg_conn, _rows(instrument_id, bump=600), merge_policy="overwrite", changed_only=True
+    )
+    dirty = rebuild_bars_30m_dirty(
+        pg_conn, instrument_id=instrument_id, derived_from_import_id=None
+    )
+
+    assert (dirty.session_deleted, dirty.session_inserted) == (3, 3)
+    days = fetch_session_daily(pg_conn, instrument_id=instrument_id, td_min=_TD, td_max=_TD)
+    assert _ohlc(days) == _from_bars_derived(pg_conn, instrument_id)
+    assert [d.high for d in days] == [1010.75, 1015.0, 1015.0]
+    assert fetch_session_daily(pg_conn, **next_day) == other_day
+
+
+def test_partial_day_and_session_filter(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    rth = set(range(510, 960))
+    upsert_bars_1m(pg_conn, _rows(instrument_id, minutes=rth), merge_policy="skip")
+    rebuild_bars_30m_range(
+        pg_conn, instrument_id=instrument_id, td_min=_TD, td_max=_TD, derived_from_import_id=None
+    )
+
+    day = dict(instrument_id=instrument_id, td_min=_TD, td_max=_TD)
+    days = fetch_session_daily(pg_conn, **day, sessions=["FULL_DAY", "ON", "RTH"])
+
+    # No ON bars, so no ON row; FULL_DAY equals RTH.
+    assert [d.session for d in days] == ["FULL_DAY", "RTH"]
+    assert _ohlc(days)["FULL_DAY"] == _ohlc(days)["RTH"]
+    assert days[0].bar_count_1m == 450
+    with pytest.raises(ValueError, match="unknown session"):
+        fetch_session_daily(pg_conn, **day, sessions=["IB"])
+
+
+def test_apply_schema_builds_missing_session_daily(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    upsert_bars_1m(pg_conn, _rows(instrument_id), merge_policy="skip")
+    rebuild_bars_30m_range(
+        pg_conn, instrument_id=instrument_id, td_min=_TD, td_max=_TD, derived_from_import_id=None
+    )
+    before = fetch_session_daily(pg_conn, instrument_id=instrument_id, td_min=_TD, td_max=_TD)
+    pg_conn.execute("DELETE FROM session_daily;")
+
+    apply_schema(pg_conn)
+
+    assert fetch_session_daily(
+        pg_conn, instrument_id=instrument_id, td_min=_TD, td_max=_TD
+    ) == before
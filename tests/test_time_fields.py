@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from zoneinfo import ZoneInfo
 
 import pytest
 
-from es_stats.services.time_fields import compute_time_fields
+from es_stats.services.time_fields import (
+    compute_time_fields,
+    compute_time_fields_batch,
+    compute_time_fields_from_epoch,
+)
 
 
 def test_ct_minute_of_day_basic():
@@ -42,3 +47,82 @@ def test_dst_gap_is_rejected():
     dt = datetime(2025, 3, 9, 2, 30, 0)
     with pytest.raises(ValueError):
         compute_time_fields(dt, "America/Chicago")
+
+
+def _scalar_or_error(dt: datetime, tz: str):
+    try:
+        return compute_time_fields(dt, tz)
+    except ValueError as e:
+        return str(e)
+
+
+def _batch_or_error(dt: datetime, tz: str):
+    try:
+        return compute_time_fields_batch([dt], tz)[0]
+    except ValueError as e:
+        return str(e)
+
+
+@pytest.mark.parametrize("tz", ["America/Chicago", "America/New_York", "Europe/London", "UTC"])
+def test_batch_matches_scalar_around_dst_transitions(tz: str) -> None:
+    # Every minute of the hours around each transition (and the CT 17:00 rollover)
+    # on the DST-change days of several years, plus an ordinary day.
+    zone = ZoneInfo(tz)
+    days = [datetime(2025, 6, 4)]
+    for year in (2007, 2015, 2020, 2024, 2025, 2026):
+        for month in (3, 10, 11):
+            for d in range(31):
+                day = datetime(year, month, 1) + timedelta(days=d)
+                nxt = day + timedelta(days=1)
+                if day.month == month and zone.utcoffset(day) != zone.utcoffset(nxt):
+                    days.append(day)
+    dts = [
+        day + timedelta(hours=h, minutes=m)
+        for day in days
+        for h in (0, 1, 2, 3, 16, 17, 23)
+        for m in range(60)
+    ]
+
+    expected = {dt: _scalar_or_error(dt, tz) for dt in dts}
+    valid = [dt for dt in dts if not isinstance(expected[dt], str)]
+    gaps = [dt for dt in dts if isinstance(expected[dt], str)]
+    if tz in ("America/Chicago", "America/New_York"):
+        assert len(gaps) == 60 * 6  # one missing hour per spring-forward
+
+    batch = compute_time_fields_batch(valid, tz)
+    assert [batch[i] for i in range(len(batch))] == [expected[dt] for dt in valid]
+    for dt in gaps:
+        assert _batch_or_error(dt, tz) == expected[dt]
+
+
+def test_batch_ambiguous_time_uses_fold_0() -> None:
+    # 2025-11-02 01:30 CT happens twice; fold=0 is the earlier (CDT) instant.
+    dt = datetime(2025, 11, 2, 1, 30)
+    assert compute_time_fields_batch([dt], "America/Chicago")[0] == compute_time_fields(
+        dt, "America/Chicago"
+    )
+    assert compute_time_fields_batch([dt], "America/Chicago").ts_start_utc[0] == int(
+        datetime(2025, 11, 2, 6, 30, tzinfo=UTC).timestamp()
+    )
+
+
+def test_batch_dst_gap_is_rejected_with_scalar_message() -> None:
+    dt = datetime(2025, 3, 9, 2, 30, 0)
+    with pytest.raises(ValueError) as scalar:
+        compute_time_fields(dt, "America/Chicago")
+    with pytest.raises(ValueError) as batch:
+        compute_time_fields_batch([datetime(2025, 3, 9, 1, 59), dt], "America/Chicago")
+    assert str(batch.value) == str(scalar.value)
+
+
+def test_batch_epoch_and_mixed_inputs() -> None:
+    aware = datetime(2025, 1, 1, 0, 0, tzinfo=UTC)
+    naive = datetime(2025, 1, 2, 8, 30)
+
+    mixed = compute_time_fields_batch([aware, naive], "America/New_York")
+    assert mixed[0] == compute_time_fields(aware, "America/New_York")
+    assert mixed[1] == compute_time_fields(naive, "America/New_York")
+
+    epoch = compute_time_fields_from_epoch([int(aware.timestamp())])
+    assert epoch[0] == compute_time_fields(aware, "America/Chicago")
+    assert len(compute_time_fields_from_epoch([])) == 0
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from es_stats.domain.calendar import TradingSession
+from es_stats.services.trading_calendar import (
+    generate_sessions,
+    parse_calendar_csv,
+    parse_session_hours,
+    trading_session,
+)
+
+
+def test_parse_session_hours_treats_close_as_exclusive() -> None:
+    assert parse_session_hours("17:00-16:00") == (1020, 959)
+    assert parse_session_hours("08:30-12:00") == (510, 719)
+    assert parse_session_hours("17:00-17:00") == (1020, 1019)
+    with pytest.raises(ValueError, match="HH:MM-HH:MM"):
+        parse_session_hours("17:00")
+    with pytest.raises(ValueError, match="HH:MM time"):
+        parse_session_hours("17:00-25:00")
+
+
+def test_trading_session_requires_open_and_close_together() -> None:
+    with pytest.raises(ValueError, match="both be set or both be None"):
+        TradingSession(20250106, 1020, None)
+    with pytest.raises(ValueError, match=r"close_minute_ct must be in \[0, 1439\]"):
+        TradingSession(20250106, 1020, 1440)
+
+
+def test_generate_sessions_covers_every_date_in_the_range() -> None:
+    overrides = {
+        20250703: trading_session(date(2025, 7, 3), 1020, 719),
+        20250704: trading_session(date(2025, 7, 4), None, None),
+    }
+    sessions = generate_sessions(date(2025, 7, 3), date(2025, 7, 7), overrides=overrides)
+
+    assert [(s.trading_date_ct_int, s.open_minute_ct, s.close_minute_ct) for s in sessions] == [
+        (20250703, 1020, 719),
+        (20250704, None, None),
+        (20250705, None, None),
+        (20250706, None, None),
+        (20250707, 1020, 959),
+    ]
+    assert [s.expected_mask.bit_count() for s in sessions] == [1140, 0, 0, 0, 1380]
+    assert sessions[-1].expected_mask == sessions[-1].session_window.minute_mask
+    with pytest.raises(ValueError, match="before start"):
+        generate_sessions(date(2025, 7, 7), date(2025, 7, 3))
+
+
+def test_expected_mask_drops_minutes_the_clock_skips() -> None:
+    # DST starts 2025-03-09 02:00 CT: 02:00-02:59 never happens that day.
+    sessions = generate_sessions(
+        date(2025, 3, 9), date(2025, 3, 10), weekdays=frozenset(range(7))
+    )
+    spring, monday = sessions
+    assert spring.expected_mask.bit_count() == 1380 - 60
+    assert not spring.expected_mask >> 120 & 1 and not spring.expected_mask >> 179 & 1
+    assert spring.expected_mask >> 180 & 1
+    # Monday's session opens Sunday 17:00, after the jump.
+    assert monday.expected_mask.bit_count() == 1380
+
+    # 2025-11-02 repeats 01:00-01:59; each CT minute is still expected once.
+    (fall,) = generate_sessions(date(2025, 11, 2), date(2025, 11, 2), weekdays=frozenset(range(7)))
+    assert fall.expected_mask.bit_count() == 1380
+
+    # Evening minutes of a trading date fall on the previous calendar day:
+    # 2025-03-10's full day only crosses 2025-03-09 after the jump.
+    next_day = trading_session(date(2025, 3, 10), 1020, 1019)
+    assert next_day.expected_mask.bit_count() == 1440
+
+
+def test_parse_calendar_csv() -> None:
+    sessions = parse_calendar_csv(
+        [
+            "trading_date,open,close,note\n",
+            "2025-07-03,17:00,12:00,early close\n",
+            "2025-07-04,,,Independence Day\n",
+        ]
+    )
+    assert [(s.trading_date_ct_int, s.open_minute_ct, s.close_minute_ct) for s in sessions] == [
+        (20250703, 1020, 719),
+        (20250704, None, None),
+    ]
+    assert sessions[1].expected_mask == 0
+
+    with pytest.raises(ValueError, match="missing column"):
+        parse_calendar_csv(["trading_date,open\n", "2025-07-03,17:00\n"])
+    with pytest.raises(ValueError, match="line 3: open and close must both be set"):
+        parse_calendar_csv(
+            ["trading_date,open,close\n", "2025-07-03,17:00,12:00\n", "2025-07-04,17:00,\n"]
+        )
+    with pytest.raises(ValueError, match="line 2: expected an HH:MM time"):
+        parse_calendar_csv(["trading_date,open,close\n", "2025-07-03,5pm,12:00\n"])
+    with pytest.raises(ValueError, match=r"line 3: missing value\(s\) for open, close"):
+        parse_calendar_csv(["trading_date,open,close\n", "2025-07-03,17:00,12:00\n", "2024-01-02\n"])
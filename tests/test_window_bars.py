@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import psycopg
+
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.repositories.bars_1m_repo import upsert_bars_1m
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.window_bars_repo import fetch_window_bars
+from es_stats.services.window_planner import plan_windows
+
+_CT = ZoneInfo("America/Chicago")
+
+
+def _rows(instrument_id: int) -> list[tuple]:
+    """
+    Trading dates 2025-11-02 (DST fall-back: 25 hours, CT 01:00-01:59 twice)
+    and 2025-11-03, with every 7th bar and a few repeated-hour bars missing.
+    """
+    rows = []
+    t = datetime(2025, 11, 1, 17, 0, tzinfo=_CT).astimezone(timezone.utc)
+    end = datetime(2025, 11, 3, 17, 0, tzinfo=_CT).astimezone(timezone.utc)
+    i = 0
+    while t < end:
+        ct = t.astimezone(_CT)
+        minute = ct.hour * 60 + ct.minute
+        td_date = ct.date() + timedelta(days=1) if minute >= 1020 else ct.date()
+        second_pass = ct.fold == 1
+        if i % 7 and not (second_pass and minute in (85, 88, 89)):
+            mid = 20000 + (i * 37) % 101
+            rows.append(
+                (
+                    instrument_id,
+                    int(t.timestamp()),
+                    int(td_date.strftime("%Y%m%d")),
+                    minute,
+                    mid * 0.25,
+                    (mid + 1 + i % 3) * 0.25,
+                    (mid - 1 - i % 5) * 0.25,
+                    (mid + i % 2) * 0.25,
+                    1 + i % 11,
+                    1 + i % 4,
+                    None,
+                )
+            )
+        t += timedelta(minutes=1)
+        i += 1
+    return rows
+
+
+def test_hybrid_plan_matches_pure_1m_evaluation(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    upsert_bars_1m(pg_conn, _rows(instrument_id), merge_policy="skip")
+    rebuild_bars_30m_range(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=20251102,
+        td_max=20251103,
+        derived_from_import_id=None,
+    )
+
+    windows = [
+        WindowSpec(WindowAnchor.TRADING_DATE_CT, s, e, name)
+        for name, s, e in (
+            ("IB_ext", 510, 614),
+            ("ON", 1020, 509),
+            ("day", 1020, 1019),
+            ("into_repeat", 45, 89),  # ends inside the repeated 01:00-01:59 hour
+            ("repeat", 61, 119),
+            ("close_edge", 950, 970),
+            ("midnight", 1410, 44),
+        )
+    ]
+    hybrid_plans = plan_windows(windows)
+    pure_plans = plan_windows(windows, ())
+    assert all(f.table == "bars_1m" for p in pure_plans for f in p.fragments)
+    assert sum(p.rows_per_day for p in hybrid_plans) < sum(p.rows_per_day for p in pure_plans)
+
+    kwargs = {"instrument_id": instrument_id, "td_min": 20251102, "td_max": 20251103}
+    hybrid = fetch_window_bars(pg_conn, plans=hybrid_plans, **kwargs)
+    pure = fetch_window_bars(pg_conn, plans=pure_plans, **kwargs)
+
+    assert len(pure) == 2 * len(windows)
+    assert hybrid == pure
+    # The DST day has 25 hours of bars, less the ones dropped above.
+    day = {(b.trading_date_ct_int, b.window_index): b for b in pure}
+    assert day[(20251102, 2)].bar_count_1m == 1500 - 1500 // 7 - 1 - 3
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from statistics import fmean, median
+from zoneinfo import ZoneInfo
+
+import psycopg
+import pytest
+
+from es_stats.domain.missing_policy import MissingPolicy, MissingPolicyMode, WindowRole
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.repositories.bars_1m_repo import upsert_bars_1m
+from es_stats.repositories.bars_30m_repo import rebuild_bars_30m_range
+from es_stats.repositories.day_coverage_repo import fetch_day_coverage
+from es_stats.repositories.instruments_repo import ensure_instrument
+from es_stats.repositories.trading_calendar_repo import upsert_trading_calendar
+from es_stats.services.analyses.window_metrics import run_window_metrics
+from es_stats.services.completeness import CoverageExclusionReason, evaluate_day_coverage
+from es_stats.services.trading_calendar import (
+    DEFAULT_SESSION_MASK,
+    generate_sessions,
+    trading_session,
+)
+
+_CT = ZoneInfo("America/Chicago")
+
+RTH = WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH")
+ON = WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 509, "ON")
+IB = WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 569, "IB")
+ODD = WindowSpec(WindowAnchor.TRADING_DATE_CT, 1431, 14, "23:51-00:14")
+FULL = WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 1019, "FULL")
+
+
+def _load(conn: psycopg.Connection, instrument_id: int) -> dict[int, dict[int, tuple]]:
+    """
+    Bars for trading dates 2025-03-03..05, 07 and 11 (17:00-15:59 CT), with
+    every 97th bar missing, 10:00-11:40 missing on the 5th and the 7th
+    closing at 12:00. Returns {trading date: {CT minute: (o, h, l, c, v, n)}}.
+    """
+    rows, bars = [], {}
+    for day in (3, 4, 5, 7, 11):
+        d = date(2025, 3, day)
+        td = int(d.strftime("%Y%m%d"))
+        bars[td] = {}
+        t = datetime(d.year, d.month, d.day, 17, 0, tzinfo=_CT) - timedelta(days=1)
+        for i in range(1380):
+            ct = (t + timedelta(minutes=i)).astimezone(_CT)
+            minute = ct.hour * 60 + ct.minute
+            if i % 97 == 0 or (td == 20250305 and 600 <= minute <= 700):
+                continue
+            if td == 20250307 and 720 <= minute < 960:
+                continue
+            mid = 20000 + (td * 7 + i * 37) % 151
+            bar = (mid, mid + 1 + i % 3, mid - 1 - i % 5, mid + i % 2, 1 + i % 11, 1 + i % 4)
+            bars[td][minute] = bar
+            ts = int(ct.astimezone(timezone.utc).timestamp())
+            rows.append(
+                (instrument_id, ts, td, minute, *(p * 0.25 for p in bar[:4]), *bar[4:], None)
+            )
+    upsert_bars_1m(conn, rows, merge_policy="skip")
+    rebuild_bars_30m_range(
+        conn,
+        instrument_id=instrument_id,
+        td_min=20250301,
+        td_max=20250331,
+        derived_from_import_id=None,
+    )
+    return bars
+
+
+def _expected_day(bars: dict[int, tuple], window: WindowSpec) -> tuple:
+    # Minutes in session order: 17:00 (previous evening) first; prices at tick 0.25.
+    order = sorted(m for m in bars if m in window.covered_minutes())
+    order = [m for m in order if m >= 1020] + [m for m in order if m < 1020]
+    picked = [bars[m] for m in order]
+    high, low = max(b[1] for b in picked), min(b[2] for b in picked)
+    return (
+        picked[0][0] * 0.25,
+        high * 0.25,
+        low * 0.25,
+        picked[-1][3] * 0.25,
+        (high - low) * 0.25,
+        sum(b[4] for b in picked),
+        sum(b[5] for b in picked),
+        len(picked),
+    )
+
+
+@pytest.fixture()
+def loaded(pg_conn: psycopg.Connection):
+    instrument_id = ensure_instrument(pg_conn, "ES")
+    bars = _load(pg_conn, instrument_id)
+    sessions = generate_sessions(
+        date(2025, 3, 3),
+        date(2025, 3, 10),
+        overrides={
+            20250306: trading_session(date(2025, 3, 6), None, None),
+            20250307: trading_session(date(2025, 3, 7), 1020, 719),
+        },
+    )
+    upsert_trading_calendar(pg_conn, instrument_id=instrument_id, sessions=sessions)
+    return instrument_id, bars, {s.trading_date_ct_int: s.expected_mask for s in sessions}
+
+
+@pytest.mark.parametrize(
+    ("window", "fragments"),
+    [(RTH, ["session"]), (ON, ["session"]), (IB, ["30m"]), (ODD, ["1m", "5m", "15m"])],
+)
+def test_window_metrics_match_bars_1m(pg_conn: psycopg.Connection, loaded, window, fragments):
+    instrument_id, bars, expected_masks = loaded
+    policy = MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=0.05, y_tol=0.0)
+
+    report = run_window_metrics(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=20250301,
+        td_max=20250331,
+        window=window,
+        policy=policy,
+    )
+    pure_1m = run_window_metrics(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=20250301,
+        td_max=20250331,
+        window=window,
+        policy=policy,
+        resolutions=(),
+    )
+
+    assert [f.resolution for f in report.plan.fragments] == fragments
+    assert report.days == pure_1m.days
+    # 03-06 is a holiday, 03-08/09 a weekend: no rows. 03-10 expects bars but has none.
+    assert [d.trading_date_ct_int for d in report.days] == [
+        20250303, 20250304, 20250305, 20250307, 20250310, 20250311
+    ]
+    minute_masks = fetch_day_coverage(
+        pg_conn, instrument_id=instrument_id, td_min=20250301, td_max=20250331
+    )
+    for d in report.days:
+        td = d.trading_date_ct_int
+        # Same counts and verdict as scoring the day_coverage bitmap directly.
+        coverage = evaluate_day_coverage(
+            minute_mask=minute_masks.get(td, 0),
+            window=window,
+            role=WindowRole.X,
+            policy=policy,
+            expected_mask=expected_masks.get(td, DEFAULT_SESSION_MASK),
+        )
+        assert (
+            d.observed_bar_count,
+            d.expected_bar_count,
+            d.missing_bar_count,
+            d.missing_ratio,
+            d.is_complete,
+            d.exclusion_reason,
+        ) == (
+            coverage.observed_bar_count,
+            coverage.expected_bar_count,
+            coverage.missing_bar_count,
+            coverage.missing_ratio,
+            coverage.is_complete,
+            coverage.exclusion_reason,
+        )
+        if td == 20250310:
+            assert (d.open, d.range, d.bar_count, d.is_complete) == (None, None, 0, False)
+            continue
+        got = (d.open, d.high, d.low, d.close, d.range, d.volume, d.trades_count, d.bar_count)
+        assert got == _expected_day(bars[td], window)
+
+
+def test_window_metrics_coverage_and_summary(pg_conn: psycopg.Connection, loaded):
+    instrument_id, _, _ = loaded
+    policy = MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=0.05, y_tol=0.0)
+
+    report = run_window_metrics(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=20250301,
+        td_max=20250331,
+        window=RTH,
+        policy=policy,
+        percentiles=(50, 90),
+    )
+
+    by_date = {d.trading_date_ct_int: d for d in report.days}
+    # Calendar sessions set the expected count; 03-11 is not in the calendar.
+    assert {td: d.expected_bar_count for td, d in by_date.items()} == {
+        20250303: 450,
+        20250304: 450,
+        20250305: 450,
+        20250307: 210,
+        20250310: 450,
+        20250311: 450,
+    }
+    assert [td for td, d in by_date.items() if not d.is_complete] == [20250305, 20250310]
+    assert (report.days_in_range, report.included_days, report.excluded_days) == (6, 4, 2)
+    assert report.exclusion_reasons == {CoverageExclusionReason.MISSING_EXCEEDS_TOLERANCE: 2}
+
+    # Aggregated in SQL (percentile_cont), so compare with a Python reference.
+    included = [d for d in report.days if d.is_complete]
+    for name in ("range", "volume", "trades_count"):
+        values = sorted(getattr(d, name) for d in included)
+        summary = getattr(report, name)
+        assert summary.mean == pytest.approx(fmean(values))
+        assert summary.median == pytest.approx(median(values))
+        assert summary.percentiles == {
+            50: pytest.approx(median(values)),
+            90: pytest.approx(values[2] + (values[3] - values[2]) * 0.7),
+        }
+
+    strict = run_window_metrics(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=20250301,
+        td_max=20250331,
+        window=RTH,
+        policy=MissingPolicy(mode=MissingPolicyMode.STRICT),
+    )
+    assert strict.included_days == 0
+    assert strict.range is None
+
+
+def test_window_metrics_default_session_skips_the_halt(pg_conn: psycopg.Connection, loaded):
+    instrument_id, bars, _ = loaded
+    # A stray 16:30 bar on 03-11 (no calendar row) must not stand in for a missing one.
+    ts = int(datetime(2025, 3, 11, 16, 30, tzinfo=_CT).timestamp())
+    upsert_bars_1m(
+        pg_conn,
+        [(instrument_id, ts, 20250311, 990, 5000.0, 5000.25, 5000.0, 5000.0, 1, 1, None)],
+        merge_policy="skip",
+    )
+    rebuild_bars_30m_range(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=20250311,
+        td_max=20250311,
+        derived_from_import_id=None,
+    )
+    policy = MissingPolicy(mode=MissingPolicyMode.ALLOW_MISSING_UP_TO, x_tol=0.015, y_tol=0.0)
+
+    report = run_window_metrics(
+        pg_conn,
+        instrument_id=instrument_id,
+        td_min=20250311,
+        td_max=20250311,
+        window=FULL,
+        policy=policy,
+    )
+
+    (day,) = report.days
+    observed = len(bars[20250311])
+    assert (day.bar_count, day.observed_bar_count) == (observed + 1, observed)
+    # 17:00-15:59 is expected, not the whole 1440-minute window.
+    assert day.expected_bar_count == 1380
+    assert day.missing_bar_count == 1380 - observed
+    assert day.is_complete
+    assert report.exclusion_reasons == {}
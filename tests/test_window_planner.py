@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+
+from es_stats.domain.windows import WindowAnchor, WindowSpec
+from es_stats.services.window_planner import explain_plans, plan_window, plan_windows
+
+
+def _w(start: int, end: int, name: str | None = None) -> WindowSpec:
+    return WindowSpec(WindowAnchor.TRADING_DATE_CT, start, end, name)
+
+
+def _shape(plan) -> list[tuple[str, int, int, int]]:
+    return [(f.resolution, f.start_minute_ct, f.end_minute_ct, f.rows_per_day) for f in plan.fragments]
+
+
+def test_plan_uses_coarse_interiors_for_a_misaligned_window() -> None:
+    # 08:30-10:14: one 30m, one 60m and one 15m bucket instead of 105 1m bars.
+    plan = plan_window(_w(510, 614))
+    assert _shape(plan) == [("30m", 510, 539, 1), ("60m", 540, 599, 1), ("15m", 600, 614, 1)]
+    assert [f.table for f in plan.fragments] == ["bars_30m", "bars_derived", "bars_derived"]
+    assert plan.rows_per_day == 3
+
+
+def test_plan_fills_unaligned_edges_with_1m_bars() -> None:
+    plan = plan_window(_w(511, 554))
+    assert _shape(plan) == [("1m", 511, 514, 4), ("5m", 515, 524, 2), ("15m", 525, 554, 2)]
+    assert plan.fragments[0].bucket_starts == (511, 512, 513, 514)
+    assert sum(f.end_minute_ct - f.start_minute_ct + 1 for f in plan.fragments) == 44
+
+
+def test_plan_handles_windows_that_wrap_midnight() -> None:
+    assert _shape(plan_window(_w(1020, 509))) == [("session", 1020, 509, 1)]
+    assert _shape(plan_window(_w(1410, 44))) == [("30m", 1410, 29, 2), ("15m", 30, 44, 1)]
+
+
+def test_plan_without_coarse_resolutions_is_pure_1m() -> None:
+    plan = plan_window(_w(510, 614), ())
+    assert _shape(plan) == [("1m", 510, 614, 105)]
+
+
+def test_explain_lists_tables_per_window_and_totals() -> None:
+    text = explain_plans(plan_windows([_w(510, 614, "IB_ext"), _w(950, 970)]))
+    assert text.splitlines() == [
+        "IB_ext 08:30-10:14 (105m): 30m 08:30-08:59 x1 [bars_30m] + 60m 09:00-09:59 x1 "
+        "[bars_derived] + 15m 10:00-10:14 x1 [bars_derived] = 3 rows/day (1m: 105)",
+        "15:50-16:10 (21m): 5m 15:50-16:09 x4 [bars_derived] + 1m 16:10-16:10 x1 [bars_1m] "
+        "= 5 rows/day (1m: 21)",
+        "rows/day by table: bars_1m=1, bars_30m=1, bars_derived=6 (total 8, pure 1m 126)",
+    ]
+
+
+def test_plan_windows_rejects_empty_windows() -> None:
+    with pytest.raises(ValueError, match="at least one window"):
+        plan_windows([])
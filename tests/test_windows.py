@@ -2,7 +2,13 @@ from __future__ import annotations
 
 import pytest
 
-from es_stats.domain.windows import WindowAnchor, WindowOrderRule, WindowSpec, validate_pair
+from es_stats.domain.windows import (
+    WindowAnchor,
+    WindowOrderRule,
+    WindowSpec,
+    validate_pair,
+    window_membership,
+)
 
 
 def test_window_spec_duration_for_non_wrapping_window() -> None:
@@ -52,3 +58,36 @@ def test_window_spec_rejects_out_of_range_minutes() -> None:
         WindowSpec(WindowAnchor.TRADING_DATE_CT, -1, 10)
     with pytest.raises(ValueError, match="end_minute_ct"):
         WindowSpec(WindowAnchor.TRADING_DATE_CT, 10, 1440)
+
+
+@pytest.mark.parametrize(
+    ("start", "end"),
+    [(0, 0), (0, 1439), (510, 959), (1020, 509), (1439, 0), (1020, 1019), (700, 700)],
+)
+def test_minute_mask_matches_covered_minutes(start: int, end: int) -> None:
+    w = WindowSpec(WindowAnchor.TRADING_DATE_CT, start, end)
+    assert {m for m in range(1440) if w.minute_mask >> m & 1} == w.covered_minutes()
+    assert w.minute_mask.bit_count() == w.duration_minutes
+    assert [m for m, flag in enumerate(w.minute_flags) if flag] == sorted(w.covered_minutes())
+
+
+def test_overlap_and_containment_use_masks() -> None:
+    on = WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 509, "ON")
+    rth = WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH")
+    asia = WindowSpec(WindowAnchor.TRADING_DATE_CT, 1080, 120, "Asia")
+    assert not on.overlaps(rth)
+    assert on.overlaps(asia) and asia.overlaps(on)
+    assert on.contains(asia) and not asia.contains(on)
+    assert not rth.contains(asia)
+    assert on.contains_minute(0) and not on.contains_minute(510)
+
+
+def test_members_and_window_membership_map_minute_arrays() -> None:
+    on = WindowSpec(WindowAnchor.TRADING_DATE_CT, 1020, 509, "ON")
+    ib = WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 569, "IB")
+    rth = WindowSpec(WindowAnchor.TRADING_DATE_CT, 510, 959, "RTH")
+    minutes = [1020, 509, 510, 569, 570, 959, 960, 1019]
+
+    assert on.members(minutes) == bytes([1, 1, 0, 0, 0, 0, 0, 0])
+    assert window_membership(minutes, [on, ib, rth]) == [1, 1, 6, 6, 4, 4, 0, 0]
+    assert window_membership([], [on]) == []